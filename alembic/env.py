@@ -10,10 +10,17 @@ from core.models.base import Base
 import core.models.catalog  # noqa: F401
 import core.models.transaction  # noqa: F401
 import core.models.inventory_snapshot  # noqa: F401
+import core.models.inventory_version  # noqa: F401
+import core.models.inventory_holding  # noqa: F401
+import core.models.transaction_daily_total  # noqa: F401
+import core.models.transaction_version  # noqa: F401
+import core.models.transaction_search  # noqa: F401
 import core.models.price  # noqa: F401
 import core.models.listings  # noqa: F401
 import core.models.decisions  # noqa: F401
 import core.models.sync_state  # noqa: F401
+import core.models.ebay_resolution  # noqa: F401
+import core.models.market_indicators  # noqa: F401
 import core.auth  # noqa: F401 - imports User model
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,67 @@
+"""add inventory holding table
+
+Revision ID: 0b33709a5498
+Revises: 28831e09c4f5
+Create Date: 2026-10-18 22:40:44.297601
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0b33709a5498"
+down_revision: Union[str, None] = "28831e09c4f5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "inventory_holding",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("sku_id", sa.Uuid(), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("total_cost", sa.Numeric(scale=2), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["sku_id"],
+            ["sku.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("user_id", "sku_id"),
+    )
+    op.create_index(
+        op.f("ix_inventory_holding_sku_id"),
+        "inventory_holding",
+        ["sku_id"],
+        unique=False,
+    )
+
+    # Backfill from the line items; the transaction DAO keeps it current
+    op.execute(
+        """
+        INSERT INTO inventory_holding (user_id, sku_id, quantity, total_cost)
+        SELECT user_id, sku_id, sum(remaining_quantity),
+               sum(unit_price_amount * remaining_quantity)
+        FROM line_item
+        GROUP BY user_id, sku_id
+        HAVING sum(remaining_quantity) > 0
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_inventory_holding_sku_id"), table_name="inventory_holding")
+    op.drop_table("inventory_holding")
@@ -0,0 +1,51 @@
+"""add transaction_version and transaction type index
+
+Revision ID: 12f3090b98c3
+Revises: 9719f9490fae
+Create Date: 2026-10-18 23:15:56.507642
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "12f3090b98c3"
+down_revision: Union[str, None] = "9719f9490fae"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "transaction_version",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column(
+            "version", sa.BigInteger(), server_default=sa.text("1"), nullable=False
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    op.create_index(
+        "ix_transaction_user_id_type_date",
+        "transaction",
+        ["user_id", "type", "date"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_transaction_user_id_type_date", table_name="transaction")
+    op.drop_table("transaction_version")
@@ -0,0 +1,46 @@
+"""add inventory version table
+
+Revision ID: 28831e09c4f5
+Revises: b8e2f61a9d37
+Create Date: 2026-10-18 22:29:33.225422
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "28831e09c4f5"
+down_revision: Union[str, None] = "b8e2f61a9d37"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "inventory_version",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column(
+            "version", sa.BigInteger(), server_default=sa.text("1"), nullable=False
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    op.create_index(op.f("ix_line_item_sku_id"), "line_item", ["sku_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_line_item_sku_id"), table_name="line_item")
+    op.drop_table("inventory_version")
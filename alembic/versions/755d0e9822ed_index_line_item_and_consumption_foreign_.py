@@ -0,0 +1,51 @@
+"""index line item and consumption foreign keys
+
+Revision ID: 755d0e9822ed
+Revises: 0b33709a5498
+Create Date: 2026-10-18 22:47:25.883455
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "755d0e9822ed"
+down_revision: Union[str, None] = "0b33709a5498"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        op.f("ix_line_item_transaction_id"),
+        "line_item",
+        ["transaction_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_line_item_consumption_purchase_line_item_id"),
+        "line_item_consumption",
+        ["purchase_line_item_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_line_item_consumption_sale_line_item_id"),
+        "line_item_consumption",
+        ["sale_line_item_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_line_item_consumption_sale_line_item_id"),
+        table_name="line_item_consumption",
+    )
+    op.drop_index(
+        op.f("ix_line_item_consumption_purchase_line_item_id"),
+        table_name="line_item_consumption",
+    )
+    op.drop_index(op.f("ix_line_item_transaction_id"), table_name="line_item")
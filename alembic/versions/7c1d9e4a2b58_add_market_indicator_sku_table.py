@@ -0,0 +1,96 @@
+"""add market indicator sku table
+
+Revision ID: 7c1d9e4a2b58
+Revises: 5fe4886d9615
+Create Date: 2025-11-18 10:12:44.518203
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from core.models.types import TextEnum
+from core.models.market_indicators import MarketIndicatorClassification
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7c1d9e4a2b58"
+down_revision: Union[str, None] = "5fe4886d9615"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "market_indicator_sku",
+        sa.Column("sku_id", sa.UUID(), nullable=False),
+        sa.Column(
+            "classification", TextEnum(MarketIndicatorClassification), nullable=False
+        ),
+        sa.Column("is_market_indicator", sa.Boolean(), nullable=False),
+        sa.Column(
+            "refreshed_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["sku_id"],
+            ["sku.id"],
+        ),
+        sa.PrimaryKeyConstraint("sku_id"),
+    )
+    op.create_index(
+        "ix_market_indicator_sku_indicator",
+        "market_indicator_sku",
+        ["sku_id"],
+        unique=False,
+        postgresql_where=sa.text("is_market_indicator"),
+    )
+    op.create_index(
+        "ix_market_indicator_sku_classification",
+        "market_indicator_sku",
+        ["classification", "sku_id"],
+        unique=False,
+    )
+
+    # Backfill from the current catalog; update_catalog_db keeps it in sync after
+    op.execute(
+        """
+        INSERT INTO market_indicator_sku (sku_id, classification, is_market_indicator)
+        SELECT sku.id,
+               CASE
+                   WHEN product.product_type = 'SEALED'
+                        AND product.name ILIKE '%Booster Pack%' THEN 'BOOSTER_PACK'
+                   WHEN product.product_type = 'CARDS' THEN 'CARD'
+                   ELSE 'SEALED'
+               END,
+               (product.product_type = 'CARDS'
+                AND condition.abbreviation IN ('NM', 'LP')
+                AND language.abbreviation = 'EN')
+               OR (product.product_type = 'SEALED' AND condition.abbreviation = 'U')
+        FROM sku
+        JOIN product ON sku.product_id = product.id
+        JOIN condition ON sku.condition_id = condition.id
+        JOIN language ON sku.language_id = language.id
+        WHERE (product.product_type = 'CARDS'
+               AND condition.abbreviation IN ('NM', 'LP')
+               AND language.abbreviation = 'EN')
+           OR (product.product_type = 'SEALED'
+               AND (condition.abbreviation = 'U'
+                    OR product.name ILIKE '%Booster Pack%'))
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_market_indicator_sku_classification", table_name="market_indicator_sku"
+    )
+    op.drop_index(
+        "ix_market_indicator_sku_indicator",
+        table_name="market_indicator_sku",
+        postgresql_where=sa.text("is_market_indicator"),
+    )
+    op.drop_table("market_indicator_sku")
@@ -0,0 +1,73 @@
+"""add transaction_daily_total rollup
+
+Revision ID: 9719f9490fae
+Revises: 755d0e9822ed
+Create Date: 2026-10-18 23:09:57.810081
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9719f9490fae"
+down_revision: Union[str, None] = "755d0e9822ed"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "transaction_daily_total",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("sale_count", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.Numeric(scale=2), nullable=False),
+        sa.Column("purchase_count", sa.Integer(), nullable=False),
+        sa.Column("expenses", sa.Numeric(scale=2), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("user_id", "day"),
+    )
+    op.create_index(
+        "ix_transaction_user_id_date", "transaction", ["user_id", "date"], unique=False
+    )
+    # Backfill from the transactions; the transaction DAO keeps it current
+    op.execute(
+        """
+        INSERT INTO transaction_daily_total (user_id, day, sale_count, revenue,
+                                             purchase_count, expenses)
+        SELECT t.user_id, t.date::date,
+               count(*) FILTER (WHERE t.type = 'SALE'),
+               coalesce(sum(coalesce(li.total, 0) + t.tax_amount
+                            - t.shipping_cost_amount)
+                        FILTER (WHERE t.type = 'SALE'), 0),
+               count(*) FILTER (WHERE t.type = 'PURCHASE'),
+               coalesce(sum(coalesce(li.total, 0) + t.tax_amount
+                            + t.shipping_cost_amount)
+                        FILTER (WHERE t.type = 'PURCHASE'), 0)
+        FROM transaction AS t
+        LEFT JOIN (
+            SELECT transaction_id, sum(quantity * unit_price_amount) AS total
+            FROM line_item
+            GROUP BY transaction_id
+        ) AS li ON li.transaction_id = t.id
+        GROUP BY t.user_id, t.date::date
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_transaction_user_id_date", table_name="transaction")
+    op.drop_table("transaction_daily_total")
@@ -0,0 +1,75 @@
+"""add sku price reference table
+
+Revision ID: b8e2f61a9d37
+Revises: 7c1d9e4a2b58
+Create Date: 2025-11-20 09:41:27.301644
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from core.models.types import TextEnum
+from core.models.price import Marketplace, PriceReferenceHorizon
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b8e2f61a9d37"
+down_revision: Union[str, None] = "7c1d9e4a2b58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sku_price_reference",
+        sa.Column("sku_id", sa.UUID(), nullable=False),
+        sa.Column("marketplace", TextEnum(Marketplace), nullable=False),
+        sa.Column("horizon", TextEnum(PriceReferenceHorizon), nullable=False),
+        sa.Column("reference_datetime", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "lowest_listing_price_total",
+            sa.Numeric(precision=10, scale=2),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["sku_id"],
+            ["sku.id"],
+        ),
+        sa.PrimaryKeyConstraint("sku_id", "marketplace", "horizon"),
+    )
+    op.create_index(op.f("ix_product_set_id"), "product", ["set_id"], unique=False)
+    op.create_index(op.f("ix_sku_product_id"), "sku", ["product_id"], unique=False)
+
+    # Backfill as of now; the next snapshot run refreshes it
+    op.execute(
+        """
+        INSERT INTO sku_price_reference (sku_id, marketplace, horizon,
+                                         reference_datetime,
+                                         lowest_listing_price_total)
+        SELECT latest.sku_id, latest.marketplace, horizon.name,
+               previous.snapshot_datetime, previous.lowest_listing_price_total
+        FROM sku_latest_price AS latest
+        CROSS JOIN (
+            VALUES ('24h', interval '24 hours'),
+                   ('7d', interval '7 days'),
+                   ('30d', interval '30 days')
+        ) AS horizon (name, span)
+        JOIN LATERAL (
+            SELECT snapshot_datetime, lowest_listing_price_total
+            FROM sku_price_data_snapshot
+            WHERE sku_id = latest.sku_id
+              AND marketplace = latest.marketplace
+              AND snapshot_datetime <= now() - horizon.span
+            ORDER BY snapshot_datetime DESC
+            LIMIT 1
+        ) AS previous ON true
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_sku_product_id"), table_name="sku")
+    op.drop_index(op.f("ix_product_set_id"), table_name="product")
+    op.drop_table("sku_price_reference")
@@ -0,0 +1,77 @@
+"""add transaction_search documents
+
+Revision ID: df0ab3701f5f
+Revises: 12f3090b98c3
+Create Date: 2026-10-18 23:29:58.380417
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "df0ab3701f5f"
+down_revision: Union[str, None] = "12f3090b98c3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "transaction_search",
+        sa.Column("transaction_id", sa.Uuid(), nullable=False),
+        sa.Column("document", postgresql.TSVECTOR(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["transaction_id"], ["transaction.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("transaction_id"),
+    )
+    op.create_index(
+        "ix_transaction_search_document",
+        "transaction_search",
+        ["document"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+    # Backfill from the transactions; the transaction DAO keeps it current
+    op.execute(
+        """
+        INSERT INTO transaction_search (transaction_id, document)
+        SELECT t.id,
+               setweight(to_tsvector('english', coalesce(t.counterparty_name, '')), 'A')
+               || setweight(to_tsvector('english', coalesce(p.names, '')), 'A')
+               || setweight(to_tsvector('english', coalesce(p.set_names, '')), 'B')
+               || setweight(to_tsvector('english', coalesce(p.details, '')), 'C')
+        FROM transaction AS t
+        LEFT JOIN (
+            SELECT line_item.transaction_id,
+                   string_agg(product.name, ' ') AS names,
+                   string_agg(product.set_name, ' ') AS set_names,
+                   string_agg(concat_ws(' ', product.rarity, product.number), ' ')
+                       AS details
+            FROM line_item
+            JOIN sku ON sku.id = line_item.sku_id
+            JOIN product ON product.id = sku.product_id
+            GROUP BY line_item.transaction_id
+        ) AS p ON p.transaction_id = t.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_transaction_search_document",
+        table_name="transaction_search",
+        postgresql_using="gin",
+    )
+    op.drop_table("transaction_search")
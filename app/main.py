@@ -12,6 +12,8 @@ from app.routes.inventory.api import router as inventory_router
 from app.routes.market.api import router as market_router
 from app.routes.decisions.api import router as decisions_router
 from core.services.tcgplayer_catalog_service import get_tcgplayer_catalog_service
+from core.services.oauth_token_store import log_token_metrics
+from core.services.sku_price_source import log_price_source_stats
 from core.services.redis_service import get_redis_pool, close_redis_pool
 
 SQLALCHEMY_DATABASE_URL = get_environment().db_url
@@ -33,6 +35,8 @@ async def lifespan(app: FastAPI):
     yield
 
     # Cleanup on shutdown
+    await log_token_metrics()
+    log_price_source_stats()
     await tcgplayer_catalog_service.close()
     await close_redis_pool()
 
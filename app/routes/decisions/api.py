@@ -1,58 +1,72 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy import select, desc
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session, selectinload
 
 from core.database import get_db_session
-from core.models.decisions import BuyDecision, Decision
+from core.dao.buy_decision import (
+    count_current_buy_decisions,
+    get_current_buy_decisions_page,
+)
+from core.models.decisions import BuyDecision
 from app.routes.catalog.schemas import SKUWithProductResponseSchema
-from .schemas import BuyDecisionsResponseSchema, BuyDecisionResponseSchema
+from .schemas import (
+    BuyDecisionsRequestParams,
+    BuyDecisionsResponseSchema,
+    BuyDecisionResponseSchema,
+    decode_buy_decision_cursor,
+    encode_buy_decision_cursor,
+)
 
 router = APIRouter(prefix="/buy-decisions", tags=["buy-decisions"])
 
 
 @router.get("/", response_model=BuyDecisionsResponseSchema)
 async def get_buy_decisions(
+    params: BuyDecisionsRequestParams = Depends(),
     session: Session = Depends(get_db_session),
 ):
     """
-    Get latest BUY decision per SKU, sorted by expected profit (highest first).
-    Returns all current BUY recommendations across all SKUs.
+    Get the current BUY decision per SKU, sorted by the requested field (highest first).
+    Reads from the buy_decision_current projection and pages with an opaque keyset cursor.
     Public endpoint for monitoring algorithm performance.
     """
-    # Use DISTINCT ON to get latest decision per SKU
-    query = (
-        select(BuyDecision)
-        .options(
+    after = None
+    if params.cursor:
+        try:
+            after = decode_buy_decision_cursor(params.cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    # Fetch one extra row to know whether another page exists
+    rows = get_current_buy_decisions_page(
+        session,
+        sort_by=params.sort_by,
+        limit=params.limit + 1,
+        after=after,
+        load_options=[
             selectinload(BuyDecision.sku).options(
                 *SKUWithProductResponseSchema.get_load_options()
             )
-        )
-        .where(BuyDecision.decision == Decision.BUY)
-        .order_by(
-            BuyDecision.sku_id,
-            desc(BuyDecision.created_at),
-            desc(BuyDecision.expected_resale_net),
-        )
-        .distinct(BuyDecision.sku_id)
+        ],
     )
 
-    # Execute the DISTINCT ON query first to get latest per SKU
-    latest_decisions = session.execute(query).scalars().all()
-
-    # Sort by expected_resale_net
-    latest_decisions.sort(key=lambda d: d.expected_resale_net, reverse=True)
-    results = latest_decisions
+    next_cursor = None
+    if len(rows) > params.limit:
+        rows = rows[: params.limit]
+        last_decision, last_sort_value = rows[-1]
+        next_cursor = encode_buy_decision_cursor(last_sort_value, last_decision.sku_id)
 
     # Transform results using the schema
     decisions = [
-        BuyDecisionResponseSchema.model_validate(decision) for decision in results
+        BuyDecisionResponseSchema.model_validate(decision) for decision, _ in rows
     ]
 
     return BuyDecisionsResponseSchema(
         decisions=decisions,
-        total_count=len(decisions),
+        total_count=count_current_buy_decisions(session),
         filters_applied={
             "decision": "BUY",
             "latest_per_sku": True,
+            "sort_by": params.sort_by.value,
         },
+        next_cursor=next_cursor,
     )
@@ -1,11 +1,15 @@
+import base64
+import json
 from datetime import datetime
-from typing import List
+from decimal import Decimal
+from typing import List, Optional, Tuple
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.routes.utils import ORMModel, MoneyAmountSchema
 from app.routes.catalog.schemas import SKUWithProductResponseSchema
+from core.dao.buy_decision import BuyDecisionSortField
 from core.models.decisions import Decision
 
 
@@ -22,7 +26,32 @@ class BuyDecisionResponseSchema(ORMModel):
     created_at: datetime
 
 
+class BuyDecisionsRequestParams(BaseModel):
+    sort_by: BuyDecisionSortField = BuyDecisionSortField.EXPECTED_RESALE_NET
+    limit: int = Field(default=50, ge=1, le=200)
+    cursor: Optional[str] = None
+
+    class Config:
+        extra = "forbid"
+
+
 class BuyDecisionsResponseSchema(BaseModel):
     decisions: List[BuyDecisionResponseSchema]
     total_count: int
     filters_applied: dict
+    next_cursor: Optional[str] = None
+
+
+def encode_buy_decision_cursor(sort_value: Decimal, sku_id: UUID) -> str:
+    """Encode the keyset position of the last row on a page as an opaque token."""
+    payload = json.dumps({"v": str(sort_value), "k": str(sku_id)})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_buy_decision_cursor(cursor: str) -> Tuple[Decimal, UUID]:
+    """Decode a token produced by encode_buy_decision_cursor. Raises ValueError if malformed."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return Decimal(payload["v"]), UUID(payload["k"])
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
@@ -15,3 +15,38 @@ def test_get_buy_decisions():
         assert "decisions" in data
         assert "total_count" in data
         assert "filters_applied" in data
+
+
+def test_get_buy_decisions_keyset_pagination():
+    """Test that following next_cursor pages through decisions without overlap."""
+    with TestClient(app) as client:
+        first = client.get(
+            "/buy-decisions", params={"limit": 2, "sort_by": "expected_margin"}
+        )
+        assert first.status_code == 200, first.json()
+        first_data = first.json()
+        assert len(first_data["decisions"]) <= 2
+
+        if first_data["next_cursor"] is None:
+            return
+
+        second = client.get(
+            "/buy-decisions",
+            params={
+                "limit": 2,
+                "sort_by": "expected_margin",
+                "cursor": first_data["next_cursor"],
+            },
+        )
+        assert second.status_code == 200, second.json()
+
+        first_ids = {d["id"] for d in first_data["decisions"]}
+        second_ids = {d["id"] for d in second.json()["decisions"]}
+        assert first_ids.isdisjoint(second_ids)
+
+
+def test_get_buy_decisions_invalid_cursor():
+    """Test that a malformed cursor is rejected."""
+    with TestClient(app) as client:
+        response = client.get("/buy-decisions", params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
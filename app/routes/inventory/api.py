@@ -2,7 +2,7 @@ from datetime import datetime, timedelta, date
 from datetime import timezone as datetime_timezone
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, true
 from typing import List, TypedDict
 from uuid import UUID
 from decimal import Decimal
@@ -33,15 +33,22 @@ from core.database import get_db_session
 from core.models.catalog import SKU, Product
 from core.dao.price import (
     latest_price_subquery,
-    price_24h_ago_subquery,
+    price_24h_ago_lateral,
     fetch_sku_price_snapshots,
     normalize_price_history,
     date_to_datetime_utc,
     PriceHistoryPoint,
 )
-from core.services.tcgplayer_catalog_service import get_tcgplayer_catalog_service
+from core.services.live_price_service import (
+    LivePriceService,
+    get_live_price_service,
+)
 from core.models.transaction import Transaction, LineItem, TransactionType
-from core.services.inventory_service import get_inventory_metrics, get_inventory_history
+from core.services.inventory_service import get_inventory_history
+from core.services.inventory_metrics_cache import (
+    InventoryMetricsCache,
+    get_inventory_metrics_cache,
+)
 from core.services.price_service import build_daily_price_series_for_skus
 
 
@@ -66,6 +73,7 @@ def get_inventory_performance_endpoint(
     days: int | None = None,
     session: Session = Depends(get_db_session),
     current_user: User = Depends(get_current_user),
+    metrics_cache: InventoryMetricsCache = Depends(get_inventory_metrics_cache),
 ):
     """Return historical inventory performance data for visualization.
 
@@ -78,7 +86,7 @@ def get_inventory_performance_endpoint(
         session=session, user_id=current_user.id, catalog_id=catalog_id, days=days
     )
     # 2) Fetch live metrics for today
-    metrics = get_inventory_metrics(
+    metrics = metrics_cache.get_metrics(
         session=session, user_id=current_user.id, catalog_id=catalog_id
     )
     # 3) Build today's snapshot row
@@ -97,9 +105,10 @@ def get_inventory_metrics_endpoint(
     catalog_id: UUID | None = None,
     session: Session = Depends(get_db_session),
     current_user: User = Depends(get_current_user),
+    metrics_cache: InventoryMetricsCache = Depends(get_inventory_metrics_cache),
 ):
     """Return aggregate metrics for the selected catalogue (or all user's catalogues)."""
-    metrics = get_inventory_metrics(
+    metrics = metrics_cache.get_metrics(
         session=session, user_id=current_user.id, catalog_id=catalog_id
     )
     return InventoryMetricsResponseSchema(**metrics)
@@ -228,7 +237,7 @@ def get_inventory_item_details(
     """
     inventory_sku_quantity_cte = get_sku_cost_quantity_cte(user_id=current_user.id)
     latest_price = latest_price_subquery()
-    price_24h_ago = price_24h_ago_subquery()
+    price_24h_ago = price_24h_ago_lateral(SKU.id)
 
     query = (
         select(
@@ -240,7 +249,7 @@ def get_inventory_item_details(
         )
         .join(inventory_sku_quantity_cte, SKU.id == inventory_sku_quantity_cte.c.sku_id)
         .outerjoin(latest_price, SKU.id == latest_price.c.sku_id)
-        .outerjoin(price_24h_ago, SKU.id == price_24h_ago.c.sku_id)
+        .outerjoin(price_24h_ago, true())
         .options(  # Eager load SKU's related data for the response schema
             joinedload(SKU.product).joinedload(Product.set),
             joinedload(SKU.condition),
@@ -426,6 +435,7 @@ async def get_sku_price_history(
     marketplace: str | None = None,
     session: Session = Depends(get_db_session),
     current_user: User = Depends(get_current_user),
+    live_price_service: LivePriceService = Depends(get_live_price_service),
 ):
     """
     Get the normalized price history for a specific SKU in inventory.
@@ -459,36 +469,32 @@ async def get_sku_price_history(
         end_date=end_date,
     )
 
-    # Fetch fresh price data for today (read-only, not stored)
+    # Overlay today's live price (read-only, not stored)
     try:
         sku_tcgplayer_id = session.execute(
             select(SKU.tcgplayer_id).where(SKU.id == sku_id)
         ).scalar_one_or_none()
 
         if sku_tcgplayer_id:
-            catalog_service = get_tcgplayer_catalog_service()
-            # Fetch current price directly from TCGPlayer
-            sku_prices_response = await catalog_service.get_sku_prices(
-                [sku_tcgplayer_id]
+            live_prices = await live_price_service.get_live_prices(
+                session, {sku_tcgplayer_id: sku_id}
             )
+            fresh_price = live_prices.get(sku_id)
 
-            if sku_prices_response.results:
-                fresh_price = sku_prices_response.results[0].lowest_listing_price_total
-
-                if fresh_price is not None:
-                    today_iso = date_to_datetime_utc(date.today()).isoformat()
+            if fresh_price is not None:
+                today_iso = date_to_datetime_utc(date.today()).isoformat()
 
-                    # Check if the last data point is today and update it, otherwise append
-                    if price_data and price_data[-1].datetime_iso == today_iso:
-                        price_data[-1] = PriceHistoryPoint(
+                # Check if the last data point is today and update it, otherwise append
+                if price_data and price_data[-1].datetime_iso == today_iso:
+                    price_data[-1] = PriceHistoryPoint(
+                        datetime_iso=today_iso, price=float(fresh_price)
+                    )
+                else:
+                    price_data.append(
+                        PriceHistoryPoint(
                             datetime_iso=today_iso, price=float(fresh_price)
                         )
-                    else:
-                        price_data.append(
-                            PriceHistoryPoint(
-                                datetime_iso=today_iso, price=float(fresh_price)
-                            )
-                        )
+                    )
 
     except Exception as e:
         # Log the error but don't fail the request - just return historical data
@@ -4,7 +4,7 @@ from typing import Dict, List, Optional
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.routes.catalog.schemas import (
@@ -29,15 +29,16 @@ from app.routes.market.schemas import (
     ProductVariantPriceHistoryResponseSchema,
     SKUPriceHistorySeriesSchema,
     PriceHistoryItemSchema,
+    BulkPriceHistoryRequestSchema,
+    BulkPriceHistoryResponseSchema,
 )
 from app.routes.catalog.schemas import SKUBaseResponseSchema
 from app.routes.utils import MoneySchema
 from core.database import get_db_session
-from core.models.catalog import Product, ProductVariant, SKU
+from core.models.catalog import ProductVariant, SKU
 from core.models.catalog import Set
 from core.models.price import Marketplace, SKULatestPrice
-from core.models.catalog import Condition, Printing, Language
-from core.services.schemas.schema import ProductType
+from core.models.catalog import Condition
 from core.services import market_data_service
 from core.services.market_data_service import (
     MarketDataService,
@@ -52,6 +53,10 @@ from core.services.tcgplayer_catalog_service import (
     TCGPlayerCatalogService,
     get_tcgplayer_catalog_service,
 )
+from core.services.live_price_service import (
+    LivePriceService,
+    get_live_price_service,
+)
 from core.services.ebay_listing_service import (
     EbayListingService,
     get_ebay_listing_service,
@@ -61,8 +66,10 @@ from app.routes.market.service import (
     get_tcgplayer_product_variant_listings,
     get_ebay_product_variant_listings,
 )
+from core.dao.price_reference import set_price_comparison_select
 from core.dao.price import (
     fetch_bulk_sku_price_histories,
+    fetch_price_history_columns,
     date_to_datetime_utc,
     PriceHistoryPoint,
 )
@@ -360,143 +367,51 @@ def get_set_price_comparison(
     Calculate the total market value of all cards in a set, comparing current prices
     with historical prices from N days ago to show growth trends.
     """
-    from datetime import datetime, timedelta
-    from core.models.price import SKUPriceDataSnapshot
-
     # Verify set exists
     set_obj = session.get(Set, set_id)
     if set_obj is None:
         raise HTTPException(status_code=404, detail="Set not found")
 
-    # Calculate historical date
-    historical_date = datetime.now() - timedelta(days=days_ago)
-
-    # Get current prices (latest)
-    current_result = session.execute(
-        select(
-            SKU,
-            SKULatestPrice.lowest_listing_price_total,
-            Product.name,
-            Condition.name,
-            Printing.name,
-            Language.name,
-        )
-        .select_from(SKU)
-        .join(Product, SKU.product_id == Product.id)
-        .join(Set, Product.set_id == Set.id)
-        .join(Condition, SKU.condition_id == Condition.id)
-        .join(Printing, SKU.printing_id == Printing.id)
-        .join(Language, SKU.language_id == Language.id)
-        .outerjoin(
-            SKULatestPrice,
-            (SKULatestPrice.sku_id == SKU.id)
-            & (SKULatestPrice.marketplace == Marketplace.TCGPLAYER),
-        )
-        .where(Set.id == set_id)
-        .where(Product.product_type == ProductType.CARDS)
-    ).all()
-
-    # Get historical prices from the closest snapshot to historical_date
-    # We need to get the latest snapshot for each SKU that was taken on or before historical_date
-    historical_subquery = (
-        select(
-            SKUPriceDataSnapshot.sku_id,
-            func.max(SKUPriceDataSnapshot.snapshot_datetime).label(
-                "latest_snapshot_date"
-            ),
-        )
-        .where(
-            (SKUPriceDataSnapshot.marketplace == Marketplace.TCGPLAYER)
-            & (SKUPriceDataSnapshot.snapshot_datetime <= historical_date)
-        )
-        .group_by(SKUPriceDataSnapshot.sku_id)
-        .subquery()
-    )
-
-    historical_result = session.execute(
-        select(
-            SKU,
-            SKUPriceDataSnapshot.lowest_listing_price_total,
-            Product.name,
-            Condition.name,
-            Printing.name,
-            Language.name,
-        )
-        .select_from(SKU)
-        .join(Product, SKU.product_id == Product.id)
-        .join(Set, Product.set_id == Set.id)
-        .join(Condition, SKU.condition_id == Condition.id)
-        .join(Printing, SKU.printing_id == Printing.id)
-        .join(Language, SKU.language_id == Language.id)
-        .join(historical_subquery, historical_subquery.c.sku_id == SKU.id)
-        .join(
-            SKUPriceDataSnapshot,
-            (SKUPriceDataSnapshot.sku_id == SKU.id)
-            & (SKUPriceDataSnapshot.marketplace == Marketplace.TCGPLAYER)
-            & (
-                SKUPriceDataSnapshot.snapshot_datetime
-                == historical_subquery.c.latest_snapshot_date
-            ),
-        )
-        .where(Set.id == set_id)
-        .where(Product.product_type == ProductType.CARDS)
-    ).all()
+    # Current and historical prices in one pass over the set's SKUs
+    result = session.execute(set_price_comparison_select(set_id, days_ago)).all()
 
-    # Calculate current totals
     current_total_market_value = 0.0
     current_top_priced_card = None
     current_highest_price = 0.0
+    historical_total_market_value = 0.0
+    historical_top_priced_card = None
+    historical_highest_price = 0.0
 
-    for (
-        sku,
-        price,
-        product_name,
-        condition_name,
-        printing_name,
-        language_name,
-    ) in current_result:
-        if price is not None:
-            price_float = float(price)
+    for row in result:
+        if row.current_price is not None:
+            price_float = float(row.current_price)
             current_total_market_value += price_float
 
             # Only consider Near Mint cards for top priced card
-            if price_float > current_highest_price and condition_name == "Near Mint":
+            if price_float > current_highest_price and row.condition == "Near Mint":
                 current_highest_price = price_float
                 current_top_priced_card = TopPricedCardSchema(
-                    sku_id=sku.id,
-                    product_name=product_name,
-                    condition=condition_name,
-                    printing=printing_name,
-                    language=language_name,
+                    sku_id=row.sku_id,
+                    product_name=row.product_name,
+                    condition=row.condition,
+                    printing=row.printing,
+                    language=row.language,
                     price=price_float,
                 )
 
-    # Calculate historical totals
-    historical_total_market_value = 0.0
-    historical_top_priced_card = None
-    historical_highest_price = 0.0
-
-    for (
-        sku,
-        price,
-        product_name,
-        condition_name,
-        printing_name,
-        language_name,
-    ) in historical_result:
-        if price is not None:
-            price_float = float(price)
+        if row.historical_price is not None:
+            price_float = float(row.historical_price)
             historical_total_market_value += price_float
 
             # Only consider Near Mint cards for top priced card
-            if price_float > historical_highest_price and condition_name == "Near Mint":
+            if price_float > historical_highest_price and row.condition == "Near Mint":
                 historical_highest_price = price_float
                 historical_top_priced_card = TopPricedCardSchema(
-                    sku_id=sku.id,
-                    product_name=product_name,
-                    condition=condition_name,
-                    printing=printing_name,
-                    language=language_name,
+                    sku_id=row.sku_id,
+                    product_name=row.product_name,
+                    condition=row.condition,
+                    printing=row.printing,
+                    language=row.language,
                     price=price_float,
                 )
 
@@ -639,6 +554,39 @@ async def get_product_variant_price_summary(
     return ProductVariantPriceSummaryResponseSchema(prices=prices)
 
 
+@router.post(
+    "/price-history",
+    response_model=BulkPriceHistoryResponseSchema,
+    summary="Get price history for many SKUs",
+)
+def get_bulk_price_history(
+    request: BulkPriceHistoryRequestSchema,
+    session: Session = Depends(get_db_session),
+):
+    """
+    Return daily or weekly price history for up to 500 SKUs in one round-trip.
+
+    The response is columnar: one timestamp axis shared by every SKU, and per
+    SKU an array of prices aligned with it (each bucket's closing price,
+    forward-filled). Prices come from the snapshot history only; today's
+    bucket reflects the last snapshot run rather than a live price.
+    """
+    end_date = datetime.now(datetime_timezone.utc)
+    columns = fetch_price_history_columns(
+        session,
+        list(dict.fromkeys(request.sku_ids)),
+        start_date=end_date - timedelta(days=request.days),
+        end_date=end_date,
+        resolution=request.resolution,
+        marketplace=request.marketplace,
+    )
+    return BulkPriceHistoryResponseSchema(
+        resolution=columns.resolution,
+        timestamps=columns.timestamps,
+        prices=columns.prices,
+    )
+
+
 @router.get(
     "/product-variants/{product_variant_id}/price-history",
     response_model=ProductVariantPriceHistoryResponseSchema,
@@ -649,15 +597,13 @@ async def get_product_variant_price_history(
     days: int | None = None,
     _marketplace: str | None = None,
     session: Session = Depends(get_db_session),
-    tcgplayer_catalog_service: TCGPlayerCatalogService = Depends(
-        get_tcgplayer_catalog_service
-    ),
+    live_price_service: LivePriceService = Depends(get_live_price_service),
 ):
     """
     Return normalized daily price history for every SKU in the given product variant.
 
-    Pulls historical data from the price history table and forward-fills the most recent
-    marketplace data by calling TCGPlayer directly for today's price when available.
+    Pulls historical data from the price history table and overlays today's price
+    from the live price service when available.
 
     Parameters:
     - days: Number of days to look back. If None, returns all historical data.
@@ -691,40 +637,33 @@ async def get_product_variant_price_history(
     )
 
     try:
-        sku_tcgplayer_ids = [
-            sku.tcgplayer_id for sku in sku_records if sku.tcgplayer_id
-        ]
+        sku_ids_by_tcgplayer_id = {
+            sku.tcgplayer_id: sku.id for sku in sku_records if sku.tcgplayer_id
+        }
 
-        if sku_tcgplayer_ids:
-            sku_prices_response = await tcgplayer_catalog_service.get_sku_prices(
-                sku_tcgplayer_ids
+        if sku_ids_by_tcgplayer_id:
+            live_prices = await live_price_service.get_live_prices(
+                session, sku_ids_by_tcgplayer_id
             )
+            today_iso = date_to_datetime_utc(
+                datetime.now(datetime_timezone.utc).date()
+            ).isoformat()
 
-            if sku_prices_response.results:
-                today_iso = date_to_datetime_utc(
-                    datetime.now(datetime_timezone.utc).date()
-                ).isoformat()
-                tcgplayer_to_sku = {sku.tcgplayer_id: sku.id for sku in sku_records}
-
-                for price_result in sku_prices_response.results:
-                    sku_id = tcgplayer_to_sku.get(price_result.sku_id)
-                    if sku_id and price_result.lowest_listing_price_total is not None:
-                        price_data = price_histories.get(sku_id)
-
-                        # Only enrich SKUs that already have historical data
-                        if not price_data:
-                            continue
-
-                        fresh_price = float(price_result.lowest_listing_price_total)
-
-                        if price_data and price_data[-1].datetime_iso == today_iso:
-                            price_data[-1].price = fresh_price
-                        else:
-                            price_data.append(
-                                PriceHistoryPoint(
-                                    datetime_iso=today_iso, price=fresh_price
-                                )
-                            )
+            for sku_id, live_price in live_prices.items():
+                price_data = price_histories.get(sku_id)
+
+                # Only enrich SKUs that already have historical data
+                if not price_data:
+                    continue
+
+                fresh_price = float(live_price)
+
+                if price_data[-1].datetime_iso == today_iso:
+                    price_data[-1].price = fresh_price
+                else:
+                    price_data.append(
+                        PriceHistoryPoint(datetime_iso=today_iso, price=fresh_price)
+                    )
 
     except Exception as exc:  # noqa: BLE001
         import logging
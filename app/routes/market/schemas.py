@@ -1,4 +1,5 @@
 from typing import Optional, List, Annotated, Union
+import uuid
 from typing_extensions import Literal
 from datetime import datetime
 from pydantic import BaseModel, Field, AfterValidator
@@ -9,7 +10,7 @@ from app.routes.catalog.schemas import (
     SKUWithProductResponseSchema,
 )
 from app.routes.utils import MoneyAmountSchema, MoneySchema
-from core.models.price import Marketplace
+from core.models.price import Marketplace, PriceHistoryResolution
 
 
 # Schemas for Market Data endpoint
@@ -182,3 +183,23 @@ class ProductVariantPriceHistoryResponseSchema(BaseModel):
     """All SKU price history for a product variant."""
 
     series: list[SKUPriceHistorySeriesSchema]
+
+
+class BulkPriceHistoryRequestSchema(BaseModel):
+    """SKUs and window for a bulk price history request."""
+
+    sku_ids: list[uuid.UUID] = Field(..., min_length=1, max_length=500)
+    days: int = Field(30, ge=1, le=365, description="Number of days to look back")
+    resolution: PriceHistoryResolution = PriceHistoryResolution.DAILY
+    marketplace: Marketplace = Marketplace.TCGPLAYER
+
+
+class BulkPriceHistoryResponseSchema(BaseModel):
+    """Columnar price histories on a shared timestamp axis."""
+
+    resolution: PriceHistoryResolution
+    currency: str = "USD"
+    timestamps: list[datetime]
+    # sku_id -> price at the close of each timestamp's bucket (null before the
+    # first known price); SKUs without any price in the window are omitted
+    prices: dict[uuid.UUID, list[Optional[float]]]
@@ -9,7 +9,6 @@ from sqlalchemy.orm import Session, joinedload
 
 from app.routes.transactions.service import (
     create_transaction_service,
-    get_transaction_metrics,
     get_transaction_performance,
 )
 from core.dao.transaction import (
@@ -46,9 +45,10 @@ from core.services.create_transaction import (
     LineItemInput,
     calculate_weighted_unit_prices,
 )
-from core.services.tcgplayer_catalog_service import (
-    TCGPlayerCatalogService,
-    get_tcgplayer_catalog_service,
+from core.services.sku_price_source import SkuPriceSource, get_sku_price_source
+from core.services.transaction_metrics_cache import (
+    TransactionMetricsCache,
+    get_transaction_metrics_cache,
 )
 from core.models.user import User
 
@@ -59,9 +59,13 @@ router = APIRouter(
 
 
 @router.get("/metrics", response_model=TransactionMetricsResponseSchema)
-async def get_transactions_metrics(session: Session = Depends(get_db_session)):
-    """Get aggregate metrics for all transactions."""
-    metrics = get_transaction_metrics(session=session)
+async def get_transactions_metrics(
+    session: Session = Depends(get_db_session),
+    current_user: User = Depends(get_current_user),
+    metrics_cache: TransactionMetricsCache = Depends(get_transaction_metrics_cache),
+):
+    """Get aggregate metrics for the current user's transactions."""
+    metrics = metrics_cache.get_metrics(session=session, user_id=current_user.id)
     return TransactionMetricsResponseSchema(**metrics)
 
 
@@ -159,10 +163,13 @@ def get_transaction_performance_endpoint(
         description="Number of days to look back (omit for all time)",
     ),
     session: Session = Depends(get_db_session),
+    current_user: User = Depends(get_current_user),
 ):
-    """Get transaction performance data for visualization."""
+    """Get the current user's transaction performance data for visualization."""
     try:
-        performance_data = get_transaction_performance(session=session, days=days)
+        performance_data = get_transaction_performance(
+            session=session, user_id=current_user.id, days=days
+        )
         return TransactionPerformanceResponseSchema(**performance_data)
     except Exception as e:
         raise HTTPException(
@@ -186,14 +193,14 @@ async def get_transaction(
 @router.post("/", response_model=TransactionResponseSchema)
 async def create_transaction(
     request: TransactionCreateRequestSchema,
-    catalog_service: TCGPlayerCatalogService = Depends(get_tcgplayer_catalog_service),
+    price_source: SkuPriceSource = Depends(get_sku_price_source),
     session: Session = Depends(get_db_session),
     current_user: User = Depends(get_current_user),
 ):
     try:
         # Start a transaction explicitly
         transaction = await create_transaction_service(
-            request, catalog_service, session, current_user.id
+            request, price_source, session, current_user.id
         )
 
         session.commit()
@@ -309,9 +316,7 @@ async def update_transaction(
             try:
                 # Execute in order: Delete -> Update -> Add
                 if ids_to_delete:
-                    delete_transaction_line_items(
-                        session, transaction.type, ids_to_delete
-                    )
+                    delete_transaction_line_items(session, ids_to_delete)
                     session.flush()  # Flush deletions so subsequent operations see the changes
 
                 if items_to_update:
@@ -365,7 +370,7 @@ async def update_transaction(
 async def calculate_weighted_prices(
     request: WeightedPriceCalculationRequestSchema,
     session: Session = Depends(get_db_session),
-    catalog_service: TCGPlayerCatalogService = Depends(get_tcgplayer_catalog_service),
+    price_source: SkuPriceSource = Depends(get_sku_price_source),
     current_user: User = Depends(get_current_user),
 ):
     """Calculate unit prices by distributing total amount based on market price weighting."""
@@ -376,10 +381,10 @@ async def calculate_weighted_prices(
     ]
 
     try:
-        # Function now returns List[LineItemData]
-        calculated_data: List[LineItemData] = await calculate_weighted_unit_prices(
+        # Function now returns List[WeightedLineItemData]
+        calculated_data = await calculate_weighted_unit_prices(
             session=session,
-            catalog_service=catalog_service,
+            price_source=price_source,
             line_items=core_line_items,
             total_amount=request.total_amount,
             user_id=current_user.id,
@@ -390,12 +395,13 @@ async def calculate_weighted_prices(
             status_code=500, detail=f"Error during price calculation: {e}"
         )
 
-    # Map the result (List[LineItemData]) to the response schema using attribute access
+    # Map the result (List[WeightedLineItemData]) to the response schema using attribute access
     response_items = [
         CalculatedWeightedLineItemSchema(
             sku_id=item.sku_id,  # Use attribute access
             quantity=item.quantity,  # Use attribute access
             unit_price_amount=item.unit_price_amount,  # Use attribute access
+            price_source=item.price_source,
         )
         for item in calculated_data
     ]
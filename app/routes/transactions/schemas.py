@@ -11,6 +11,7 @@ from app.routes.utils import MoneyAmountSchema, ORMModel
 from core.models.transaction import LineItem
 from core.models.transaction import Transaction
 from core.models.transaction import TransactionType
+from core.services.sku_price_source import PriceSource
 
 
 class PlatformResponseSchema(ORMModel):
@@ -151,6 +152,8 @@ class CalculatedWeightedLineItemSchema(BaseModel):
     sku_id: uuid.UUID
     quantity: int
     unit_price_amount: MoneyAmountSchema
+    # Where the market price weighting this line came from
+    price_source: PriceSource
 
 
 # Response schema for the weighted price calculation endpoint
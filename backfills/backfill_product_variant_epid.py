@@ -13,6 +13,7 @@ from core.services.ebay_product_resolver import (
     ProductSearchInput,
     POKEMON_PRINTING_PRIORITY,
 )
+from core.services.ebay_resolution_store import EbayResolutionStore
 from core.utils.request_pacer import ConstantRatePacer
 from sqlalchemy import case
 from sqlalchemy.orm import joinedload
@@ -76,11 +77,24 @@ def get_pokemon_card_variants_without_epid(session) -> list[ProductVariant]:
     return variants
 
 
+def build_product_input(variant: ProductVariant) -> ProductSearchInput:
+    return ProductSearchInput(
+        clean_name=variant.product.clean_name,
+        number=variant.product.number,
+        set_code=variant.product.set.code,
+        printing_name=variant.printing.name,
+    )
+
+
 async def backfill_product_variant_epid():
     """Backfill eBay Product IDs (EPIDs) for Pokemon card ProductVariant records."""
     session = SessionLocal()
     api_client = get_ebay_api_client()
-    resolver = EbayProductResolver(api_client=api_client)
+    # Persists outcomes so reruns skip settled variants and reuse API responses
+    resolution_store = EbayResolutionStore()
+    resolver = EbayProductResolver(
+        api_client=api_client, resolution_store=resolution_store
+    )
 
     # Rate limiting to avoid eBay API limits
     pacer = ConstantRatePacer(requests_per_second=1.0)
@@ -100,31 +114,47 @@ async def backfill_product_variant_epid():
             "updated": 0,
             "not_found": 0,  # No EPID found
             "errors": 0,  # API/validation errors
+            "settled": 0,  # Answered from the resolution store without API calls
         }
 
-        logger.info(f"Starting backfill for {total_variants} Pokemon card variants...")
+        # Settled variants don't need a pacer slot: apply stored EPIDs (e.g. from a
+        # run that stopped before committing) and skip products still in cooldown
+        pending: list[tuple[ProductVariant, ProductSearchInput]] = []
+        for variant in all_variants:
+            product_input = build_product_input(variant)
+            settled = resolution_store.get_settled(product_input)
+            if settled is None:
+                pending.append((variant, product_input))
+                continue
+
+            stats["settled"] += 1
+            if settled.epid:
+                variant.ebay_product_id = settled.epid
+                stats["updated"] += 1
+            else:
+                stats["not_found"] += 1
+
+        session.commit()
+        logger.info(
+            f"{stats['settled']} variants already settled in the resolution store, "
+            f"{len(pending)} left to resolve"
+        )
+
+        logger.info(f"Starting backfill for {len(pending)} Pokemon card variants...")
         logger.info(f"Rate limit: {pacer.requests_per_second} requests per second")
         logger.info(
-            f"Estimated time: {total_variants / pacer.requests_per_second / 3600:.1f} hours"
+            f"Estimated time: {len(pending) / pacer.requests_per_second / 3600:.1f} hours"
         )
 
         # Process variants with rate limiting
         variant_idx = 0
-        async for _ in pacer.create_schedule(total_variants):
-            if variant_idx >= len(all_variants):
+        async for _ in pacer.create_schedule(len(pending)):
+            if variant_idx >= len(pending):
                 break
 
-            variant = all_variants[variant_idx]
+            variant, product_input = pending[variant_idx]
             variant_idx += 1
 
-            # Build search input
-            product_input = ProductSearchInput(
-                clean_name=variant.product.clean_name,
-                number=variant.product.number,
-                set_code=variant.product.set.code,
-                printing_name=variant.printing.name,
-            )
-
             try:
                 epid = await resolver.resolve(product_input)
 
@@ -143,7 +173,7 @@ async def backfill_product_variant_epid():
                 else:
                     stats["not_found"] += 1
                     logger.warning(
-                        f"⚠️  [{variant_idx}/{total_variants}] {variant.product.name} "
+                        f"⚠️  [{variant_idx}/{len(pending)}] {variant.product.name} "
                         f"{variant.product.number} ({variant.printing.name}): No EPID found"
                     )
 
@@ -164,7 +194,7 @@ async def backfill_product_variant_epid():
 
                 stats["errors"] += 1
                 logger.error(
-                    f"❌ [{variant_idx}/{total_variants}] {variant.product.name} "
+                    f"❌ [{variant_idx}/{len(pending)}] {variant.product.name} "
                     f"{variant.product.number} ({variant.printing.name}): {e}",
                     exc_info=True,
                 )
@@ -188,6 +218,8 @@ async def backfill_product_variant_epid():
         logger.info(
             f"❌ Errors: {stats['errors']} ({stats['errors'] / stats['total'] * 100:.1f}%)"
         )
+        logger.info(f"♻️  Settled from resolution store: {stats['settled']}")
+        logger.info(resolution_store.stats.summary())
         logger.info("=" * 80)
 
     finally:
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for BulkSkuPriceFetcher against a local pricing stub.
+
+Starts a local fake of the TCGPlayer token and SKU pricing endpoints whose
+latency grows with the number of IDs per request and with the number of
+requests in flight, and which answers 429 once more than --rate-limit requests
+are in flight. Two workloads are fetched:
+
+- single job: one caller asks for --skus SKU prices
+- overlapping jobs: the product snapshot (all SKUs) and the inventory snapshot
+  (--overlap of the same SKUs) run at the same time
+
+through:
+
+- sequential: 200-ID chunks fetched one after another (single job only)
+- chunked: the original scheme, 200-ID chunks through process_task_queue with
+  10 workers per job and no retry
+- bulk fetcher: one shared BulkSkuPriceFetcher
+
+Usage:
+    python benchmarks/bench_bulk_price_fetcher.py [--skus 100000] [--overlap 20000] [--rate-limit 12]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.services import tcgplayer_catalog_service as catalog  # noqa: E402
+from core.services.bulk_price_fetcher import BulkSkuPriceFetcher  # noqa: E402
+from core.services.oauth_token_store import InMemoryTokenStore  # noqa: E402
+from core.utils.workers import process_task_queue  # noqa: E402
+
+CHUNK_SIZE = 200
+CHUNK_WORKERS = 10
+
+
+class FakePricingAPI:
+    """Local token and pricing endpoints with load-dependent latency."""
+
+    def __init__(
+        self,
+        rate_limit: int,
+        base_ms: float,
+        per_id_ms: float,
+        per_in_flight_ms: float,
+    ) -> None:
+        self.rate_limit = rate_limit
+        self.base_ms = base_ms
+        self.per_id_ms = per_id_ms
+        self.per_in_flight_ms = per_in_flight_ms
+        self.in_flight = 0
+        self.requests = 0
+        self.throttled = 0
+        self.ids_served = 0
+        self.app = web.Application()
+        self.app.router.add_post("/token", self.token)
+        self.app.router.add_get("/pricing/sku/{ids}", self.sku_prices)
+
+    def reset(self) -> None:
+        self.requests = self.throttled = self.ids_served = 0
+
+    async def token(self, request: web.Request) -> web.Response:
+        expires = datetime.now(timezone.utc) + timedelta(days=14)
+        return web.json_response(
+            {
+                "access_token": "token",
+                ".expires": expires.strftime("%a, %d %b %Y %H:%M:%S GMT"),
+            }
+        )
+
+    async def sku_prices(self, request: web.Request) -> web.Response:
+        sku_ids = [int(i) for i in request.match_info["ids"].split(",")]
+        self.requests += 1
+        self.in_flight += 1
+        try:
+            if self.in_flight > self.rate_limit:
+                self.throttled += 1
+                await asyncio.sleep(self.base_ms / 1000)
+                raise web.HTTPTooManyRequests()
+            delay_ms = (
+                self.base_ms
+                + self.per_id_ms * len(sku_ids)
+                + self.per_in_flight_ms * self.in_flight
+            )
+            await asyncio.sleep(delay_ms / 1000)
+        finally:
+            self.in_flight -= 1
+
+        self.ids_served += len(sku_ids)
+        return web.json_response(
+            {
+                "success": True,
+                "errors": [],
+                "results": [
+                    {
+                        "skuId": sku_id,
+                        "lowPrice": 1.0,
+                        "lowestShipping": 0.99,
+                        "lowestListingPrice": 1.0,
+                        "marketPrice": 1.25,
+                        "directLowPrice": None,
+                    }
+                    for sku_id in sku_ids
+                ],
+            }
+        )
+
+
+async def chunked_job(
+    service, sku_ids: list[int], num_workers: int = CHUNK_WORKERS
+) -> int:
+    """Fetch like the original cron jobs; return the number of prices received."""
+    received = 0
+
+    async def fetch(chunk: list[int]) -> None:
+        nonlocal received
+        response = await service.get_sku_prices(chunk)
+        received += len(response.results)
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(0, len(sku_ids), CHUNK_SIZE):
+        queue.put_nowait(fetch(sku_ids[i : i + CHUNK_SIZE]))
+    try:
+        await process_task_queue(queue, num_workers=num_workers)
+    except ExceptionGroup:
+        # Failed chunks are logged and dropped by the jobs
+        pass
+    return received
+
+
+async def bulk_job(fetcher: BulkSkuPriceFetcher, sku_ids: list[int]) -> int:
+    response = await fetcher.get_sku_prices(sku_ids)
+    return len(response.results)
+
+
+async def run_workload(label: str, jobs, fake: FakePricingAPI) -> None:
+    fake.reset()
+    wanted = sum(len(ids) for ids in jobs["ids"])
+    start = time.perf_counter()
+    received = sum(await asyncio.gather(*jobs["run"]))
+    wall = time.perf_counter() - start
+    print(
+        f"{label:<32} {wall:7.2f}s {received / wall:9.0f} SKUs/s delivered "
+        f"requests={fake.requests:<5} 429s={fake.throttled:<5} "
+        f"ids sent={fake.ids_served:<7} missing={wanted - received}"
+    )
+
+
+async def main_async(args) -> None:
+    fake = FakePricingAPI(
+        args.rate_limit, args.base_ms, args.per_id_ms, args.per_in_flight_ms
+    )
+    runner = web.AppRunner(fake.app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    base_url = f"http://127.0.0.1:{port}"
+    catalog.TCGPLAYER_ACCESS_TOKEN_URL = f"{base_url}/token"
+    catalog.TCGPLAYER_PRICING_URL = f"{base_url}/pricing"
+
+    product_ids = list(range(1, args.skus + 1))
+    # Inventory SKUs are a subset of the catalog the product job snapshots
+    inventory_ids = product_ids[:: max(1, args.skus // args.overlap)][: args.overlap]
+
+    service = catalog.TCGPlayerCatalogService(token_store=InMemoryTokenStore())
+    await service.init()
+    print(
+        f"{args.skus} SKUs, stub: {args.base_ms}ms + {args.per_id_ms}ms/ID + "
+        f"{args.per_in_flight_ms}ms/in-flight request, 429 above {args.rate_limit} "
+        "in flight"
+    )
+    try:
+        await run_workload(
+            "sequential (single job)",
+            {"ids": [product_ids], "run": [chunked_job(service, product_ids, 1)]},
+            fake,
+        )
+        for workload, id_lists in (
+            ("single job", [product_ids]),
+            ("overlapping jobs", [product_ids, inventory_ids]),
+        ):
+            await run_workload(
+                f"chunked ({workload})",
+                {
+                    "ids": id_lists,
+                    "run": [chunked_job(service, ids) for ids in id_lists],
+                },
+                fake,
+            )
+            fetcher = BulkSkuPriceFetcher(service, max_concurrency=args.concurrency)
+            await run_workload(
+                f"bulk fetcher ({workload})",
+                {
+                    "ids": id_lists,
+                    "run": [bulk_job(fetcher, ids) for ids in id_lists],
+                },
+                fake,
+            )
+            print(f"{'':<32} {fetcher.stats.summary()}")
+    finally:
+        await service.close()
+        await runner.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--skus", type=int, default=100_000)
+    parser.add_argument("--overlap", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--rate-limit", type=int, default=12)
+    parser.add_argument("--base-ms", type=float, default=40.0)
+    parser.add_argument("--per-id-ms", type=float, default=0.2)
+    parser.add_argument("--per-in-flight-ms", type=float, default=4.0)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
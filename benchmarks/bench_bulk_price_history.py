@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Compare loading a portfolio's price history one SKU at a time with the bulk
+columnar endpoint.
+
+Seeds ``--skus`` SKUs with ``--days`` of snapshot history (one snapshot per SKU
+every few days, as written by the daily job when the price changed), then
+builds the responses for a ``--window``-day chart:
+
+- per-SKU: what GET /inventory/{sku_id}/price-history does for each SKU,
+  fetch_sku_price_snapshots (two queries) + normalize_price_history, serialized
+  as InventoryPriceHistoryResponseSchema. HTTP overhead per request and the
+  live price overlay are not included, so this understates the per-SKU cost.
+- bulk: what POST /market/price-history does for all of them,
+  fetch_price_history_columns (one query), serialized as
+  BulkPriceHistoryResponseSchema, at daily and weekly resolution.
+
+Payload sizes are the JSON bodies, raw and gzipped. All writes happen in one
+transaction that is rolled back.
+
+Usage:
+    python benchmarks/bench_bulk_price_history.py [--skus 300] [--days 730]
+        [--window 90] [--change-every 3] [--repeat 5]
+"""
+
+import argparse
+import gzip
+import os
+import sys
+from datetime import UTC, datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import text  # noqa: E402
+
+from app.routes.inventory.schemas import (  # noqa: E402
+    InventoryPriceHistoryItemSchema,
+    InventoryPriceHistoryResponseSchema,
+)
+from app.routes.market.schemas import BulkPriceHistoryResponseSchema  # noqa: E402
+from app.routes.utils import MoneySchema  # noqa: E402
+from benchmarks.utils import time_call  # noqa: E402
+from core.dao.price import (  # noqa: E402
+    fetch_price_history_columns,
+    fetch_sku_price_snapshots,
+    normalize_price_history,
+)
+from core.database import SessionLocal  # noqa: E402
+from core.models.price import PriceHistoryResolution  # noqa: E402
+
+
+def seed(session, args, now: datetime) -> list:
+    """Create snapshot history for the portfolio SKUs; returns their IDs."""
+    sku_ids = (
+        session.execute(
+            text("SELECT id FROM sku ORDER BY tcgplayer_id LIMIT :skus"),
+            {"skus": args.skus},
+        )
+        .scalars()
+        .all()
+    )
+    session.execute(
+        text(
+            """
+            INSERT INTO sku_price_data_snapshot (sku_id, marketplace,
+                                                 snapshot_datetime,
+                                                 lowest_listing_price_total)
+            SELECT sku_id, 'tcgplayer',
+                   :now - make_interval(days => days_ago, hours => n::int % 24),
+                   round((1 + random() * 100)::numeric, 2)
+            FROM unnest(CAST(:sku_ids AS uuid[])) WITH ORDINALITY AS skus(sku_id, n)
+            CROSS JOIN generate_series(0, :days - 1) AS days_ago
+            WHERE (days_ago + n) % :change_every = 0
+            ON CONFLICT DO NOTHING
+            """
+        ),
+        {
+            "now": now,
+            "sku_ids": sku_ids,
+            "days": args.days,
+            "change_every": args.change_every,
+        },
+    )
+    session.execute(text("ANALYZE sku_price_data_snapshot"))
+    return sku_ids
+
+
+def per_sku_payloads(session, sku_ids, start: datetime, end: datetime) -> list[bytes]:
+    payloads = []
+    for sku_id in sku_ids:
+        price_changes, initial_price = fetch_sku_price_snapshots(
+            session=session, sku_id=sku_id, start_date=start, end_date=end
+        )
+        price_data = normalize_price_history(
+            price_changes=price_changes,
+            initial_price=initial_price,
+            start_date=start,
+            end_date=end,
+        )
+        response = InventoryPriceHistoryResponseSchema(
+            items=[
+                InventoryPriceHistoryItemSchema(
+                    datetime=point.datetime_iso,
+                    price=MoneySchema(amount=point.price, currency="USD"),
+                )
+                for point in price_data
+            ]
+        )
+        payloads.append(response.model_dump_json().encode())
+    return payloads
+
+
+def bulk_payload(session, sku_ids, start: datetime, end: datetime, resolution) -> bytes:
+    columns = fetch_price_history_columns(
+        session, sku_ids, start, end, resolution=resolution
+    )
+    return (
+        BulkPriceHistoryResponseSchema(
+            resolution=columns.resolution,
+            timestamps=columns.timestamps,
+            prices=columns.prices,
+        )
+        .model_dump_json()
+        .encode()
+    )
+
+
+def sizes(payloads: list[bytes]) -> str:
+    raw = sum(map(len, payloads))
+    compressed = sum(len(gzip.compress(p)) for p in payloads)
+    return f"payload={raw / 1024:8.1f}KiB gzip={compressed / 1024:7.1f}KiB"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--skus", type=int, default=300)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--window", type=int, default=90)
+    parser.add_argument("--change-every", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    end = datetime.now(UTC)
+    start = end - timedelta(days=args.window)
+    session = SessionLocal()
+    try:
+        sku_ids = seed(session, args, end)
+        print(
+            f"{len(sku_ids)} SKUs, {args.days} days of history, {args.window}-day "
+            f"window (rolled back afterwards)"
+        )
+
+        print(
+            time_call(
+                f"per-SKU ({len(sku_ids)} requests)",
+                lambda: per_sku_payloads(session, sku_ids, start, end),
+                args.repeat,
+            )
+        )
+        print(f"  {sizes(per_sku_payloads(session, sku_ids, start, end))}")
+        for resolution in PriceHistoryResolution:
+            print(
+                time_call(
+                    f"bulk ({resolution})",
+                    lambda: bulk_payload(session, sku_ids, start, end, resolution),
+                    args.repeat,
+                )
+            )
+            print(
+                f"  {sizes([bulk_payload(session, sku_ids, start, end, resolution)])}"
+            )
+    finally:
+        session.rollback()
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Benchmark the /buy-decisions read path: DISTINCT ON over the full decision history
+versus keyset pages served from the buy_decision_current projection.
+
+Seeds one million historical decisions (inside a transaction that is rolled back)
+spread over existing SKUs, then times both query shapes.
+
+Usage:
+    python benchmarks/bench_buy_decisions.py [--decisions 1000000] [--skus 20000]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import desc, select, text  # noqa: E402
+
+from benchmarks.utils import time_call  # noqa: E402
+from core.dao.buy_decision import (  # noqa: E402
+    BuyDecisionSortField,
+    get_current_buy_decisions_page,
+)
+from core.database import SessionLocal  # noqa: E402
+from core.models.decisions import BuyDecision, Decision  # noqa: E402
+
+PAGE_SIZE = 50
+
+
+def seed_decisions(session, decision_count: int, sku_count: int) -> None:
+    session.execute(
+        text(
+            """
+            CREATE TEMP TABLE bench_sku ON COMMIT DROP AS
+            SELECT id, row_number() OVER () AS rn FROM sku LIMIT :sku_count
+            """
+        ),
+        {"sku_count": sku_count},
+    )
+    session.execute(
+        text(
+            """
+            INSERT INTO buy_decision (
+                id, sku_id, decision, quantity, buy_vwap, expected_resale_net,
+                asof_listings, asof_sales, reason_codes, created_at
+            )
+            SELECT
+                gen_random_uuid(),
+                s.id,
+                CASE WHEN random() < 0.3 THEN 'BUY' ELSE 'PASS' END,
+                (1 + floor(random() * 5))::int,
+                round((2 + random() * 50)::numeric, 2),
+                round((2 + random() * 60)::numeric, 2),
+                now() - (g * interval '1 second'),
+                now() - (g * interval '1 second'),
+                '[]'::jsonb,
+                now() - (g * interval '1 second')
+            FROM generate_series(1, :decision_count) AS g
+            JOIN bench_sku s
+              ON s.rn = 1 + (g % (SELECT count(*) FROM bench_sku))
+            """
+        ),
+        {"decision_count": decision_count},
+    )
+    # Same statement the projection migration uses to seed itself
+    session.execute(text("DELETE FROM buy_decision_current"))
+    session.execute(
+        text(
+            """
+            INSERT INTO buy_decision_current (
+                sku_id, buy_decision_id, decision, quantity, buy_vwap,
+                expected_resale_net, expected_margin, expected_profit, created_at
+            )
+            SELECT DISTINCT ON (sku_id)
+                sku_id, id, decision, quantity, buy_vwap, expected_resale_net,
+                expected_resale_net - buy_vwap,
+                (expected_resale_net - buy_vwap) * quantity,
+                created_at
+            FROM buy_decision
+            ORDER BY sku_id, created_at DESC, id DESC
+            """
+        )
+    )
+    session.execute(text("ANALYZE buy_decision"))
+    session.execute(text("ANALYZE buy_decision_current"))
+
+
+def legacy_query(session):
+    rows = (
+        session.execute(
+            select(BuyDecision)
+            .where(BuyDecision.decision == Decision.BUY)
+            .order_by(
+                BuyDecision.sku_id,
+                desc(BuyDecision.created_at),
+                desc(BuyDecision.expected_resale_net),
+            )
+            .distinct(BuyDecision.sku_id)
+        )
+        .scalars()
+        .all()
+    )
+    rows.sort(key=lambda d: d.expected_resale_net, reverse=True)
+    session.expunge_all()
+    return rows
+
+
+def projection_pages(session, sort_by: BuyDecisionSortField, pages: int):
+    after = None
+    for _ in range(pages):
+        rows = get_current_buy_decisions_page(
+            session, sort_by=sort_by, limit=PAGE_SIZE, after=after
+        )
+        if not rows:
+            break
+        last_decision, last_value = rows[-1]
+        after = (last_value, last_decision.sku_id)
+    session.expunge_all()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--decisions", type=int, default=1_000_000)
+    parser.add_argument("--skus", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        print(f"Seeding {args.decisions} decisions across {args.skus} SKUs...")
+        seed_decisions(session, args.decisions, args.skus)
+
+        results = [
+            time_call(
+                "legacy DISTINCT ON + Python sort (all rows)",
+                lambda: legacy_query(session),
+                args.repeat,
+            )
+        ]
+        for sort_by in BuyDecisionSortField:
+            results.append(
+                time_call(
+                    f"projection first page ({sort_by.value})",
+                    lambda s=sort_by: projection_pages(session, s, 1),
+                    args.repeat,
+                )
+            )
+        results.append(
+            time_call(
+                "projection 20 pages deep (expected_margin)",
+                lambda: projection_pages(
+                    session, BuyDecisionSortField.EXPECTED_MARGIN, 20
+                ),
+                args.repeat,
+            )
+        )
+
+        for result in results:
+            print(result)
+    finally:
+        session.rollback()
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
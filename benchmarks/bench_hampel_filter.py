@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+CPU benchmark for the eBay listing price outlier (Hampel) filter.
+
+Compares the Decimal implementation (sorted copies for the median and MAD)
+against the NumPy implementation over integer cents on listing sets of
+increasing size, and checks that both keep the same listings.
+
+Usage:
+    python benchmarks/bench_hampel_filter.py [--sizes 200,2000,20000] [--repeat 5]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+from decimal import Decimal
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.utils import time_call  # noqa: E402
+from core.environment import OutlierFilterImpl  # noqa: E402
+from core.services.ebay_listing_service import EbayListingService  # noqa: E402
+from core.services.schemas.ebay import (  # noqa: E402
+    ItemSummarySchema,
+    MoneySchema,
+    ShippingOptionSchema,
+)
+
+
+def generate_listings(count: int, rng: random.Random) -> list:
+    listings = []
+    for index in range(count):
+        if rng.random() < 0.05:
+            price = rng.uniform(0.5, 3)  # lots, proxies and fan art
+        else:
+            price = rng.gauss(45, 6)
+        listings.append(
+            ItemSummarySchema(
+                item_id=f"v1|{index}|0",
+                price=MoneySchema(
+                    value=Decimal(max(1, round(price * 100))) / 100, currency="USD"
+                ),
+                shipping_options=[
+                    ShippingOptionSchema(
+                        shipping_cost=MoneySchema(
+                            value=Decimal(rng.choice([0, 99, 125, 499])) / 100,
+                            currency="USD",
+                        )
+                    )
+                ],
+            )
+        )
+    return listings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="200,2000,20000")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    rng = random.Random(args.seed)
+    decimal_service = EbayListingService(
+        None, None, outlier_filter=OutlierFilterImpl.DECIMAL
+    )
+    numpy_service = EbayListingService(
+        None, None, outlier_filter=OutlierFilterImpl.NUMPY
+    )
+
+    for size in (int(s) for s in args.sizes.split(",")):
+        listings = generate_listings(size, rng)
+        kept_decimal = decimal_service._filter_price_outliers(listings)
+        kept_numpy = numpy_service._filter_price_outliers(listings)
+        assert [i.item_id for i in kept_decimal] == [i.item_id for i in kept_numpy]
+
+        print(f"{size} listings, {size - len(kept_numpy)} filtered")
+        print(
+            time_call(
+                "decimal filter",
+                lambda: decimal_service._filter_price_outliers(listings),
+                args.repeat,
+            )
+        )
+        print(
+            time_call(
+                "numpy filter",
+                lambda: numpy_service._filter_price_outliers(listings),
+                args.repeat,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Benchmark inventory reads for a user with a long transaction history, computing
+per-SKU quantity and cost basis from every line item (the previous
+get_sku_cost_quantity_cte) versus reading the inventory_holding ledger.
+
+Seeds one user with ``--line-items`` purchase line items spread over
+``--transactions`` transactions and ``--skus`` SKUs, most of them already sold
+out (remaining_quantity 0), then times query_inventory_items,
+build_inventory_query and get_inventory_metrics both ways, plus a full
+rebuild of the user's ledger. Everything is rolled back afterwards.
+
+Usage:
+    python benchmarks/bench_inventory_holdings.py [--line-items 100000]
+        [--skus 5000] [--transactions 2000]
+"""
+
+import argparse
+import os
+import sys
+import uuid
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import CTE, func, select, text  # noqa: E402
+
+from benchmarks.utils import time_call  # noqa: E402
+from core.dao import inventory  # noqa: E402
+from core.dao.inventory_holding import rebuild_holdings  # noqa: E402
+from core.database import SessionLocal  # noqa: E402
+from core.models.transaction import LineItem, Transaction  # noqa: E402
+from core.services.inventory_service import get_inventory_metrics  # noqa: E402
+
+
+def line_item_cost_quantity_cte(user_id: uuid.UUID) -> CTE:
+    """The previous get_sku_cost_quantity_cte: aggregate every line item."""
+    total_quantity = func.sum(LineItem.remaining_quantity).label("total_quantity")
+    total_cost = func.sum(
+        LineItem.unit_price_amount * LineItem.remaining_quantity
+    ).label("total_cost")
+    return (
+        select(LineItem.sku_id, total_quantity, total_cost)
+        .join(Transaction)
+        .where(LineItem.user_id == user_id)
+        .group_by(LineItem.sku_id)
+        .having(total_quantity > 0)
+    ).cte()
+
+
+def seed_history(session, args) -> uuid.UUID:
+    user_id = uuid.uuid4()
+    session.execute(
+        text("INSERT INTO users (id, email) VALUES (:id, :email)"),
+        {"id": user_id, "email": f"{user_id}@bench.local"},
+    )
+    session.execute(
+        text(
+            """
+            INSERT INTO transaction (id, date, type, currency,
+                                     shipping_cost_amount, tax_amount, user_id)
+            SELECT gen_random_uuid(), now() - g * interval '1 day', 'PURCHASE',
+                   'USD', 0, 0, :user_id
+            FROM generate_series(1, :transactions) AS g
+            """
+        ),
+        {"user_id": user_id, "transactions": args.transactions},
+    )
+    # Line items bypass the ORM here, so the ledger is rebuilt (and timed) below
+    session.execute(
+        text(
+            """
+            WITH skus AS (
+                SELECT array_agg(id) AS ids
+                FROM (SELECT id FROM sku ORDER BY random() LIMIT :skus) AS s
+            ),
+            transactions AS (
+                SELECT array_agg(id) AS ids FROM transaction WHERE user_id = :user_id
+            )
+            INSERT INTO line_item (id, sku_id, quantity, remaining_quantity,
+                                   unit_price_amount, transaction_id, user_id)
+            SELECT gen_random_uuid(),
+                   skus.ids[1 + (random() * (cardinality(skus.ids) - 1))::int],
+                   2,
+                   CASE WHEN random() < 0.1 THEN 1 + (random() > 0.5)::int
+                        ELSE 0 END,
+                   round((0.5 + random() * 20)::numeric, 2),
+                   transactions.ids[
+                       1 + (random() * (cardinality(transactions.ids) - 1))::int
+                   ],
+                   :user_id
+            FROM skus, transactions, generate_series(1, :line_items)
+            """
+        ),
+        {"user_id": user_id, "skus": args.skus, "line_items": args.line_items},
+    )
+    session.execute(
+        text(
+            """
+            INSERT INTO sku_latest_price (sku_id, marketplace,
+                                          lowest_listing_price_total)
+            SELECT DISTINCT sku_id, 'tcgplayer', round((1 + random() * 50)::numeric, 2)
+            FROM line_item WHERE user_id = :user_id
+            ON CONFLICT (sku_id, marketplace) DO NOTHING
+            """
+        ),
+        {"user_id": user_id},
+    )
+    return user_id
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--line-items", type=int, default=100_000)
+    parser.add_argument("--skus", type=int, default=5_000)
+    parser.add_argument("--transactions", type=int, default=2_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        session.execute(text("SELECT setseed(0.5)"))
+        user_id = seed_history(session, args)
+        print(
+            time_call(
+                "rebuild_holdings (one user)",
+                lambda: rebuild_holdings(session, user_id),
+                args.repeat,
+            )
+        )
+        for table in ("line_item", "transaction", "inventory_holding"):
+            session.execute(text(f"ANALYZE {table}"))
+        held = session.execute(
+            text("SELECT count(*) FROM inventory_holding WHERE user_id = :user_id"),
+            {"user_id": user_id},
+        ).scalar_one()
+        print(
+            f"Seeded {args.line_items} line items over {args.skus} SKUs, "
+            f"{held} still held (rolled back afterwards)"
+        )
+
+        reads = {
+            "query_inventory_items": lambda: session.execute(
+                inventory.query_inventory_items(user_id)
+            ).all(),
+            "build_inventory_query": lambda: session.execute(
+                inventory.build_inventory_query(user_id)
+            ).all(),
+            "get_inventory_metrics": lambda: get_inventory_metrics(session, user_id),
+        }
+        for name, read in reads.items():
+            print(f"{name}:")
+            with mock.patch.object(
+                inventory, "get_sku_cost_quantity_cte", line_item_cost_quantity_cte
+            ):
+                print(time_call("  from line items", read, args.repeat))
+            print(time_call("  from holdings ledger", read, args.repeat))
+    finally:
+        session.rollback()
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
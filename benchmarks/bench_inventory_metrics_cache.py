@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Measure the /inventory/performance and /inventory/metrics endpoints with and
+without the inventory metrics cache.
+
+Seeds ``--users`` users holding ``--portfolio`` SKUs each, with latest prices,
+then replays the same request stream twice, once with get_inventory_metrics
+computed on every call (the previous behaviour) and once through
+InventoryMetricsCache:
+
+- each dashboard view requests /performance then /metrics for one user and one
+  of (all catalogues, the user's largest catalogue), picked at random
+- every ``--write-every`` views one user records a purchase (through the ORM,
+  so the flush hook moves their version)
+- every ``--refresh-every`` views a price refresh job rewrites the latest price
+  of ``--refresh-skus`` random SKUs (moving the version of users holding them)
+
+Latencies are per endpoint call, measured on the endpoint functions (no HTTP).
+Each run seeds the same data into its own transaction, rolled back afterwards.
+
+Usage:
+    python benchmarks/bench_inventory_metrics_cache.py [--users 20]
+        [--portfolio 2000] [--views 300]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+from collections import defaultdict
+from datetime import UTC, datetime
+from decimal import Decimal
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.routes.inventory.api import (  # noqa: E402
+    get_inventory_metrics_endpoint,
+    get_inventory_performance_endpoint,
+)
+from benchmarks.utils import TimingResult  # noqa: E402
+from core.dao.inventory_holding import rebuild_holdings  # noqa: E402
+from core.dao.latest_price import write_latest_prices  # noqa: E402
+from core.dao.transaction import (  # noqa: E402
+    LineItemData,
+    TransactionData,
+    create_transaction_with_line_items,
+)
+from core.database import engine  # noqa: E402
+from core.models.price import Marketplace  # noqa: E402
+from core.models.transaction import TransactionType  # noqa: E402
+from core.models.user import User  # noqa: E402
+from core.services.inventory_metrics_cache import InventoryMetricsCache  # noqa: E402
+from core.services.inventory_service import get_inventory_metrics  # noqa: E402
+
+
+class Uncached:
+    """Computes the metrics on every call, as the endpoints used to."""
+
+    def get_metrics(self, session, user_id, catalog_id=None):
+        return get_inventory_metrics(session, user_id=user_id, catalog_id=catalog_id)
+
+
+def seed(session, args) -> dict[uuid.UUID, uuid.UUID]:
+    """Create the users and their holdings; returns user ID -> largest catalogue."""
+    user_ids = [uuid.uuid4() for _ in range(args.users)]
+    for user_id in user_ids:
+        session.execute(
+            text("INSERT INTO users (id, email) VALUES (:id, :email)"),
+            {"id": user_id, "email": f"{user_id}@bench.local"},
+        )
+        session.execute(
+            text(
+                """
+                WITH purchase AS (
+                    INSERT INTO transaction (id, date, type, currency,
+                                             shipping_cost_amount, tax_amount,
+                                             user_id)
+                    VALUES (gen_random_uuid(), now(), 'PURCHASE', 'USD', 0, 0,
+                            :user_id)
+                    RETURNING id
+                )
+                INSERT INTO line_item (id, sku_id, quantity, remaining_quantity,
+                                       unit_price_amount, transaction_id, user_id)
+                SELECT gen_random_uuid(), sku.id, 2, 2, 5, purchase.id, :user_id
+                FROM purchase, (SELECT id FROM sku ORDER BY random() LIMIT :n) AS sku
+                """
+            ),
+            {"user_id": user_id, "n": args.portfolio},
+        )
+        rebuild_holdings(session, user_id)
+    session.execute(
+        text(
+            """
+            INSERT INTO sku_latest_price (sku_id, marketplace,
+                                          lowest_listing_price_total)
+            SELECT DISTINCT sku_id, 'tcgplayer', round((1 + random() * 50)::numeric, 2)
+            FROM line_item
+            ON CONFLICT (sku_id, marketplace) DO NOTHING
+            """
+        )
+    )
+    session.commit()
+    for table in ("line_item", "transaction", "sku_latest_price"):
+        session.execute(text(f"ANALYZE {table}"))
+
+    catalogs = session.execute(
+        text(
+            """
+            SELECT DISTINCT ON (line_item.user_id) line_item.user_id, set.catalog_id
+            FROM line_item
+            JOIN sku ON line_item.sku_id = sku.id
+            JOIN product ON sku.product_id = product.id
+            JOIN set ON product.set_id = set.id
+            WHERE line_item.user_id = ANY(:user_ids)
+            GROUP BY line_item.user_id, set.catalog_id
+            ORDER BY line_item.user_id, count(*) DESC
+            """
+        ),
+        {"user_ids": user_ids},
+    ).all()
+    return dict(catalogs)
+
+
+def replay(session, args, catalogs, metrics_cache, sku_pool) -> dict[str, list]:
+    rng = random.Random(0)
+    users = {user_id: session.get(User, user_id) for user_id in catalogs}
+    samples = defaultdict(list)
+
+    def timed(label, fn):
+        started = time.perf_counter()
+        fn()
+        samples[label].append((time.perf_counter() - started) * 1000)
+
+    for view in range(1, args.views + 1):
+        user_id = rng.choice(list(catalogs))
+        catalog_id = rng.choice([None, catalogs[user_id]])
+        timed(
+            "/inventory/performance",
+            lambda: get_inventory_performance_endpoint(
+                catalog_id=catalog_id,
+                days=30,
+                session=session,
+                current_user=users[user_id],
+                metrics_cache=metrics_cache,
+            ),
+        )
+        timed(
+            "/inventory/metrics",
+            lambda: get_inventory_metrics_endpoint(
+                catalog_id=catalog_id,
+                session=session,
+                current_user=users[user_id],
+                metrics_cache=metrics_cache,
+            ),
+        )
+        session.rollback()
+
+        if view % args.write_every == 0:
+            writer = rng.choice(list(catalogs))
+            create_transaction_with_line_items(
+                session,
+                TransactionData(
+                    date=datetime.now(UTC),
+                    type=TransactionType.PURCHASE,
+                    counterparty_name="Bench",
+                    currency="USD",
+                    shipping_cost_amount=Decimal("0"),
+                    tax_amount=Decimal("0"),
+                    user_id=writer,
+                ),
+                [
+                    LineItemData(
+                        sku_id=rng.choice(sku_pool),
+                        quantity=1,
+                        unit_price_amount=Decimal("3.00"),
+                        user_id=writer,
+                    )
+                ],
+            )
+            session.commit()
+        if view % args.refresh_every == 0:
+            write_latest_prices(
+                session,
+                [
+                    {
+                        "sku_id": sku_id,
+                        "marketplace": Marketplace.TCGPLAYER,
+                        "lowest_listing_price_total": Decimal(rng.randint(100, 5000))
+                        / 100,
+                    }
+                    for sku_id in rng.sample(sku_pool, args.refresh_skus)
+                ],
+                Marketplace.TCGPLAYER,
+            )
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--portfolio", type=int, default=2000)
+    parser.add_argument("--views", type=int, default=300)
+    parser.add_argument("--write-every", type=int, default=10)
+    parser.add_argument("--refresh-every", type=int, default=25)
+    parser.add_argument("--refresh-skus", type=int, default=500)
+    args = parser.parse_args()
+
+    print(
+        f"{args.users} users x {args.portfolio} SKUs, {args.views} dashboard "
+        f"views, a purchase every {args.write_every} views, "
+        f"{args.refresh_skus} prices refreshed every {args.refresh_every} "
+        f"views (rolled back afterwards)"
+    )
+    for label, metrics_cache in (
+        ("uncached", Uncached()),
+        ("cached", InventoryMetricsCache()),
+    ):
+        # A fresh copy of the same data for each run, so neither runs against
+        # the other's accumulated writes
+        connection = engine.connect()
+        transaction = connection.begin()
+        try:
+            session = Session(bind=connection, join_transaction_mode="create_savepoint")
+            session.execute(text("SELECT setseed(0.5)"))
+            catalogs = seed(session, args)
+            sku_pool = list(
+                session.execute(text("SELECT id FROM sku ORDER BY id")).scalars()
+            )
+            samples = replay(session, args, catalogs, metrics_cache, sku_pool)
+        finally:
+            transaction.rollback()
+            connection.close()
+
+        print(f"{label}:")
+        for endpoint, timings in samples.items():
+            print(f"  {TimingResult(label=endpoint, samples_ms=timings)}")
+        if isinstance(metrics_cache, InventoryMetricsCache):
+            stats = metrics_cache.stats
+            print(
+                f"  hit ratio={stats.hit_ratio:.1%} ({stats.hits} hits, "
+                f"{stats.misses} misses)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark the inventory query's 24-hours-ago price lookup for small and large portfolios.
+
+Compares the unscoped DISTINCT ON join (price_24h_ago_subquery) with the LATERAL lookup
+used by build_inventory_query (price_24h_ago_lateral). Snapshot history and portfolios
+are seeded inside a transaction that is rolled back.
+
+Usage:
+    python benchmarks/bench_inventory_price_24h.py [--skus 60000] [--snapshots 30]
+"""
+
+import argparse
+import os
+import sys
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import text  # noqa: E402
+
+from benchmarks.utils import time_call  # noqa: E402
+from core.dao.inventory import build_inventory_query, query_inventory_items  # noqa: E402
+from core.dao.inventory_holding import rebuild_holdings  # noqa: E402
+from core.dao.price import latest_price_subquery, price_24h_ago_subquery  # noqa: E402
+from core.database import SessionLocal  # noqa: E402
+from core.models.catalog import SKU  # noqa: E402
+
+
+def seed_snapshots(session, sku_count: int, snapshots_per_sku: int) -> None:
+    session.execute(
+        text(
+            """
+            INSERT INTO sku_price_data_snapshot (
+                sku_id, marketplace, snapshot_datetime, lowest_listing_price_total
+            )
+            SELECT s.id, 'tcgplayer', now() - (g * interval '8 hours'),
+                   round((1 + random() * 50)::numeric, 2)
+            FROM (SELECT id FROM sku ORDER BY id LIMIT :sku_count) AS s
+            CROSS JOIN generate_series(1, :snapshots) AS g
+            """
+        ),
+        {"sku_count": sku_count, "snapshots": snapshots_per_sku},
+    )
+
+
+def seed_portfolio(session, portfolio_size: int) -> uuid.UUID:
+    user_id = uuid.uuid4()
+    transaction_id = uuid.uuid4()
+    session.execute(
+        text("INSERT INTO users (id, email) VALUES (:id, :email)"),
+        {"id": user_id, "email": f"{user_id}@bench.local"},
+    )
+    session.execute(
+        text(
+            """
+            INSERT INTO transaction (id, date, type, currency, shipping_cost_amount,
+                                     tax_amount, user_id)
+            VALUES (:id, now(), 'PURCHASE', 'USD', 0, 0, :user_id)
+            """
+        ),
+        {"id": transaction_id, "user_id": user_id},
+    )
+    session.execute(
+        text(
+            """
+            INSERT INTO line_item (id, sku_id, quantity, remaining_quantity,
+                                   unit_price_amount, transaction_id, user_id)
+            SELECT gen_random_uuid(), id, 1, 1, 5, :transaction_id, :user_id
+            FROM sku ORDER BY random() LIMIT :portfolio_size
+            """
+        ),
+        {
+            "transaction_id": transaction_id,
+            "user_id": user_id,
+            "portfolio_size": portfolio_size,
+        },
+    )
+    rebuild_holdings(session, user_id)
+    return user_id
+
+
+def unscoped_inventory_query(user_id: uuid.UUID):
+    """The previous query shape: join against DISTINCT ON over every snapshotted SKU."""
+    latest_price = latest_price_subquery()
+    price_24h_ago = price_24h_ago_subquery()
+    return (
+        query_inventory_items(user_id)
+        .add_columns(
+            latest_price.c.lowest_listing_price_total,
+            price_24h_ago.c.lowest_listing_price_total.label("price_24h_ago"),
+        )
+        .outerjoin(latest_price, SKU.id == latest_price.c.sku_id)
+        .outerjoin(price_24h_ago, SKU.id == price_24h_ago.c.sku_id)
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--skus", type=int, default=60_000)
+    parser.add_argument("--snapshots", type=int, default=30)
+    parser.add_argument(
+        "--portfolios", type=int, nargs="+", default=[50, 5_000], metavar="SIZE"
+    )
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        seed_snapshots(session, args.skus, args.snapshots)
+        user_ids = {size: seed_portfolio(session, size) for size in args.portfolios}
+        session.execute(text("ANALYZE sku_price_data_snapshot"))
+        session.execute(text("ANALYZE line_item"))
+        print(
+            f"Seeded {args.skus * args.snapshots} snapshots over {args.skus} SKUs "
+            f"(rolled back afterwards)"
+        )
+
+        for size, user_id in user_ids.items():
+            print(f"Portfolio of {size} SKUs:")
+            print(
+                time_call(
+                    "  unscoped DISTINCT ON join",
+                    lambda: session.execute(unscoped_inventory_query(user_id)).all(),
+                    args.repeat,
+                )
+            )
+            print(
+                time_call(
+                    "  LATERAL lookup",
+                    lambda: session.execute(build_inventory_query(user_id)).all(),
+                    args.repeat,
+                )
+            )
+    finally:
+        session.rollback()
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
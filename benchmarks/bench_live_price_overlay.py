@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Count upstream pricing calls per 100 dashboard page loads, before and after the
+live price overlay.
+
+Each page load opens ``--skus-per-page`` SKU price-history views (one SKU each,
+as get_sku_price_history does) plus one product variant view of
+``--variant-skus`` SKUs (get_product_variant_price_history), drawn from a pool
+of popular SKUs. Page loads arrive in waves of ``--concurrency``:
+
+- direct: every view calls the pricing API, as the endpoints used to
+- overlay: every view goes through LivePriceService
+
+Time is compressed: ``--wave-interval`` seconds pass between waves and the
+overlay TTL is ``--ttl`` seconds, so the defaults model page loads every 30s
+against a 120s TTL. A second pass uses a pricing stub slower than the overlay
+timeout to show the sku_latest_price fallback bounding page latency.
+
+Usage:
+    python benchmarks/bench_live_price_overlay.py [--page-loads 100] [--pool 200]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import text  # noqa: E402
+
+from core.database import SessionLocal  # noqa: E402
+from core.services.live_price_service import LivePriceService  # noqa: E402
+from core.services.schemas.schema import (  # noqa: E402
+    SKUPricingResponseSchema,
+    SKUPricingSchema,
+)
+
+
+class StubCatalogService:
+    """Prices every SKU after ``latency`` seconds and counts requests."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.requests = 0
+
+    async def get_sku_prices(self, sku_ids: list[int]) -> SKUPricingResponseSchema:
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        return SKUPricingResponseSchema(
+            success=True,
+            errors=[],
+            results=[
+                SKUPricingSchema(
+                    sku_id=sku_id,
+                    low_price=None,
+                    lowest_shipping=Decimal("0"),
+                    lowest_listing_price=Decimal(sku_id % 5000 + 100) / 100,
+                    market_price=None,
+                    direct_low_price=None,
+                )
+                for sku_id in sku_ids
+            ],
+        )
+
+
+def build_pages(args, pool: list[tuple[int, object]]) -> list[list[dict]]:
+    """Each page load as the lookups its views make."""
+    rng = random.Random(0)
+    pages = []
+    for _ in range(args.page_loads):
+        views = [dict([rng.choice(pool)]) for _ in range(args.skus_per_page)]
+        start = rng.randrange(0, len(pool) - args.variant_skus)
+        views.append(dict(pool[start : start + args.variant_skus]))
+        pages.append(views)
+    return pages
+
+
+async def run_pages(args, pages, lookup) -> list[float]:
+    latencies = []
+
+    async def page_load(views):
+        started = time.perf_counter()
+        await asyncio.gather(*(lookup(view) for view in views))
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    for i in range(0, len(pages), args.concurrency):
+        await asyncio.gather(*(page_load(p) for p in pages[i : i + args.concurrency]))
+        await asyncio.sleep(args.wave_interval)
+    return latencies
+
+
+def report(label: str, requests: int, page_loads: int, latencies) -> None:
+    print(
+        f"{label:<32} upstream calls per 100 page loads="
+        f"{requests * 100 / page_loads:7.1f}  page p50="
+        f"{statistics.median(latencies):7.1f}ms max={max(latencies):7.1f}ms"
+    )
+
+
+async def main_async(args) -> None:
+    session = SessionLocal()
+    try:
+        pool = [
+            (row.tcgplayer_id, row.id)
+            for row in session.execute(
+                text("SELECT tcgplayer_id, id FROM sku ORDER BY id LIMIT :pool"),
+                {"pool": args.pool},
+            )
+        ]
+        pages = build_pages(args, pool)
+        views = sum(map(len, pages))
+        print(
+            f"{args.page_loads} page loads, {views} views, {args.pool} popular SKUs, "
+            f"{args.concurrency} concurrent page loads per wave"
+        )
+
+        for label, latency, timeout in (
+            ("", args.latency, args.timeout),
+            ("slow upstream, ", args.slow_latency, args.timeout),
+        ):
+            direct = StubCatalogService(latency)
+            latencies = await run_pages(
+                args, pages, lambda view: direct.get_sku_prices(list(view))
+            )
+            report(f"{label}direct", direct.requests, len(pages), latencies)
+
+            catalog = StubCatalogService(latency)
+            overlay = LivePriceService(catalog, ttl=args.ttl, timeout=timeout)
+            latencies = await run_pages(
+                args,
+                pages,
+                lambda view: overlay.get_live_prices(session, view),
+            )
+            report(f"{label}overlay", catalog.requests, len(pages), latencies)
+            print(f"  {overlay.stats.summary(catalog.requests)}")
+    finally:
+        session.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page-loads", type=int, default=100)
+    parser.add_argument("--skus-per-page", type=int, default=12)
+    parser.add_argument("--variant-skus", type=int, default=6)
+    parser.add_argument("--pool", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--wave-interval", type=float, default=0.05)
+    parser.add_argument("--ttl", type=float, default=0.2)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--slow-latency", type=float, default=1.0)
+    parser.add_argument("--timeout", type=float, default=0.15)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Time the SKU selection of each job that consumes market indicator membership,
+before and after materializing it in market_indicator_sku.
+
+- compute_sku_listing_data_refresh_priority: get_market_indicator_sku_ids
+- snapshot_product_sku_prices: the price refresh universe (market indicators,
+  today-updated and booster pack SKUs)
+- TCGPlayer ID getters: get_market_indicator_sku_tcgplayer_ids and
+  get_booster_pack_tcgplayer_ids
+
+"Before" runs the previous live queries against the catalog; "after" reads the
+table. The refresh that now runs after catalog ingest is timed as well. Sealed
+SKUs are moved to an Unopened condition inside a transaction that is rolled back.
+
+Usage:
+    python benchmarks/bench_market_indicators.py [--repeat 10]
+"""
+
+import argparse
+import os
+import sys
+from datetime import UTC, datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import select, text, union  # noqa: E402
+
+from benchmarks.utils import time_call  # noqa: E402
+from core.dao.market_indicators import (  # noqa: E402
+    get_booster_pack_tcgplayer_ids,
+    get_market_indicator_sku_ids,
+    get_market_indicator_sku_tcgplayer_ids,
+    refresh_market_indicator_skus,
+)
+from core.dao.price_refresh import (  # noqa: E402
+    PriceRefreshSource,
+    query_price_refresh_universe,
+)
+from core.database import SessionLocal  # noqa: E402
+from core.models.catalog import Catalog, Condition, Language, Product, SKU, Set  # noqa: E402
+from core.models.price import Marketplace, SKULatestPrice  # noqa: E402
+from core.services.schemas.schema import ProductType  # noqa: E402
+
+
+def live_market_indicator_sku_ids(session) -> list:
+    """The previous get_market_indicator_sku_ids: lookups, then two joins."""
+    nm, lp, unopened = (
+        session.execute(
+            select(Condition.id).where(Condition.abbreviation == abbreviation)
+        ).scalar_one()
+        for abbreviation in ("NM", "LP", "U")
+    )
+    english = session.execute(
+        select(Language.id).where(Language.abbreviation == "EN")
+    ).scalar_one()
+    catalog_ids = session.execute(select(Catalog.id).distinct()).scalars().all()
+
+    card_skus = session.execute(
+        select(SKU.id, SKU.product_id)
+        .join(Product, SKU.product_id == Product.id)
+        .join(Set, Product.set_id == Set.id)
+        .where(
+            Product.product_type == ProductType.CARDS,
+            Set.catalog_id.in_(catalog_ids),
+            SKU.condition_id.in_([nm, lp]),
+            SKU.language_id == english,
+        )
+    ).all()
+    sealed_skus = session.execute(
+        select(SKU.id, SKU.product_id)
+        .join(Product, SKU.product_id == Product.id)
+        .join(Set, Product.set_id == Set.id)
+        .where(
+            Product.product_type == ProductType.SEALED,
+            Set.catalog_id.in_(catalog_ids),
+            SKU.condition_id == unopened,
+        )
+    ).all()
+    return list({row.id for row in card_skus} | {row.id for row in sealed_skus})
+
+
+def live_market_indicator_select():
+    return union(
+        select(SKU.id)
+        .join(Product, SKU.product_id == Product.id)
+        .join(Condition, SKU.condition_id == Condition.id)
+        .join(Language, SKU.language_id == Language.id)
+        .where(
+            Product.product_type == ProductType.CARDS,
+            Condition.abbreviation.in_(["NM", "LP"]),
+            Language.abbreviation == "EN",
+        ),
+        select(SKU.id)
+        .join(Product, SKU.product_id == Product.id)
+        .join(Condition, SKU.condition_id == Condition.id)
+        .where(
+            Product.product_type == ProductType.SEALED,
+            Condition.abbreviation == "U",
+        ),
+    )
+
+
+def live_booster_pack_select():
+    return (
+        select(SKU.id)
+        .join(Product, SKU.product_id == Product.id)
+        .where(
+            Product.product_type == ProductType.SEALED,
+            Product.name.ilike("%Booster Pack%"),
+        )
+    )
+
+
+def live_product_job_universe(today_start: datetime):
+    sku_ids = union(
+        live_market_indicator_select(),
+        live_booster_pack_select(),
+        select(SKULatestPrice.sku_id).where(
+            SKULatestPrice.marketplace == Marketplace.TCGPLAYER,
+            SKULatestPrice.updated_at >= today_start,
+        ),
+    ).subquery()
+    return select(SKU.id, SKU.tcgplayer_id).where(
+        SKU.id.in_(select(sku_ids.c[0])), SKU.tcgplayer_id.isnot(None)
+    )
+
+
+def live_market_indicator_tcgplayer_ids(session) -> list:
+    internal_ids = live_market_indicator_sku_ids(session)
+    return list(
+        session.execute(
+            select(SKU.tcgplayer_id).where(
+                SKU.id.in_(internal_ids), SKU.tcgplayer_id.isnot(None)
+            )
+        ).scalars()
+    )
+
+
+def live_booster_pack_tcgplayer_ids(session) -> list:
+    return list(
+        session.execute(
+            live_booster_pack_select().with_only_columns(SKU.tcgplayer_id)
+        ).scalars()
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    today_start = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+    product_sources = [
+        PriceRefreshSource.MARKET_INDICATORS,
+        PriceRefreshSource.RECENTLY_UPDATED,
+        PriceRefreshSource.BOOSTER_PACKS,
+    ]
+
+    session = SessionLocal()
+    try:
+        session.execute(
+            text(
+                """
+                INSERT INTO condition (id, tcgplayer_id, name, abbreviation)
+                SELECT gen_random_uuid(), 99, 'Unopened', 'U'
+                WHERE NOT EXISTS (SELECT 1 FROM condition WHERE abbreviation = 'U')
+                """
+            )
+        )
+        session.execute(
+            text(
+                """
+                UPDATE sku SET condition_id = (
+                    SELECT id FROM condition WHERE abbreviation = 'U'
+                )
+                FROM product
+                WHERE sku.product_id = product.id
+                  AND product.product_type = 'SEALED'
+                """
+            )
+        )
+        print(
+            time_call(
+                "refresh after catalog ingest",
+                lambda: refresh_market_indicator_skus(session),
+                args.repeat,
+            )
+        )
+        session.execute(text("ANALYZE market_indicator_sku"))
+        members = session.execute(
+            text("SELECT count(*) FROM market_indicator_sku")
+        ).scalar_one()
+        print(f"{members} member SKUs (rolled back afterwards)")
+
+        comparisons = [
+            (
+                "compute_sku_listing_data_refresh_priority",
+                lambda: live_market_indicator_sku_ids(session),
+                lambda: get_market_indicator_sku_ids(session),
+            ),
+            (
+                "snapshot_product_sku_prices universe",
+                lambda: session.execute(live_product_job_universe(today_start)).all(),
+                lambda: session.execute(
+                    query_price_refresh_universe(
+                        product_sources, updated_since=today_start
+                    )
+                ).all(),
+            ),
+            (
+                "get_market_indicator_sku_tcgplayer_ids",
+                lambda: live_market_indicator_tcgplayer_ids(session),
+                lambda: get_market_indicator_sku_tcgplayer_ids(session),
+            ),
+            (
+                "get_booster_pack_tcgplayer_ids",
+                lambda: live_booster_pack_tcgplayer_ids(session),
+                lambda: get_booster_pack_tcgplayer_ids(session),
+            ),
+        ]
+        for job, before, after in comparisons:
+            assert sorted(map(str, before())) == sorted(map(str, after())), job
+            print(f"{job}:")
+            print(time_call("  before (live query)", before, args.repeat))
+            print(time_call("  after (market_indicator_sku)", after, args.repeat))
+    finally:
+        session.rollback()
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Compare the SKU price cron jobs before and after the unified refresh engine.
+
+Seeds user holdings and today-updated latest prices, then runs each job's SKU
+selection, price fetch and writes against an in-process pricing stub:
+
+- legacy: the previous orchestration. The product job unions market indicator,
+  today-updated and booster pack SKUs from separate queries, and the inventory
+  job runs query_inventory_items once per user. Both fetch 200-ID batches
+  through update_latest_sku_prices, which remaps IDs and writes the cache and
+  snapshots with separate statements.
+- engine: refresh_sku_prices with the same sources.
+
+Reports wall time, pricing API requests and DB statements per run. All writes
+go to savepoints of one transaction that is rolled back.
+
+Usage:
+    python benchmarks/bench_price_refresh.py [--users 50] [--holdings 400]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import UTC, datetime
+from decimal import Decimal
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import event, select, text  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from core.dao.inventory import query_inventory_items  # noqa: E402
+from core.dao.inventory_holding import rebuild_holdings  # noqa: E402
+from core.dao.latest_price import get_today_updated_sku_ids  # noqa: E402
+from core.dao.market_indicators import (  # noqa: E402
+    get_booster_pack_tcgplayer_ids,
+    get_market_indicator_sku_tcgplayer_ids,
+)
+from core.dao.price_refresh import PriceRefreshSource  # noqa: E402
+from core.database import engine  # noqa: E402
+from core.models.catalog import SKU  # noqa: E402
+from core.models.price import Marketplace  # noqa: E402
+from core.models.user import User  # noqa: E402
+from core.services.price_refresh_service import refresh_sku_prices  # noqa: E402
+from core.services.price_service import update_latest_sku_prices  # noqa: E402
+from core.services.schemas.schema import (  # noqa: E402
+    SKUPricingResponseSchema,
+    SKUPricingSchema,
+)
+from core.utils.workers import process_task_queue  # noqa: E402
+
+LEGACY_BATCH_SIZE = 200
+
+
+class StubCatalogService:
+    """Prices every SKU at a price derived from its ID and counts requests."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+
+    async def get_sku_prices(self, sku_ids: list[int]) -> SKUPricingResponseSchema:
+        self.requests += 1
+        return SKUPricingResponseSchema(
+            success=True,
+            errors=[],
+            results=[
+                SKUPricingSchema(
+                    sku_id=sku_id,
+                    low_price=None,
+                    lowest_shipping=Decimal("0"),
+                    lowest_listing_price=Decimal(sku_id % 5000 + 100) / 100,
+                    market_price=None,
+                    direct_low_price=None,
+                )
+                for sku_id in sku_ids
+            ],
+        )
+
+
+class StatementCounter:
+    def __init__(self, connection) -> None:
+        self.count = 0
+        event.listen(connection, "before_cursor_execute", self._count)
+
+    def _count(self, *args) -> None:
+        self.count += 1
+
+
+def seed(session: Session, users: int, holdings: int, today_updated: int) -> None:
+    # The market indicator lookup needs the sealed "Unopened" condition
+    session.execute(
+        text(
+            """
+            INSERT INTO condition (id, tcgplayer_id, name, abbreviation)
+            SELECT gen_random_uuid(), 99, 'Unopened', 'U'
+            WHERE NOT EXISTS (SELECT 1 FROM condition WHERE abbreviation = 'U')
+            """
+        )
+    )
+    for i in range(users):
+        user_id, transaction_id = uuid.uuid4(), uuid.uuid4()
+        session.execute(
+            text("INSERT INTO users (id, email) VALUES (:id, :email)"),
+            {"id": user_id, "email": f"{user_id}@bench.local"},
+        )
+        session.execute(
+            text(
+                """
+                INSERT INTO transaction (id, date, type, currency,
+                                         shipping_cost_amount, tax_amount, user_id)
+                VALUES (:id, now(), 'PURCHASE', 'USD', 0, 0, :user_id)
+                """
+            ),
+            {"id": transaction_id, "user_id": user_id},
+        )
+        # Holdings overlap: each user holds a random slice of a shared pool
+        session.execute(
+            text(
+                """
+                INSERT INTO line_item (id, sku_id, quantity, remaining_quantity,
+                                       unit_price_amount, transaction_id, user_id)
+                SELECT gen_random_uuid(), id, 1, 1, 5, :transaction_id, :user_id
+                FROM (SELECT id FROM sku ORDER BY id LIMIT :pool) AS pool
+                ORDER BY random() LIMIT :holdings
+                """
+            ),
+            {
+                "transaction_id": transaction_id,
+                "user_id": user_id,
+                "pool": holdings * 10,
+                "holdings": holdings,
+            },
+        )
+        rebuild_holdings(session, user_id)
+    session.execute(
+        text(
+            """
+            INSERT INTO sku_latest_price (sku_id, marketplace,
+                                          lowest_listing_price_total, updated_at)
+            SELECT id, 'tcgplayer', 1, now() FROM sku ORDER BY id DESC LIMIT :count
+            """
+        ),
+        {"count": today_updated},
+    )
+    session.execute(text("ANALYZE line_item"))
+    session.execute(text("ANALYZE sku_latest_price"))
+    session.commit()
+
+
+async def legacy_product_job(session_factory, service, today_start) -> int:
+    with session_factory() as session:
+        market_indicator_ids = get_market_indicator_sku_tcgplayer_ids(session)
+        today_updated_sku_ids = get_today_updated_sku_ids(
+            session, marketplace=Marketplace.TCGPLAYER, cutoff_datetime=today_start
+        )
+        today_updated_ids = (
+            session.execute(
+                select(SKU.tcgplayer_id).where(
+                    SKU.id.in_(today_updated_sku_ids), SKU.tcgplayer_id.isnot(None)
+                )
+            )
+            .scalars()
+            .all()
+            if today_updated_sku_ids
+            else []
+        )
+        booster_pack_ids = get_booster_pack_tcgplayer_ids(session)
+    target_ids = list(set(market_indicator_ids + today_updated_ids + booster_pack_ids))
+
+    async def process_batch(batch_ids: list[int]) -> int:
+        with session_factory() as session:
+            internal_ids = [
+                row.id
+                for row in session.execute(
+                    select(SKU.id).where(SKU.tcgplayer_id.in_(batch_ids))
+                ).all()
+            ]
+            return await update_latest_sku_prices(
+                session=session,
+                catalog_service=service,
+                sku_ids=internal_ids,
+                marketplace=Marketplace.TCGPLAYER,
+                write_through=True,
+            )
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(0, len(target_ids), LEGACY_BATCH_SIZE):
+        queue.put_nowait(process_batch(target_ids[i : i + LEGACY_BATCH_SIZE]))
+    await process_task_queue(queue)
+    return len(target_ids)
+
+
+async def legacy_inventory_job(session_factory, service) -> int:
+    with session_factory() as session:
+        sku_ids = set()
+        for user in session.scalars(select(User)).all():
+            sku_ids.update(
+                sku.id
+                for (sku, _, _) in session.execute(query_inventory_items(user.id)).all()
+            )
+    sku_ids = list(sku_ids)
+
+    async def process_batch(batch_ids) -> int:
+        with session_factory() as session:
+            return await update_latest_sku_prices(
+                session=session,
+                catalog_service=service,
+                sku_ids=batch_ids,
+                marketplace=Marketplace.TCGPLAYER,
+            )
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(0, len(sku_ids), LEGACY_BATCH_SIZE):
+        queue.put_nowait(process_batch(sku_ids[i : i + LEGACY_BATCH_SIZE]))
+    await process_task_queue(queue)
+    return len(sku_ids)
+
+
+def report(label: str, skus: int, wall: float, service, counter, before) -> None:
+    print(
+        f"{label:<28} {wall * 1000:9.1f}ms skus={skus:<6} "
+        f"api requests={service.requests:<5} db statements={counter.count - before}"
+    )
+
+
+async def main_async(args) -> None:
+    connection = engine.connect()
+    transaction = connection.begin()
+
+    def session_factory() -> Session:
+        return Session(bind=connection, join_transaction_mode="create_savepoint")
+
+    counter = StatementCounter(connection)
+    today_start = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+    try:
+        with session_factory() as session:
+            seed(session, args.users, args.holdings, args.today_updated)
+        print(
+            f"{args.users} users x {args.holdings} holdings, {args.today_updated} "
+            "SKUs updated today (rolled back afterwards)"
+        )
+        product_sources = [
+            PriceRefreshSource.MARKET_INDICATORS,
+            PriceRefreshSource.RECENTLY_UPDATED,
+            PriceRefreshSource.BOOSTER_PACKS,
+        ]
+
+        for job in ("product", "inventory"):
+            service, before = StubCatalogService(), counter.count
+            start = time.perf_counter()
+            if job == "product":
+                skus = await legacy_product_job(session_factory, service, today_start)
+            else:
+                skus = await legacy_inventory_job(session_factory, service)
+            report(
+                f"legacy {job} job",
+                skus,
+                time.perf_counter() - start,
+                service,
+                counter,
+                before,
+            )
+
+            service, before = StubCatalogService(), counter.count
+            start = time.perf_counter()
+            stats = await refresh_sku_prices(
+                service,
+                product_sources if job == "product" else [PriceRefreshSource.INVENTORY],
+                write_snapshots=job == "product",
+                updated_since=today_start,
+                session_factory=session_factory,
+            )
+            report(
+                f"engine {job} job",
+                stats.skus_targeted,
+                time.perf_counter() - start,
+                service,
+                counter,
+                before,
+            )
+    finally:
+        transaction.rollback()
+        connection.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--holdings", type=int, default=400)
+    parser.add_argument("--today-updated", type=int, default=2_000)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
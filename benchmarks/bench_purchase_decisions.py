@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+CPU benchmark for the purchase decision sweep's evaluation step over 10k SKUs.
+
+Compares the per-SKU path (linear listing scan per SKU + compute_purchase_decision)
+with group_listings_by_sku + compute_purchase_decisions_batch on synthetic market
+data, and checks that both paths produce identical decisions.
+
+Usage:
+    python benchmarks/bench_purchase_decisions.py [--skus 10000] [--skus-per-product 4]
+"""
+
+import argparse
+import os
+import random
+import sys
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.utils import time_call  # noqa: E402
+from core.models.listings import SaleRecord  # noqa: E402
+from core.models.price import Marketplace  # noqa: E402
+from core.services.purchase_decision_service import (  # noqa: E402
+    MarketData,
+    compute_purchase_decision,
+    compute_purchase_decisions_batch,
+    group_listings_by_sku,
+)
+from core.services.schemas.tcgplayer import TCGPlayerListingSchema  # noqa: E402
+
+ASOF = datetime.now(timezone.utc)
+
+
+def build_products(rng: random.Random, sku_count: int, skus_per_product: int):
+    """Return [(listings for the product, [(sku_id, sku_tcgplayer_id, sales)])]."""
+    products = []
+    next_tcgplayer_id = 1
+    for _ in range(sku_count // skus_per_product):
+        base = Decimal(rng.randint(150, 20000)) / 100
+        listings = []
+        skus = []
+        for _ in range(skus_per_product):
+            sku_tcgplayer_id = next_tcgplayer_id
+            next_tcgplayer_id += 1
+            for _ in range(rng.randint(0, 60)):
+                listings.append(
+                    TCGPlayerListingSchema.model_construct(
+                        price=(base * Decimal(rng.randint(75, 150)) / 100).quantize(
+                            Decimal("0.01")
+                        ),
+                        shipping_price=Decimal(rng.choice([0, 0, 99, 130])) / 100,
+                        quantity=rng.randint(1, 8),
+                        seller_id=f"seller-{rng.randint(1, 40)}",
+                        product_condition_id=sku_tcgplayer_id,
+                    )
+                )
+            sales = [
+                SaleRecord(
+                    sale_price=(base * Decimal(rng.randint(85, 160)) / 100).quantize(
+                        Decimal("0.01")
+                    ),
+                    shipping_price=rng.choice([None, Decimal("0.99")]),
+                    quantity=rng.randint(1, 4),
+                )
+                for _ in range(rng.randint(0, 40))
+            ]
+            skus.append((uuid.uuid4(), sku_tcgplayer_id, sales))
+        rng.shuffle(listings)
+        products.append((listings, skus))
+    return products
+
+
+def per_sku_path(products):
+    decisions = []
+    for listings, skus in products:
+        for sku_id, sku_tcgplayer_id, sales in skus:
+            sku_listings = [
+                listing
+                for listing in listings
+                if listing.product_condition_id == sku_tcgplayer_id
+            ]
+            decisions.append(
+                compute_purchase_decision(
+                    MarketData(
+                        sku_id=sku_id,
+                        marketplace=Marketplace.TCGPLAYER,
+                        listings=sku_listings,
+                        sales=sales,
+                        asof_listings=ASOF,
+                        asof_sales=ASOF,
+                    )
+                )
+            )
+    return decisions
+
+
+def batch_path(products):
+    market_data_list = []
+    for listings, skus in products:
+        listings_by_sku = group_listings_by_sku(listings)
+        for sku_id, sku_tcgplayer_id, sales in skus:
+            market_data_list.append(
+                MarketData(
+                    sku_id=sku_id,
+                    marketplace=Marketplace.TCGPLAYER,
+                    listings=listings_by_sku.get(sku_tcgplayer_id, []),
+                    sales=sales,
+                    asof_listings=ASOF,
+                    asof_sales=ASOF,
+                )
+            )
+    return compute_purchase_decisions_batch(market_data_list)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--skus", type=int, default=10_000)
+    parser.add_argument("--skus-per-product", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    products = build_products(rng, args.skus, args.skus_per_product)
+    listing_count = sum(len(listings) for listings, _ in products)
+    print(f"Synthetic sweep: {args.skus} SKUs, {listing_count} listings")
+
+    expected = per_sku_path(products)
+    actual = batch_path(products)
+    mismatches = sum(
+        1
+        for a, b in zip(expected, actual)
+        if (a.decision, a.quantity, a.buy_vwap, a.expected_resale_net, a.reason_codes)
+        != (b.decision, b.quantity, b.buy_vwap, b.expected_resale_net, b.reason_codes)
+    )
+    buys = sum(1 for d in actual if d.decision.value == "BUY")
+    print(f"Decisions compared: {len(actual)}, BUY: {buys}, mismatches: {mismatches}")
+
+    print(time_call("per-SKU path", lambda: per_sku_path(products), args.repeat))
+    print(time_call("batch path", lambda: batch_path(products), args.repeat))
+
+
+if __name__ == "__main__":
+    main()
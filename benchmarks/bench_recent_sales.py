@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Benchmark get_recent_sales_for_skus: rows transferred, peak memory and latency per call.
+
+Compares the previous shape (fetch every sale in the window, trim to N per SKU in
+Python) with the LATERAL top-N-per-SKU query. Sales are seeded inside a transaction
+that is rolled back, with a small share of liquid SKUs carrying thousands of sales.
+
+Usage:
+    python benchmarks/bench_recent_sales.py [--skus 2000] [--liquid-share 0.1]
+"""
+
+import argparse
+import os
+import sys
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import desc, func, select, text  # noqa: E402
+
+from benchmarks.utils import time_call  # noqa: E402
+from core.dao.sales import get_recent_sales_for_skus  # noqa: E402
+from core.database import SessionLocal  # noqa: E402
+from core.models.listings import SaleRecord  # noqa: E402
+from core.models.price import Marketplace  # noqa: E402
+
+LIMIT_PER_SKU = 100
+
+
+def seed_sales(session, sku_count: int, liquid_share: float, liquid_sales: int) -> list:
+    session.execute(
+        text(
+            """
+            CREATE TEMP TABLE bench_sku ON COMMIT DROP AS
+            SELECT id, row_number() OVER (ORDER BY id) AS rn
+            FROM sku ORDER BY id LIMIT :sku_count
+            """
+        ),
+        {"sku_count": sku_count},
+    )
+    session.execute(
+        text(
+            """
+            INSERT INTO sale_record (
+                id, sku_id, marketplace, sale_date, sale_price, quantity
+            )
+            SELECT gen_random_uuid(), s.id, 'tcgplayer',
+                   now() - (g * interval '7 minutes'),
+                   round((1 + random() * 50)::numeric, 2), 1
+            FROM bench_sku s
+            CROSS JOIN LATERAL generate_series(
+                1, CASE WHEN s.rn <= :liquid_count THEN :liquid_sales ELSE 20 END
+            ) AS g
+            """
+        ),
+        {
+            "liquid_count": int(sku_count * liquid_share),
+            "liquid_sales": liquid_sales,
+        },
+    )
+    session.execute(text("ANALYZE sale_record"))
+    return list(session.execute(text("SELECT id FROM bench_sku")).scalars())
+
+
+def fetch_all_query(sku_ids, marketplace, since_date):
+    return (
+        select(SaleRecord)
+        .where(
+            SaleRecord.sku_id.in_(sku_ids),
+            SaleRecord.marketplace == marketplace,
+            SaleRecord.sale_date >= since_date,
+        )
+        .order_by(SaleRecord.sku_id, desc(SaleRecord.sale_date))
+    )
+
+
+def fetch_all_then_trim(session, sku_ids, marketplace, since_date, limit_per_sku):
+    """The previous implementation: unbounded fetch, trimmed per SKU in Python."""
+    query = fetch_all_query(sku_ids, marketplace, since_date)
+    sales_by_sku = {}
+    for sale in session.execute(query).scalars().all():
+        sku_sales = sales_by_sku.setdefault(sale.sku_id, [])
+        if len(sku_sales) < limit_per_sku:
+            sku_sales.append(sale)
+    return sales_by_sku
+
+
+def measure(label: str, session, fn, repeat: int) -> None:
+    session.expunge_all()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<24} peak memory per call: {peak / 1_048_576:8.1f} MiB")
+
+    def run():
+        session.expunge_all()
+        fn()
+
+    print(time_call(f"  {label}", run, repeat))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--skus", type=int, default=2_000)
+    parser.add_argument("--liquid-share", type=float, default=0.1)
+    parser.add_argument("--liquid-sales", type=int, default=3_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    marketplace = Marketplace.TCGPLAYER
+    since_date = datetime.now(timezone.utc) - timedelta(days=90)
+
+    session = SessionLocal()
+    try:
+        sku_ids = seed_sales(session, args.skus, args.liquid_share, args.liquid_sales)
+
+        legacy_query = fetch_all_query(sku_ids, marketplace, since_date)
+        legacy_rows = session.execute(
+            select(func.count()).select_from(legacy_query.subquery())
+        ).scalar()
+        topn_rows = sum(
+            len(sales)
+            for sales in get_recent_sales_for_skus(
+                session, sku_ids, marketplace, since_date, LIMIT_PER_SKU
+            ).values()
+        )
+        print(
+            f"{len(sku_ids)} SKUs, limit_per_sku={LIMIT_PER_SKU} "
+            f"(seeded data rolled back afterwards)"
+        )
+        print(f"  rows transferred: fetch-all {legacy_rows}, top-N {topn_rows}")
+
+        measure(
+            "fetch-all + trim",
+            session,
+            lambda: fetch_all_then_trim(
+                session, sku_ids, marketplace, since_date, LIMIT_PER_SKU
+            ),
+            args.repeat,
+        )
+        measure(
+            "LATERAL top-N",
+            session,
+            lambda: get_recent_sales_for_skus(
+                session, sku_ids, marketplace, since_date, LIMIT_PER_SKU
+            ),
+            args.repeat,
+        )
+    finally:
+        session.rollback()
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
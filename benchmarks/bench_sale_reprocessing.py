@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Benchmark replaying a year of sales: the per-SKU ORM loop of the previous
+scripts/reprocess_sales.py (restore each consumption, then
+process_sale_line_items) versus reprocess_sales.
+
+Seeds one user with a year of history: ``--purchases`` purchase transactions
+of ``--lots-per-purchase`` lots each over ``--skus`` SKUs, and ``--sales`` sale
+line items dated after a lot of their SKU, with no consumptions recorded (as
+after a bad import). Each mode replays the whole year from the same seed in its
+own transaction, rolled back afterwards; reprocess_sales is then run again to
+time a replay that finds nothing to change, and as a dry run.
+
+Usage:
+    python benchmarks/bench_sale_reprocessing.py [--purchases 3000]
+        [--sales 10000] [--skus 500]
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from datetime import UTC, datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import select, text  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from benchmarks.utils import TimingResult  # noqa: E402
+from core.dao.inventory_holding import diff_holdings, rebuild_holdings  # noqa: E402
+from core.dao.transaction import (  # noqa: E402
+    find_line_item_invariant_violations,
+    process_sale_line_items,
+)
+from core.database import engine  # noqa: E402
+from core.models.transaction import (  # noqa: E402
+    LineItem,
+    LineItemConsumption,
+    Transaction,
+    TransactionType,
+)
+from core.services.sale_reprocessing_service import reprocess_sales  # noqa: E402
+
+YEAR_START = datetime(2024, 1, 1, tzinfo=UTC)
+YEAR_END = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def per_sku_replay(session, user_id) -> None:
+    """The previous script's loop: one ORM rewind and replay per SKU."""
+    sku_ids = session.scalars(
+        select(LineItem.sku_id)
+        .join(Transaction)
+        .where(
+            LineItem.user_id == user_id,
+            Transaction.type == TransactionType.SALE,
+            Transaction.date >= YEAR_START,
+            Transaction.date < YEAR_END,
+        )
+        .distinct()
+    ).all()
+    for sku_id in sku_ids:
+        sale_line_items = (
+            session.query(LineItem)
+            .join(Transaction)
+            .filter(
+                Transaction.type == TransactionType.SALE,
+                LineItem.sku_id == sku_id,
+                LineItem.user_id == user_id,
+            )
+            .order_by(Transaction.date)
+            .all()
+        )
+        consumptions = (
+            session.query(LineItemConsumption)
+            .filter(
+                LineItemConsumption.sale_line_item_id.in_(
+                    [line_item.id for line_item in sale_line_items]
+                )
+            )
+            .all()
+        )
+        for consumption in consumptions:
+            session.get(
+                LineItem, consumption.purchase_line_item_id
+            ).remaining_quantity += consumption.quantity
+            session.delete(consumption)
+        session.flush()
+        process_sale_line_items(session, sale_line_items)
+    session.flush()
+
+
+def seed(session, args) -> uuid.UUID:
+    user_id = uuid.uuid4()
+    session.execute(
+        text("INSERT INTO users (id, email) VALUES (:id, :email)"),
+        {"id": user_id, "email": f"{user_id}@bench.local"},
+    )
+    session.execute(
+        text(
+            """
+            INSERT INTO transaction (id, date, type, currency,
+                                     shipping_cost_amount, tax_amount, user_id)
+            SELECT gen_random_uuid(), :start + random() * interval '330 days',
+                   'PURCHASE', 'USD', 0, 0, :user_id
+            FROM generate_series(1, :purchases)
+            """
+        ),
+        {"user_id": user_id, "start": YEAR_START, "purchases": args.purchases},
+    )
+    session.execute(
+        text(
+            """
+            WITH skus AS (
+                SELECT array_agg(id) AS ids
+                FROM (SELECT id FROM sku ORDER BY random() LIMIT :skus) AS s
+            )
+            INSERT INTO line_item (id, sku_id, quantity, remaining_quantity,
+                                   unit_price_amount, transaction_id, user_id)
+            SELECT gen_random_uuid(),
+                   skus.ids[1 + (random() * (cardinality(skus.ids) - 1))::int],
+                   2, 2, 3, transaction.id, :user_id
+            FROM skus, transaction, generate_series(1, :lots)
+            WHERE transaction.user_id = :user_id
+            """
+        ),
+        {"user_id": user_id, "skus": args.skus, "lots": args.lots_per_purchase},
+    )
+    # Each sale sells one unit of a distinct lot, up to 35 days after it
+    session.execute(
+        text(
+            """
+            WITH lots AS (
+                SELECT line_item.sku_id, transaction.date,
+                       gen_random_uuid() AS sale_id
+                FROM line_item
+                JOIN transaction ON transaction.id = line_item.transaction_id
+                WHERE line_item.user_id = :user_id
+                ORDER BY random() LIMIT :sales
+            ),
+            sales AS (
+                INSERT INTO transaction (id, date, type, currency,
+                                         shipping_cost_amount, tax_amount, user_id)
+                SELECT sale_id, date + random() * interval '35 days',
+                       'SALE', 'USD', 0, 0, :user_id
+                FROM lots
+            )
+            INSERT INTO line_item (id, sku_id, quantity, unit_price_amount,
+                                   transaction_id, user_id)
+            SELECT gen_random_uuid(), sku_id, 1, 5, sale_id, :user_id FROM lots
+            """
+        ),
+        {"user_id": user_id, "sales": args.sales},
+    )
+    rebuild_holdings(session, user_id)
+    session.commit()
+    for table in ("transaction", "line_item", "line_item_consumption"):
+        session.execute(text(f"ANALYZE {table}"))
+    return user_id
+
+
+def timed(label, fn) -> TimingResult:
+    started = time.perf_counter()
+    fn()
+    return TimingResult(
+        label=label, samples_ms=[(time.perf_counter() - started) * 1000]
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--purchases", type=int, default=3_000)
+    parser.add_argument("--lots-per-purchase", type=int, default=4)
+    parser.add_argument("--sales", type=int, default=10_000)
+    parser.add_argument("--skus", type=int, default=500)
+    args = parser.parse_args()
+
+    print(
+        f"{args.purchases} purchases x {args.lots_per_purchase} lots and "
+        f"{args.sales} sales over {args.skus} SKUs in a year (rolled back afterwards)"
+    )
+    for mode in ("per-SKU ORM replay", "reprocess_sales"):
+        connection = engine.connect()
+        transaction = connection.begin()
+        try:
+            session = Session(bind=connection, join_transaction_mode="create_savepoint")
+            session.execute(text("SELECT setseed(0.5)"))
+            user_id = seed(session, args)
+
+            def replay_year(dry_run=False):
+                return reprocess_sales(
+                    session,
+                    user_id,
+                    start_date=YEAR_START,
+                    end_date=YEAR_END,
+                    dry_run=dry_run,
+                )
+
+            if mode == "reprocess_sales":
+                results = [
+                    timed("reprocess_sales (full rewrite)", replay_year),
+                    timed("reprocess_sales (nothing to change)", replay_year),
+                    timed(
+                        "reprocess_sales (dry run)", lambda: replay_year(dry_run=True)
+                    ),
+                ]
+            else:
+                results = [timed(mode, lambda: per_sku_replay(session, user_id))]
+            session.commit()
+
+            violations = find_line_item_invariant_violations(session, user_id)
+            drift = diff_holdings(session, user_id)
+            for result in results:
+                print(result)
+            print(
+                f"  {len(violations)} invariant violations, "
+                f"{len(drift)} ledger mismatches"
+            )
+        finally:
+            transaction.rollback()
+            connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Time the set price comparison endpoint's queries before and after reading
+historical prices from sku_price_reference.
+
+Seeds sets of ~1k card SKUs and two years of snapshot history (one snapshot per
+SKU every few days, as written by the daily job when the price changed) for the
+set SKUs plus a population of other SKUs, so total history outweighs set size:
+
+- legacy: the previous endpoint queries. Current prices from sku_latest_price,
+  historical prices through a GROUP BY max(snapshot_datetime) over every SKU's
+  history, joined back to the snapshots.
+- reference: set_price_comparison_select for a precomputed horizon (30 days).
+- lateral: set_price_comparison_select for any other horizon (45 days), one
+  snapshot probe per set SKU.
+
+refresh_price_references, which now runs after each snapshot run, is timed too.
+All writes happen in one transaction that is rolled back.
+
+Usage:
+    python benchmarks/bench_set_price_comparison.py [--sets 3] [--skus-per-set 1000]
+        [--other-skus 5000] [--days 730] [--change-every 3] [--repeat 10]
+"""
+
+import argparse
+import os
+import sys
+from datetime import UTC, datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import func, select, text  # noqa: E402
+
+from benchmarks.utils import time_call  # noqa: E402
+from core.dao.price_reference import (  # noqa: E402
+    refresh_price_references,
+    set_price_comparison_select,
+)
+from core.database import SessionLocal  # noqa: E402
+from core.models.catalog import Product, SKU, Set  # noqa: E402
+from core.models.price import (  # noqa: E402
+    Marketplace,
+    SKULatestPrice,
+    SKUPriceDataSnapshot,
+)
+from core.services.schemas.schema import ProductType  # noqa: E402
+
+
+def seed(session, args, snapshot_dt: datetime) -> list:
+    """Create the benchmark sets and price history; returns the set IDs."""
+    set_ids = (
+        session.execute(
+            text(
+                """
+                INSERT INTO set (id, tcgplayer_id, name, code, release_date,
+                                 modified_date, catalog_id)
+                SELECT gen_random_uuid(), -n, 'Bench Set ' || n, 'BENCH' || n,
+                       now(), now(), (SELECT catalog_id FROM set LIMIT 1)
+                FROM generate_series(1, :sets) AS n
+                RETURNING id
+                """
+            ),
+            {"sets": args.sets},
+        )
+        .scalars()
+        .all()
+    )
+    # Move whole card products into the sets until each holds ~skus_per_set SKUs
+    session.execute(
+        text(
+            """
+            WITH products AS (
+                SELECT product.id,
+                       CAST(sum(count(*)) OVER (ORDER BY product.id) AS bigint)
+                           AS running_skus
+                FROM product
+                JOIN sku ON sku.product_id = product.id
+                WHERE product.product_type = 'CARDS'
+                GROUP BY product.id
+            )
+            UPDATE product
+            SET set_id = (CAST(:set_ids AS uuid[]))[
+                (products.running_skus - 1) / :skus_per_set + 1
+            ]
+            FROM products
+            WHERE product.id = products.id
+              AND products.running_skus <= :sets * :skus_per_set
+            """
+        ),
+        {
+            "set_ids": set_ids,
+            "sets": args.sets,
+            "skus_per_set": args.skus_per_set,
+        },
+    )
+    # Set SKUs plus other SKUs get history; offsets spread the change days
+    session.execute(
+        text(
+            """
+            WITH priced AS (
+                (SELECT sku.id, row_number() OVER () AS n
+                 FROM sku JOIN product ON sku.product_id = product.id
+                 WHERE product.set_id = ANY(CAST(:set_ids AS uuid[])))
+                UNION ALL
+                (SELECT sku.id, row_number() OVER () AS n
+                 FROM sku JOIN product ON sku.product_id = product.id
+                 WHERE product.set_id <> ALL(CAST(:set_ids AS uuid[]))
+                 LIMIT :other_skus)
+            )
+            INSERT INTO sku_price_data_snapshot (sku_id, marketplace,
+                                                 snapshot_datetime,
+                                                 lowest_listing_price_total)
+            SELECT priced.id, 'tcgplayer',
+                   :snapshot_dt - make_interval(days => days_ago),
+                   round((1 + random() * 100)::numeric, 2)
+            FROM priced
+            CROSS JOIN generate_series(0, :days - 1) AS days_ago
+            WHERE (days_ago + priced.n) % :change_every = 0 OR days_ago = 0
+            """
+        ),
+        {
+            "set_ids": set_ids,
+            "other_skus": args.other_skus,
+            "snapshot_dt": snapshot_dt,
+            "days": args.days,
+            "change_every": args.change_every,
+        },
+    )
+    session.execute(
+        text(
+            """
+            INSERT INTO sku_latest_price (sku_id, marketplace,
+                                          lowest_listing_price_total, updated_at)
+            SELECT sku_id, marketplace, lowest_listing_price_total, snapshot_datetime
+            FROM sku_price_data_snapshot
+            WHERE snapshot_datetime = :snapshot_dt
+            """
+        ),
+        {"snapshot_dt": snapshot_dt},
+    )
+    for table in ("product", "sku", "sku_price_data_snapshot", "sku_latest_price"):
+        session.execute(text(f"ANALYZE {table}"))
+    return set_ids
+
+
+def legacy_set_prices(session, set_id, days_ago: int) -> tuple[float, float]:
+    """The previous endpoint queries; returns (current total, historical total)."""
+    historical_date = datetime.now(UTC) - timedelta(days=days_ago)
+    current = session.execute(
+        select(SKULatestPrice.lowest_listing_price_total)
+        .select_from(SKU)
+        .join(Product, SKU.product_id == Product.id)
+        .join(Set, Product.set_id == Set.id)
+        .outerjoin(
+            SKULatestPrice,
+            (SKULatestPrice.sku_id == SKU.id)
+            & (SKULatestPrice.marketplace == Marketplace.TCGPLAYER),
+        )
+        .where(Set.id == set_id)
+        .where(Product.product_type == ProductType.CARDS)
+    ).scalars()
+    historical_subquery = (
+        select(
+            SKUPriceDataSnapshot.sku_id,
+            func.max(SKUPriceDataSnapshot.snapshot_datetime).label(
+                "latest_snapshot_date"
+            ),
+        )
+        .where(
+            (SKUPriceDataSnapshot.marketplace == Marketplace.TCGPLAYER)
+            & (SKUPriceDataSnapshot.snapshot_datetime <= historical_date)
+        )
+        .group_by(SKUPriceDataSnapshot.sku_id)
+        .subquery()
+    )
+    historical = session.execute(
+        select(SKUPriceDataSnapshot.lowest_listing_price_total)
+        .select_from(SKU)
+        .join(Product, SKU.product_id == Product.id)
+        .join(Set, Product.set_id == Set.id)
+        .join(historical_subquery, historical_subquery.c.sku_id == SKU.id)
+        .join(
+            SKUPriceDataSnapshot,
+            (SKUPriceDataSnapshot.sku_id == SKU.id)
+            & (SKUPriceDataSnapshot.marketplace == Marketplace.TCGPLAYER)
+            & (
+                SKUPriceDataSnapshot.snapshot_datetime
+                == historical_subquery.c.latest_snapshot_date
+            ),
+        )
+        .where(Set.id == set_id)
+        .where(Product.product_type == ProductType.CARDS)
+    ).scalars()
+    return (
+        round(sum(float(p) for p in current if p is not None), 2),
+        round(sum(float(p) for p in historical), 2),
+    )
+
+
+def set_prices(session, set_id, days_ago: int) -> tuple[float, float]:
+    rows = session.execute(set_price_comparison_select(set_id, days_ago)).all()
+    return (
+        round(sum(float(r.current_price) for r in rows if r.current_price), 2),
+        round(sum(float(r.historical_price) for r in rows if r.historical_price), 2),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sets", type=int, default=3)
+    parser.add_argument("--skus-per-set", type=int, default=1000)
+    parser.add_argument("--other-skus", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--change-every", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    snapshot_dt = datetime.now(UTC) - timedelta(minutes=1)
+    session = SessionLocal()
+    try:
+        set_ids = seed(session, args, snapshot_dt)
+        snapshots = session.execute(
+            text("SELECT count(*) FROM sku_price_data_snapshot")
+        ).scalar_one()
+        print(
+            f"{args.sets} sets x ~{args.skus_per_set} SKUs, {snapshots} snapshots "
+            f"over {args.days} days (rolled back afterwards)"
+        )
+
+        print(
+            time_call(
+                "refresh_price_references",
+                lambda: refresh_price_references(
+                    session, Marketplace.TCGPLAYER, snapshot_dt
+                ),
+                args.repeat,
+            )
+        )
+        session.execute(text("ANALYZE sku_price_reference"))
+
+        set_id = set_ids[0]
+        for label, days_ago in (("reference", 30), ("lateral", 45)):
+            expected = legacy_set_prices(session, set_id, days_ago)
+            assert set_prices(session, set_id, days_ago) == expected, days_ago
+            print(f"days_ago={days_ago}:")
+            print(
+                time_call(
+                    "  legacy (GROUP BY over all history)",
+                    lambda: legacy_set_prices(session, set_id, days_ago),
+                    args.repeat,
+                )
+            )
+            print(
+                time_call(
+                    f"  set_price_comparison_select ({label})",
+                    lambda: set_prices(session, set_id, days_ago),
+                    args.repeat,
+                )
+            )
+    finally:
+        session.rollback()
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+CPU benchmark for the tiered SKU sampler: select 500 SKUs from 200k candidates.
+
+Compares the original list-based sampler (softmax over the top-L window with
+list.remove per pick) against TierCandidates._select_from_tier, which samples
+with Gumbel noise over NumPy arrays.
+
+Usage:
+    python benchmarks/bench_sku_sampler.py [--candidates 200000] [--select 500]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import uuid
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.utils import time_call  # noqa: E402
+from core.services.sku_selection import (  # noqa: E402
+    MIN_WINDOW_SIZE,
+    TIER_CONFIGS,
+    TOP_L_WINDOW,
+    Candidate,
+    TierCandidates,
+)
+
+
+def list_sampler(candidates, temperature, count):
+    available = candidates.copy()
+    selected = []
+    for _ in range(min(count, len(available))):
+        window_size = max(MIN_WINDOW_SIZE, min(TOP_L_WINDOW, len(available)))
+        window = available[:window_size]
+        max_score = max(c.service_score for c in window)
+        weights = [
+            math.exp((c.service_score - max_score) / temperature) for c in window
+        ]
+        total = sum(weights)
+        rand_val = random.random()
+        cumulative = 0.0
+        chosen = window[-1]
+        for candidate, weight in zip(window, weights):
+            cumulative += weight / total
+            if rand_val <= cumulative:
+                chosen = candidate
+                break
+        selected.append(chosen)
+        available.remove(chosen)
+    return selected
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--candidates", type=int, default=200_000)
+    parser.add_argument("--select", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    candidates = sorted(
+        (
+            Candidate(
+                sku_id=uuid.UUID(int=rng.getrandbits(128)),
+                product_tcgplayer_id=i,
+                priority_score=rng.uniform(0.8, 1.0),
+                age_norm=rng.random(),
+                service_score=rng.random(),
+                last_refresh_at=None,
+            )
+            for i in range(args.candidates)
+        ),
+        key=lambda c: c.service_score,
+        reverse=True,
+    )
+    tier = TIER_CONFIGS[0]
+    random.seed(args.seed)
+    tier_candidates = TierCandidates(None, None, rng=np.random.default_rng(args.seed))
+
+    print(f"Selecting {args.select} of {len(candidates)} candidates (tier {tier.name})")
+    print(
+        time_call(
+            "list sampler",
+            lambda: list_sampler(candidates, tier.temperature, args.select),
+            args.repeat,
+        )
+    )
+    print(
+        time_call(
+            "vectorized sampler",
+            lambda: tier_candidates._select_from_tier(candidates, tier, args.select),
+            args.repeat,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Contention benchmark for TCGPlayerCatalogService bearer token checks.
+
+Starts a local fake of the TCGPlayer token and SKU pricing endpoints, then
+issues 500 concurrent get_sku_prices calls through:
+
+- locked check: the original scheme, which takes the service lock and parses
+  the ".expires" string on every call
+- shared token: SharedOAuthToken's freshness check, read without a lock
+
+Each scenario is run warm (token already valid) and cold (every caller arrives
+before the first token is minted). Token mints are counted by the fake. The
+header path is also timed on its own, without the pricing request.
+
+Usage:
+    python benchmarks/bench_tcgplayer_token_contention.py [--concurrency 500] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.services import tcgplayer_catalog_service as catalog  # noqa: E402
+from core.services.oauth_token_store import InMemoryTokenStore  # noqa: E402
+from core.services.schemas.schema import RefreshTokenRequestSchema  # noqa: E402
+
+
+class FakeTCGPlayer:
+    """Local token and pricing endpoints."""
+
+    def __init__(self) -> None:
+        self.mints = 0
+        self.app = web.Application()
+        self.app.router.add_post("/token", self.token)
+        self.app.router.add_get("/pricing/sku/{ids}", self.sku_prices)
+
+    async def token(self, request: web.Request) -> web.Response:
+        self.mints += 1
+        await asyncio.sleep(0.05)  # token endpoint latency
+        expires = datetime.now(timezone.utc) + timedelta(days=14)
+        return web.json_response(
+            {
+                "access_token": f"token-{self.mints}",
+                ".expires": expires.strftime("%a, %d %b %Y %H:%M:%S GMT"),
+            }
+        )
+
+    async def sku_prices(self, request: web.Request) -> web.Response:
+        sku_ids = [int(i) for i in request.match_info["ids"].split(",")]
+        return web.json_response(
+            {
+                "success": True,
+                "errors": [],
+                "results": [
+                    {
+                        "skuId": sku_id,
+                        "lowPrice": 1.0,
+                        "lowestShipping": 0.99,
+                        "lowestListingPrice": 1.0,
+                        "marketPrice": 1.25,
+                        "directLowPrice": None,
+                    }
+                    for sku_id in sku_ids
+                ],
+            }
+        )
+
+
+class LockedCheckService(catalog.TCGPlayerCatalogService):
+    """The original scheme: lock, then parse the expiry string, on every call."""
+
+    def __init__(self) -> None:
+        super().__init__(token_store=InMemoryTokenStore())
+        self.lock = asyncio.Lock()
+        self.access_token = None
+        self.access_token_expiry = None
+
+    async def get_authorization_headers(self) -> dict:
+        async with self.lock:
+            if self._expired():
+                environment = catalog.get_environment()
+                data = RefreshTokenRequestSchema(
+                    grant_type="client_credentials",
+                    client_id=environment.tcgplayer_client_id,
+                    client_secret=environment.tcgplayer_client_secret,
+                ).model_dump()
+                async with self.session.post(
+                    catalog.TCGPLAYER_ACCESS_TOKEN_URL, data=data
+                ) as response:
+                    data = await response.json()
+                    self.access_token = data["access_token"]
+                    self.access_token_expiry = data[".expires"]
+            return {"Authorization": f"bearer {self.access_token}"}
+
+    def _expired(self) -> bool:
+        if self.access_token_expiry is None:
+            return True
+        expiry_date = datetime.strptime(
+            self.access_token_expiry, "%a, %d %b %Y %H:%M:%S %Z"
+        )
+        return datetime.now() > expiry_date
+
+
+async def run_burst(service, concurrency: int) -> list:
+    """Return per-call latencies (ms) of concurrent get_sku_prices calls."""
+
+    async def call(sku_id: int) -> float:
+        start = time.perf_counter()
+        await service.get_sku_prices([sku_id])
+        return (time.perf_counter() - start) * 1000
+
+    return await asyncio.gather(*(call(i) for i in range(concurrency)))
+
+
+def describe(label: str, latencies: list, wall_ms: float, mints: int) -> str:
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return (
+        f"{label:<28} wall={wall_ms:8.1f}ms call median="
+        f"{statistics.median(latencies):7.2f}ms p95={p95:7.2f}ms mints={mints}"
+    )
+
+
+async def measure(make_service, label: str, args, fake: FakeTCGPlayer) -> None:
+    for scenario in ("cold", "warm"):
+        walls, latencies, mints = [], [], 0
+        for _ in range(args.repeat):
+            service = make_service()
+            await service.init()
+            if scenario == "warm":
+                await service.get_authorization_headers()
+            before = fake.mints
+            start = time.perf_counter()
+            latencies.extend(await run_burst(service, args.concurrency))
+            walls.append((time.perf_counter() - start) * 1000)
+            mints += fake.mints - before
+            await service.close()
+        print(
+            describe(
+                f"{label} ({scenario})", latencies, statistics.median(walls), mints
+            )
+        )
+
+    # Token check alone: the header path without the pricing request
+    service = make_service()
+    await service.init()
+    await service.get_authorization_headers()
+    samples = []
+    for _ in range(args.repeat * 10):
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(service.get_authorization_headers() for _ in range(args.concurrency))
+        )
+        samples.append((time.perf_counter() - start) * 1000)
+    await service.close()
+    print(f"{label + ' (headers only)':<28} wall={statistics.median(samples):8.2f}ms")
+
+
+async def main_async(args) -> None:
+    fake = FakeTCGPlayer()
+    runner = web.AppRunner(fake.app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    base_url = f"http://127.0.0.1:{port}"
+    catalog.TCGPLAYER_ACCESS_TOKEN_URL = f"{base_url}/token"
+    catalog.TCGPLAYER_PRICING_URL = f"{base_url}/pricing"
+
+    print(f"{args.concurrency} concurrent get_sku_prices calls x {args.repeat}")
+    try:
+        await measure(LockedCheckService, "locked check", args, fake)
+        await measure(
+            lambda: catalog.TCGPlayerCatalogService(token_store=InMemoryTokenStore()),
+            "shared token",
+            args,
+            fake,
+        )
+    finally:
+        await runner.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Benchmark bulk deletion of transactions: the previous row-by-row
+delete_transactions (one ORM delete and consumption restore per row) versus
+the set-based one.
+
+Seeds one user with ``--purchases`` purchase transactions of
+``--lots-per-purchase`` line items each and ``--sales`` sale transactions of
+one line item, each sale consuming one unit from a random purchase lot, then
+deletes ``--delete`` transactions (sales and purchases alike) both ways. Each
+round seeds the same data into its own transaction, rolled back afterwards,
+and checks the line item invariants and the holdings ledger after deleting.
+
+Usage:
+    python benchmarks/bench_transaction_delete.py [--purchases 4000]
+        [--sales 2000] [--delete 5000] [--rounds 1]
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from collections import defaultdict
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import select, text  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from benchmarks.utils import TimingResult  # noqa: E402
+from core.dao.inventory_holding import diff_holdings, rebuild_holdings  # noqa: E402
+from core.dao.transaction import (  # noqa: E402
+    delete_transactions,
+    find_line_item_invariant_violations,
+    process_sale_line_items,
+)
+from core.database import engine  # noqa: E402
+from core.models.transaction import (  # noqa: E402
+    LineItem,
+    LineItemConsumption,
+    Transaction,
+    TransactionType,
+)
+
+
+def row_by_row_delete_transactions(session, transaction_ids) -> None:
+    """The previous delete_transactions: sales first, one row at a time."""
+    transactions = (
+        session.query(Transaction).filter(Transaction.id.in_(transaction_ids)).all()
+    )
+    line_items = defaultdict(list)
+    for line_item in session.query(LineItem).filter(
+        LineItem.transaction_id.in_(transaction_ids)
+    ):
+        line_items[line_item.transaction_id].append(line_item.id)
+
+    for transaction in sorted(
+        transactions, key=lambda t: t.type != TransactionType.SALE
+    ):
+        ids = line_items[transaction.id]
+        if transaction.type == TransactionType.SALE:
+            consumptions = (
+                session.query(LineItemConsumption)
+                .filter(LineItemConsumption.sale_line_item_id.in_(ids))
+                .all()
+            )
+            for consumption in consumptions:
+                session.query(LineItem).get(
+                    consumption.purchase_line_item_id
+                ).remaining_quantity += consumption.quantity
+                session.delete(consumption)
+            reprocess = []
+        else:
+            consumptions = (
+                session.query(LineItemConsumption)
+                .filter(LineItemConsumption.purchase_line_item_id.in_(ids))
+                .all()
+            )
+            reprocess = session.scalars(
+                select(LineItem).where(
+                    LineItem.id.in_({c.sale_line_item_id for c in consumptions})
+                )
+            ).all()
+            for consumption in consumptions:
+                session.delete(consumption)
+        for line_item_id in ids:
+            line_item = session.query(LineItem).get(line_item_id)
+            if line_item:
+                session.delete(line_item)
+        process_sale_line_items(session, reprocess)
+        session.flush()
+        session.delete(transaction)
+    session.flush()
+
+
+def seed(session, args) -> tuple[uuid.UUID, list[uuid.UUID]]:
+    """Seed the user's history; returns the user and the transactions to delete."""
+    user_id = uuid.uuid4()
+    session.execute(
+        text("INSERT INTO users (id, email) VALUES (:id, :email)"),
+        {"id": user_id, "email": f"{user_id}@bench.local"},
+    )
+    session.execute(
+        text(
+            """
+            INSERT INTO transaction (id, date, type, currency,
+                                     shipping_cost_amount, tax_amount, user_id)
+            SELECT gen_random_uuid(), now() - interval '1 year' + g * interval '1 minute',
+                   'PURCHASE', 'USD', 0, 0, :user_id
+            FROM generate_series(1, :purchases) AS g
+            """
+        ),
+        {"user_id": user_id, "purchases": args.purchases},
+    )
+    session.execute(
+        text(
+            """
+            WITH skus AS (SELECT array_agg(id) AS ids FROM sku)
+            INSERT INTO line_item (id, sku_id, quantity, remaining_quantity,
+                                   unit_price_amount, transaction_id, user_id)
+            SELECT gen_random_uuid(),
+                   skus.ids[1 + (random() * (cardinality(skus.ids) - 1))::int],
+                   3, 3, 2, transaction.id, :user_id
+            FROM skus, transaction, generate_series(1, :lots)
+            WHERE transaction.user_id = :user_id
+            """
+        ),
+        {"user_id": user_id, "lots": args.lots_per_purchase},
+    )
+    # Each sale consumes one unit of a distinct random lot, after its purchase
+    session.execute(
+        text(
+            """
+            WITH lots AS (
+                SELECT line_item.id, line_item.sku_id, transaction.date
+                FROM line_item JOIN transaction ON transaction.id = line_item.transaction_id
+                WHERE line_item.user_id = :user_id
+                ORDER BY random() LIMIT :sales
+            ),
+            sales AS (
+                INSERT INTO transaction (id, date, type, currency,
+                                         shipping_cost_amount, tax_amount, user_id)
+                SELECT gen_random_uuid(), now(), 'SALE', 'USD', 0, 0, :user_id
+                FROM lots
+                RETURNING id
+            ),
+            pairs AS (
+                SELECT lots.id AS lot_id, lots.sku_id, sales.id AS sale_id,
+                       gen_random_uuid() AS sale_line_item_id
+                FROM (SELECT *, row_number() OVER () AS n FROM lots) AS lots
+                JOIN (SELECT id, row_number() OVER () AS n FROM sales) AS sales
+                  USING (n)
+            ),
+            sale_line_items AS (
+                INSERT INTO line_item (id, sku_id, quantity, unit_price_amount,
+                                       transaction_id, user_id)
+                SELECT sale_line_item_id, sku_id, 1, 4, sale_id, :user_id FROM pairs
+            ),
+            consumed AS (
+                UPDATE line_item SET remaining_quantity = remaining_quantity - 1
+                FROM pairs WHERE line_item.id = pairs.lot_id
+            )
+            INSERT INTO line_item_consumption (id, user_id, sale_line_item_id,
+                                               purchase_line_item_id, quantity)
+            SELECT gen_random_uuid(), :user_id, sale_line_item_id, lot_id, 1 FROM pairs
+            """
+        ),
+        {"user_id": user_id, "sales": args.sales},
+    )
+    rebuild_holdings(session, user_id)
+    session.commit()
+    for table in ("transaction", "line_item", "line_item_consumption"):
+        session.execute(text(f"ANALYZE {table}"))
+
+    doomed = session.scalars(
+        text(
+            """
+            SELECT id FROM transaction WHERE user_id = :user_id
+            ORDER BY type = 'SALE' DESC, random() LIMIT :count
+            """
+        ),
+        {"user_id": user_id, "count": args.delete},
+    ).all()
+    return user_id, doomed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--purchases", type=int, default=4_000)
+    parser.add_argument("--lots-per-purchase", type=int, default=3)
+    parser.add_argument("--sales", type=int, default=2_000)
+    parser.add_argument("--delete", type=int, default=5_000)
+    parser.add_argument("--rounds", type=int, default=1)
+    args = parser.parse_args()
+
+    print(
+        f"{args.purchases} purchases x {args.lots_per_purchase} lots, "
+        f"{args.sales} sales; deleting {args.delete} transactions "
+        f"(rolled back afterwards)"
+    )
+    for label, delete in (
+        ("row-by-row delete_transactions", row_by_row_delete_transactions),
+        ("set-based delete_transactions", delete_transactions),
+    ):
+        samples = []
+        for _ in range(args.rounds):
+            connection = engine.connect()
+            transaction = connection.begin()
+            try:
+                session = Session(
+                    bind=connection, join_transaction_mode="create_savepoint"
+                )
+                session.execute(text("SELECT setseed(0.5)"))
+                user_id, doomed = seed(session, args)
+
+                started = time.perf_counter()
+                delete(session, doomed)
+                session.commit()
+                samples.append((time.perf_counter() - started) * 1000)
+
+                violations = find_line_item_invariant_violations(session, user_id)
+                drift = diff_holdings(session, user_id)
+                if violations or drift:
+                    raise SystemExit(
+                        f"{label}: {len(violations)} invariant violations, "
+                        f"{len(drift)} ledger mismatches"
+                    )
+            finally:
+                transaction.rollback()
+                connection.close()
+        print(TimingResult(label=label, samples_ms=samples))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Benchmark /transactions/metrics on a multi-tenant database: the previous
+get_transaction_metrics (two aggregations, one per transaction type, each over
+every tenant's line items) versus the single-pass, user-scoped
+get_transaction_metrics, uncached and through TransactionMetricsCache.
+
+Seeds ``--tenants`` users with ``--transactions`` transactions (purchases and
+sales) of ``--line-items`` line items each, then replays ``--requests`` metrics
+requests for random users; every ``--write-every`` requests one user records a
+sale through the ORM, moving their transaction version. Latencies are per
+metrics call (no HTTP). Everything is rolled back afterwards.
+
+Usage:
+    python benchmarks/bench_transaction_metrics.py [--tenants 100]
+        [--transactions 500] [--requests 1000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import UTC, datetime
+from decimal import Decimal
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import func, select, text  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from benchmarks.utils import TimingResult  # noqa: E402
+from core.dao.transaction import (  # noqa: E402
+    LineItemData,
+    TransactionData,
+    create_transaction_with_line_items,
+)
+from core.database import engine  # noqa: E402
+from core.models.transaction import LineItem, Transaction, TransactionType  # noqa: E402
+from core.services.transaction_metrics_cache import (  # noqa: E402
+    TransactionMetricsCache,
+)
+from core.services.transaction_service import get_transaction_metrics  # noqa: E402
+
+
+def previous_transaction_metrics(session) -> dict:
+    """The previous get_transaction_metrics: one unscoped query per type."""
+    line_items_total = (
+        select(
+            LineItem.transaction_id,
+            func.sum(LineItem.quantity * LineItem.unit_price_amount).label("total"),
+        )
+        .group_by(LineItem.transaction_id)
+        .subquery()
+    )
+    results = {}
+    for transaction_type, sign in (
+        (TransactionType.SALE, -1),
+        (TransactionType.PURCHASE, 1),
+    ):
+        results[transaction_type] = session.execute(
+            select(
+                func.count(Transaction.id).label("count"),
+                func.coalesce(
+                    func.sum(
+                        line_items_total.c.total
+                        + Transaction.tax_amount
+                        + sign * Transaction.shipping_cost_amount
+                    ),
+                    0,
+                ).label("total"),
+            )
+            .join(line_items_total, Transaction.id == line_items_total.c.transaction_id)
+            .where(Transaction.type == transaction_type)
+        ).first()
+    sales, purchases = results[TransactionType.SALE], results[TransactionType.PURCHASE]
+    return {
+        "total_revenue": float(sales.total),
+        "total_spent": float(purchases.total),
+        "net_profit": float(sales.total) - float(purchases.total),
+        "total_transactions": sales.count + purchases.count,
+        "currency": "USD",
+    }
+
+
+class Uncached:
+    """Computes the metrics on every call."""
+
+    def get_metrics(self, session, user_id):
+        return get_transaction_metrics(session, user_id)
+
+
+class Previous:
+    """The previous endpoint: the same totals for every caller."""
+
+    def get_metrics(self, session, user_id):
+        return previous_transaction_metrics(session)
+
+
+def seed(session, args) -> list[uuid.UUID]:
+    user_ids = [uuid.uuid4() for _ in range(args.tenants)]
+    session.execute(
+        text(
+            """
+            INSERT INTO users (id, email)
+            SELECT id, id || '@bench.local' FROM unnest(CAST(:ids AS uuid[])) AS id
+            """
+        ),
+        {"ids": [str(user_id) for user_id in user_ids]},
+    )
+    session.execute(
+        text(
+            """
+            INSERT INTO transaction (id, date, type, currency,
+                                     shipping_cost_amount, tax_amount, user_id)
+            SELECT gen_random_uuid(), now() - random() * interval '3 years',
+                   CASE WHEN random() < 0.5 THEN 'SALE' ELSE 'PURCHASE' END,
+                   'USD', round((random() * 5)::numeric, 2),
+                   round((random() * 3)::numeric, 2), users.id
+            FROM unnest(CAST(:ids AS uuid[])) AS users(id),
+                 generate_series(1, :transactions)
+            """
+        ),
+        {
+            "ids": [str(user_id) for user_id in user_ids],
+            "transactions": args.transactions,
+        },
+    )
+    session.execute(
+        text(
+            """
+            WITH skus AS (SELECT array_agg(id) AS ids FROM sku)
+            INSERT INTO line_item (id, sku_id, quantity, unit_price_amount,
+                                   transaction_id, user_id)
+            SELECT gen_random_uuid(),
+                   skus.ids[1 + (random() * (cardinality(skus.ids) - 1))::int],
+                   1 + (random() * 3)::int, round((1 + random() * 40)::numeric, 2),
+                   transaction.id, transaction.user_id
+            FROM skus, transaction, generate_series(1, :line_items)
+            WHERE transaction.user_id = ANY(CAST(:ids AS uuid[]))
+            """
+        ),
+        {"ids": [str(user_id) for user_id in user_ids], "line_items": args.line_items},
+    )
+    session.commit()
+    for table in ("transaction", "line_item"):
+        session.execute(text(f"ANALYZE {table}"))
+    return user_ids
+
+
+def record_sale(session, user_id, sku_id) -> None:
+    create_transaction_with_line_items(
+        session,
+        TransactionData(
+            date=datetime.now(UTC),
+            type=TransactionType.SALE,
+            counterparty_name="Bench",
+            currency="USD",
+            shipping_cost_amount=Decimal("0"),
+            tax_amount=Decimal("0"),
+            user_id=user_id,
+        ),
+        [
+            LineItemData(
+                sku_id=sku_id,
+                quantity=0,
+                unit_price_amount=Decimal("1.00"),
+                user_id=user_id,
+            )
+        ],
+    )
+    session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tenants", type=int, default=100)
+    parser.add_argument("--transactions", type=int, default=500)
+    parser.add_argument("--line-items", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--write-every", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(
+        f"{args.tenants} tenants x {args.transactions} transactions x "
+        f"{args.line_items} line items; {args.requests} requests, a write every "
+        f"{args.write_every} (rolled back afterwards)"
+    )
+    for label, metrics_source in (
+        ("previous (unscoped, two queries)", Previous()),
+        ("single pass, user-scoped", Uncached()),
+        ("single pass + TransactionMetricsCache", TransactionMetricsCache()),
+    ):
+        connection = engine.connect()
+        transaction = connection.begin()
+        try:
+            session = Session(bind=connection, join_transaction_mode="create_savepoint")
+            session.execute(text("SELECT setseed(0.5)"))
+            user_ids = seed(session, args)
+            sku_id = session.execute(text("SELECT id FROM sku LIMIT 1")).scalar_one()
+            rng = random.Random(args.seed)
+
+            samples = []
+            for request in range(args.requests):
+                if request and request % args.write_every == 0:
+                    record_sale(session, rng.choice(user_ids), sku_id)
+                user_id = rng.choice(user_ids)
+                started = time.perf_counter()
+                metrics_source.get_metrics(session, user_id)
+                samples.append((time.perf_counter() - started) * 1000)
+            print(TimingResult(label=label, samples_ms=samples))
+            if isinstance(metrics_source, TransactionMetricsCache):
+                print(f"  hit ratio {metrics_source.stats.hit_ratio:.2f}")
+        finally:
+            transaction.rollback()
+            connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Benchmark the transaction performance chart: the previous
+get_transaction_performance (per-period GROUP BY over every transaction and
+line item in the window, gaps filled in Python with a scan of the points so far
+for every weekly step) versus the one reading the daily totals rollup with the
+gaps filled by generate_series.
+
+Seeds one account with five years of history ending today: ``--transactions``
+transactions (purchases and sales) of ``--line-items`` line items each, builds
+their daily totals, and times the all-time, one-year and 30-day charts. Also
+times recording one more transaction, which now refreshes its day's totals.
+Everything is rolled back afterwards.
+
+Usage:
+    python benchmarks/bench_transaction_performance.py [--transactions 40000]
+        [--line-items 3] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from datetime import UTC, date, datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import Date, and_, case, func, select, text  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.routes.transactions.service import get_transaction_performance  # noqa: E402
+from benchmarks.utils import TimingResult, time_call  # noqa: E402
+from core.dao.transaction import (  # noqa: E402
+    LineItemData,
+    TransactionData,
+    create_transaction_with_line_items,
+)
+from core.dao.transaction_daily_total import rebuild_daily_totals  # noqa: E402
+from core.database import engine  # noqa: E402
+from core.models.transaction import LineItem, Transaction, TransactionType  # noqa: E402
+
+
+def previous_transaction_performance(session, days=30) -> dict:
+    """The previous get_transaction_performance, condensed."""
+    end_date = date.today()
+    if days is None:
+        earliest = session.execute(select(func.min(Transaction.date))).scalar()
+        if earliest is None:
+            return {"data_points": [], "currency": "USD"}
+        start_date = earliest.date()
+        granularity = "daily" if (end_date - start_date).days <= 30 else "weekly"
+    else:
+        start_date = end_date - timedelta(days=days)
+        granularity = "daily" if days <= 30 else "weekly"
+
+    line_items_total = (
+        select(
+            LineItem.transaction_id,
+            func.sum(LineItem.quantity * LineItem.unit_price_amount).label("total"),
+        )
+        .group_by(LineItem.transaction_id)
+        .subquery()
+    )
+    totals = (
+        select(
+            Transaction.id,
+            Transaction.date,
+            Transaction.type,
+            Transaction.tax_amount,
+            Transaction.shipping_cost_amount,
+            func.coalesce(line_items_total.c.total, 0).label("total"),
+        )
+        .outerjoin(
+            line_items_total, Transaction.id == line_items_total.c.transaction_id
+        )
+        .where(and_(Transaction.date >= start_date, Transaction.date <= end_date))
+        .subquery()
+    )
+    unit = "week" if granularity == "weekly" else "day"
+    period = func.cast(func.date_trunc(unit, totals.c.date), Date)
+    group_by = [period]
+    if granularity == "weekly":
+        group_by = [
+            func.extract("isoyear", totals.c.date),
+            func.extract("week", totals.c.date),
+            period,
+        ]
+    results = session.execute(
+        select(
+            period.label("period"),
+            func.sum(
+                case(
+                    (
+                        totals.c.type == TransactionType.SALE,
+                        totals.c.total
+                        + totals.c.tax_amount
+                        - totals.c.shipping_cost_amount,
+                    ),
+                    else_=0,
+                )
+            ).label("revenue"),
+            func.sum(
+                case(
+                    (
+                        totals.c.type == TransactionType.PURCHASE,
+                        totals.c.total
+                        + totals.c.tax_amount
+                        + totals.c.shipping_cost_amount,
+                    ),
+                    else_=0,
+                )
+            ).label("expenses"),
+            func.count(totals.c.id).label("transaction_count"),
+        )
+        .group_by(*group_by)
+        .order_by(period)
+    ).all()
+
+    def point(day, revenue=0.0, expenses=0.0, count=0):
+        return {
+            "date": day.isoformat(),
+            "revenue": revenue,
+            "expenses": expenses,
+            "net_profit": revenue - expenses,
+            "transaction_count": count,
+        }
+
+    existing = {
+        r.period: point(
+            r.period, float(r.revenue or 0), float(r.expenses or 0), r.transaction_count
+        )
+        for r in results
+    }
+    if (end_date - start_date).days > 730 or not existing:
+        return {"data_points": list(existing.values()), "currency": "USD"}
+
+    points = []
+    current = max(start_date, min(existing))
+    while current <= end_date:
+        if granularity == "weekly":
+            week_start = current - timedelta(days=current.weekday())
+            if not any(p["date"] == week_start.isoformat() for p in points):
+                points.append(existing.get(week_start) or point(week_start))
+            current += timedelta(days=7)
+        else:
+            points.append(existing.get(current) or point(current))
+            current += timedelta(days=1)
+    return {"data_points": sorted(points, key=lambda p: p["date"]), "currency": "USD"}
+
+
+def seed(session, args) -> uuid.UUID:
+    user_id = uuid.uuid4()
+    session.execute(
+        text("INSERT INTO users (id, email) VALUES (:id, :email)"),
+        {"id": user_id, "email": f"{user_id}@bench.local"},
+    )
+    session.execute(
+        text(
+            """
+            INSERT INTO transaction (id, date, type, currency,
+                                     shipping_cost_amount, tax_amount, user_id)
+            SELECT gen_random_uuid(), now() - random() * interval '1826 days',
+                   CASE WHEN random() < 0.6 THEN 'SALE' ELSE 'PURCHASE' END,
+                   'USD', round((random() * 5)::numeric, 2),
+                   round((random() * 3)::numeric, 2), :user_id
+            FROM generate_series(1, :transactions)
+            """
+        ),
+        {"user_id": user_id, "transactions": args.transactions},
+    )
+    session.execute(
+        text(
+            """
+            WITH skus AS (SELECT array_agg(id) AS ids FROM sku)
+            INSERT INTO line_item (id, sku_id, quantity, unit_price_amount,
+                                   transaction_id, user_id)
+            SELECT gen_random_uuid(),
+                   skus.ids[1 + (random() * (cardinality(skus.ids) - 1))::int],
+                   1 + (random() * 3)::int, round((1 + random() * 40)::numeric, 2),
+                   transaction.id, :user_id
+            FROM skus, transaction, generate_series(1, :line_items)
+            WHERE transaction.user_id = :user_id
+            """
+        ),
+        {"user_id": user_id, "line_items": args.line_items},
+    )
+    rebuild_daily_totals(session, user_id)
+    session.commit()
+    for table in ("transaction", "line_item", "transaction_daily_total"):
+        session.execute(text(f"ANALYZE {table}"))
+    return user_id
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--transactions", type=int, default=40_000)
+    parser.add_argument("--line-items", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    connection = engine.connect()
+    transaction = connection.begin()
+    try:
+        session = Session(bind=connection, join_transaction_mode="create_savepoint")
+        session.execute(text("SELECT setseed(0.5)"))
+        user_id = seed(session, args)
+        sku_id = session.execute(text("SELECT id FROM sku LIMIT 1")).scalar_one()
+        print(
+            f"{args.transactions} transactions x {args.line_items} line items over "
+            f"five years (rolled back afterwards)"
+        )
+
+        for label, days in (("all time", None), ("365 days", 365), ("30 days", 30)):
+            previous = previous_transaction_performance(session, days)["data_points"]
+            current = get_transaction_performance(session, user_id, days)["data_points"]
+            print(f"{label}: {len(previous)} points before, {len(current)} points now")
+            print(
+                time_call(
+                    f"  previous ({label})",
+                    lambda: previous_transaction_performance(session, days),
+                    args.repeat,
+                )
+            )
+            print(
+                time_call(
+                    f"  rollup + generate_series ({label})",
+                    lambda: get_transaction_performance(session, user_id, days),
+                    args.repeat,
+                )
+            )
+
+        def record_purchase():
+            create_transaction_with_line_items(
+                session,
+                TransactionData(
+                    date=datetime.now(UTC),
+                    type=TransactionType.PURCHASE,
+                    counterparty_name="Bench",
+                    currency="USD",
+                    shipping_cost_amount=Decimal("1.00"),
+                    tax_amount=Decimal("0.00"),
+                    user_id=user_id,
+                ),
+                [
+                    LineItemData(
+                        sku_id=sku_id,
+                        quantity=1,
+                        unit_price_amount=Decimal("2.00"),
+                        user_id=user_id,
+                    )
+                ],
+            )
+            session.commit()
+
+        print(
+            time_call(
+                "record a purchase (incl. daily totals refresh)",
+                record_purchase,
+                args.repeat,
+            )
+        )
+        started = time.perf_counter()
+        rebuild_daily_totals(session, user_id)
+        print(
+            TimingResult(
+                label="rebuild_daily_totals (account)",
+                samples_ms=[(time.perf_counter() - started) * 1000],
+            )
+        )
+    finally:
+        transaction.rollback()
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Benchmark ranked transaction search: the previous
+build_filtered_transactions_query (every transaction joined to its line items,
+products and sets, a tsvector built and ranked per joined row, then DISTINCT ON
+the transaction) versus the one matching and ranking the stored search
+documents through their GIN index.
+
+Seeds ``--transactions`` transactions of ``--line-items`` line items each, with
+counterparties drawn from ``--counterparties`` names, builds their search
+documents, and times a search for one counterparty, one product and a term
+every transaction matches. The plans of the selective searches are checked:
+they must be driven by ix_transaction_search_document and must not scan
+line_item. Everything is rolled back afterwards.
+
+Usage:
+    python benchmarks/bench_transaction_search.py [--transactions 200000]
+        [--line-items 2] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import desc, func, select, text  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from benchmarks.utils import time_call  # noqa: E402
+from core.dao.catalog import create_product_set_fts_vector  # noqa: E402
+from core.dao.transaction import (  # noqa: E402
+    TransactionFilterParams,
+    build_filtered_transactions_query,
+)
+from core.dao.transaction_search import (  # noqa: E402
+    rebuild_transaction_search,
+    transaction_search_query,
+)
+from core.database import engine  # noqa: E402
+from core.models.catalog import SKU, Product, Set  # noqa: E402
+from core.models.transaction import LineItem, Transaction  # noqa: E402
+
+
+def previous_filtered_transactions_query(search_query: str):
+    """The previous build_filtered_transactions_query, search filter only."""
+    base_from = (
+        Transaction.__table__.join(
+            LineItem.__table__, LineItem.transaction_id == Transaction.id
+        )
+        .join(SKU.__table__, SKU.id == LineItem.sku_id)
+        .join(Product.__table__, Product.id == SKU.product_id)
+        .join(Set.__table__, Set.id == Product.set_id)
+    )
+    counterparty_ts_vector = func.setweight(
+        func.to_tsvector("english", func.coalesce(Transaction.counterparty_name, "")),
+        "A",
+    )
+    combined_ts_vector = counterparty_ts_vector.op("||")(
+        create_product_set_fts_vector()
+    )
+    ts_query = transaction_search_query(search_query)
+    rank_expr = func.ts_rank(combined_ts_vector, ts_query).label("rank")
+    inner = (
+        select(Transaction.id.label("id"), Transaction.date.label("date"), rank_expr)
+        .select_from(base_from)
+        .where(combined_ts_vector.op("@@")(ts_query))
+        .order_by(
+            Transaction.id,
+            desc(rank_expr),
+            desc(Transaction.date),
+            desc(Transaction.id),
+        )
+        .distinct(Transaction.id)
+        .subquery()
+    )
+    return select(inner.c.id, inner.c.date, inner.c.rank).order_by(
+        desc(inner.c.rank), desc(inner.c.date), desc(inner.c.id)
+    )
+
+
+def new_filtered_transactions_query(session, search_query: str):
+    return build_filtered_transactions_query(
+        session, TransactionFilterParams(search_query=search_query)
+    )
+
+
+def explain(session, statement) -> str:
+    # Bound rather than literal parameters: to_tsquery's regconfig has no
+    # literal renderer
+    compiled = statement.compile(dialect=engine.dialect)
+    rows = session.connection().exec_driver_sql(f"EXPLAIN {compiled}", compiled.params)
+    return "\n".join(row[0] for row in rows)
+
+
+def seed(session, args) -> None:
+    user_id = session.execute(
+        text(
+            """
+            INSERT INTO users (id, email)
+            SELECT id, id || '@bench.local' FROM gen_random_uuid() AS id
+            RETURNING id
+            """
+        )
+    ).scalar_one()
+    session.execute(
+        text(
+            """
+            INSERT INTO transaction (id, date, type, counterparty_name, currency,
+                                     shipping_cost_amount, tax_amount, user_id)
+            SELECT gen_random_uuid(), now() - random() * interval '3 years',
+                   CASE WHEN random() < 0.5 THEN 'SALE' ELSE 'PURCHASE' END,
+                   'Trader' || lpad((random() * :counterparties)::int::text, 5, '0'),
+                   'USD', 0, 0, :user_id
+            FROM generate_series(1, :transactions)
+            """
+        ),
+        {
+            "user_id": user_id,
+            "transactions": args.transactions,
+            "counterparties": args.counterparties,
+        },
+    )
+    session.execute(
+        text(
+            """
+            WITH skus AS (SELECT array_agg(id) AS ids FROM sku)
+            INSERT INTO line_item (id, sku_id, quantity, unit_price_amount,
+                                   transaction_id, user_id)
+            SELECT gen_random_uuid(),
+                   skus.ids[1 + (random() * (cardinality(skus.ids) - 1))::int],
+                   1, round((1 + random() * 40)::numeric, 2),
+                   transaction.id, :user_id
+            FROM skus, transaction, generate_series(1, :line_items)
+            WHERE transaction.user_id = :user_id
+            """
+        ),
+        {"user_id": user_id, "line_items": args.line_items},
+    )
+    for table in ("transaction", "line_item"):
+        session.execute(text(f"ANALYZE {table}"))
+    rebuild_transaction_search(session)
+    session.commit()
+    session.execute(text("ANALYZE transaction_search"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--transactions", type=int, default=200_000)
+    parser.add_argument("--line-items", type=int, default=2)
+    parser.add_argument("--counterparties", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    connection = engine.connect()
+    transaction = connection.begin()
+    try:
+        session = Session(bind=connection, join_transaction_mode="create_savepoint")
+        session.execute(text("SELECT setseed(0.5)"))
+        seed(session, args)
+        counterparty, product = session.execute(
+            select(Transaction.counterparty_name, Product.name)
+            .join(LineItem, LineItem.transaction_id == Transaction.id)
+            .join(SKU, SKU.id == LineItem.sku_id)
+            .join(Product, Product.id == SKU.product_id)
+            .where(Transaction.counterparty_name.like("Trader%"))
+            .limit(1)
+        ).one()
+        print(
+            f"{args.transactions} transactions x {args.line_items} line items, "
+            f"{args.counterparties} counterparties (rolled back afterwards)"
+        )
+
+        searches = [
+            (f"counterparty {counterparty!r}", counterparty, True),
+            (f"product {product!r}", product, True),
+            ("every transaction 'trader'", "trader", False),
+        ]
+        for label, search_query, selective in searches:
+            previous = previous_filtered_transactions_query(search_query)
+            new = new_filtered_transactions_query(session, search_query)
+            previous_ids = [row.id for row in session.execute(previous)]
+            new_ids = [row.id for row in session.execute(new)]
+            print(f"{label}: {len(new_ids)} matches")
+            assert set(new_ids) == set(previous_ids), label
+
+            if selective:
+                plan = explain(session, new)
+                assert "ix_transaction_search_document" in plan, plan
+                assert "Seq Scan on line_item" not in plan, plan
+                assert "Seq Scan on transaction " not in plan, plan
+
+            print(
+                time_call(
+                    "  previous (join + DISTINCT ON)",
+                    lambda: session.execute(previous).all(),
+                    repeat=args.repeat,
+                )
+            )
+            print(
+                time_call(
+                    "  stored search documents",
+                    lambda: session.execute(new).all(),
+                    repeat=args.repeat,
+                )
+            )
+    finally:
+        transaction.rollback()
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
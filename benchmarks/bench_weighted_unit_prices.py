@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Benchmark creating ``--line-items``-line purchase orders with weighted unit
+prices, by SKU price source:
+
+- live: every SKU priced by one TCGPlayer request, as transaction creation did
+- latest: SKUs with a sku_latest_price under a day old use it; the rest are
+  fetched live in one batched call
+
+The pricing API is a stub answering after ``--latency`` seconds per request.
+``--fresh`` of the SKU pool has a fresh latest price, and the rest a two-day-old
+one. Each order prices its line items, then records the transaction and line
+items and commits, as POST /transactions does. Everything is rolled back
+afterwards.
+
+Usage:
+    python benchmarks/bench_weighted_unit_prices.py [--orders 20]
+        [--line-items 500] [--fresh 0.9] [--latency 0.3]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import UTC, datetime
+from decimal import Decimal
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from benchmarks.utils import TimingResult  # noqa: E402
+from core.dao.transaction import (  # noqa: E402
+    TransactionData,
+    create_transaction_with_line_items,
+)
+from core.database import engine  # noqa: E402
+from core.models.transaction import TransactionType  # noqa: E402
+from core.services.create_transaction import (  # noqa: E402
+    LineItemInput,
+    calculate_weighted_unit_prices,
+)
+from core.services.schemas.schema import (  # noqa: E402
+    SKUPricingResponseSchema,
+    SKUPricingSchema,
+)
+from core.services.sku_price_source import (  # noqa: E402
+    LatestSkuPriceSource,
+    LiveSkuPriceSource,
+)
+
+
+class StubCatalogService:
+    """Prices every SKU after ``latency`` seconds and counts requests."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.requests = 0
+        self.skus = 0
+
+    async def get_sku_prices(self, sku_ids: list[int]) -> SKUPricingResponseSchema:
+        self.requests += 1
+        self.skus += len(sku_ids)
+        await asyncio.sleep(self.latency)
+        return SKUPricingResponseSchema(
+            success=True,
+            errors=[],
+            results=[
+                SKUPricingSchema(
+                    sku_id=sku_id,
+                    low_price=None,
+                    lowest_shipping=Decimal("0"),
+                    lowest_listing_price=Decimal(sku_id % 5000 + 100) / 100,
+                    market_price=None,
+                    direct_low_price=None,
+                )
+                for sku_id in sku_ids
+            ],
+        )
+
+
+def seed(session, args) -> tuple[uuid.UUID, list[uuid.UUID]]:
+    user_id = uuid.uuid4()
+    session.execute(
+        text("INSERT INTO users (id, email) VALUES (:id, :email)"),
+        {"id": user_id, "email": f"{user_id}@bench.local"},
+    )
+    pool = list(
+        session.execute(
+            text("SELECT id FROM sku ORDER BY id LIMIT :pool"), {"pool": args.pool}
+        ).scalars()
+    )
+    session.execute(
+        text(
+            """
+            INSERT INTO sku_latest_price (sku_id, marketplace,
+                                          lowest_listing_price_total, updated_at)
+            SELECT id, 'tcgplayer', round((1 + random() * 40)::numeric, 2),
+                   CASE WHEN random() < :fresh THEN now()
+                        ELSE now() - interval '2 days' END
+            FROM unnest(CAST(:ids AS uuid[])) AS id
+            ON CONFLICT (sku_id, marketplace) DO UPDATE
+            SET lowest_listing_price_total = excluded.lowest_listing_price_total,
+                updated_at = excluded.updated_at
+            """
+        ),
+        {"ids": [str(sku_id) for sku_id in pool], "fresh": args.fresh},
+    )
+    session.commit()
+    return user_id, pool
+
+
+async def record_order(session, price_source, user_id, sku_ids) -> float:
+    """Record one order; returns the milliseconds spent pricing it."""
+    started = time.perf_counter()
+    line_items_data = await calculate_weighted_unit_prices(
+        session,
+        price_source,
+        [LineItemInput(sku_id=sku_id, quantity=1) for sku_id in sku_ids],
+        Decimal("1000.00"),
+        user_id,
+    )
+    pricing_ms = (time.perf_counter() - started) * 1000
+    create_transaction_with_line_items(
+        session,
+        TransactionData(
+            date=datetime.now(UTC),
+            type=TransactionType.PURCHASE,
+            counterparty_name="Bench",
+            currency="USD",
+            shipping_cost_amount=Decimal("0"),
+            tax_amount=Decimal("0"),
+            user_id=user_id,
+        ),
+        line_items_data,
+    )
+    session.commit()
+    return pricing_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=20)
+    parser.add_argument("--line-items", type=int, default=500)
+    parser.add_argument("--pool", type=int, default=2000)
+    parser.add_argument("--fresh", type=float, default=0.9)
+    parser.add_argument("--latency", type=float, default=0.3)
+    args = parser.parse_args()
+
+    print(
+        f"{args.orders} orders x {args.line_items} line items from {args.pool} SKUs, "
+        f"{args.fresh:.0%} with a fresh latest price; pricing API latency "
+        f"{args.latency * 1000:.0f}ms per request (rolled back afterwards)"
+    )
+    for label, make_source in (
+        ("live (one request for every SKU)", LiveSkuPriceSource),
+        ("latest price, stale SKUs live", LatestSkuPriceSource),
+    ):
+        catalog_service = StubCatalogService(args.latency)
+        price_source = make_source(catalog_service)
+        connection = engine.connect()
+        transaction = connection.begin()
+        try:
+            session = Session(bind=connection, join_transaction_mode="create_savepoint")
+            session.execute(text("SELECT setseed(0.5)"))
+            user_id, pool = seed(session, args)
+            rng = random.Random(0)
+
+            async def run() -> tuple[list[float], list[float]]:
+                pricing, total = [], []
+                for _ in range(args.orders):
+                    sku_ids = rng.sample(pool, args.line_items)
+                    started = time.perf_counter()
+                    pricing.append(
+                        await record_order(session, price_source, user_id, sku_ids)
+                    )
+                    total.append((time.perf_counter() - started) * 1000)
+                return pricing, total
+
+            pricing, total = asyncio.run(run())
+            print(label)
+            print(TimingResult(label="  pricing", samples_ms=pricing))
+            print(
+                TimingResult(
+                    label="  create (pricing + insert + commit)", samples_ms=total
+                )
+            )
+            print(
+                f"  {catalog_service.requests} pricing requests for "
+                f"{catalog_service.skus} SKUs; {price_source.stats.summary()}"
+            )
+        finally:
+            transaction.rollback()
+            connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Common helpers for benchmark scripts.
+
+DB-backed benchmarks seed their data inside a single transaction and roll it back
+when they finish, so they can be pointed at a development database safely.
+"""
+
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Callable, List
+
+
+@dataclass
+class TimingResult:
+    label: str
+    samples_ms: List[float]
+
+    @property
+    def median_ms(self) -> float:
+        return statistics.median(self.samples_ms)
+
+    @property
+    def p95_ms(self) -> float:
+        ordered = sorted(self.samples_ms)
+        return ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+
+    def __str__(self) -> str:
+        return (
+            f"{self.label:<48} median={self.median_ms:9.2f}ms "
+            f"p95={self.p95_ms:9.2f}ms n={len(self.samples_ms)}"
+        )
+
+
+def time_call(label: str, fn: Callable[[], object], repeat: int = 5) -> TimingResult:
+    """Run ``fn`` ``repeat`` times (after one warm-up call) and collect wall-clock timings."""
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return TimingResult(label=label, samples_ms=samples)
@@ -1,12 +1,14 @@
 import uuid
-from typing import List, TypedDict
+from enum import StrEnum
+from typing import List, Optional, Tuple, TypedDict
 from datetime import datetime
 from decimal import Decimal
 
+from sqlalchemy import select, func, tuple_
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import insert
 
-from core.models.decisions import BuyDecision, Decision
+from core.models.decisions import BuyDecision, CurrentBuyDecision, Decision
 
 
 class BuyDecisionData(TypedDict):
@@ -22,6 +24,14 @@ class BuyDecisionData(TypedDict):
     reason_codes: List[str]
 
 
+class BuyDecisionSortField(StrEnum):
+    """Columns of the current-decision projection that support keyset pagination."""
+
+    EXPECTED_RESALE_NET = "expected_resale_net"
+    EXPECTED_MARGIN = "expected_margin"
+    EXPECTED_PROFIT = "expected_profit"
+
+
 def insert_buy_decisions(
     session: Session, decisions: List[BuyDecisionData]
 ) -> List[BuyDecision]:
@@ -46,3 +56,120 @@ def insert_buy_decisions(
     session.flush()
 
     return inserted_decisions
+
+
+def upsert_current_buy_decisions(session: Session, decisions: List[BuyDecision]) -> int:
+    """
+    Point the current-decision projection at the given decisions.
+
+    Rows are only replaced when the incoming decision is at least as recent as
+    the one already projected, so out-of-order writers cannot regress a SKU.
+
+    Args:
+        session: Database session
+        decisions: Persisted BuyDecision records (e.g. from insert_buy_decisions)
+
+    Returns:
+        Number of projection rows inserted or updated
+    """
+    if not decisions:
+        return 0
+
+    # ON CONFLICT cannot touch the same row twice in one statement, keep the newest per SKU
+    latest_by_sku: dict[uuid.UUID, BuyDecision] = {}
+    for decision in decisions:
+        current = latest_by_sku.get(decision.sku_id)
+        if current is None or decision.created_at >= current.created_at:
+            latest_by_sku[decision.sku_id] = decision
+
+    values = []
+    for decision in latest_by_sku.values():
+        expected_margin = decision.expected_resale_net - decision.buy_vwap
+        values.append(
+            {
+                "sku_id": decision.sku_id,
+                "buy_decision_id": decision.id,
+                "decision": decision.decision,
+                "quantity": decision.quantity,
+                "buy_vwap": decision.buy_vwap,
+                "expected_resale_net": decision.expected_resale_net,
+                "expected_margin": expected_margin,
+                "expected_profit": expected_margin * decision.quantity,
+                "created_at": decision.created_at,
+            }
+        )
+
+    stmt = insert(CurrentBuyDecision).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["sku_id"],
+        set_={
+            "buy_decision_id": stmt.excluded.buy_decision_id,
+            "decision": stmt.excluded.decision,
+            "quantity": stmt.excluded.quantity,
+            "buy_vwap": stmt.excluded.buy_vwap,
+            "expected_resale_net": stmt.excluded.expected_resale_net,
+            "expected_margin": stmt.excluded.expected_margin,
+            "expected_profit": stmt.excluded.expected_profit,
+            "created_at": stmt.excluded.created_at,
+        },
+        where=CurrentBuyDecision.created_at <= stmt.excluded.created_at,
+    )
+
+    result = session.execute(stmt)
+    return result.rowcount
+
+
+def get_current_buy_decisions_page(
+    session: Session,
+    sort_by: BuyDecisionSortField,
+    limit: int,
+    after: Optional[Tuple[Decimal, uuid.UUID]] = None,
+    load_options: Optional[list] = None,
+) -> List[Tuple[BuyDecision, Decimal]]:
+    """
+    Fetch one page of current BUY decisions ordered by ``sort_by`` descending.
+
+    Uses keyset pagination on (sort value, sku_id) so each page is an index
+    range scan on the projection regardless of how deep the caller has paged.
+
+    Args:
+        session: Database session
+        sort_by: Projection column to order by (highest first)
+        limit: Maximum number of rows to return
+        after: (sort value, sku_id) of the last row of the previous page
+        load_options: Loader options applied to the BuyDecision entities
+
+    Returns:
+        List of (BuyDecision, sort value) tuples in page order
+    """
+    sort_column = getattr(CurrentBuyDecision, sort_by.value)
+
+    query = (
+        select(BuyDecision, sort_column)
+        .join(
+            CurrentBuyDecision,
+            CurrentBuyDecision.buy_decision_id == BuyDecision.id,
+        )
+        .where(CurrentBuyDecision.decision == Decision.BUY)
+        .order_by(sort_column.desc(), CurrentBuyDecision.sku_id.desc())
+        .limit(limit)
+    )
+
+    if after is not None:
+        query = query.where(
+            tuple_(sort_column, CurrentBuyDecision.sku_id) < tuple_(*after)
+        )
+
+    if load_options:
+        query = query.options(*load_options)
+
+    return [(row[0], row[1]) for row in session.execute(query).all()]
+
+
+def count_current_buy_decisions(session: Session) -> int:
+    """Count SKUs whose current decision is BUY."""
+    return session.scalar(
+        select(func.count())
+        .select_from(CurrentBuyDecision)
+        .where(CurrentBuyDecision.decision == Decision.BUY)
+    )
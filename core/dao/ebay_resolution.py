@@ -0,0 +1,172 @@
+from datetime import datetime
+from typing import Dict, List, Optional, TypedDict
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+
+from core.models.ebay_resolution import (
+    EbayEpidResolution,
+    EbayItemValidation,
+    EbaySearchResult,
+    EpidResolutionStatus,
+)
+
+
+class EpidResolutionData(TypedDict):
+    """Type definition for rows written by upsert_epid_resolution."""
+
+    resolution_key: str
+    status: EpidResolutionStatus
+    epid: Optional[str]
+    api_calls: int
+    resolved_at: datetime
+
+
+class ItemValidationData(TypedDict):
+    """Type definition for rows written by upsert_item_validation."""
+
+    item_id: str
+    card_number: Optional[str]
+    finish: Optional[str]
+    features: Optional[str]
+    language: Optional[str]
+    source: Optional[str]
+    fetched_at: datetime
+
+
+def get_epid_resolution(
+    session: Session, resolution_key: str
+) -> Optional[EbayEpidResolution]:
+    """
+    Load the stored resolution outcome for a product search input.
+
+    Args:
+        session: Database session
+        resolution_key: Key derived from the product search input
+
+    Returns:
+        The stored EbayEpidResolution, or None if the product was never resolved
+    """
+    return session.get(EbayEpidResolution, resolution_key)
+
+
+def upsert_epid_resolution(session: Session, resolution: EpidResolutionData) -> None:
+    """
+    Insert or replace a resolution outcome, counting repeated attempts.
+
+    Args:
+        session: Database session
+        resolution: EpidResolutionData for the product
+    """
+    stmt = insert(EbayEpidResolution).values(**resolution, attempts=1)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[EbayEpidResolution.resolution_key],
+        set_={
+            "status": stmt.excluded.status,
+            "epid": stmt.excluded.epid,
+            "api_calls": stmt.excluded.api_calls,
+            "resolved_at": stmt.excluded.resolved_at,
+            "attempts": EbayEpidResolution.attempts + 1,
+        },
+    )
+    session.execute(stmt)
+
+
+def get_search_result(
+    session: Session, query: str, aspect_filter: str, fetched_after: datetime
+) -> Optional[List[list]]:
+    """
+    Load stored search results that are newer than fetched_after.
+
+    Args:
+        session: Database session
+        query: Browse search query string
+        aspect_filter: Aspect filter used for the search ("" for none)
+        fetched_after: Oldest acceptable fetch time
+
+    Returns:
+        [[epid, [item_id, ...]], ...] pairs, or None if missing or stale
+    """
+    return session.scalar(
+        select(EbaySearchResult.epid_item_ids).where(
+            EbaySearchResult.query == query,
+            EbaySearchResult.aspect_filter == aspect_filter,
+            EbaySearchResult.fetched_at > fetched_after,
+        )
+    )
+
+
+def upsert_search_result(
+    session: Session,
+    query: str,
+    aspect_filter: str,
+    epid_item_ids: List[list],
+    fetched_at: datetime,
+) -> None:
+    """
+    Insert or replace the stored results of a browse search.
+
+    Args:
+        session: Database session
+        query: Browse search query string
+        aspect_filter: Aspect filter used for the search ("" for none)
+        epid_item_ids: [[epid, [item_id, ...]], ...] pairs in search order
+        fetched_at: When the search ran
+    """
+    stmt = insert(EbaySearchResult).values(
+        query=query,
+        aspect_filter=aspect_filter,
+        epid_item_ids=epid_item_ids,
+        fetched_at=fetched_at,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[EbaySearchResult.query, EbaySearchResult.aspect_filter],
+        set_={
+            "epid_item_ids": stmt.excluded.epid_item_ids,
+            "fetched_at": stmt.excluded.fetched_at,
+        },
+    )
+    session.execute(stmt)
+
+
+def get_item_validations(
+    session: Session, item_ids: List[str]
+) -> Dict[str, EbayItemValidation]:
+    """
+    Bulk load stored item validation aspects.
+
+    Args:
+        session: Database session
+        item_ids: eBay item ids to look up
+
+    Returns:
+        Dictionary mapping item_id to EbayItemValidation for the items that are stored
+    """
+    if not item_ids:
+        return {}
+
+    rows = session.scalars(
+        select(EbayItemValidation).where(EbayItemValidation.item_id.in_(item_ids))
+    ).all()
+    return {row.item_id: row for row in rows}
+
+
+def upsert_item_validation(session: Session, validation: ItemValidationData) -> None:
+    """
+    Insert or replace the validation aspects extracted for one item.
+
+    Args:
+        session: Database session
+        validation: ItemValidationData for the item
+    """
+    stmt = insert(EbayItemValidation).values(**validation)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[EbayItemValidation.item_id],
+        set_={
+            column: stmt.excluded[column]
+            for column in validation
+            if column != "item_id"
+        },
+    )
+    session.execute(stmt)
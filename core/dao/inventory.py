@@ -1,36 +1,33 @@
-from sqlalchemy import func, select, Select, CTE
+from sqlalchemy import func, select, true, Select, CTE
 from typing import Optional, TypedDict
 from decimal import Decimal
 from uuid import UUID
 
 from core.models.catalog import SKU, Catalog, Set, Product, Condition, Printing
-from core.models.transaction import Transaction, LineItem
-from core.dao.price import latest_price_subquery, price_24h_ago_subquery
+from core.models.inventory_holding import InventoryHolding
+from core.dao.price import latest_price_subquery, price_24h_ago_lateral
 from core.dao.catalog import create_product_set_fts_vector, create_ts_query
 
 
 def get_sku_cost_quantity_cte(user_id: UUID) -> CTE:
-    total_quantity = func.sum(
-        LineItem.remaining_quantity,
-    ).label("total_quantity")
-
-    total_cost = func.sum(
-        LineItem.unit_price_amount * LineItem.remaining_quantity,
-    ).label("total_cost")
-
+    """Per-SKU quantity and cost basis of a user's holdings, from the ledger."""
     return (
         select(
-            LineItem.sku_id,
-            total_quantity,
-            total_cost,
-        )
-        .join(Transaction)
-        .where(LineItem.user_id == user_id)
-        .group_by(LineItem.sku_id)
-        .having(total_quantity > 0)
+            InventoryHolding.sku_id,
+            InventoryHolding.quantity.label("total_quantity"),
+            InventoryHolding.total_cost.label("total_cost"),
+        ).where(InventoryHolding.user_id == user_id)
     ).cte()
 
 
+def inventory_sku_ids_select() -> Select:
+    """Select the IDs of SKUs any user currently holds, as a single statement.
+
+    Equivalent to the union of `query_inventory_items` over every user.
+    """
+    return select(InventoryHolding.sku_id).distinct()
+
+
 # Added type alias definition
 class InventoryQueryResultRow(TypedDict):
     sku: SKU
@@ -98,7 +95,8 @@ def build_inventory_query(
 
     # Add latest price data join
     latest_price = latest_price_subquery()
-    price_24h_ago = price_24h_ago_subquery()
+    # Correlated per SKU so only the user's holdings are looked up
+    price_24h_ago = price_24h_ago_lateral(SKU.id)
 
     inventory_query = (
         inventory_query.add_columns(
@@ -106,7 +104,7 @@ def build_inventory_query(
             price_24h_ago.c.lowest_listing_price_total.label("price_24h_ago"),
         )
         .outerjoin(latest_price, SKU.id == latest_price.c.sku_id)
-        .outerjoin(price_24h_ago, SKU.id == price_24h_ago.c.sku_id)
+        .outerjoin(price_24h_ago, true())
     )
 
     # Map model -> join condition, mirroring the original logic
@@ -0,0 +1,192 @@
+"""
+Data access for the inventory holdings ledger (see `InventoryHolding`).
+
+`refresh_holdings` recomputes the ledger rows of the (user, SKU) pairs a write
+touched, from those pairs' line items only, so keeping the ledger current
+costs in proportion to the write rather than to the user's history. It holds
+the users' write lock (see `core.dao.user_lock`), so concurrent writers to one
+user recompute one after the other.
+`recompute_holdings_select` is the full recomputation that the ledger must
+always equal; `diff_holdings` and `rebuild_holdings` compare against it.
+"""
+
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import (
+    Connection,
+    Select,
+    and_,
+    bindparam,
+    delete,
+    func,
+    select,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert
+from sqlalchemy.orm import Session
+
+from core.dao.user_lock import lock_users
+from core.models.inventory_holding import InventoryHolding
+from core.models.transaction import LineItem
+
+_UUIDS = ARRAY(PG_UUID(as_uuid=True))
+
+
+def recompute_holdings_select(user_id: Optional[UUID] = None) -> Select:
+    """Holdings computed from every line item (of one user, if given)."""
+    quantity = func.sum(LineItem.remaining_quantity)
+    stmt = (
+        select(
+            LineItem.user_id,
+            LineItem.sku_id,
+            quantity.label("quantity"),
+            func.sum(LineItem.unit_price_amount * LineItem.remaining_quantity).label(
+                "total_cost"
+            ),
+        )
+        .group_by(LineItem.user_id, LineItem.sku_id)
+        .having(quantity > 0)
+    )
+    if user_id is not None:
+        stmt = stmt.where(LineItem.user_id == user_id)
+    return stmt
+
+
+def _upsert_holdings(holdings: Select):
+    stmt = insert(InventoryHolding).from_select(
+        ["user_id", "sku_id", "quantity", "total_cost"], holdings
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[InventoryHolding.user_id, InventoryHolding.sku_id],
+        set_={
+            "quantity": stmt.excluded.quantity,
+            "total_cost": stmt.excluded.total_cost,
+            "updated_at": func.now(),
+        },
+        # Rewriting an unchanged row would only churn updated_at
+        where=tuple_(InventoryHolding.quantity, InventoryHolding.total_cost)
+        != tuple_(stmt.excluded.quantity, stmt.excluded.total_cost),
+    )
+
+
+def refresh_holdings(
+    connection: Session | Connection, pairs: Iterable[tuple[UUID, UUID]]
+) -> None:
+    """
+    Recompute the ledger rows of (user_id, sku_id) ``pairs`` from their line items.
+
+    Runs in the caller's transaction, which holds the users' write lock from
+    here on; pairs left without a positive quantity lose their row.
+    """
+    # Sorted so concurrent refreshes lock the rows in the same order
+    rows = sorted(set(pairs))
+    if not rows:
+        return
+    lock_users(connection, (user_id for user_id, _ in rows))
+    # Two array parameters however many pairs a bulk write touched
+    touched = (
+        func.unnest(
+            bindparam("user_ids", value=[user_id for user_id, _ in rows], type_=_UUIDS),
+            bindparam("sku_ids", value=[sku_id for _, sku_id in rows], type_=_UUIDS),
+        )
+        .table_valued("user_id", "sku_id")
+        .render_derived(name="touched")
+    )
+    connection.execute(
+        _upsert_holdings(
+            recompute_holdings_select()
+            .join(
+                touched,
+                and_(
+                    LineItem.user_id == touched.c.user_id,
+                    LineItem.sku_id == touched.c.sku_id,
+                ),
+            )
+            .order_by(LineItem.user_id, LineItem.sku_id)
+        )
+    )
+    # Sold out or deleted: no positive quantity left to upsert
+    held = (
+        select(func.sum(LineItem.remaining_quantity))
+        .where(
+            LineItem.user_id == InventoryHolding.user_id,
+            LineItem.sku_id == InventoryHolding.sku_id,
+        )
+        .scalar_subquery()
+    )
+    connection.execute(
+        delete(InventoryHolding).where(
+            InventoryHolding.user_id == touched.c.user_id,
+            InventoryHolding.sku_id == touched.c.sku_id,
+            func.coalesce(held, 0) <= 0,
+        )
+    )
+
+
+@dataclass
+class HoldingDiff:
+    """A (user, SKU) pair where the ledger and the line items disagree."""
+
+    user_id: UUID
+    sku_id: UUID
+    ledger_quantity: Optional[int]
+    ledger_total_cost: Optional[Decimal]
+    quantity: Optional[int]
+    total_cost: Optional[Decimal]
+
+
+def diff_holdings(
+    session: Session, user_id: Optional[UUID] = None
+) -> list[HoldingDiff]:
+    """Ledger rows that differ from a full recomputation (for one user, if given)."""
+    expected = recompute_holdings_select(user_id).subquery("expected")
+    ledger = select(InventoryHolding)
+    if user_id is not None:
+        ledger = ledger.where(InventoryHolding.user_id == user_id)
+    ledger = ledger.subquery("ledger")
+    rows = session.execute(
+        select(
+            func.coalesce(ledger.c.user_id, expected.c.user_id),
+            func.coalesce(ledger.c.sku_id, expected.c.sku_id),
+            ledger.c.quantity,
+            ledger.c.total_cost,
+            expected.c.quantity,
+            expected.c.total_cost,
+        )
+        .select_from(ledger)
+        .join(
+            expected,
+            and_(
+                ledger.c.user_id == expected.c.user_id,
+                ledger.c.sku_id == expected.c.sku_id,
+            ),
+            full=True,
+        )
+        .where(
+            tuple_(ledger.c.quantity, ledger.c.total_cost).is_distinct_from(
+                tuple_(expected.c.quantity, expected.c.total_cost)
+            )
+        )
+    ).all()
+    return [HoldingDiff(*row) for row in rows]
+
+
+def rebuild_holdings(session: Session, user_id: Optional[UUID] = None) -> int:
+    """
+    Replace the ledger (for one user, if given) with a full recomputation.
+
+    Runs in the caller's transaction.
+
+    Returns:
+        Number of ledger rows written
+    """
+    stale = delete(InventoryHolding)
+    if user_id is not None:
+        stale = stale.where(InventoryHolding.user_id == user_id)
+    session.execute(stale)
+    return session.execute(
+        _upsert_holdings(recompute_holdings_select(user_id))
+    ).rowcount
@@ -0,0 +1,42 @@
+"""
+Data access for the per-user inventory version (see `InventoryVersion`).
+
+Everything that can change a user's inventory valuation moves the version in
+its own transaction: line item writes through the ORM (see the flush hook in
+`core.dao.transaction`) and latest price writes for SKUs the user holds.
+"""
+
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import Connection, select
+from sqlalchemy.orm import Session
+
+from core.dao.user_version import bump_user_versions, get_user_version
+from core.models.inventory_holding import InventoryHolding
+from core.models.inventory_version import InventoryVersion
+
+
+def get_inventory_version(session: Session, user_id: UUID) -> int:
+    """Current inventory version of a user (0 if it never moved)."""
+    return get_user_version(session, InventoryVersion, user_id)
+
+
+def bump_inventory_versions(
+    connection: Session | Connection, user_ids: Iterable[UUID]
+) -> None:
+    """Move the inventory version of ``user_ids``, in the caller's transaction."""
+    bump_user_versions(connection, InventoryVersion, user_ids)
+
+
+def bump_inventory_versions_for_skus(session: Session, sku_ids: list[UUID]) -> None:
+    """Move the inventory version of every user holding any of ``sku_ids``."""
+    if not sku_ids:
+        return
+    holders = (
+        select(InventoryHolding.user_id)
+        .where(InventoryHolding.sku_id.in_(sku_ids))
+        .distinct()
+        .order_by(InventoryHolding.user_id)
+    )
+    bump_user_versions(session, InventoryVersion, holders)
@@ -1,12 +1,13 @@
-from datetime import datetime
+from datetime import UTC, datetime
 from typing import Sequence, TypedDict
 import uuid
 
-from sqlalchemy import select
+from sqlalchemy import func, literal, select, true
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
-from core.models.price import SKULatestPrice, Marketplace
+from core.dao.inventory_version import bump_inventory_versions_for_skus
+from core.models.price import SKULatestPrice, SKUPriceDataSnapshot, Marketplace
 
 
 class LatestPriceRecord(TypedDict):
@@ -24,6 +25,9 @@ def upsert_latest_prices(
     """
     Upsert price records into sku_latest_price.
 
+    Also moves the inventory version of every user holding one of the SKUs, in
+    the same transaction.
+
     Parameters
     ----------
     session : Session
@@ -51,11 +55,120 @@ def upsert_latest_prices(
     )
 
     result = session.execute(upsert_stmt)
+    bump_inventory_versions_for_skus(
+        session, [record["sku_id"] for record in price_records]
+    )
     session.commit()
 
     return result.rowcount
 
 
+def write_latest_prices(
+    session: Session,
+    price_records: Sequence[LatestPriceRecord],
+    marketplace: Marketplace,
+    write_snapshots: bool = False,
+    snapshot_dt: datetime | None = None,
+) -> tuple[int, int]:
+    """
+    Upsert price records into sku_latest_price and, optionally, snapshot changes.
+
+    Unlike `upsert_latest_prices` followed by `insert_price_snapshots_if_changed`,
+    this is a single statement: the upsert runs as a data-modifying CTE, and its
+    RETURNING rows are compared against each SKU's most recent snapshot (one
+    probe of ix_sku_price_snapshot_covering per SKU) to insert the snapshots
+    whose price changed. ``updated_at`` is set on every upserted row. A second
+    statement moves the inventory version of every user holding one of the SKUs,
+    in the same transaction.
+
+    Parameters
+    ----------
+    session : Session
+        Active SQLAlchemy session.
+    price_records : Sequence[LatestPriceRecord]
+        Latest price records to write, at most one per SKU.
+    marketplace : Marketplace
+        Marketplace the records and snapshots belong to.
+    write_snapshots : bool
+        If True, also insert a snapshot for each SKU whose price changed.
+    snapshot_dt : datetime | None
+        Timestamp for the snapshots (defaults to now, UTC).
+
+    Returns
+    -------
+    tuple[int, int]
+        Latest price rows upserted, snapshot rows inserted.
+    """
+    if not price_records:
+        return 0, 0
+
+    stmt = insert(SKULatestPrice).values(price_records)
+    upsert_stmt = stmt.on_conflict_do_update(
+        index_elements=["sku_id", "marketplace"],
+        set_={
+            "lowest_listing_price_total": stmt.excluded.lowest_listing_price_total,
+            "updated_at": func.now(),
+        },
+    )
+
+    sku_ids = [record["sku_id"] for record in price_records]
+    if not write_snapshots:
+        result = session.execute(upsert_stmt)
+        bump_inventory_versions_for_skus(session, sku_ids)
+        session.commit()
+        return result.rowcount, 0
+
+    upserted = upsert_stmt.returning(
+        SKULatestPrice.sku_id, SKULatestPrice.lowest_listing_price_total
+    ).cte("upserted")
+    previous = (
+        select(SKUPriceDataSnapshot.lowest_listing_price_total)
+        .where(SKUPriceDataSnapshot.sku_id == upserted.c.sku_id)
+        .where(SKUPriceDataSnapshot.marketplace == marketplace)
+        .order_by(SKUPriceDataSnapshot.snapshot_datetime.desc())
+        .limit(1)
+        .lateral("previous")
+    )
+    changed = (
+        select(
+            upserted.c.sku_id,
+            literal(marketplace, SKUPriceDataSnapshot.marketplace.type),
+            literal(
+                snapshot_dt or datetime.now(UTC),
+                SKUPriceDataSnapshot.snapshot_datetime.type,
+            ),
+            upserted.c.lowest_listing_price_total,
+        )
+        .select_from(upserted)
+        .outerjoin(previous, true())
+        .where(
+            previous.c.lowest_listing_price_total.is_distinct_from(
+                upserted.c.lowest_listing_price_total
+            )
+        )
+    )
+    snapshot_stmt = (
+        insert(SKUPriceDataSnapshot)
+        .from_select(
+            [
+                SKUPriceDataSnapshot.sku_id,
+                SKUPriceDataSnapshot.marketplace,
+                SKUPriceDataSnapshot.snapshot_datetime,
+                SKUPriceDataSnapshot.lowest_listing_price_total,
+            ],
+            changed,
+        )
+        .add_cte(upserted)
+    )
+
+    result = session.execute(snapshot_stmt)
+    bump_inventory_versions_for_skus(session, sku_ids)
+    session.commit()
+
+    # Every record is either inserted or updated by the upsert
+    return len(price_records), result.rowcount
+
+
 def get_today_updated_sku_ids(
     session: Session, marketplace: Marketplace, cutoff_datetime: datetime
 ) -> list[uuid.UUID]:
@@ -1,89 +1,159 @@
 """
 Data access layer for market indicator SKUs.
 
-Provides functions to query SKUs that serve as market indicators based on
-condition, language, and product type criteria.
+Market indicator and booster pack membership is materialized in the
+market_indicator_sku table by `refresh_market_indicator_skus`, which runs after
+catalog ingest. The getters and selects below read that table through its
+indexes rather than re-evaluating the condition, language and product name
+criteria.
 """
 
 import uuid
 from typing import List
 
-from sqlalchemy import select
+from sqlalchemy import Select, and_, case, delete, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
-from core.models.catalog import Catalog, Condition, Language, Product, SKU, Set
+from core.models.catalog import Condition, Language, Product, SKU
+from core.models.market_indicators import (
+    MarketIndicatorClassification,
+    MarketIndicatorSKU,
+)
 from core.services.schemas.schema import ProductType
 
 
-def get_market_indicator_sku_ids(session: Session) -> List[uuid.UUID]:
+def classify_market_indicator_skus_select() -> Select:
     """
-    Get internal SKU IDs for market indicator SKUs.
+    Evaluate market indicator and booster pack membership against the catalog.
 
     Market indicators include:
     - Cards: NM/LP condition, English language
     - Sealed products: Unopened condition
 
+    Booster packs are sealed products whose name contains "Booster Pack", in
+    any condition.
+
+    Returns:
+        Select of (sku_id, classification, is_market_indicator), one row per
+        member SKU
+    """
+    is_card_indicator = and_(
+        Product.product_type == ProductType.CARDS,
+        Condition.abbreviation.in_(["NM", "LP"]),
+        Language.abbreviation == "EN",
+    )
+    is_sealed_indicator = and_(
+        Product.product_type == ProductType.SEALED,
+        Condition.abbreviation == "U",
+    )
+    is_booster_pack = and_(
+        Product.product_type == ProductType.SEALED,
+        Product.name.ilike("%Booster Pack%"),
+    )
+
+    return (
+        select(
+            SKU.id.label("sku_id"),
+            case(
+                (is_booster_pack, MarketIndicatorClassification.BOOSTER_PACK.value),
+                (
+                    Product.product_type == ProductType.CARDS,
+                    MarketIndicatorClassification.CARD.value,
+                ),
+                else_=MarketIndicatorClassification.SEALED.value,
+            ).label("classification"),
+            or_(is_card_indicator, is_sealed_indicator).label("is_market_indicator"),
+        )
+        .join(Product, SKU.product_id == Product.id)
+        .join(Condition, SKU.condition_id == Condition.id)
+        .join(Language, SKU.language_id == Language.id)
+        .where(or_(is_card_indicator, is_sealed_indicator, is_booster_pack))
+    )
+
+
+def refresh_market_indicator_skus(session: Session) -> tuple[int, int]:
+    """
+    Bring market_indicator_sku in line with the catalog.
+
+    Upserts current members, touching only rows whose classification changed,
+    and deletes SKUs that no longer qualify. Runs in the caller's transaction.
+
     Args:
         session: Active SQLAlchemy session
 
     Returns:
-        List of internal SKU IDs
+        Tuple of (rows inserted or updated, rows deleted)
     """
-    # Get condition and language UUIDs
-    nm_condition_uuid = session.execute(
-        select(Condition.id).where(Condition.abbreviation == "NM")
-    ).scalar_one()
+    stmt = insert(MarketIndicatorSKU).from_select(
+        ["sku_id", "classification", "is_market_indicator"],
+        classify_market_indicator_skus_select(),
+    )
+    upserted = session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[MarketIndicatorSKU.sku_id],
+            set_={
+                "classification": stmt.excluded.classification,
+                "is_market_indicator": stmt.excluded.is_market_indicator,
+                "refreshed_at": func.now(),
+            },
+            where=or_(
+                MarketIndicatorSKU.classification != stmt.excluded.classification,
+                MarketIndicatorSKU.is_market_indicator
+                != stmt.excluded.is_market_indicator,
+            ),
+        )
+    ).rowcount
 
-    lp_condition_uuid = session.execute(
-        select(Condition.id).where(Condition.abbreviation == "LP")
-    ).scalar_one()
+    deleted = session.execute(
+        delete(MarketIndicatorSKU).where(
+            MarketIndicatorSKU.sku_id.not_in(
+                classify_market_indicator_skus_select().with_only_columns(SKU.id)
+            )
+        )
+    ).rowcount
 
-    unopened_condition_uuid = session.execute(
-        select(Condition.id).where(Condition.abbreviation == "U")
-    ).scalar_one()
+    return upserted, deleted
 
-    english_language_uuid = session.execute(
-        select(Language.id).where(Language.abbreviation == "EN")
-    ).scalar_one()
 
-    catalog_ids = session.execute(select(Catalog.id).distinct()).scalars().all()
+def market_indicator_sku_ids_select() -> Select:
+    """
+    Select internal SKU IDs for market indicator SKUs.
 
-    # Query card SKUs (NM/LP English)
-    card_skus_stmt = (
-        select(SKU.id, SKU.product_id)
-        .join(Product, SKU.product_id == Product.id)
-        .join(Set, Product.set_id == Set.id)
-        .where(
-            Product.product_type == ProductType.CARDS,
-            Set.catalog_id.in_(catalog_ids),
-            SKU.condition_id.in_([nm_condition_uuid, lp_condition_uuid]),
-            SKU.language_id == english_language_uuid,
-        )
+    Reads market_indicator_sku (partial index ix_market_indicator_sku_indicator),
+    and can be embedded in a larger set-based query.
+
+    Returns:
+        Select of sku_id
+    """
+    return select(MarketIndicatorSKU.sku_id).where(
+        MarketIndicatorSKU.is_market_indicator
     )
 
-    # Query sealed product SKUs (Unopened)
-    sealed_skus_stmt = (
-        select(SKU.id, SKU.product_id)
-        .join(Product, SKU.product_id == Product.id)
-        .join(Set, Product.set_id == Set.id)
-        .where(
-            Product.product_type == ProductType.SEALED,
-            Set.catalog_id.in_(catalog_ids),
-            SKU.condition_id == unopened_condition_uuid,
-        )
+
+def booster_pack_sku_ids_select() -> Select:
+    """
+    Select internal SKU IDs for all sealed booster pack SKUs.
+
+    Returns:
+        Select of sku_id
+    """
+    return select(MarketIndicatorSKU.sku_id).where(
+        MarketIndicatorSKU.classification == MarketIndicatorClassification.BOOSTER_PACK
     )
 
-    card_results = session.execute(card_skus_stmt).all()
-    sealed_results = session.execute(sealed_skus_stmt).all()
 
-    # Extract SKU IDs
-    card_sku_ids = [row.id for row in card_results]
-    sealed_sku_ids = [row.id for row in sealed_results]
+def get_market_indicator_sku_ids(session: Session) -> List[uuid.UUID]:
+    """
+    Get internal SKU IDs for market indicator SKUs.
 
-    # Combine and deduplicate
-    combined_sku_ids = list(set(card_sku_ids + sealed_sku_ids))
+    Args:
+        session: Active SQLAlchemy session
 
-    return combined_sku_ids
+    Returns:
+        List of internal SKU IDs
+    """
+    return list(session.execute(market_indicator_sku_ids_select()).scalars())
 
 
 def get_market_indicator_sku_tcgplayer_ids(session: Session) -> List[int]:
@@ -98,21 +168,11 @@ def get_market_indicator_sku_tcgplayer_ids(session: Session) -> List[int]:
     Returns:
         List of TCGPlayer IDs
     """
-    internal_sku_ids = get_market_indicator_sku_ids(session)
-
-    if not internal_sku_ids:
-        return []
-
-    # Map internal IDs to TCGPlayer IDs
-    tcgplayer_ids = (
-        session.execute(
-            select(SKU.tcgplayer_id).where(
-                SKU.id.in_(internal_sku_ids), SKU.tcgplayer_id.isnot(None)
-            )
-        )
-        .scalars()
-        .all()
-    )
+    tcgplayer_ids = session.execute(
+        select(SKU.tcgplayer_id)
+        .join(MarketIndicatorSKU, MarketIndicatorSKU.sku_id == SKU.id)
+        .where(MarketIndicatorSKU.is_market_indicator, SKU.tcgplayer_id.isnot(None))
+    ).scalars()
 
     return list(tcgplayer_ids)
 
@@ -129,18 +189,14 @@ def get_booster_pack_tcgplayer_ids(session: Session) -> List[int]:
     Returns:
         List of TCGPlayer IDs for booster pack SKUs
     """
-    booster_pack_tcg_ids = (
-        session.execute(
-            select(SKU.tcgplayer_id)
-            .join(Product, SKU.product_id == Product.id)
-            .where(
-                Product.product_type == ProductType.SEALED,
-                Product.name.ilike("%Booster Pack%"),
-                SKU.tcgplayer_id.isnot(None),
-            )
+    booster_pack_tcg_ids = session.execute(
+        select(SKU.tcgplayer_id)
+        .join(MarketIndicatorSKU, MarketIndicatorSKU.sku_id == SKU.id)
+        .where(
+            MarketIndicatorSKU.classification
+            == MarketIndicatorClassification.BOOSTER_PACK,
+            SKU.tcgplayer_id.isnot(None),
         )
-        .scalars()
-        .all()
-    )
+    ).scalars()
 
     return list(booster_pack_tcg_ids)
@@ -4,10 +4,29 @@ import uuid
 from uuid import UUID
 from dataclasses import dataclass
 
-from sqlalchemy import select, insert, func
+from sqlalchemy import (
+    Integer,
+    select,
+    insert,
+    func,
+    cast,
+    column,
+    literal,
+    true,
+    union_all,
+    values,
+    ColumnElement,
+    Lateral,
+)
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Session
 
-from core.models.price import SKUPriceDataSnapshot, SKULatestPrice, Marketplace
+from core.models.price import (
+    SKUPriceDataSnapshot,
+    SKULatestPrice,
+    Marketplace,
+    PriceHistoryResolution,
+)
 
 
 def latest_price_subquery():
@@ -135,6 +154,35 @@ def price_24h_ago_subquery():
     )
 
 
+def price_24h_ago_lateral(sku_id_column: ColumnElement[UUID]) -> Lateral:
+    """
+    Returns a LATERAL subquery with the price snapshot from 24 hours ago for one SKU.
+
+    Unlike `price_24h_ago_subquery`, the lookup is correlated to `sku_id_column`, so
+    it only touches the SKUs in the caller's result set. Each outer row is resolved
+    with a single probe of `ix_sku_price_snapshot_covering`. Join it with
+    `outerjoin(lateral, true())`.
+
+    Args:
+        sku_id_column: The outer query's SKU id column to correlate against
+
+    Returns:
+        A SQLAlchemy lateral subquery containing:
+        - lowest_listing_price_total: The price from the most recent snapshot 24 hours ago
+    """
+    twenty_four_hours_ago = datetime.now(UTC) - timedelta(hours=24)
+
+    return (
+        select(SKUPriceDataSnapshot.lowest_listing_price_total)
+        .where(SKUPriceDataSnapshot.sku_id == sku_id_column)
+        .where(SKUPriceDataSnapshot.marketplace == Marketplace.TCGPLAYER)
+        .where(SKUPriceDataSnapshot.snapshot_datetime <= twenty_four_hours_ago)
+        .order_by(SKUPriceDataSnapshot.snapshot_datetime.desc())
+        .limit(1)
+        .lateral("price_24h_ago")
+    )
+
+
 def date_to_datetime_utc(d: Union[date, datetime]) -> datetime:
     """Convert a date to a UTC datetime at midnight."""
     if isinstance(d, datetime):
@@ -493,3 +541,154 @@ def fetch_bulk_sku_price_histories(
         result[sku_id] = price_data
 
     return result
+
+
+@dataclass
+class PriceHistoryColumns:
+    """Price histories for many SKUs on a shared timestamp axis."""
+
+    resolution: PriceHistoryResolution
+    # Start of each bucket, oldest first
+    timestamps: list[datetime]
+    # sku_id -> closing price of each bucket, aligned with ``timestamps``.
+    # None until the SKU's first known price.
+    prices: dict[UUID, list[float | None]]
+
+
+def price_history_axis(
+    start_date: datetime, end_date: datetime, resolution: PriceHistoryResolution
+) -> list[datetime]:
+    """
+    Bucket start times covering ``start_date`` to ``end_date``.
+
+    Daily buckets start at UTC midnight, weekly buckets at UTC midnight on Monday.
+    """
+    first = start_date.date()
+    last = end_date.date()
+    if resolution == PriceHistoryResolution.WEEKLY:
+        first -= timedelta(days=first.weekday())
+        last -= timedelta(days=last.weekday())
+    count = (last - first) // resolution.step + 1
+    return [date_to_datetime_utc(first) + i * resolution.step for i in range(count)]
+
+
+def fetch_price_history_columns(
+    session: Session,
+    sku_ids: list[UUID],
+    start_date: datetime,
+    end_date: datetime,
+    resolution: PriceHistoryResolution = PriceHistoryResolution.DAILY,
+    marketplace: Marketplace = Marketplace.TCGPLAYER,
+) -> PriceHistoryColumns:
+    """
+    Fetch forward-filled price histories for many SKUs in one query.
+
+    Each bucket holds the SKU's price at the bucket's close (the last snapshot
+    before the next bucket starts, or before ``end_date`` for the current one),
+    carrying forward the last known price through buckets without changes.
+    The query returns only the last snapshot per (SKU, bucket), picked with a
+    window over the in-window snapshots plus one index probe per SKU for the
+    price the window opens with; the carry-forward runs here.
+
+    Parameters
+    ----------
+    session : Session
+        Active SQLAlchemy session.
+    sku_ids : list[UUID]
+        SKUs to fetch price histories for.
+    start_date : datetime
+        Start of the date range; the first bucket is the one containing it.
+    end_date : datetime
+        End of the date range.
+    resolution : PriceHistoryResolution
+        Bucket size of the timestamp axis.
+    marketplace : Marketplace
+        Marketplace of the price snapshots.
+
+    Returns
+    -------
+    PriceHistoryColumns
+        The timestamp axis and one price array per SKU with at least one known
+        price in the range. SKUs without any are left out.
+    """
+    timestamps = price_history_axis(start_date, end_date, resolution)
+    result = PriceHistoryColumns(
+        resolution=resolution, timestamps=timestamps, prices={}
+    )
+    if not sku_ids:
+        return result
+
+    axis_start = timestamps[0]
+    skus = values(column("sku_id", PG_UUID(as_uuid=True)), name="skus").data(
+        [(sku_id,) for sku_id in sku_ids]
+    )
+    opening = (
+        select(
+            SKUPriceDataSnapshot.snapshot_datetime,
+            SKUPriceDataSnapshot.lowest_listing_price_total,
+        )
+        .where(SKUPriceDataSnapshot.sku_id == skus.c.sku_id)
+        .where(SKUPriceDataSnapshot.marketplace == marketplace)
+        .where(SKUPriceDataSnapshot.snapshot_datetime <= axis_start)
+        .order_by(SKUPriceDataSnapshot.snapshot_datetime.desc())
+        .limit(1)
+        .lateral("opening")
+    )
+    bucket = cast(
+        func.floor(
+            func.extract("epoch", SKUPriceDataSnapshot.snapshot_datetime - axis_start)
+            / resolution.step.total_seconds()
+        ),
+        Integer,
+    )
+    points = union_all(
+        select(
+            skus.c.sku_id,
+            literal(-1).label("bucket"),
+            opening.c.snapshot_datetime,
+            opening.c.lowest_listing_price_total,
+        ).join_from(skus, opening, true()),
+        select(
+            SKUPriceDataSnapshot.sku_id,
+            bucket.label("bucket"),
+            SKUPriceDataSnapshot.snapshot_datetime,
+            SKUPriceDataSnapshot.lowest_listing_price_total,
+        )
+        .where(SKUPriceDataSnapshot.sku_id.in_(sku_ids))
+        .where(SKUPriceDataSnapshot.marketplace == marketplace)
+        .where(SKUPriceDataSnapshot.snapshot_datetime > axis_start)
+        .where(SKUPriceDataSnapshot.snapshot_datetime <= end_date),
+    ).subquery("points")
+    ranked = select(
+        points.c.sku_id,
+        points.c.bucket,
+        points.c.lowest_listing_price_total,
+        func.row_number()
+        .over(
+            partition_by=(points.c.sku_id, points.c.bucket),
+            order_by=points.c.snapshot_datetime.desc(),
+        )
+        .label("rn"),
+    ).subquery("ranked")
+    rows = session.execute(
+        select(ranked.c.sku_id, ranked.c.bucket, ranked.c.lowest_listing_price_total)
+        .where(ranked.c.rn == 1)
+        .order_by(ranked.c.sku_id, ranked.c.bucket)
+    ).all()
+
+    closes_by_sku: dict[UUID, dict[int, float]] = {}
+    for sku_id, bucket_index, price in rows:
+        closes_by_sku.setdefault(sku_id, {})[bucket_index] = float(price)
+
+    for sku_id in sku_ids:
+        closes = closes_by_sku.get(sku_id)
+        if not closes:
+            continue
+        current = closes.get(-1)
+        series: list[float | None] = []
+        for i in range(len(timestamps)):
+            current = closes.get(i, current)
+            series.append(current)
+        result.prices[sku_id] = series
+
+    return result
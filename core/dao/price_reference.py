@@ -0,0 +1,190 @@
+"""
+Data access layer for precomputed "price at T" references.
+
+`refresh_price_references` runs after each snapshot run and stores, per SKU and
+horizon, the most recent snapshot on or before ``snapshot_dt - horizon`` in
+sku_price_reference. Because snapshots are only written by those runs, the row
+is also the answer to "price N days ago" for any time until the next run.
+"""
+
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import (
+    DateTime,
+    Select,
+    String,
+    column,
+    literal,
+    select,
+    true,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from core.models.catalog import Condition, Language, Printing, Product, SKU
+from core.models.price import (
+    Marketplace,
+    PriceReferenceHorizon,
+    SKULatestPrice,
+    SKUPriceDataSnapshot,
+    SKUPriceReference,
+)
+from core.services.schemas.schema import ProductType
+
+
+def refresh_price_references(
+    session: Session,
+    marketplace: Marketplace,
+    snapshot_dt: datetime,
+) -> int:
+    """
+    Recompute sku_price_reference for every priced SKU as of ``snapshot_dt``.
+
+    One statement: each (SKU, horizon) pair probes ix_sku_price_snapshot_covering
+    once, and only references that moved to a different snapshot are written.
+    Runs in the caller's transaction.
+
+    Args:
+        session: Active SQLAlchemy session
+        marketplace: Marketplace to refresh references for
+        snapshot_dt: Timestamp of the snapshot run the references are taken from
+
+    Returns:
+        Number of reference rows inserted or updated
+    """
+    horizons = values(
+        column("horizon", String),
+        column("cutoff", DateTime(timezone=True)),
+        name="horizons",
+    ).data(
+        [
+            (horizon.value, snapshot_dt - horizon.delta)
+            for horizon in PriceReferenceHorizon
+        ]
+    )
+    previous = (
+        select(
+            SKUPriceDataSnapshot.snapshot_datetime,
+            SKUPriceDataSnapshot.lowest_listing_price_total,
+        )
+        .where(SKUPriceDataSnapshot.sku_id == SKULatestPrice.sku_id)
+        .where(SKUPriceDataSnapshot.marketplace == marketplace)
+        .where(SKUPriceDataSnapshot.snapshot_datetime <= horizons.c.cutoff)
+        .order_by(SKUPriceDataSnapshot.snapshot_datetime.desc())
+        .limit(1)
+        .lateral("previous")
+    )
+    references = (
+        select(
+            SKULatestPrice.sku_id,
+            literal(marketplace, SKUPriceReference.marketplace.type),
+            horizons.c.horizon,
+            previous.c.snapshot_datetime,
+            previous.c.lowest_listing_price_total,
+        )
+        .select_from(SKULatestPrice)
+        .join(horizons, true())
+        .join(previous, true())
+        .where(SKULatestPrice.marketplace == marketplace)
+    )
+
+    stmt = insert(SKUPriceReference).from_select(
+        [
+            SKUPriceReference.sku_id,
+            SKUPriceReference.marketplace,
+            SKUPriceReference.horizon,
+            SKUPriceReference.reference_datetime,
+            SKUPriceReference.lowest_listing_price_total,
+        ],
+        references,
+    )
+    return session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[
+                SKUPriceReference.sku_id,
+                SKUPriceReference.marketplace,
+                SKUPriceReference.horizon,
+            ],
+            set_={
+                "reference_datetime": stmt.excluded.reference_datetime,
+                "lowest_listing_price_total": stmt.excluded.lowest_listing_price_total,
+            },
+            where=SKUPriceReference.reference_datetime
+            != stmt.excluded.reference_datetime,
+        )
+    ).rowcount
+
+
+def set_price_comparison_select(
+    set_id: uuid.UUID,
+    days_ago: int,
+    marketplace: Marketplace = Marketplace.TCGPLAYER,
+) -> Select:
+    """
+    Select current and historical prices for every card SKU in a set.
+
+    Current prices come from sku_latest_price. When ``days_ago`` is a
+    precomputed horizon (1, 7 or 30) historical prices are read from
+    sku_price_reference; otherwise each SKU probes its own snapshot history
+    once. Either way the cost follows the set size, not the total history.
+
+    Args:
+        set_id: Set to compare
+        days_ago: How far back the historical price is taken
+        marketplace: Marketplace to read prices for
+
+    Returns:
+        Select of (sku_id, product_name, condition, printing, language,
+        current_price, historical_price); prices are NULL when unknown
+    """
+    horizon = PriceReferenceHorizon.from_days(days_ago)
+    if horizon is not None:
+        historical = (
+            select(
+                SKUPriceReference.sku_id,
+                SKUPriceReference.lowest_listing_price_total,
+            )
+            .where(SKUPriceReference.marketplace == marketplace)
+            .where(SKUPriceReference.horizon == horizon)
+            .subquery("historical")
+        )
+        historical_onclause = historical.c.sku_id == SKU.id
+    else:
+        historical_date = datetime.now(UTC) - timedelta(days=days_ago)
+        historical = (
+            select(SKUPriceDataSnapshot.lowest_listing_price_total)
+            .where(SKUPriceDataSnapshot.sku_id == SKU.id)
+            .where(SKUPriceDataSnapshot.marketplace == marketplace)
+            .where(SKUPriceDataSnapshot.snapshot_datetime <= historical_date)
+            .order_by(SKUPriceDataSnapshot.snapshot_datetime.desc())
+            .limit(1)
+            .lateral("historical")
+        )
+        historical_onclause = true()
+
+    return (
+        select(
+            SKU.id.label("sku_id"),
+            Product.name.label("product_name"),
+            Condition.name.label("condition"),
+            Printing.name.label("printing"),
+            Language.name.label("language"),
+            SKULatestPrice.lowest_listing_price_total.label("current_price"),
+            historical.c.lowest_listing_price_total.label("historical_price"),
+        )
+        .select_from(SKU)
+        .join(Product, SKU.product_id == Product.id)
+        .join(Condition, SKU.condition_id == Condition.id)
+        .join(Printing, SKU.printing_id == Printing.id)
+        .join(Language, SKU.language_id == Language.id)
+        .outerjoin(
+            SKULatestPrice,
+            (SKULatestPrice.sku_id == SKU.id)
+            & (SKULatestPrice.marketplace == marketplace),
+        )
+        .outerjoin(historical, historical_onclause)
+        .where(Product.set_id == set_id)
+        .where(Product.product_type == ProductType.CARDS)
+    )
@@ -0,0 +1,80 @@
+"""
+Data access layer for the SKU universe of price refresh jobs.
+
+Each source is a set-based select of internal SKU IDs; a refresh run unions the
+sources it needs and maps them to TCGPlayer IDs in a single statement.
+"""
+
+import enum
+from datetime import datetime
+from typing import Iterable
+
+from sqlalchemy import Select, select, union
+from sqlalchemy.sql.selectable import SelectBase
+
+from core.dao.inventory import inventory_sku_ids_select
+from core.dao.market_indicators import (
+    booster_pack_sku_ids_select,
+    market_indicator_sku_ids_select,
+)
+from core.models.catalog import SKU
+from core.models.price import Marketplace, SKULatestPrice
+
+
+class PriceRefreshSource(enum.StrEnum):
+    MARKET_INDICATORS = "market_indicators"
+    BOOSTER_PACKS = "booster_packs"
+    # SKUs whose latest price was written at or after ``updated_since``
+    RECENTLY_UPDATED = "recently_updated"
+    INVENTORY = "inventory"
+
+
+def _source_sku_ids_select(
+    source: PriceRefreshSource,
+    marketplace: Marketplace,
+    updated_since: datetime | None,
+) -> SelectBase:
+    match source:
+        case PriceRefreshSource.MARKET_INDICATORS:
+            return market_indicator_sku_ids_select()
+        case PriceRefreshSource.BOOSTER_PACKS:
+            return booster_pack_sku_ids_select()
+        case PriceRefreshSource.RECENTLY_UPDATED:
+            if updated_since is None:
+                raise ValueError("RECENTLY_UPDATED requires updated_since")
+            return select(SKULatestPrice.sku_id).where(
+                SKULatestPrice.marketplace == marketplace,
+                SKULatestPrice.updated_at >= updated_since,
+            )
+        case PriceRefreshSource.INVENTORY:
+            return inventory_sku_ids_select()
+
+
+def query_price_refresh_universe(
+    sources: Iterable[PriceRefreshSource],
+    marketplace: Marketplace = Marketplace.TCGPLAYER,
+    updated_since: datetime | None = None,
+) -> Select:
+    """
+    Select the de-duplicated SKUs to refresh across ``sources``.
+
+    Args:
+        sources: Sources whose SKUs make up the universe
+        marketplace: Marketplace whose latest prices RECENTLY_UPDATED reads
+        updated_since: Cutoff for RECENTLY_UPDATED
+
+    Returns:
+        Select of (SKU.id, SKU.tcgplayer_id), one row per SKU with a TCGPlayer ID
+    """
+    source_selects = [
+        _source_sku_ids_select(source, marketplace, updated_since)
+        for source in dict.fromkeys(sources)
+    ]
+    if not source_selects:
+        raise ValueError("At least one price refresh source is required")
+
+    sku_ids = union(*source_selects).subquery()
+    return select(SKU.id, SKU.tcgplayer_id).where(
+        SKU.id.in_(select(sku_ids.c[0])),
+        SKU.tcgplayer_id.isnot(None),
+    )
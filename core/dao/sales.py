@@ -3,9 +3,9 @@ from datetime import datetime, timezone, timedelta
 from decimal import Decimal
 from typing import List, Optional, TypedDict
 
-from sqlalchemy import select, desc, func
-from sqlalchemy.orm import Session
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import bindparam, select, desc, func, true
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.dialects.postgresql import ARRAY, UUID, insert
 
 from core.models.catalog import SKU
 from core.models.listings import SaleRecord
@@ -113,28 +113,41 @@ def get_recent_sales_for_skus(
     if not sku_ids:
         return {}
 
-    # Query all sales for the given SKUs and marketplace
-    query = (
+    # One LATERAL probe of ix_sale_record_sku_marketplace_date per SKU, so at most
+    # limit_per_sku rows per SKU leave the database
+    requested_skus = select(
+        func.unnest(
+            bindparam(
+                "sku_ids",
+                value=list(dict.fromkeys(sku_ids)),
+                type_=ARRAY(UUID(as_uuid=True)),
+            )
+        ).label("sku_id")
+    ).subquery("requested_skus")
+
+    recent_sales = (
         select(SaleRecord)
         .where(
-            SaleRecord.sku_id.in_(sku_ids),
+            SaleRecord.sku_id == requested_skus.c.sku_id,
             SaleRecord.marketplace == marketplace,
             SaleRecord.sale_date >= since_date,
         )
-        .order_by(SaleRecord.sku_id, desc(SaleRecord.sale_date))
+        .order_by(desc(SaleRecord.sale_date))
+        .limit(limit_per_sku)
+        .lateral("recent_sales")
     )
+    recent_sale = aliased(SaleRecord, recent_sales)
 
-    result = session.execute(query)
-    all_sales = result.scalars().all()
-
-    # Group by sku_id and limit per SKU
-    sales_by_sku = {}
-    for sale in all_sales:
-        if sale.sku_id not in sales_by_sku:
-            sales_by_sku[sale.sku_id] = []
+    query = (
+        select(recent_sale)
+        .select_from(requested_skus)
+        .join(recent_sales, true())
+        .order_by(recent_sale.sku_id, desc(recent_sale.sale_date))
+    )
 
-        if len(sales_by_sku[sale.sku_id]) < limit_per_sku:
-            sales_by_sku[sale.sku_id].append(sale)
+    sales_by_sku: dict[uuid.UUID, List[SaleRecord]] = {}
+    for sale in session.execute(query).scalars():
+        sales_by_sku.setdefault(sale.sku_id, []).append(sale)
 
     return sales_by_sku
 
@@ -4,13 +4,39 @@ from collections import defaultdict
 from datetime import datetime, date
 from dataclasses import dataclass
 
-from sqlalchemy import asc, desc, select, func, distinct, or_, literal
+from sqlalchemy import (
+    Select,
+    any_,
+    asc,
+    bindparam,
+    case,
+    delete,
+    desc,
+    event,
+    inspect,
+    select,
+    func,
+    distinct,
+    or_,
+    literal,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
 from sqlalchemy.orm import Session, aliased, Query
 
+from core.dao.inventory_holding import refresh_holdings
+from core.dao.inventory_version import bump_inventory_versions
+from core.dao.transaction_daily_total import refresh_daily_totals
+from core.dao.transaction_search import (
+    refresh_transaction_search,
+    transaction_search_query,
+)
+from core.dao.transaction_version import bump_transaction_versions
 from core.models.transaction import TransactionType, Platform
 from core.models.transaction import LineItem, LineItemConsumption, Transaction
 from core.models.types import MoneyAmount
 from core.models.catalog import SKU, Product, Set, Catalog
+from core.models.transaction_search import TransactionSearchDocument
 
 
 class InsufficientInventoryError(Exception):
@@ -21,12 +47,145 @@ class TransactionNotFoundError(Exception):
     pass
 
 
+@event.listens_for(Session, "after_flush")
+def _sync_inventory_on_flush(session: Session, flush_context) -> None:
+    """
+    Keep the holdings ledger and inventory versions in step with line item writes.
+
+    Every path that creates, updates or deletes line items (including the FIFO
+    consumption in `process_sale_line_items`) flushes them through the session,
+    so this runs in the same transaction as the write.
+    """
+    # session.new/dirty/deleted still hold the flushed objects at this point
+    pairs = {
+        (obj.user_id, obj.sku_id)
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if isinstance(obj, LineItem) and obj.user_id is not None
+    }
+    if pairs:
+        connection = session.connection()
+        refresh_holdings(connection, pairs)
+        bump_inventory_versions(connection, {user_id for user_id, _ in pairs})
+
+
+# Attributes that feed the transaction daily totals
+_DAILY_TOTAL_TRANSACTION_ATTRS = (
+    "user_id",
+    "date",
+    "type",
+    "tax_amount",
+    "shipping_cost_amount",
+)
+_DAILY_TOTAL_LINE_ITEM_ATTRS = ("transaction_id", "quantity", "unit_price_amount")
+
+
+def _transaction_days(
+    session: Session, transaction_ids: set[uuid.UUID]
+) -> list[tuple[uuid.UUID, datetime]]:
+    """(user_id, date) of the given transactions that still exist."""
+    if not transaction_ids:
+        return []
+    return session.execute(
+        select(Transaction.user_id, Transaction.date).where(
+            Transaction.id
+            == any_(
+                bindparam(
+                    "transaction_ids",
+                    value=list(transaction_ids),
+                    type_=ARRAY(PG_UUID(as_uuid=True)),
+                )
+            )
+        )
+    ).all()
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_daily_totals_on_flush(session: Session, flush_context) -> None:
+    """
+    Keep the transaction daily totals and transaction versions in step with
+    transaction and line item writes, in the same transaction as the write.
+
+    A transaction moved to another day refreshes both days; line item writes
+    that leave the totals alone (such as FIFO consumption) are skipped.
+    """
+    keys = set()
+    transaction_ids = set()
+    # session.new/dirty/deleted and attribute history still hold the pre-flush state
+    new, dirty, deleted = session.new, session.dirty, session.deleted
+    for obj in (*new, *dirty, *deleted):
+        if isinstance(obj, Transaction):
+            attrs = _DAILY_TOTAL_TRANSACTION_ATTRS
+        elif isinstance(obj, LineItem):
+            attrs = _DAILY_TOTAL_LINE_ITEM_ATTRS
+        else:
+            continue
+        state = inspect(obj)
+        if obj in dirty and not any(
+            state.attrs[attr].history.has_changes() for attr in attrs
+        ):
+            continue
+        if isinstance(obj, LineItem):
+            transaction_ids.update(
+                state.attrs.transaction_id.history.sum() or [obj.transaction_id]
+            )
+            continue
+        dates = [value for value in state.attrs.date.history.sum() if value]
+        if not dates:
+            # Not loaded: look the transaction up now that it is written
+            transaction_ids.add(obj.id)
+            continue
+        user_ids = [value for value in state.attrs.user_id.history.sum() if value]
+        keys.update(
+            (user_id, transaction_date)
+            for user_id in user_ids or [obj.user_id]
+            for transaction_date in dates
+        )
+    transaction_ids.discard(None)
+    keys.update(_transaction_days(session, transaction_ids))
+    if keys:
+        connection = session.connection()
+        refresh_daily_totals(connection, keys)
+        bump_transaction_versions(connection, {user_id for user_id, _ in keys})
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_search_documents_on_flush(session: Session, flush_context) -> None:
+    """
+    Keep transaction search documents in step with writes to counterparties
+    and line items, in the same transaction as the write.
+    """
+    transaction_ids = set()
+    new, dirty, deleted = session.new, session.dirty, session.deleted
+    for obj in (*new, *dirty, *deleted):
+        if isinstance(obj, Transaction):
+            attrs = ("counterparty_name",)
+        elif isinstance(obj, LineItem):
+            attrs = ("transaction_id", "sku_id")
+        else:
+            continue
+        state = inspect(obj)
+        if obj in dirty and not any(
+            state.attrs[attr].history.has_changes() for attr in attrs
+        ):
+            continue
+        if isinstance(obj, Transaction):
+            transaction_ids.add(obj.id)
+        else:
+            transaction_ids.update(
+                state.attrs.transaction_id.history.sum() or [obj.transaction_id]
+            )
+    transaction_ids.discard(None)
+    if transaction_ids:
+        refresh_transaction_search(session.connection(), transaction_ids)
+
+
 def process_sale_line_items(session: Session, sale_line_items: list[LineItem]) -> None:
     if not sale_line_items:
         return
 
-    # 1. Gather all relevant SKUs
+    # 1. Gather all relevant SKUs and their owners
     sku_ids = {item.sku_id for item in sale_line_items}
+    user_ids = {item.user_id for item in sale_line_items}
 
     # 2. Group sale line items by SKU and date for easier processing
     sku_id_to_sale_line_items = defaultdict(list)
@@ -39,6 +198,7 @@ def process_sale_line_items(session: Session, sale_line_items: list[LineItem]) -
         .join(Transaction)
         .where(
             LineItem.sku_id.in_(sku_ids),
+            LineItem.user_id.in_(user_ids),
             LineItem.remaining_quantity.isnot(None),
             LineItem.remaining_quantity > 0,
         )
@@ -46,12 +206,13 @@ def process_sale_line_items(session: Session, sale_line_items: list[LineItem]) -
         .all()
     )
 
-    # 4. Group purchase line items by SKU
-    sku_id_to_purchase_line_items = defaultdict(list)
+    # 4. Group purchase line items by owner and SKU: a sale only draws on its
+    # own user's lots
+    user_sku_to_purchase_line_items = defaultdict(list)
     for purchase_line_item in all_purchase_line_items:
-        sku_id_to_purchase_line_items[purchase_line_item.sku_id].append(
-            purchase_line_item
-        )
+        user_sku_to_purchase_line_items[
+            (purchase_line_item.user_id, purchase_line_item.sku_id)
+        ].append(purchase_line_item)
 
     # 5. Consume inventory for each sale line item
     for sale_line_item in sale_line_items:
@@ -61,8 +222,8 @@ def process_sale_line_items(session: Session, sale_line_items: list[LineItem]) -
         # Filter purchase line items to only include those with dates before the sale date
         fifo_purchase_line_items = [
             purchase_line_item
-            for purchase_line_item in sku_id_to_purchase_line_items[
-                sale_line_item.sku_id
+            for purchase_line_item in user_sku_to_purchase_line_items[
+                (sale_line_item.user_id, sale_line_item.sku_id)
             ]
             if purchase_line_item.transaction.date <= sale_date
         ]
@@ -78,6 +239,7 @@ def process_sale_line_items(session: Session, sale_line_items: list[LineItem]) -
                         sale_line_item_id=sale_line_item.id,
                         purchase_line_item_id=purchase_line_item.id,
                         quantity=sell_quantity,
+                        user_id=sale_line_item.user_id,
                     )
                 )
                 sell_quantity = 0
@@ -91,6 +253,7 @@ def process_sale_line_items(session: Session, sale_line_items: list[LineItem]) -
                         sale_line_item_id=sale_line_item.id,
                         purchase_line_item_id=purchase_line_item.id,
                         quantity=quantity_available,
+                        user_id=sale_line_item.user_id,
                     )
                 )
 
@@ -103,94 +266,90 @@ def process_sale_line_items(session: Session, sale_line_items: list[LineItem]) -
     session.flush()
 
 
-def delete_sale_line_items(session: Session, line_item_ids: list[uuid.UUID]) -> None:
+def _delete_line_items(session: Session, doomed: Select) -> set[uuid.UUID]:
     """
-    Deletes sale line items and their associated consumptions.
+    Delete the line items selected by ``doomed`` (a select of line item IDs)
+    with a few set-based statements, undoing the FIFO consumption they took
+    part in.
 
-    Args:
-        session: The database session
-        line_item_ids: List of line item IDs to delete
+    Purchase lots consumed by doomed sales get their quantity back. Sales that
+    consumed a doomed purchase lot are released from all their lots and
+    consumed again from what remains, as `process_sale_line_items` would have
+    on a fresh insert.
 
     Returns:
-        None
+        IDs of the transactions the deleted line items belonged to, whose
+        daily totals are left to the caller to refresh
+
+    Raises:
+        InsufficientInventoryError: If a sale can no longer be fulfilled.
     """
-    # Find all consumptions related to these sale line items
-    consumptions = (
-        session.query(LineItemConsumption)
-        .filter(LineItemConsumption.sale_line_item_id.in_(line_item_ids))
-        .all()
+    # Bulk statements bypass the unit of work: write out pending changes first
+    session.flush()
+    # Never correlated: the statements below also target line_item
+    doomed_ids = doomed.correlate(None).scalar_subquery()
+
+    # Surviving sales that consumed from a doomed purchase lot
+    reprocess_ids = session.scalars(
+        select(LineItemConsumption.sale_line_item_id)
+        .where(LineItemConsumption.purchase_line_item_id.in_(doomed_ids))
+        .where(LineItemConsumption.sale_line_item_id.not_in(doomed_ids))
+        .distinct()
+    ).all()
+    released = or_(
+        LineItemConsumption.sale_line_item_id.in_(doomed_ids),
+        LineItemConsumption.sale_line_item_id.in_(reprocess_ids),
     )
 
-    # Get associated purchase line items
-    purchase_line_item_ids = {
-        consumption.purchase_line_item_id for consumption in consumptions
-    }
-    purchase_line_items = (
-        session.query(LineItem).filter(LineItem.id.in_(purchase_line_item_ids)).all()
+    released_per_lot = (
+        select(
+            LineItemConsumption.purchase_line_item_id,
+            func.sum(LineItemConsumption.quantity).label("quantity"),
+        )
+        .where(released)
+        .group_by(LineItemConsumption.purchase_line_item_id)
+        .subquery()
     )
-    purchase_line_item_dict = {
-        line_item.id: line_item for line_item in purchase_line_items
-    }
-
-    # Restore purchase line item quantities and delete consumptions
-    for consumption in consumptions:
-        # Restore the purchase line item quantity
-        purchase_line_item_dict[
-            consumption.purchase_line_item_id
-        ].remaining_quantity += consumption.quantity
-        # Delete the consumption
-        session.delete(consumption)
-
-    # Delete the sale line items
-    for line_item_id in line_item_ids:
-        line_item = session.query(LineItem).get(line_item_id)
-        if line_item:
-            session.delete(line_item)
-
-    session.flush()
-
-
-def delete_purchase_line_items(
-    session: Session, line_item_ids: list[uuid.UUID]
-) -> None:
-    """
-    Deletes purchase line items and their associated consumptions.
-    This will also reprocess any affected sale line items.
-
-    Args:
-        session: The database session
-        line_item_ids: List of line item IDs to delete
+    touched = session.execute(
+        update(LineItem)
+        .where(LineItem.id == released_per_lot.c.purchase_line_item_id)
+        .where(LineItem.id.not_in(doomed_ids))
+        .values(
+            remaining_quantity=LineItem.remaining_quantity + released_per_lot.c.quantity
+        )
+        .returning(LineItem.user_id, LineItem.sku_id),
+        execution_options={"synchronize_session": "fetch"},
+    ).all()
 
-    Returns:
-        None
-    """
-    # Find all consumptions related to these purchase line items
-    consumptions = (
-        session.query(LineItemConsumption)
-        .filter(LineItemConsumption.purchase_line_item_id.in_(line_item_ids))
-        .all()
+    session.execute(
+        delete(LineItemConsumption).where(
+            or_(released, LineItemConsumption.purchase_line_item_id.in_(doomed_ids))
+        ),
+        execution_options={"synchronize_session": "fetch"},
     )
-
-    # Get associated sale line items
-    sale_line_item_ids = {consumption.sale_line_item_id for consumption in consumptions}
-    sale_line_items = session.scalars(
-        select(LineItem).where(LineItem.id.in_(sale_line_item_ids))
+    deleted = session.execute(
+        delete(LineItem)
+        .where(LineItem.id.in_(doomed_ids))
+        .returning(LineItem.user_id, LineItem.sku_id, LineItem.transaction_id),
+        execution_options={"synchronize_session": "fetch"},
     ).all()
-
-    # Delete all associated consumptions
-    for consumption in consumptions:
-        session.delete(consumption)
-
-    # Delete the purchase line items
-    for line_item_id in line_item_ids:
-        line_item = session.query(LineItem).get(line_item_id)
-        if line_item:
-            session.delete(line_item)
-
-    # Re-process sale line items
-    process_sale_line_items(session, sale_line_items)
-
-    session.flush()
+    touched += [(user_id, sku_id) for user_id, sku_id, _ in deleted]
+
+    # The flush hook does not see bulk statements
+    if touched:
+        connection = session.connection()
+        refresh_holdings(connection, touched)
+        bump_inventory_versions(connection, {user_id for user_id, _ in touched})
+
+    if reprocess_ids:
+        sale_line_items = session.scalars(
+            select(LineItem)
+            .join(Transaction)
+            .where(LineItem.id.in_(reprocess_ids))
+            .order_by(asc(Transaction.date), asc(LineItem.id))
+        ).all()
+        process_sale_line_items(session, sale_line_items)
+    return {transaction_id for _, _, transaction_id in deleted}
 
 
 def delete_transactions(session: Session, transaction_ids: list[uuid.UUID]) -> None:
@@ -200,63 +359,129 @@ def delete_transactions(session: Session, transaction_ids: list[uuid.UUID]) -> N
 
     Raises:
         TransactionNotFoundError: If one or more transactions are not found.
+        InsufficientInventoryError: If a remaining sale can no longer be fulfilled.
     """
-    # Fetch all transactions with the provided IDs
-    transactions = (
-        session.query(Transaction).filter(Transaction.id.in_(transaction_ids)).all()
+    requested = set(transaction_ids)
+    # One array parameter rather than an IN list per statement
+    requested_ids = any_(
+        bindparam(
+            "transaction_ids", value=list(requested), type_=ARRAY(PG_UUID(as_uuid=True))
+        )
     )
+    found = set(
+        session.scalars(select(Transaction.id).where(Transaction.id == requested_ids))
+    )
+    if found != requested:
+        raise TransactionNotFoundError(f"Transactions not found: {requested - found}")
 
-    line_items = (
-        session.query(LineItem)
-        .filter(LineItem.transaction_id.in_(transaction_ids))
-        .all()
+    _delete_line_items(
+        session, select(LineItem.id).where(LineItem.transaction_id == requested_ids)
     )
+    deleted = session.execute(
+        delete(Transaction)
+        .where(Transaction.id == requested_ids)
+        .returning(Transaction.user_id, Transaction.date),
+        execution_options={"synchronize_session": "fetch"},
+    ).all()
+    # The flush hook does not see bulk statements
+    connection = session.connection()
+    refresh_daily_totals(connection, deleted)
+    bump_transaction_versions(connection, {user_id for user_id, _ in deleted})
 
-    transaction_id_to_line_items = defaultdict(list)
 
-    for line_item in line_items:
-        transaction_id_to_line_items[line_item.transaction_id].append(line_item)
+def delete_transaction_line_items(
+    session: Session, line_item_ids: list[uuid.UUID]
+) -> None:
+    """
+    Deletes line items of one transaction and their consumptions.
 
-    if len(transactions) != len(transaction_ids):
-        raise TransactionNotFoundError(
-            f"Transactions not found: {set(transaction_ids) - {t.id for t in transactions}}"
-        )
+    Raises:
+        InsufficientInventoryError: If a remaining sale can no longer be fulfilled.
+    """
+    transaction_ids = _delete_line_items(
+        session, select(LineItem.id).where(LineItem.id.in_(line_item_ids))
+    )
+    # The flush hook does not see bulk statements
+    connection = session.connection()
+    days = _transaction_days(session, transaction_ids)
+    refresh_daily_totals(connection, days)
+    bump_transaction_versions(connection, {user_id for user_id, _ in days})
+    refresh_transaction_search(connection, transaction_ids)
 
-    # Reorder transactions to process SALE transactions before PURCHASE transactions using exhaustive match‑case
-    def transaction_priority(t: Transaction) -> int:
-        match t.type:
-            case TransactionType.SALE:
-                return 0
-            case TransactionType.PURCHASE:
-                return 1
-            case _:
-                assert_never(t.type)
-
-    ordered_transactions = sorted(transactions, key=transaction_priority)
-
-    for transaction in ordered_transactions:
-        delete_transaction_line_items(
-            session,
-            transaction.type,
-            [
-                line_item.id
-                for line_item in transaction_id_to_line_items[transaction.id]
-            ],
-        )
 
-        session.delete(transaction)
+@dataclass
+class LineItemInvariantViolation:
+    """A line item whose quantities disagree with its consumptions."""
 
-    session.flush()
+    line_item_id: uuid.UUID
+    transaction_type: TransactionType
+    quantity: int
+    remaining_quantity: Optional[int]
+    consumed: int
 
 
-def delete_transaction_line_items(
-    session: Session, transaction_type: TransactionType, line_item_ids: list[uuid.UUID]
-) -> None:
-    match transaction_type:
-        case TransactionType.PURCHASE:
-            delete_purchase_line_items(session, line_item_ids)
-        case TransactionType.SALE:
-            delete_sale_line_items(session, line_item_ids)
+def find_line_item_invariant_violations(
+    session: Session, user_id: Optional[uuid.UUID] = None
+) -> list[LineItemInvariantViolation]:
+    """
+    Line items (of one user, if given) whose consumptions do not add up.
+
+    A purchase lot's remaining quantity must be its quantity less everything
+    consumed from it, and a sale must have consumed exactly its quantity.
+    """
+    consumed_from = (
+        select(
+            LineItemConsumption.purchase_line_item_id.label("line_item_id"),
+            func.sum(LineItemConsumption.quantity).label("quantity"),
+        )
+        .group_by(LineItemConsumption.purchase_line_item_id)
+        .subquery()
+    )
+    consumed_by = (
+        select(
+            LineItemConsumption.sale_line_item_id.label("line_item_id"),
+            func.sum(LineItemConsumption.quantity).label("quantity"),
+        )
+        .group_by(LineItemConsumption.sale_line_item_id)
+        .subquery()
+    )
+    consumed = func.coalesce(
+        case(
+            (
+                Transaction.type == TransactionType.PURCHASE,
+                consumed_from.c.quantity,
+            ),
+            else_=consumed_by.c.quantity,
+        ),
+        0,
+    )
+    stmt = (
+        select(
+            LineItem.id,
+            Transaction.type,
+            LineItem.quantity,
+            LineItem.remaining_quantity,
+            consumed,
+        )
+        .join(Transaction)
+        .outerjoin(consumed_from, consumed_from.c.line_item_id == LineItem.id)
+        .outerjoin(consumed_by, consumed_by.c.line_item_id == LineItem.id)
+        .where(
+            case(
+                (
+                    Transaction.type == TransactionType.PURCHASE,
+                    LineItem.remaining_quantity.is_distinct_from(
+                        LineItem.quantity - consumed
+                    ),
+                ),
+                else_=LineItem.quantity != consumed,
+            )
+        )
+        .order_by(LineItem.id)
+    )
+    if user_id is not None:
+        stmt = stmt.where(LineItem.user_id == user_id)
+    return [LineItemInvariantViolation(*row) for row in session.execute(stmt)]
 
 
 @dataclass
@@ -551,56 +776,29 @@ def build_filtered_transactions_query(
     session: Session, filters: TransactionFilterParams
 ) -> Query[Transaction]:
     """
-    Build a filtered, de-duplicated base query using DISTINCT ON for transactions.
+    Build a filtered base query of transactions that have line items.
+
+    A search matches and ranks the stored search documents (see
+    `core.dao.transaction_search`), so only matching transactions are read.
 
     Returns a SELECT of (id, date, rank) ordered globally for pagination/consumption.
     """
-    # Import here to avoid circular dependency
-    from core.dao.catalog import create_product_set_fts_vector
+    rank_expr = literal(0.0)
+    where_clauses = [
+        select(LineItem.id).where(LineItem.transaction_id == Transaction.id).exists()
+    ]
+    base_from = Transaction.__table__
 
-    # Base FROM with necessary joins for filtering/search
-    base_from = (
-        Transaction.__table__.join(
-            LineItem.__table__, LineItem.transaction_id == Transaction.id
-        )
-        .join(SKU.__table__, SKU.id == LineItem.sku_id)
-        .join(Product.__table__, Product.id == SKU.product_id)
-        .join(Set.__table__, Set.id == Product.set_id)
+    ts_query = (
+        transaction_search_query(filters.search_query) if filters.search_query else None
     )
-
-    # Search rank
-    rank_expr = literal(0.0).label("rank")
-    if filters.search_query:
-        search_terms = filters.search_query.split()
-        if search_terms:
-            counterparty_ts_vector = func.setweight(
-                func.to_tsvector(
-                    "english", func.coalesce(Transaction.counterparty_name, "")
-                ),
-                "A",
-            )
-            product_ts_vector = create_product_set_fts_vector()
-            combined_ts_vector = counterparty_ts_vector.op("||")(product_ts_vector)
-            prefix_terms = [term + ":*" for term in search_terms]
-            ts_query = func.to_tsquery("english", " & ".join(prefix_terms))
-            rank_expr = func.ts_rank(combined_ts_vector, ts_query).label("rank")
-
-    # Build WHERE conditions
-    where_clauses = []
-    if filters.search_query:
-        search_terms = filters.search_query.split()
-        if search_terms:
-            counterparty_ts_vector = func.setweight(
-                func.to_tsvector(
-                    "english", func.coalesce(Transaction.counterparty_name, "")
-                ),
-                "A",
-            )
-            product_ts_vector = create_product_set_fts_vector()
-            combined_ts_vector = counterparty_ts_vector.op("||")(product_ts_vector)
-            prefix_terms = [term + ":*" for term in search_terms]
-            ts_query = func.to_tsquery("english", " & ".join(prefix_terms))
-            where_clauses.append(combined_ts_vector.op("@@")(ts_query))
+    if ts_query is not None:
+        base_from = base_from.join(
+            TransactionSearchDocument.__table__,
+            TransactionSearchDocument.transaction_id == Transaction.id,
+        )
+        where_clauses.append(TransactionSearchDocument.document.op("@@")(ts_query))
+        rank_expr = func.ts_rank(TransactionSearchDocument.document, ts_query)
 
     if filters.date_start:
         where_clauses.append(Transaction.date >= filters.date_start)
@@ -639,23 +837,15 @@ def build_filtered_transactions_query(
         if filters.amount_max is not None:
             where_clauses.append(amount_subq.c.total_amount <= filters.amount_max)
 
-    # Inner: pick best row per transaction id
-    inner = select(
-        Transaction.id.label("id"),
-        Transaction.date.label("date"),
-        rank_expr,
-    ).select_from(base_from)
-    if where_clauses:
-        inner = inner.where(*where_clauses)
-
+    # One row per transaction: the search document is per transaction too
     inner = (
-        inner.order_by(
-            Transaction.id,  # required first for DISTINCT ON
-            desc(rank_expr),
-            desc(Transaction.date),
-            desc(Transaction.id),
+        select(
+            Transaction.id.label("id"),
+            Transaction.date.label("date"),
+            rank_expr.label("rank"),
         )
-        .distinct(Transaction.id)  # DISTINCT ON (id)
+        .select_from(base_from)
+        .where(*where_clauses)
         .subquery()
     )
 
@@ -0,0 +1,232 @@
+"""
+Data access for the transaction daily totals rollup (see `TransactionDailyTotal`).
+
+`refresh_daily_totals` recomputes the rollup rows of the (user, day) pairs a
+write touched, from those days' transactions only, holding the users' write
+lock (see `core.dao.user_lock`). `recompute_daily_totals_select`
+is the full recomputation the rollup must always equal; `rebuild_daily_totals`
+replaces the rollup with it. `performance_series_select` reads the rollup as a
+gap-free daily or weekly series for the performance charts.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Iterable, Literal, Optional
+from uuid import UUID
+
+from sqlalchemy import (
+    Connection,
+    Date,
+    DateTime,
+    Select,
+    and_,
+    bindparam,
+    cast,
+    delete,
+    func,
+    literal,
+    select,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert
+from sqlalchemy.orm import Session
+
+from core.dao.user_lock import lock_users
+from core.models.transaction import LineItem, Transaction, TransactionType
+from core.models.transaction_daily_total import TransactionDailyTotal
+
+
+def recompute_daily_totals_select(user_id: Optional[UUID] = None) -> Select:
+    """Daily totals computed from every transaction (of one user, if given)."""
+    # Correlated so a refresh only sums the line items of the days it touches
+    line_items_total = func.coalesce(
+        select(func.sum(LineItem.quantity * LineItem.unit_price_amount))
+        .where(LineItem.transaction_id == Transaction.id)
+        .scalar_subquery(),
+        0,
+    )
+    is_sale = Transaction.type == TransactionType.SALE
+    is_purchase = Transaction.type == TransactionType.PURCHASE
+    day = cast(Transaction.date, Date)
+    stmt = select(
+        Transaction.user_id,
+        day.label("day"),
+        func.count().filter(is_sale).label("sale_count"),
+        func.coalesce(
+            func.sum(
+                line_items_total
+                + Transaction.tax_amount
+                - Transaction.shipping_cost_amount
+            ).filter(is_sale),
+            0,
+        ).label("revenue"),
+        func.count().filter(is_purchase).label("purchase_count"),
+        func.coalesce(
+            func.sum(
+                line_items_total
+                + Transaction.tax_amount
+                + Transaction.shipping_cost_amount
+            ).filter(is_purchase),
+            0,
+        ).label("expenses"),
+    ).group_by(Transaction.user_id, day)
+    if user_id is not None:
+        stmt = stmt.where(Transaction.user_id == user_id)
+    return stmt
+
+
+def _upsert_daily_totals(totals: Select):
+    columns = ["sale_count", "revenue", "purchase_count", "expenses"]
+    stmt = insert(TransactionDailyTotal).from_select(
+        ["user_id", "day", *columns], totals
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[TransactionDailyTotal.user_id, TransactionDailyTotal.day],
+        set_={
+            **{column: stmt.excluded[column] for column in columns},
+            "updated_at": func.now(),
+        },
+        # Rewriting an unchanged row would only churn updated_at
+        where=tuple_(*(TransactionDailyTotal.__table__.c[column] for column in columns))
+        != tuple_(*(stmt.excluded[column] for column in columns)),
+    )
+
+
+def refresh_daily_totals(
+    connection: Session | Connection, keys: Iterable[tuple[UUID, datetime]]
+) -> None:
+    """
+    Recompute the rollup rows of the days containing (user_id, transaction date)
+    ``keys`` from those days' transactions.
+
+    Days are taken in the database session's time zone, as the rollup's are.
+    Runs in the caller's transaction, which holds the users' write lock from
+    here on; days left without a transaction lose their row.
+    """
+    keys = set(keys)
+    if not keys:
+        return
+    lock_users(connection, (user_id for user_id, _ in keys))
+    touched = (
+        func.unnest(
+            bindparam(
+                "user_ids",
+                value=[user_id for user_id, _ in keys],
+                type_=ARRAY(PG_UUID(as_uuid=True)),
+            ),
+            bindparam(
+                "dates",
+                value=[transaction_date for _, transaction_date in keys],
+                type_=ARRAY(DateTime(timezone=True)),
+            ),
+        )
+        .table_valued("user_id", "date")
+        .render_derived(name="touched")
+    )
+    touched_days = (
+        select(touched.c.user_id, cast(touched.c.date, Date).label("day"))
+        .distinct()
+        .subquery("touched_days")
+    )
+    connection.execute(
+        _upsert_daily_totals(
+            recompute_daily_totals_select()
+            .join(
+                touched_days,
+                and_(
+                    Transaction.user_id == touched_days.c.user_id,
+                    Transaction.date >= touched_days.c.day,
+                    Transaction.date < touched_days.c.day + 1,
+                ),
+            )
+            # Sorted so concurrent refreshes lock the rows in the same order
+            .order_by(Transaction.user_id, cast(Transaction.date, Date))
+        )
+    )
+    # Emptied or moved away: no transaction left on the day
+    recorded = (
+        select(Transaction.id)
+        .where(
+            Transaction.user_id == TransactionDailyTotal.user_id,
+            Transaction.date >= TransactionDailyTotal.day,
+            Transaction.date < TransactionDailyTotal.day + 1,
+        )
+        .exists()
+    )
+    connection.execute(
+        delete(TransactionDailyTotal).where(
+            TransactionDailyTotal.user_id == touched_days.c.user_id,
+            TransactionDailyTotal.day == touched_days.c.day,
+            ~recorded,
+        )
+    )
+
+
+def rebuild_daily_totals(session: Session, user_id: Optional[UUID] = None) -> int:
+    """
+    Replace the rollup (for one user, if given) with a full recomputation.
+
+    Runs in the caller's transaction.
+
+    Returns:
+        Number of rollup rows written
+    """
+    stale = delete(TransactionDailyTotal)
+    if user_id is not None:
+        stale = stale.where(TransactionDailyTotal.user_id == user_id)
+    session.execute(stale)
+    return session.execute(
+        _upsert_daily_totals(recompute_daily_totals_select(user_id))
+    ).rowcount
+
+
+def performance_series_select(
+    start_date: date,
+    end_date: date,
+    granularity: Literal["daily", "weekly"],
+    user_id: Optional[UUID] = None,
+) -> Select:
+    """
+    Revenue, expenses and transaction count per day or per week (starting on
+    Monday) from ``start_date`` to ``end_date`` inclusive, summed over all users
+    unless ``user_id`` is given.
+
+    The series starts at the first period with a transaction and has a zero
+    row for every later period without one; it is empty if there is none.
+    """
+    unit = "week" if granularity == "weekly" else "day"
+    period = cast(func.date_trunc(unit, TransactionDailyTotal.day), Date)
+    totals = select(
+        period.label("period"),
+        func.sum(TransactionDailyTotal.revenue).label("revenue"),
+        func.sum(TransactionDailyTotal.expenses).label("expenses"),
+        func.sum(
+            TransactionDailyTotal.sale_count + TransactionDailyTotal.purchase_count
+        ).label("transaction_count"),
+    ).where(
+        TransactionDailyTotal.day >= start_date, TransactionDailyTotal.day <= end_date
+    )
+    if user_id is not None:
+        totals = totals.where(TransactionDailyTotal.user_id == user_id)
+    totals = totals.group_by(period).cte("totals")
+
+    periods = select(
+        cast(
+            func.generate_series(
+                cast(select(func.min(totals.c.period)).scalar_subquery(), DateTime),
+                func.date_trunc(unit, cast(literal(end_date, Date), DateTime)),
+                literal(timedelta(weeks=1) if unit == "week" else timedelta(days=1)),
+            ),
+            Date,
+        ).label("period")
+    ).subquery("periods")
+    return (
+        select(
+            periods.c.period,
+            func.coalesce(totals.c.revenue, 0).label("revenue"),
+            func.coalesce(totals.c.expenses, 0).label("expenses"),
+            func.coalesce(totals.c.transaction_count, 0).label("transaction_count"),
+        )
+        .select_from(periods)
+        .outerjoin(totals, totals.c.period == periods.c.period)
+        .order_by(periods.c.period)
+    )
@@ -0,0 +1,157 @@
+"""
+Data access for the transaction search documents (see `TransactionSearchDocument`).
+
+`refresh_transaction_search` recomputes the documents of the transactions a
+write touched, from those transactions' line items only, holding their users'
+write lock (see `core.dao.user_lock`);
+`refresh_transaction_search_for_products` recomputes the documents of the
+transactions of products whose catalogue names changed, as catalogue ingest
+(`cron.tasks.update_catalog_db`) does; `rebuild_transaction_search` recomputes
+every document. `transaction_search_query` turns a search string into the
+prefix tsquery the documents are matched and ranked against.
+"""
+
+import uuid
+from typing import Iterable, Optional
+
+from sqlalchemy import (
+    ColumnElement,
+    Connection,
+    Select,
+    any_,
+    bindparam,
+    delete,
+    func,
+    select,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert
+from sqlalchemy.orm import Session
+
+from core.dao.user_lock import lock_users
+from core.models.catalog import SKU, Product
+from core.models.transaction import LineItem, Transaction
+from core.models.transaction_search import TransactionSearchDocument
+
+
+def _weighted(text: ColumnElement, weight: str) -> ColumnElement:
+    return func.setweight(func.to_tsvector("english", func.coalesce(text, "")), weight)
+
+
+def transaction_documents_select(
+    transaction_ids: Optional[list[uuid.UUID]] = None,
+) -> Select:
+    """Search documents computed from every transaction (or the given ones)."""
+    products = (
+        select(
+            LineItem.transaction_id,
+            func.string_agg(Product.name, " ").label("names"),
+            func.string_agg(Product.set_name, " ").label("set_names"),
+            func.string_agg(
+                func.concat_ws(" ", Product.rarity, Product.number), " "
+            ).label("details"),
+        )
+        .join(SKU, SKU.id == LineItem.sku_id)
+        .join(Product, Product.id == SKU.product_id)
+    )
+    stmt = select(Transaction.id)
+    if transaction_ids is not None:
+        ids = bindparam(
+            "transaction_ids",
+            value=list(transaction_ids),
+            type_=ARRAY(PG_UUID(as_uuid=True)),
+        )
+        products = products.where(LineItem.transaction_id == any_(ids))
+        stmt = stmt.where(Transaction.id == any_(ids))
+    products = products.group_by(LineItem.transaction_id).subquery("products")
+    document = (
+        _weighted(Transaction.counterparty_name, "A")
+        .op("||")(_weighted(products.c.names, "A"))
+        .op("||")(_weighted(products.c.set_names, "B"))
+        .op("||")(_weighted(products.c.details, "C"))
+    )
+    return (
+        stmt.add_columns(document.label("document"))
+        .outerjoin(products, products.c.transaction_id == Transaction.id)
+        # Sorted so concurrent refreshes lock the rows in the same order
+        .order_by(Transaction.id)
+    )
+
+
+def _upsert_documents(documents: Select):
+    stmt = insert(TransactionSearchDocument).from_select(
+        ["transaction_id", "document"], documents
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[TransactionSearchDocument.transaction_id],
+        set_={"document": stmt.excluded.document, "updated_at": func.now()},
+        # Rewriting an unchanged row would only churn updated_at
+        where=TransactionSearchDocument.document != stmt.excluded.document,
+    )
+
+
+def refresh_transaction_search(
+    connection: Session | Connection, transaction_ids: Iterable[uuid.UUID]
+) -> None:
+    """
+    Recompute the search documents of ``transaction_ids`` that still exist.
+
+    Runs in the caller's transaction, which holds the transactions' users'
+    write lock from here on; deleted transactions take their document with
+    them.
+    """
+    transaction_ids = sorted(set(transaction_ids))
+    if not transaction_ids:
+        return
+    lock_users(
+        connection,
+        connection.execute(
+            select(Transaction.user_id)
+            .where(Transaction.id.in_(transaction_ids))
+            .distinct()
+        ).scalars(),
+    )
+    connection.execute(_upsert_documents(transaction_documents_select(transaction_ids)))
+
+
+def refresh_transaction_search_for_products(
+    connection: Session | Connection, product_ids: Iterable[uuid.UUID]
+) -> None:
+    """
+    Recompute the search documents of transactions with line items of ``product_ids``.
+
+    Runs in the caller's transaction, like refresh_transaction_search.
+    """
+    product_ids = sorted(set(product_ids))
+    if not product_ids:
+        return
+    refresh_transaction_search(
+        connection,
+        connection.execute(
+            select(LineItem.transaction_id)
+            .join(SKU, SKU.id == LineItem.sku_id)
+            .where(SKU.product_id.in_(product_ids))
+            .distinct()
+        ).scalars(),
+    )
+
+
+def rebuild_transaction_search(session: Session) -> int:
+    """
+    Replace every search document with a recomputation.
+
+    Runs in the caller's transaction.
+
+    Returns:
+        Number of documents written
+    """
+    session.execute(delete(TransactionSearchDocument))
+    return session.execute(_upsert_documents(transaction_documents_select())).rowcount
+
+
+def transaction_search_query(search_query: str) -> Optional[ColumnElement]:
+    """Prefix tsquery matching every term of ``search_query`` (None if blank)."""
+    search_terms = search_query.split()
+    if not search_terms:
+        return None
+    prefix_terms = [term + ":*" for term in search_terms]
+    return func.to_tsquery("english", " & ".join(prefix_terms))
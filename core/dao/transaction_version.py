@@ -0,0 +1,29 @@
+"""
+Data access for the per-user transaction version (see `TransactionVersion`).
+
+Everything that can change a user's transaction totals moves the version in
+its own transaction, alongside the daily totals refresh: transaction and line
+item writes through the ORM (see the flush hook in `core.dao.transaction`) and
+the set-based deletes there.
+"""
+
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import Connection
+from sqlalchemy.orm import Session
+
+from core.dao.user_version import bump_user_versions, get_user_version
+from core.models.transaction_version import TransactionVersion
+
+
+def get_transaction_version(session: Session, user_id: UUID) -> int:
+    """Current transaction version of a user (0 if it never moved)."""
+    return get_user_version(session, TransactionVersion, user_id)
+
+
+def bump_transaction_versions(
+    connection: Session | Connection, user_ids: Iterable[UUID]
+) -> None:
+    """Move the transaction version of ``user_ids``, in the caller's transaction."""
+    bump_user_versions(connection, TransactionVersion, user_ids)
@@ -0,0 +1,33 @@
+"""
+Per-user write lock of the tables derived from a user's transactions.
+
+The inventory holdings ledger, the transaction daily totals rollup and the
+transaction search documents are recomputed from the rows a write touched,
+with one INSERT … SELECT … ON CONFLICT DO UPDATE. Under READ COMMITTED that
+statement reads a snapshot taken when it starts, so two transactions writing
+the same user's data at the same time could each upsert a sum that leaves out
+the other's rows. Taking the user's lock first makes the second writer wait
+until the first commits, and its recompute then starts from a snapshot that
+includes the first writer's rows.
+"""
+
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import Connection, func, select
+from sqlalchemy.orm import Session
+
+# First key of every per-user lock; the second is taken from the user ID
+USER_LOCK_CLASS_ID = 0x5553  # "US"
+
+
+def user_lock_key(user_id: UUID) -> tuple[int, int]:
+    """pg_advisory_xact_lock keys of a user's write lock."""
+    return USER_LOCK_CLASS_ID, int.from_bytes(user_id.bytes[:4], "big", signed=True)
+
+
+def lock_users(connection: Session | Connection, user_ids: Iterable[UUID]) -> None:
+    """Wait for the write lock of ``user_ids``, held until the caller's transaction ends."""
+    # Sorted so concurrent writers take the locks in the same order
+    for user_id in sorted(set(user_ids)):
+        connection.execute(select(func.pg_advisory_xact_lock(*user_lock_key(user_id))))
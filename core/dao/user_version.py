@@ -0,0 +1,56 @@
+"""
+Data access shared by the per-user version counters (`InventoryVersion`,
+`TransactionVersion`).
+
+Each counter table has one row per user whose version moved; users without a
+row are at version 0. Writers move a user's version in the same transaction as
+the change it tracks, so a cached value tagged with the version read before
+computing it is never older than that version.
+"""
+
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import Connection, Select, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from core.models.inventory_version import InventoryVersion
+from core.models.transaction_version import TransactionVersion
+
+UserVersionModel = type[InventoryVersion] | type[TransactionVersion]
+
+
+def get_user_version(session: Session, model: UserVersionModel, user_id: UUID) -> int:
+    """Current version of a user in ``model``'s table (0 if it never moved)."""
+    version = session.scalar(select(model.version).where(model.user_id == user_id))
+    return version or 0
+
+
+def bump_user_versions(
+    connection: Session | Connection,
+    model: UserVersionModel,
+    user_ids: Iterable[UUID] | Select,
+) -> None:
+    """
+    Move the version of users in ``model``'s table, in the caller's transaction.
+
+    Args:
+        connection: Session or connection of the caller's transaction
+        model: Version table to move
+        user_ids: User IDs, or a select of one user ID column ordered by it
+    """
+    if isinstance(user_ids, Select):
+        stmt = insert(model).from_select([model.user_id], user_ids)
+    else:
+        # Sorted so concurrent bumps lock the rows in the same order
+        rows = [{"user_id": user_id} for user_id in sorted(set(user_ids))]
+        if not rows:
+            return
+        stmt = insert(model).values(rows)
+    connection.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[model.user_id],
+            set_={"version": model.version + 1, "updated_at": func.now()},
+        )
+    )
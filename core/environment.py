@@ -12,6 +12,11 @@ class Env(str, Enum):
     PROD = "PROD"
 
 
+class OutlierFilterImpl(str, Enum):
+    DECIMAL = "DECIMAL"
+    NUMPY = "NUMPY"
+
+
 class Environment(BaseSettings):
     env: Env
     db_username: str
@@ -29,6 +34,9 @@ class Environment(BaseSettings):
     # Redis configuration
     redis_url: str
 
+    # Implementation of the eBay listing price outlier (Hampel) filter
+    ebay_outlier_filter: OutlierFilterImpl = OutlierFilterImpl.NUMPY
+
     # Optional: browser session cookie and feature param for TCGplayer web API
     tcgplayer_cookie: str | None = None
 
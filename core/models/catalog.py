@@ -63,7 +63,7 @@ class Product(Base):
     # name but without hyphens, semicolons, etc
     clean_name: Mapped[str | None] = mapped_column(index=True)
     image_url: Mapped[Optional[str]]
-    set_id: Mapped[int] = mapped_column(ForeignKey(f"{set_tablename}.id"))
+    set_id: Mapped[int] = mapped_column(ForeignKey(f"{set_tablename}.id"), index=True)
     set: Mapped["Set"] = relationship(back_populates="products")
     skus: Mapped[List["SKU"]] = relationship(back_populates="product")
     variants: Mapped[List["ProductVariant"]] = relationship(back_populates="product")
@@ -142,7 +142,9 @@ class SKU(Base):
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid7)
     tcgplayer_id: Mapped[int] = mapped_column(unique=True)
-    product_id: Mapped[int] = mapped_column(ForeignKey(f"{product_tablename}.id"))
+    product_id: Mapped[int] = mapped_column(
+        ForeignKey(f"{product_tablename}.id"), index=True
+    )
     product: Mapped["Product"] = relationship(back_populates="skus")
     printing_id: Mapped[int] = mapped_column(ForeignKey(f"{printing_tablename}.id"))
     printing: Mapped["Printing"] = relationship()
@@ -14,6 +14,7 @@ from core.models.catalog import SKU, sku_tablename
 from core.models.types import TextEnum
 
 buy_decision_tablename = "buy_decision"
+current_buy_decision_tablename = "buy_decision_current"
 
 
 class Decision(StrEnum):
@@ -56,3 +57,56 @@ class BuyDecision(Base):
             postgresql_where=(decision == Decision.BUY),
         ),
     )
+
+
+class CurrentBuyDecision(Base):
+    """
+    Projection holding the most recent decision per SKU.
+
+    Maintained by the purchase decision sweep alongside the append-only
+    ``buy_decision`` history so readers never have to DISTINCT ON the full log.
+    """
+
+    __tablename__ = current_buy_decision_tablename
+
+    sku_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey(f"{sku_tablename}.id"), primary_key=True
+    )
+    buy_decision_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey(f"{buy_decision_tablename}.id"), nullable=False
+    )
+    decision: Mapped[Decision] = mapped_column(TextEnum(Decision), nullable=False)
+    quantity: Mapped[int] = mapped_column(Integer, nullable=False)
+    buy_vwap: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
+    expected_resale_net: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
+    # Per-unit edge (expected_resale_net - buy_vwap)
+    expected_margin: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
+    # Total edge across the recommended quantity (expected_margin * quantity)
+    expected_profit: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+
+    buy_decision: Mapped[BuyDecision] = relationship("BuyDecision", lazy="select")
+
+    __table_args__ = (
+        # Keyset pagination indexes for each supported sort, BUY rows only
+        Index(
+            "ix_buy_decision_current_resale_net",
+            expected_resale_net.desc(),
+            sku_id.desc(),
+            postgresql_where=(decision == Decision.BUY),
+        ),
+        Index(
+            "ix_buy_decision_current_margin",
+            expected_margin.desc(),
+            sku_id.desc(),
+            postgresql_where=(decision == Decision.BUY),
+        ),
+        Index(
+            "ix_buy_decision_current_profit",
+            expected_profit.desc(),
+            sku_id.desc(),
+            postgresql_where=(decision == Decision.BUY),
+        ),
+    )
@@ -0,0 +1,79 @@
+"""
+SQLAlchemy models for persisted eBay EPID resolution state.
+
+Resolution outcomes, browse search results and item-detail validation aspects are
+stored so reruns of the EPID resolver skip settled products and reuse API responses
+shared across products.
+"""
+
+from datetime import datetime
+from enum import StrEnum
+from typing import List
+
+from sqlalchemy import DateTime, Integer, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from core.models.base import Base
+from core.models.types import TextEnum
+
+ebay_epid_resolution_tablename = "ebay_epid_resolution"
+ebay_search_result_tablename = "ebay_search_result"
+ebay_item_validation_tablename = "ebay_item_validation"
+
+
+class EpidResolutionStatus(StrEnum):
+    RESOLVED = "RESOLVED"
+    NOT_FOUND = "NOT_FOUND"
+
+
+class EbayEpidResolution(Base):
+    """Outcome of resolving one product search input to an EPID."""
+
+    __tablename__ = ebay_epid_resolution_tablename
+
+    # sha256 of the normalized ProductSearchInput fields
+    resolution_key: Mapped[str] = mapped_column(Text, primary_key=True)
+    status: Mapped[EpidResolutionStatus] = mapped_column(
+        TextEnum(EpidResolutionStatus), nullable=False
+    )
+    epid: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # API calls the resolution cost, used to report calls saved on reruns
+    api_calls: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    resolved_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+class EbaySearchResult(Base):
+    """EPID -> item ids collected from one browse search."""
+
+    __tablename__ = ebay_search_result_tablename
+
+    query: Mapped[str] = mapped_column(Text, primary_key=True)
+    # Empty string when the search ran without an aspect filter
+    aspect_filter: Mapped[str] = mapped_column(Text, primary_key=True)
+    # [[epid, [item_id, ...]], ...] in the order the search returned them; a JSONB
+    # object would not preserve EPID order, which breaks frequency ties
+    epid_item_ids: Mapped[List[list]] = mapped_column(JSONB, nullable=False)
+    fetched_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+class EbayItemValidation(Base):
+    """Validation aspects extracted from one item's PRODUCT fieldgroup."""
+
+    __tablename__ = ebay_item_validation_tablename
+
+    item_id: Mapped[str] = mapped_column(Text, primary_key=True)
+    # NULL aspects mean the item carried no catalog or localized aspect data
+    card_number: Mapped[str | None] = mapped_column(Text, nullable=True)
+    finish: Mapped[str | None] = mapped_column(Text, nullable=True)
+    features: Mapped[str | None] = mapped_column(Text, nullable=True)
+    language: Mapped[str | None] = mapped_column(Text, nullable=True)
+    source: Mapped[str | None] = mapped_column(Text, nullable=True)
+    fetched_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
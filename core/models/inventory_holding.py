@@ -0,0 +1,33 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import ForeignKey, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from core.models.base import Base
+from core.models.catalog import sku_tablename
+from core.models.types import MoneyAmount
+
+
+class InventoryHolding(Base):
+    """
+    A user's current holding of one SKU: the sums over their line items'
+    ``remaining_quantity`` and ``unit_price_amount * remaining_quantity``.
+
+    Maintained in the same transaction as every ORM write to line items (see
+    the flush hook in `core.dao.transaction`); only SKUs with a positive
+    quantity have a row. `scripts/verify_inventory_holdings.py` diffs it
+    against a recomputation from the line items and can rebuild it.
+    """
+
+    __tablename__ = "inventory_holding"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    sku_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey(f"{sku_tablename}.id"), primary_key=True, index=True
+    )
+    quantity: Mapped[int]
+    total_cost: Mapped[MoneyAmount]
+    updated_at: Mapped[datetime] = mapped_column(
+        server_default=func.now(), onupdate=func.now()
+    )
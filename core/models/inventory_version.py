@@ -0,0 +1,26 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from core.models.base import Base
+
+
+class InventoryVersion(Base):
+    """
+    Per-user counter that moves whenever the user's inventory valuation can change.
+
+    Writes to the user's line items and latest price refreshes of SKUs the user
+    holds increment it in the same database transaction, so a valuation tagged
+    with the version read before computing it is never older than that version.
+    Users without a row are at version 0.
+    """
+
+    __tablename__ = "inventory_version"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, server_default=text("1"))
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
@@ -0,0 +1,56 @@
+"""
+SQLAlchemy model for the materialized market indicator SKU set.
+
+Membership is recomputed from the catalog after each catalog ingest, so price and
+scoring jobs read an indexed table instead of re-evaluating the condition,
+language and product name filters on every run.
+"""
+
+import uuid
+from datetime import datetime
+from enum import StrEnum
+
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from core.models.base import Base
+from core.models.catalog import sku_tablename
+from core.models.types import TextEnum
+
+market_indicator_sku_tablename = "market_indicator_sku"
+
+
+class MarketIndicatorClassification(StrEnum):
+    # Near Mint or Lightly Played English card
+    CARD = "CARD"
+    # Sealed product other than a booster pack
+    SEALED = "SEALED"
+    # Sealed product whose name contains "Booster Pack"
+    BOOSTER_PACK = "BOOSTER_PACK"
+
+
+class MarketIndicatorSKU(Base):
+    """One SKU that is a market indicator, a booster pack, or both."""
+
+    __tablename__ = market_indicator_sku_tablename
+
+    sku_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey(f"{sku_tablename}.id"), primary_key=True
+    )
+    classification: Mapped[MarketIndicatorClassification] = mapped_column(
+        TextEnum(MarketIndicatorClassification), nullable=False
+    )
+    # False for booster pack SKUs outside the market indicator criteria
+    is_market_indicator: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    refreshed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    __table_args__ = (
+        Index(
+            "ix_market_indicator_sku_indicator",
+            "sku_id",
+            postgresql_where=is_market_indicator,
+        ),
+        Index("ix_market_indicator_sku_classification", "classification", "sku_id"),
+    )
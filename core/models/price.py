@@ -1,6 +1,6 @@
 import enum
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 from decimal import Decimal
 
 from sqlalchemy import ForeignKey, DateTime, Numeric, Index, func, CheckConstraint
@@ -16,6 +16,7 @@ sku_price_snapshot_job_tablename = "sku_price_snapshot_job"
 # sku_listing_snapshot_tablename = "sku_listing_snapshot" # Mark for removal
 sku_price_data_snapshot_tablename = "sku_price_data_snapshot"
 sku_latest_price_tablename = "sku_latest_price"
+sku_price_reference_tablename = "sku_price_reference"
 sku_listing_data_refresh_priority_tablename = "sku_listing_data_refresh_priority"
 
 
@@ -97,6 +98,67 @@ class SKUPriceDataSnapshot(Base):
     )
 
 
+class PriceReferenceHorizon(enum.StrEnum):
+    HOURS_24 = "24h"
+    DAYS_7 = "7d"
+    DAYS_30 = "30d"
+
+    @property
+    def delta(self) -> timedelta:
+        return {
+            PriceReferenceHorizon.HOURS_24: timedelta(hours=24),
+            PriceReferenceHorizon.DAYS_7: timedelta(days=7),
+            PriceReferenceHorizon.DAYS_30: timedelta(days=30),
+        }[self]
+
+    @classmethod
+    def from_days(cls, days: int) -> "PriceReferenceHorizon | None":
+        """The horizon covering exactly ``days`` days, if one is precomputed."""
+        return {1: cls.HOURS_24, 7: cls.DAYS_7, 30: cls.DAYS_30}.get(days)
+
+
+class PriceHistoryResolution(enum.StrEnum):
+    DAILY = "daily"
+    WEEKLY = "weekly"
+
+    @property
+    def step(self) -> timedelta:
+        return {
+            PriceHistoryResolution.DAILY: timedelta(days=1),
+            PriceHistoryResolution.WEEKLY: timedelta(weeks=1),
+        }[self]
+
+
+class SKUPriceReference(Base):
+    """
+    A SKU's price at a fixed horizon before the last snapshot run.
+
+    One row per (sku, marketplace, horizon) holding the most recent snapshot on
+    or before ``snapshot_dt - horizon``, refreshed by each run that writes
+    snapshots. Lets "price N days ago" lookups read one row per SKU instead of
+    searching snapshot history.
+    """
+
+    __tablename__ = sku_price_reference_tablename
+
+    sku_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey(f"{sku_tablename}.id"), primary_key=True
+    )
+    marketplace: Mapped[Marketplace] = mapped_column(
+        TextEnum(Marketplace), nullable=False, primary_key=True
+    )
+    horizon: Mapped[PriceReferenceHorizon] = mapped_column(
+        TextEnum(PriceReferenceHorizon), nullable=False, primary_key=True
+    )
+    # snapshot_datetime of the referenced snapshot
+    reference_datetime: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    lowest_listing_price_total: Mapped[Decimal] = mapped_column(
+        Numeric(10, 2), nullable=False
+    )
+
+
 class SKUListingDataRefreshPriority(Base):
     __tablename__ = sku_listing_data_refresh_priority_tablename
 
@@ -3,7 +3,7 @@ from datetime import datetime
 from enum import StrEnum
 from typing import Optional
 
-from sqlalchemy import ForeignKey, DateTime, String
+from sqlalchemy import ForeignKey, DateTime, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from uuid_extensions import uuid7
 
@@ -42,13 +42,13 @@ class LineItemConsumption(Base):
 
     # The sale line item that consumes some quantity
     sale_line_item_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey(f"{line_item_tablename}.id")
+        ForeignKey(f"{line_item_tablename}.id"), index=True
     )
     sale_line_item: Mapped["LineItem"] = relationship(foreign_keys=[sale_line_item_id])
 
     # The purchase line item from which the quantity is taken
     purchase_line_item_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey(f"{line_item_tablename}.id")
+        ForeignKey(f"{line_item_tablename}.id"), index=True
     )
     purchase_line_item: Mapped["LineItem"] = relationship(
         foreign_keys=[purchase_line_item_id]
@@ -67,7 +67,9 @@ class LineItem(Base):
     user_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("users.id"), nullable=False, index=True
     )
-    sku_id: Mapped[uuid.UUID] = mapped_column(ForeignKey(f"{sku_tablename}.id"))
+    sku_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey(f"{sku_tablename}.id"), index=True
+    )
     sku: Mapped[SKU] = relationship()
     quantity: Mapped[int]
 
@@ -77,7 +79,7 @@ class LineItem(Base):
     unit_price_amount: Mapped[MoneyAmount]
 
     transaction_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey(f"{transaction_tablename}.id")
+        ForeignKey(f"{transaction_tablename}.id"), index=True
     )
     transaction: Mapped["Transaction"] = relationship(back_populates="line_items")
 
@@ -96,7 +98,8 @@ class Transaction(Base):
     user_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("users.id"), nullable=False, index=True
     )
-    date: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    # Load the old date before a change so the day it leaves can be refreshed
+    date: Mapped[datetime] = mapped_column(DateTime(timezone=True), active_history=True)
     type: Mapped[TransactionType] = mapped_column(
         TextEnum(TransactionType), nullable=False
     )
@@ -113,3 +116,10 @@ class Transaction(Base):
     tax_amount: Mapped[MoneyAmount] = mapped_column(server_default="0")
 
     user: Mapped[User] = relationship()
+
+    __table_args__ = (
+        # Per-day lookups of a user's transactions (daily totals rollup)
+        Index("ix_transaction_user_id_date", "user_id", "date"),
+        # A user's transactions by type (transaction metrics)
+        Index("ix_transaction_user_id_type_date", "user_id", "type", "date"),
+    )
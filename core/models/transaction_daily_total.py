@@ -0,0 +1,32 @@
+import uuid
+from datetime import date, datetime
+
+from sqlalchemy import ForeignKey, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from core.models.base import Base
+from core.models.types import MoneyAmount
+
+
+class TransactionDailyTotal(Base):
+    """
+    A user's transaction totals for one calendar day: how many sales and
+    purchases they recorded, sales revenue (line items + tax - shipping) and
+    purchase expenses (line items + tax + shipping).
+
+    Maintained in the same transaction as every write to transactions and
+    line items (see the flush hook in `core.dao.transaction`); only days with
+    at least one transaction have a row.
+    """
+
+    __tablename__ = "transaction_daily_total"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    day: Mapped[date] = mapped_column(primary_key=True)
+    sale_count: Mapped[int]
+    revenue: Mapped[MoneyAmount]
+    purchase_count: Mapped[int]
+    expenses: Mapped[MoneyAmount]
+    updated_at: Mapped[datetime] = mapped_column(
+        server_default=func.now(), onupdate=func.now()
+    )
@@ -0,0 +1,36 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import ForeignKey, Index, func
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Mapped, mapped_column
+
+from core.models.base import Base
+from core.models.transaction import transaction_tablename
+
+
+class TransactionSearchDocument(Base):
+    """
+    A transaction's full-text search document: its counterparty and the name
+    (weight A), set (B), rarity and number (C) of every product it has a line
+    item for.
+
+    Maintained in the same transaction as every write to transactions and
+    line items (see the flush hook in `core.dao.transaction`) and removed with
+    its transaction.
+    """
+
+    __tablename__ = "transaction_search"
+
+    transaction_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey(f"{transaction_tablename}.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    document: Mapped[TSVECTOR] = mapped_column(TSVECTOR)
+    updated_at: Mapped[datetime] = mapped_column(
+        server_default=func.now(), onupdate=func.now()
+    )
+
+    __table_args__ = (
+        Index("ix_transaction_search_document", "document", postgresql_using="gin"),
+    )
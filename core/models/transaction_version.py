@@ -0,0 +1,26 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from core.models.base import Base
+
+
+class TransactionVersion(Base):
+    """
+    Per-user counter that moves whenever the user's transaction totals can change.
+
+    Writes to the user's transactions and line items increment it in the same
+    database transaction, so metrics tagged with the version read before
+    computing them are never older than that version. Users without a row are
+    at version 0.
+    """
+
+    __tablename__ = "transaction_version"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, server_default=text("1"))
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
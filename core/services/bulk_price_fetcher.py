@@ -0,0 +1,245 @@
+"""Concurrent, coalescing TCGPlayer SKU price fetcher with adaptive batch sizing."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterable, Optional, Set
+
+from core.services.schemas.schema import SKUPricingResponseSchema, SKUPricingSchema
+from core.services.tcgplayer_catalog_service import TCGPlayerCatalogService
+
+logger = logging.getLogger(__name__)
+
+# SKU IDs are comma-joined into the pricing URL, which caps a request at ~200 IDs
+MAX_SKU_IDS_PER_REQUEST = 200
+MIN_SKU_IDS_PER_REQUEST = 25
+BATCH_SIZE_STEP = 25
+DEFAULT_MAX_CONCURRENCY = 10
+DEFAULT_TARGET_LATENCY_SECONDS = 2.0
+DEFAULT_COALESCE_WINDOW_SECONDS = 0.05
+DEFAULT_MAX_ATTEMPTS = 3
+
+
+@dataclass
+class BulkFetchStats:
+    """Request and SKU accounting for one fetcher."""
+
+    requests: int = 0
+    failed_requests: int = 0
+    skus_requested: int = 0
+    # IDs another caller had already queued or sent
+    skus_coalesced: int = 0
+    skus_fetched: int = 0
+    skus_failed: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"{self.requests} price requests ({self.failed_requests} failed), "
+            f"{self.skus_requested} SKUs requested, {self.skus_coalesced} coalesced, "
+            f"{self.skus_fetched} fetched, {self.skus_failed} failed"
+        )
+
+
+class _FlushGroup:
+    """IDs first requested within one coalescing window, resolved together."""
+
+    __slots__ = ("prices", "remaining", "done")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.prices: Dict[int, SKUPricingSchema] = {}
+        self.remaining = 0
+        self.done: asyncio.Future = loop.create_future()
+
+
+class BulkSkuPriceFetcher:
+    """Fetch SKU prices in concurrent batches, shared by every caller.
+
+    IDs requested within ``coalesce_window`` seconds of each other are pooled, and
+    an ID already queued or in flight is never requested twice. Fan-out and
+    batch size adapt to the API: a failed request halves the number of batches
+    in flight, a request slower than ``target_latency`` halves the batch size,
+    and both grow back, up to ``max_concurrency`` and ``max_batch_size``, while
+    requests are fast. A failed batch is retried first; IDs that still fail
+    after ``max_attempts`` are left out of the results.
+
+    ``get_sku_prices`` has the same contract as
+    ``TCGPlayerCatalogService.get_sku_prices``, so the fetcher can stand in for
+    the service, and callers can pass any number of IDs.
+    """
+
+    def __init__(
+        self,
+        catalog_service: TCGPlayerCatalogService,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        initial_batch_size: int = MAX_SKU_IDS_PER_REQUEST,
+        min_batch_size: int = MIN_SKU_IDS_PER_REQUEST,
+        max_batch_size: int = MAX_SKU_IDS_PER_REQUEST,
+        target_latency: float = DEFAULT_TARGET_LATENCY_SECONDS,
+        coalesce_window: float = DEFAULT_COALESCE_WINDOW_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ) -> None:
+        self.catalog_service = catalog_service
+        self.max_concurrency = max_concurrency
+        # Fractional so it can grow by about one per round trip of requests
+        self.concurrency = float(max_concurrency)
+        self.batch_size = initial_batch_size
+        self.min_batch_size = min_batch_size
+        self.max_batch_size = max_batch_size
+        self.target_latency = target_latency
+        self.coalesce_window = coalesce_window
+        self.max_attempts = max_attempts
+        self.stats = BulkFetchStats()
+
+        self._group: Optional[_FlushGroup] = None
+        self._pending: Dict[int, _FlushGroup] = {}
+        self._queued: Deque[int] = deque()
+        self._in_flight: Dict[int, _FlushGroup] = {}
+        self._attempts: Dict[int, int] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        # The loop only keeps weak references to tasks
+        self._worker_tasks: Set[asyncio.Task] = set()
+        self._workers = 0
+
+    async def get_sku_prices(
+        self, tcgplayer_sku_ids: Iterable[int]
+    ) -> SKUPricingResponseSchema:
+        requested = []
+        for sku_id in dict.fromkeys(tcgplayer_sku_ids):
+            self.stats.skus_requested += 1
+            group = self._pending.get(sku_id) or self._in_flight.get(sku_id)
+            if group is None:
+                if self._group is None:
+                    self._group = _FlushGroup(asyncio.get_running_loop())
+                group = self._group
+                group.remaining += 1
+                self._pending[sku_id] = group
+            else:
+                self.stats.skus_coalesced += 1
+            requested.append((sku_id, group))
+
+        if self._pending and self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+
+        # asyncio.wait leaves the shared futures alone if this caller is cancelled
+        waiting = {group.done for _, group in requested if not group.done.done()}
+        if waiting:
+            await asyncio.wait(waiting)
+        results = [group.prices.get(sku_id) for sku_id, group in requested]
+        return SKUPricingResponseSchema(
+            success=True,
+            errors=[],
+            results=[result for result in results if result is not None],
+        )
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self.coalesce_window)
+        self._flush_task = None
+        self._group = None
+
+        pending, self._pending = self._pending, {}
+        self._in_flight.update(pending)
+        self._queued.extend(pending)
+        self._spawn_workers()
+
+    def _spawn_workers(self) -> None:
+        while self._workers < int(self.concurrency) and self._queued:
+            self._workers += 1
+            task = asyncio.create_task(self._drain_queue())
+            self._worker_tasks.add(task)
+            task.add_done_callback(self._worker_tasks.discard)
+
+    async def _drain_queue(self) -> None:
+        batch: list[int] = []
+        try:
+            # Workers above a reduced concurrency exit after their current batch
+            while self._queued and self._workers <= int(self.concurrency):
+                batch = [
+                    self._queued.popleft()
+                    for _ in range(min(self.batch_size, len(self._queued)))
+                ]
+                await self._fetch_batch(batch)
+                batch = []
+        finally:
+            self._workers -= 1
+            # A batch interrupted by cancellation or a BaseException would
+            # otherwise leave its callers waiting forever
+            unfinished = [sku_id for sku_id in batch if sku_id in self._in_flight]
+            self.stats.skus_failed += len(unfinished)
+            for sku_id in unfinished:
+                self._resolve(sku_id, None)
+
+    async def _fetch_batch(self, batch: list[int]) -> None:
+        self.stats.requests += 1
+        fan_out = self._workers
+        started = time.monotonic()
+        try:
+            response = await self.catalog_service.get_sku_prices(batch)
+        except Exception as e:
+            self.stats.failed_requests += 1
+            # Halve relative to the fan-out the request was sent at, so a burst
+            # of concurrent failures halves once rather than once per failure
+            self.concurrency = max(1.0, min(self.concurrency, fan_out / 2))
+            self._retry_or_fail(batch, e)
+            return
+
+        latency = time.monotonic() - started
+        if latency > self.target_latency:
+            self._shrink_batch_size(len(batch))
+        else:
+            self.concurrency = min(
+                self.max_concurrency, self.concurrency + 1 / self.concurrency
+            )
+            self._spawn_workers()
+            if latency < self.target_latency / 2:
+                self.batch_size = min(
+                    self.max_batch_size, self.batch_size + BATCH_SIZE_STEP
+                )
+
+        prices = {price.sku_id: price for price in response.results}
+        self.stats.skus_fetched += len(batch)
+        for sku_id in batch:
+            self._resolve(sku_id, prices.get(sku_id))
+
+    def _shrink_batch_size(self, observed_batch_size: int) -> None:
+        # Halve relative to the batch that was slow, so concurrent slow responses
+        # of the same size shrink the batch size once rather than once each
+        self.batch_size = max(
+            self.min_batch_size, min(self.batch_size, observed_batch_size // 2)
+        )
+
+    def _retry_or_fail(self, batch: list[int], error: Exception) -> None:
+        retry = []
+        for sku_id in batch:
+            attempts = self._attempts.get(sku_id, 0) + 1
+            self._attempts[sku_id] = attempts
+            if attempts < self.max_attempts:
+                retry.append(sku_id)
+            else:
+                self.stats.skus_failed += 1
+                self._resolve(sku_id, None)
+
+        if retry:
+            # Retried before IDs that have not been tried yet
+            self._queued.extendleft(reversed(retry))
+        if len(retry) < len(batch):
+            logger.error(
+                "Giving up on %d SKU prices after %d attempts: %s",
+                len(batch) - len(retry),
+                self.max_attempts,
+                error,
+            )
+
+    def _resolve(self, sku_id: int, price: Optional[SKUPricingSchema]) -> None:
+        self._attempts.pop(sku_id, None)
+        group = self._in_flight.pop(sku_id, None)
+        if group is None:
+            return
+        if price is not None:
+            group.prices[sku_id] = price
+        group.remaining -= 1
+        if group.remaining == 0:
+            group.done.set_result(None)
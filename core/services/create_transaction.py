@@ -8,7 +8,7 @@ from sqlalchemy.orm import Session
 # Import core DAO types
 from core.dao.transaction import LineItemData
 from core.dao.catalog import get_skus_by_id
-from core.services.tcgplayer_catalog_service import TCGPlayerCatalogService
+from core.services.sku_price_source import PriceSource, SkuPriceSource
 # Import the new core schema type
 
 
@@ -18,24 +18,31 @@ class LineItemInput:
     quantity: int
 
 
+@dataclass
+class WeightedLineItemData(LineItemData):
+    # Where the price weighting this line came from
+    price_source: PriceSource = PriceSource.NONE
+
+
 async def calculate_weighted_unit_prices(
     session: Session,
-    catalog_service: TCGPlayerCatalogService,
+    price_source: SkuPriceSource,
     line_items: List[LineItemInput],
     total_amount: Decimal,
     user_id: uuid.UUID,
-) -> list[LineItemData]:
+) -> list[WeightedLineItemData]:
     """Calculates unit prices for line items based on market price weighting.
 
     Args:
         session: DB session.
-        catalog_service: TCGPlayer service.
+        price_source: Source of the SKUs' market prices.
         line_items: List of input line items (sku_id, quantity).
         total_amount: Total amount to distribute.
         user_id: The ID of the user creating the transaction.
 
     Returns:
-        List of LineItemData objects with calculated unit prices.
+        List of WeightedLineItemData objects with calculated unit prices and
+        the source of the price each was weighted by.
     """
     # Get SKU information for price calculation
     sku_id_to_tcgplayer_id = {
@@ -43,41 +50,33 @@ async def calculate_weighted_unit_prices(
         for sku in get_skus_by_id(session, ids=[item.sku_id for item in line_items])
     }
 
-    line_items_by_tcgplayer_id = {
-        sku_id_to_tcgplayer_id[item.sku_id]: item for item in line_items
-    }
-
-    # Get prices from TCGPlayer API
-    sku_prices = await catalog_service.get_sku_prices(
-        [tcgplayer_id for tcgplayer_id in sku_id_to_tcgplayer_id.values()]
+    # Get prices, in one lookup for every SKU
+    quotes = await price_source.get_prices(
+        session,
+        {
+            tcgplayer_id: sku_id
+            for sku_id, tcgplayer_id in sku_id_to_tcgplayer_id.items()
+        },
     )
 
     # Separate items with and without market prices
     items_with_prices = []
     items_without_prices = []
 
-    for sku_price in sku_prices.results:
-        # Find the original LineItemInput object corresponding to this TCGPlayer SKU ID
-        input_item = line_items_by_tcgplayer_id.get(
-            sku_price.sku_id
-        )  # This uses the mapping we already had
-
-        if sku_price.lowest_listing_price_total is not None:
-            items_with_prices.append((input_item, sku_price))
+    for item in line_items:
+        quote = quotes.get(item.sku_id)
+        if quote is not None and quote.price is not None:
+            items_with_prices.append((item, quote))
         else:
-            items_without_prices.append(input_item)
-        # else: handle case where SKU price is returned for an ID not in our input? Log warning?
+            items_without_prices.append(item)
 
     # Calculate market price for items that have prices
     priced_items_total = sum(
-        [
-            sku_price.lowest_listing_price_total * item.quantity
-            for item, sku_price in items_with_prices
-        ]
+        [quote.price * item.quantity for item, quote in items_with_prices]
     )
 
     # Prepare line items data with calculated prices
-    line_items_data: list[LineItemData] = []
+    line_items_data: list[WeightedLineItemData] = []
 
     # Calculate quantities
     total_priced_items_units = (
@@ -90,12 +89,6 @@ async def calculate_weighted_unit_prices(
     )
     total_units = total_priced_items_units + total_unpriced_items_units
 
-    # Create a mapping for priced items TCGPlayer ID to price
-    tcgplayer_id_to_lowest_price = {
-        sku_price.sku_id: sku_price.lowest_listing_price_total
-        for _, sku_price in items_with_prices
-    }
-
     # Calculate pricing parameters - unified approach for all scenarios
     # Determine allocation based on proportion of items with market prices
     # Avoid division by zero if total_units is 0
@@ -120,28 +113,25 @@ async def calculate_weighted_unit_prices(
     )
 
     # Create line items using a single approach
-    for item, sku_price in items_with_prices:
-        tcgplayer_id = sku_id_to_tcgplayer_id.get(item.sku_id)
-
+    for item, quote in items_with_prices:
         line_items_data.append(
-            LineItemData(
+            WeightedLineItemData(
                 sku_id=item.sku_id,
                 quantity=item.quantity,
-                unit_price_amount=tcgplayer_id_to_lowest_price.get(
-                    tcgplayer_id, Decimal(0)
-                )
-                * ratio_for_priced_items,
+                unit_price_amount=quote.price * ratio_for_priced_items,
                 user_id=user_id,
+                price_source=quote.source,
             )
         )
 
     for item in items_without_prices:
         line_items_data.append(
-            LineItemData(
+            WeightedLineItemData(
                 sku_id=item.sku_id,
                 quantity=item.quantity,
                 unit_price_amount=unpriced_unit_price,
                 user_id=user_id,
+                price_source=PriceSource.NONE,
             )
         )
 
@@ -2,10 +2,9 @@
 
 from __future__ import annotations
 
-import asyncio
 import json
 import logging
-from datetime import datetime, timedelta, timezone
+import time
 from collections.abc import Mapping
 from typing import Any, Optional, TypedDict
 
@@ -13,6 +12,7 @@ import aiohttp
 from aiohttp import TraceConfig, TraceRequestEndParams
 
 from core.environment import get_environment
+from core.services.oauth_token_store import CachedToken, SharedOAuthToken, TokenStore
 from core.services.schemas.ebay import BrowseSearchResponseSchema
 from pydantic import BaseModel
 
@@ -112,6 +112,7 @@ class EbayAPIClient:
         marketplace_id: str = EBAY_US_MARKETPLACE_ID,
         scope: str = EBAY_DEFAULT_SCOPE,
         request_timeout_seconds: int = 30,
+        token_store: Optional[TokenStore] = None,
     ) -> None:
         self.marketplace_id = marketplace_id
         self.scope = scope
@@ -126,9 +127,12 @@ class EbayAPIClient:
             )
 
         self._session: Optional[aiohttp.ClientSession] = None
-        self._token_lock = asyncio.Lock()
-        self._access_token: Optional[str] = None
-        self._token_expiry: Optional[datetime] = None
+        # Application tokens are shared with every client using the same credentials
+        self._token = SharedOAuthToken(
+            f"ebay:{self._client_id}:{self.scope}",
+            self._mint_token,
+            store=token_store,
+        )
 
     async def close(self) -> None:
         if self._session and not self._session.closed:
@@ -243,24 +247,11 @@ class EbayAPIClient:
         }
 
     async def _get_access_token(self) -> str:
-        if self._token_valid():
-            return self._access_token  # type: ignore[return-value]
-
-        async with self._token_lock:
-            if self._token_valid():
-                return self._access_token  # type: ignore[return-value]
-
-            token, expires_in = await self._request_new_token()
-            self._access_token = token
-            self._token_expiry = datetime.now(timezone.utc) + timedelta(
-                seconds=expires_in
-            )
-            return token
+        return await self._token.get_token()
 
-    def _token_valid(self) -> bool:
-        if not self._access_token or not self._token_expiry:
-            return False
-        return datetime.now(timezone.utc) < self._token_expiry
+    async def _mint_token(self) -> CachedToken:
+        token, expires_in = await self._request_new_token()
+        return CachedToken(token, time.time() + expires_in)
 
     async def _request_new_token(self) -> tuple[str, int]:
         session = await self._get_session()
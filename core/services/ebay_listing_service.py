@@ -7,9 +7,11 @@ import logging
 from decimal import Decimal
 from typing import List, Optional, TypedDict, NotRequired, Tuple
 
+import numpy as np
 import redis.asyncio as redis
 from fastapi import Depends
 
+from core.environment import OutlierFilterImpl, get_environment
 from core.models.price import Marketplace
 from core.services.base_marketplace_listing_service import BaseMarketplaceListingService
 from core.services.ebay_api_client import (
@@ -68,6 +70,69 @@ HAMPEL_MAD_SCALE = Decimal("1.4826")
 HAMPEL_MAX_REMOVAL_RATIO = 0.25
 HAMPEL_MIN_REMAINING = 3
 
+# Integer ratios of the band and cutoff widths in MADs (1.5 and 3 sigma_hat)
+_CLUSTER_BAND_RATIO = (HAMPEL_CLUSTER_SIGMA * HAMPEL_MAD_SCALE).as_integer_ratio()
+_LOW_CUTOFF_RATIO = (HAMPEL_LOW_SIGMA * HAMPEL_MAD_SCALE).as_integer_ratio()
+
+
+def _twice_median(values: np.ndarray) -> int:
+    """Return 2 * median of an integer array exactly, using O(n) selection."""
+    count = len(values)
+    midpoint = count // 2
+    if count % 2 == 1:
+        return 2 * int(np.partition(values, midpoint)[midpoint])
+    partitioned = np.partition(values, (midpoint - 1, midpoint))
+    return int(partitioned[midpoint - 1]) + int(partitioned[midpoint])
+
+
+def hampel_low_outlier_mask(
+    total_cents: np.ndarray,
+) -> Optional[Tuple[np.ndarray, Decimal, Decimal]]:
+    """Guarded Hampel low-outlier test on integer cent totals.
+
+    Integer arithmetic on 2 * median and 4 * MAD makes every comparison exact,
+    so decisions match the Decimal implementation for whole-cent prices.
+
+    Args:
+        total_cents: Price plus shipping of each listing, in cents
+
+    Returns:
+        (drop mask, median price, sigma_hat) when listings should be removed,
+        or None when the filter does not apply
+    """
+    if len(total_cents) < HAMPEL_MIN_SAMPLE_SIZE:
+        return None
+
+    median_x2 = _twice_median(total_cents)
+    # deviations_x2 = 2 * |price - median|, so mad_x4 = 4 * MAD
+    deviations_x2 = np.abs(2 * total_cents - median_x2)
+    mad_x4 = _twice_median(deviations_x2)
+    if mad_x4 == 0:
+        return None
+
+    band_num, band_den = _CLUSTER_BAND_RATIO
+    cluster_count = int(
+        np.count_nonzero(2 * deviations_x2 * band_den <= band_num * mad_x4)
+    )
+    if cluster_count < HAMPEL_CLUSTER_MIN_SIZE:
+        return None
+    if cluster_count / len(total_cents) < HAMPEL_CLUSTER_MIN_RATIO:
+        return None
+
+    cutoff_num, cutoff_den = _LOW_CUTOFF_RATIO
+    drop = (2 * median_x2 - 4 * total_cents) * cutoff_den > cutoff_num * mad_x4
+    removal_count = int(np.count_nonzero(drop))
+    if removal_count == 0:
+        return None
+    if removal_count / len(total_cents) > HAMPEL_MAX_REMOVAL_RATIO:
+        return None
+    if (len(total_cents) - removal_count) < HAMPEL_MIN_REMAINING:
+        return None
+
+    median_price = Decimal(median_x2) / 200
+    sigma_hat = HAMPEL_MAD_SCALE * Decimal(mad_x4) / 400
+    return drop, median_price, sigma_hat
+
 
 def build_card_aspect_filter(
     language: Optional[ListingLanguage],
@@ -130,9 +195,15 @@ class EbayListingService(BaseMarketplaceListingService):
     def marketplace_name(self) -> str:
         return "ebay"
 
-    def __init__(self, redis_client: redis.Redis, api_client: EbayAPIClient) -> None:
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        api_client: EbayAPIClient,
+        outlier_filter: OutlierFilterImpl = OutlierFilterImpl.NUMPY,
+    ) -> None:
         super().__init__(redis_client)
         self.api_client = api_client
+        self.outlier_filter = outlier_filter
 
     def _extract_card_conditions(
         self, refinement: Optional[RefinementSchema]
@@ -165,6 +236,63 @@ class EbayListingService(BaseMarketplaceListingService):
         self, items: List[ItemSummarySchema]
     ) -> List[ItemSummarySchema]:
         """Remove extreme low-price outliers using a guarded Hampel filter."""
+        if self.outlier_filter == OutlierFilterImpl.NUMPY:
+            filtered_items = self._filter_price_outliers_numpy(items)
+            if filtered_items is not None:
+                return filtered_items
+        return self._filter_price_outliers_decimal(items)
+
+    def _filter_price_outliers_numpy(
+        self, items: List[ItemSummarySchema]
+    ) -> Optional[List[ItemSummarySchema]]:
+        """Hampel filter over integer cents.
+
+        Returns None if any total is not a whole number of cents, in which case
+        the Decimal implementation must be used.
+        """
+        priced_items: List[ItemSummarySchema] = []
+        total_cents: List[int] = []
+        for item in items:
+            price = item.price
+            if not price or price.value is None:
+                continue
+
+            total_price = price.value
+            if item.shipping_options:
+                shipping_cost = item.shipping_options[0].shipping_cost
+                if shipping_cost and shipping_cost.value is not None:
+                    total_price += shipping_cost.value
+
+            cents = total_price * 100
+            whole_cents = int(cents)
+            if whole_cents != cents:
+                return None
+            priced_items.append(item)
+            total_cents.append(whole_cents)
+
+        outliers = hampel_low_outlier_mask(np.array(total_cents, dtype=np.int64))
+        if outliers is None:
+            return items
+
+        drop, median_price, sigma_hat = outliers
+        removal_identity = {id(priced_items[i]) for i in np.flatnonzero(drop)}
+        filtered_items = [item for item in items if id(item) not in removal_identity]
+
+        logger.info(
+            "Hampel filtered %d low-priced eBay listings "
+            "(median=$%s, sigma_hat=$%s, cutoff=$%s, sample=%d)",
+            len(removal_identity),
+            format(median_price, ".2f"),
+            format(sigma_hat, ".2f"),
+            format(median_price - HAMPEL_LOW_SIGMA * sigma_hat, ".2f"),
+            len(priced_items),
+        )
+        return filtered_items
+
+    def _filter_price_outliers_decimal(
+        self, items: List[ItemSummarySchema]
+    ) -> List[ItemSummarySchema]:
+        """Hampel filter computed in Decimal; handles sub-cent prices."""
         if not items:
             return items
 
@@ -686,4 +814,8 @@ def get_ebay_listing_service(
 ) -> EbayListingService:
     """FastAPI dependency returning the simplified eBay listing service."""
 
-    return EbayListingService(redis_client, api_client)
+    return EbayListingService(
+        redis_client,
+        api_client,
+        outlier_filter=get_environment().ebay_outlier_filter,
+    )
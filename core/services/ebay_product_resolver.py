@@ -5,7 +5,7 @@ from __future__ import annotations
 import logging
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import Iterable, NamedTuple
+from typing import TYPE_CHECKING, Iterable, NamedTuple
 
 from core.services.ebay_api_client import (
     EbayAPIClient,
@@ -15,6 +15,8 @@ from core.services.ebay_api_client import (
 from core.services.schemas.ebay import BrowseSearchResponseSchema
 from core.services.ebay_listing_service import PRINTING_TO_EBAY_ASPECT_MAPPING
 
+if TYPE_CHECKING:
+    from core.services.ebay_resolution_store import EbayResolutionStore
 
 logger = logging.getLogger(__name__)
 
@@ -43,14 +45,33 @@ class ProductSearchInput:
     language_name: str | None = None
 
 
+class MissingValidationDataError(ValueError):
+    """The sample item carries no catalog or localized aspects to validate against."""
+
+
+@dataclass
+class _ResolveAttempt:
+    """Bookkeeping for one uncached resolve() call."""
+
+    # Searches and getItem lookups a from-scratch resolution needs (made or reused)
+    api_calls: int = 0
+    # An API error hid part of the evidence, so a negative outcome is not final
+    inconclusive: bool = False
+
+
 class EbayProductResolver:
     """Resolver that will map internal products to eBay EPIDs using validation."""
 
     DEFAULT_CATEGORY_ID = "183454"  # CCG Individual Cards category
     DEFAULT_LIMIT = 25
 
-    def __init__(self, api_client: EbayAPIClient | None = None) -> None:
+    def __init__(
+        self,
+        api_client: EbayAPIClient | None = None,
+        resolution_store: EbayResolutionStore | None = None,
+    ) -> None:
         self.api_client = api_client or EbayAPIClient()
+        self.resolution_store = resolution_store
 
     @staticmethod
     def _normalize_card_number(card_number: str) -> str:
@@ -265,8 +286,34 @@ class EbayProductResolver:
         # Only return if we have at least one filter beyond categoryId
         return ",".join(filters) if len(filters) > 1 else None
 
+    async def _fetch_validation_data(
+        self, item_id: str, attempt: _ResolveAttempt
+    ) -> ValidationData | None:
+        """Return validation aspects for an item, reusing stored getItem outcomes."""
+        attempt.api_calls += 1
+
+        if self.resolution_store is not None:
+            cached = self.resolution_store.get_item_validation(item_id)
+            if cached is not None:
+                return cached.validation_data
+            self.resolution_store.note_api_call()
+
+        # Fetch item details with PRODUCT fieldgroup
+        item_data = await self.api_client.get_item(item_id, fieldgroups="PRODUCT")
+
+        validation_data = self._extract_validation_data(item_data)
+
+        if self.resolution_store is not None:
+            self.resolution_store.record_item_validation(item_id, validation_data)
+
+        return validation_data
+
     async def _validate_epid(
-        self, epid: str, product_input: ProductSearchInput, sample_item_id: str
+        self,
+        epid: str,
+        product_input: ProductSearchInput,
+        sample_item_id: str,
+        attempt: _ResolveAttempt | None = None,
     ) -> bool:
         """Validate that an EPID matches the ProductVariant by checking product features.
 
@@ -274,22 +321,21 @@ class EbayProductResolver:
             epid: The EPID to validate
             product_input: Product search input with card details
             sample_item_id: A sample item_id with this EPID to call getItem on
+            attempt: Bookkeeping for the enclosing resolve() call
 
         Returns:
             True if the EPID matches the ProductVariant, False otherwise
 
         Raises:
-            Exception: If the API call fails or data extraction fails
+            MissingValidationDataError: If the item has no aspects to validate against
+            Exception: If the API call fails
         """
-        # Fetch item details with PRODUCT fieldgroup
-        item_data = await self.api_client.get_item(
-            sample_item_id, fieldgroups="PRODUCT"
+        validation_data = await self._fetch_validation_data(
+            sample_item_id, attempt or _ResolveAttempt()
         )
 
-        validation_data = self._extract_validation_data(item_data)
-
         if validation_data is None:
-            raise ValueError(
+            raise MissingValidationDataError(
                 f"Item {sample_item_id} lacks product catalog or localized aspect data"
             )
 
@@ -372,8 +418,34 @@ class EbayProductResolver:
             return False
 
     async def resolve(self, product: ProductSearchInput) -> str | None:
-        """Attempt to find the best-matching EPID for the provided product using validation."""
+        """Attempt to find the best-matching EPID for the provided product using validation.
 
+        With a resolution store, settled products are answered from the store and
+        new outcomes are recorded unless an API error made them inconclusive.
+        """
+        if self.resolution_store is not None:
+            settled = self.resolution_store.get_settled(product)
+            if settled is not None:
+                logger.debug(
+                    "Skipping settled product (%s, %s, %s): %s",
+                    product.clean_name,
+                    product.number,
+                    product.set_code,
+                    settled.status,
+                )
+                return settled.epid
+
+        attempt = _ResolveAttempt()
+        epid = await self._resolve_uncached(product, attempt)
+
+        if self.resolution_store is not None and (epid or not attempt.inconclusive):
+            self.resolution_store.record_resolution(product, epid, attempt.api_calls)
+
+        return epid
+
+    async def _resolve_uncached(
+        self, product: ProductSearchInput, attempt: _ResolveAttempt
+    ) -> str | None:
         # Collect EPIDs with their listing item IDs
         epid_to_item_ids: dict[str, list[str]] = defaultdict(list)
 
@@ -381,15 +453,14 @@ class EbayProductResolver:
         aspect_filter = self._build_aspect_filter(product)
 
         for query in self._build_candidate_queries(product):
-            response = await self._execute_search(query, aspect_filter=aspect_filter)
-            if response is None:
+            search_epids = await self._search_epid_item_ids(
+                query, aspect_filter, attempt
+            )
+            if search_epids is None:
                 continue
 
-            for item in response.item_summaries:
-                epid = getattr(item, "epid", None)
-                item_id = getattr(item, "item_id", None)
-                if epid and item_id:
-                    epid_to_item_ids[str(epid)].append(item_id)
+            for epid, item_ids in search_epids:
+                epid_to_item_ids[epid].extend(item_ids)
 
         if not epid_to_item_ids:
             logger.debug(
@@ -430,7 +501,9 @@ class EbayProductResolver:
                 )
 
                 try:
-                    if await self._validate_epid(epid, product, sample_item_id):
+                    if await self._validate_epid(
+                        epid, product, sample_item_id, attempt
+                    ):
                         logger.info(
                             "Resolved product (%s, %s, %s) to EPID=%s (validated with %d supporting listings)",
                             product.clean_name,
@@ -441,6 +514,8 @@ class EbayProductResolver:
                         )
                         return epid
                 except Exception as exc:
+                    if not isinstance(exc, MissingValidationDataError):
+                        attempt.inconclusive = True
                     logger.warning(
                         "Failed to validate EPID %s with item %s: %s. Trying next item...",
                         epid,
@@ -474,6 +549,42 @@ class EbayProductResolver:
         if query:
             yield query
 
+    async def _search_epid_item_ids(
+        self, query: str, aspect_filter: str | None, attempt: _ResolveAttempt
+    ) -> list[tuple[str, list[str]]] | None:
+        """Return (epid, item_ids) pairs in search order, reusing stored searches.
+
+        Returns None if the search failed.
+        """
+        attempt.api_calls += 1
+
+        if self.resolution_store is not None:
+            cached = self.resolution_store.get_search(query, aspect_filter)
+            if cached is not None:
+                return [(epid, item_ids) for epid, item_ids in cached]
+            self.resolution_store.note_api_call()
+
+        response = await self._execute_search(query, aspect_filter=aspect_filter)
+        if response is None:
+            attempt.inconclusive = True
+            return None
+
+        epid_to_item_ids: dict[str, list[str]] = {}
+        for item in response.item_summaries:
+            epid = getattr(item, "epid", None)
+            item_id = getattr(item, "item_id", None)
+            if epid and item_id:
+                epid_to_item_ids.setdefault(str(epid), []).append(item_id)
+
+        if self.resolution_store is not None:
+            self.resolution_store.record_search(
+                query,
+                aspect_filter,
+                [[epid, item_ids] for epid, item_ids in epid_to_item_ids.items()],
+            )
+
+        return list(epid_to_item_ids.items())
+
     async def _execute_search(
         self, query: str, aspect_filter: str | None = None
     ) -> BrowseSearchResponseSchema | None:
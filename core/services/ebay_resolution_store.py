@@ -0,0 +1,203 @@
+"""Persistent store for eBay EPID resolution outcomes and reusable API responses."""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, NamedTuple
+
+from sqlalchemy.orm import Session
+
+from core.dao.ebay_resolution import (
+    get_epid_resolution,
+    get_item_validations,
+    get_search_result,
+    upsert_epid_resolution,
+    upsert_item_validation,
+    upsert_search_result,
+)
+from core.database import SessionLocal
+from core.models.ebay_resolution import EpidResolutionStatus
+from core.services.ebay_product_resolver import ProductSearchInput, ValidationData
+
+
+# Products with no validated EPID are retried once this has elapsed
+NEGATIVE_RESOLUTION_COOLDOWN = timedelta(days=14)
+# Search results older than this are fetched again
+SEARCH_RESULT_TTL = timedelta(days=7)
+
+
+class SettledResolution(NamedTuple):
+    """A stored outcome that does not need to be resolved again."""
+
+    status: EpidResolutionStatus
+    epid: str | None
+
+
+class CachedItemValidation(NamedTuple):
+    """Stored getItem outcome; validation_data is None if the item had no aspects."""
+
+    validation_data: ValidationData | None
+
+
+@dataclass
+class ResolutionStoreStats:
+    """API call accounting for one resolver run."""
+
+    api_calls_made: int = 0
+    products_skipped: int = 0
+    searches_reused: int = 0
+    item_validations_reused: int = 0
+    # Calls skipped products originally needed, plus reused searches and items
+    api_calls_saved: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"API calls made: {self.api_calls_made}, saved: {self.api_calls_saved} "
+            f"(settled products skipped: {self.products_skipped}, "
+            f"searches reused: {self.searches_reused}, "
+            f"item validations reused: {self.item_validations_reused})"
+        )
+
+
+class EbayResolutionStore:
+    """Records EPID resolution outcomes, search results and item validations.
+
+    Positive outcomes are settled permanently. Negative outcomes are settled until
+    the cooldown elapses. Outcomes affected by API errors are never recorded.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        negative_cooldown: timedelta = NEGATIVE_RESOLUTION_COOLDOWN,
+        search_ttl: timedelta = SEARCH_RESULT_TTL,
+    ) -> None:
+        self.session_factory = session_factory
+        self.negative_cooldown = negative_cooldown
+        self.search_ttl = search_ttl
+        self.stats = ResolutionStoreStats()
+
+    @staticmethod
+    def resolution_key(product: ProductSearchInput) -> str:
+        """Stable key over every ProductSearchInput field that affects resolution."""
+        fields = (
+            product.clean_name,
+            product.number,
+            product.set_code,
+            product.printing_name,
+            product.language_name,
+        )
+        normalized = "\x1f".join((field or "").strip().lower() for field in fields)
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def note_api_call(self) -> None:
+        self.stats.api_calls_made += 1
+
+    def get_settled(self, product: ProductSearchInput) -> SettledResolution | None:
+        """Return the stored outcome if the product does not need to be resolved."""
+        with self.session_factory() as session:
+            resolution = get_epid_resolution(session, self.resolution_key(product))
+
+        if resolution is None:
+            return None
+
+        if resolution.status == EpidResolutionStatus.NOT_FOUND and (
+            datetime.now(timezone.utc) - resolution.resolved_at
+            >= self.negative_cooldown
+        ):
+            return None
+
+        self.stats.products_skipped += 1
+        self.stats.api_calls_saved += resolution.api_calls
+        return SettledResolution(status=resolution.status, epid=resolution.epid)
+
+    def record_resolution(
+        self, product: ProductSearchInput, epid: str | None, api_calls: int
+    ) -> None:
+        """Persist an outcome; api_calls is what an uncached resolution costs."""
+        with self.session_factory() as session:
+            upsert_epid_resolution(
+                session,
+                {
+                    "resolution_key": self.resolution_key(product),
+                    "status": EpidResolutionStatus.RESOLVED
+                    if epid
+                    else EpidResolutionStatus.NOT_FOUND,
+                    "epid": epid,
+                    "api_calls": api_calls,
+                    "resolved_at": datetime.now(timezone.utc),
+                },
+            )
+            session.commit()
+
+    def get_search(self, query: str, aspect_filter: str | None) -> list[list] | None:
+        """Return fresh stored [[epid, [item_id, ...]], ...] pairs for a search."""
+        with self.session_factory() as session:
+            epid_item_ids = get_search_result(
+                session,
+                query,
+                aspect_filter or "",
+                datetime.now(timezone.utc) - self.search_ttl,
+            )
+
+        if epid_item_ids is not None:
+            self.stats.searches_reused += 1
+            self.stats.api_calls_saved += 1
+        return epid_item_ids
+
+    def record_search(
+        self, query: str, aspect_filter: str | None, epid_item_ids: list[list]
+    ) -> None:
+        with self.session_factory() as session:
+            upsert_search_result(
+                session,
+                query,
+                aspect_filter or "",
+                epid_item_ids,
+                datetime.now(timezone.utc),
+            )
+            session.commit()
+
+    def get_item_validation(self, item_id: str) -> CachedItemValidation | None:
+        """Return the stored getItem outcome for an item, if any."""
+        with self.session_factory() as session:
+            row = get_item_validations(session, [item_id]).get(item_id)
+
+        if row is None:
+            return None
+
+        self.stats.item_validations_reused += 1
+        self.stats.api_calls_saved += 1
+        if row.source is None:
+            return CachedItemValidation(validation_data=None)
+        return CachedItemValidation(
+            validation_data=ValidationData(
+                card_number=row.card_number or "",
+                finish=row.finish or "",
+                features=row.features or "",
+                language=row.language or "",
+                source=row.source,
+            )
+        )
+
+    def record_item_validation(
+        self, item_id: str, validation_data: ValidationData | None
+    ) -> None:
+        with self.session_factory() as session:
+            upsert_item_validation(
+                session,
+                {
+                    "item_id": item_id,
+                    "card_number": validation_data.card_number
+                    if validation_data
+                    else None,
+                    "finish": validation_data.finish if validation_data else None,
+                    "features": validation_data.features if validation_data else None,
+                    "language": validation_data.language if validation_data else None,
+                    "source": validation_data.source if validation_data else None,
+                    "fetched_at": datetime.now(timezone.utc),
+                },
+            )
+            session.commit()
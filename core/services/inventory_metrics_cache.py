@@ -0,0 +1,65 @@
+"""Per-user, per-catalog cache of live inventory metrics, keyed by inventory version."""
+
+from __future__ import annotations
+
+from typing import Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from core.dao.inventory_version import get_inventory_version
+from core.services.inventory_service import InventoryMetrics, get_inventory_metrics
+from core.services.version_keyed_cache import VersionKeyedCache, VersionKeyedCacheStats
+
+INVENTORY_METRICS_CACHE_MAX_ENTRIES = 10_000
+
+
+class InventoryMetricsCache:
+    """get_inventory_metrics results, reused while the user's inventory is unchanged.
+
+    Every lookup reads the user's inventory version (one primary key probe) and
+    recomputes when it moved since the entry was cached. The version moves in
+    the same transaction as any transaction write or latest price refresh that
+    touches the user's holdings, and is read before the metrics are computed,
+    so readers never see totals older than their own read of the version.
+    """
+
+    def __init__(self, max_entries: int = INVENTORY_METRICS_CACHE_MAX_ENTRIES) -> None:
+        # (user_id, catalog_id) -> metrics
+        self._cache: VersionKeyedCache[
+            Tuple[UUID, Optional[UUID]], InventoryMetrics
+        ] = VersionKeyedCache(max_entries)
+
+    @property
+    def stats(self) -> VersionKeyedCacheStats:
+        return self._cache.stats
+
+    def get_metrics(
+        self, session: Session, user_id: UUID, catalog_id: Optional[UUID] = None
+    ) -> InventoryMetrics:
+        """
+        Get aggregate inventory metrics for a user and catalogue (or all catalogues).
+
+        Args:
+            session: Session to read the version and compute metrics with
+            user_id: User whose inventory to aggregate
+            catalog_id: Catalogue to restrict to, or None for all
+
+        Returns:
+            The same metrics as get_inventory_metrics
+        """
+        return self._cache.get(
+            (user_id, catalog_id),
+            get_inventory_version(session, user_id),
+            lambda: get_inventory_metrics(
+                session, user_id=user_id, catalog_id=catalog_id
+            ),
+        )
+
+
+_inventory_metrics_cache = InventoryMetricsCache()
+
+
+def get_inventory_metrics_cache() -> InventoryMetricsCache:
+    """Get the singleton instance of the inventory metrics cache"""
+    return _inventory_metrics_cache
@@ -0,0 +1,173 @@
+"""Short-lived, coalescing overlay of live TCGPlayer prices for price history views."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Mapping, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from core.dao.latest_price import bulk_fetch_latest_prices
+from core.models.price import Marketplace
+from core.services.bulk_price_fetcher import BulkSkuPriceFetcher
+from core.services.tcgplayer_catalog_service import (
+    TCGPlayerCatalogService,
+    get_tcgplayer_catalog_service,
+)
+
+logger = logging.getLogger(__name__)
+
+# Listing prices move a few times an hour; a page load within this window reuses them
+LIVE_PRICE_TTL_SECONDS = 120.0
+# Distinct SKUs requested within this window share one upstream request
+LIVE_PRICE_BATCH_WINDOW_SECONDS = 0.005
+# Past this, requests answer from sku_latest_price while the fetch completes
+LIVE_PRICE_TIMEOUT_SECONDS = 1.5
+
+
+@dataclass
+class LivePriceStats:
+    """Lookup accounting for one overlay service."""
+
+    skus_requested: int = 0
+    cache_hits: int = 0
+    fallbacks: int = 0
+
+    def summary(self, upstream_requests: int) -> str:
+        return (
+            f"{self.skus_requested} SKUs requested, {self.cache_hits} cache hits, "
+            f"{self.fallbacks} sku_latest_price fallbacks, {upstream_requests} "
+            f"upstream requests"
+        )
+
+
+class LivePriceService:
+    """Today's price for SKUs, shared by every request in the process.
+
+    Prices are cached for ``ttl`` seconds. Misses go through a
+    BulkSkuPriceFetcher, so concurrent lookups of one SKU single-flight and
+    distinct SKUs requested within ``batch_window`` seconds are sent as one
+    upstream request. A lookup waits at most ``timeout`` seconds; SKUs still
+    unanswered then (or whose request failed) are answered from
+    sku_latest_price, and the upstream fetch completes in the background to
+    fill the cache for the next request.
+    """
+
+    def __init__(
+        self,
+        catalog_service: TCGPlayerCatalogService,
+        ttl: float = LIVE_PRICE_TTL_SECONDS,
+        batch_window: float = LIVE_PRICE_BATCH_WINDOW_SECONDS,
+        timeout: float = LIVE_PRICE_TIMEOUT_SECONDS,
+    ) -> None:
+        self.ttl = ttl
+        self.timeout = timeout
+        self.fetcher = BulkSkuPriceFetcher(
+            catalog_service, coalesce_window=batch_window, max_attempts=1
+        )
+        self.stats = LivePriceStats()
+        # tcgplayer_id -> (expires_at, price); None when the SKU has no listing
+        self._cache: Dict[int, Tuple[float, Optional[Decimal]]] = {}
+        # Fetches left to finish in the background after a timeout
+        self._late_fetches: Set[asyncio.Future] = set()
+
+    async def get_live_prices(
+        self,
+        session: Session,
+        sku_ids_by_tcgplayer_id: Mapping[int, uuid.UUID],
+        marketplace: Marketplace = Marketplace.TCGPLAYER,
+    ) -> Dict[uuid.UUID, Decimal]:
+        """
+        Get today's lowest listing price total for SKUs.
+
+        Args:
+            session: Session for the sku_latest_price fallback
+            sku_ids_by_tcgplayer_id: TCGPlayer SKU ID -> internal SKU ID
+            marketplace: Marketplace of the fallback prices
+
+        Returns:
+            Mapping of internal SKU ID -> price, for SKUs with a known price
+        """
+        now = time.monotonic()
+        self.stats.skus_requested += len(sku_ids_by_tcgplayer_id)
+        prices: Dict[uuid.UUID, Decimal] = {}
+        misses = []
+        for tcgplayer_id, sku_id in sku_ids_by_tcgplayer_id.items():
+            cached = self._cache.get(tcgplayer_id)
+            if cached is not None and cached[0] > now:
+                self.stats.cache_hits += 1
+                if cached[1] is not None:
+                    prices[sku_id] = cached[1]
+            else:
+                misses.append(tcgplayer_id)
+        if not misses:
+            return prices
+
+        fetch = asyncio.ensure_future(self._fetch(misses))
+        try:
+            answered = await asyncio.wait_for(asyncio.shield(fetch), self.timeout)
+        except asyncio.TimeoutError:
+            # Nothing awaits the fetch any more; keep it alive and report how it ends
+            self._late_fetches.add(fetch)
+            fetch.add_done_callback(self._late_fetches.discard)
+            fetch.add_done_callback(_log_late_fetch_failure)
+            answered = {}
+        except Exception as e:
+            logger.warning("Live price lookup failed for %d SKUs: %s", len(misses), e)
+            answered = {}
+
+        unanswered = []
+        for tcgplayer_id in misses:
+            sku_id = sku_ids_by_tcgplayer_id[tcgplayer_id]
+            if tcgplayer_id not in answered:
+                unanswered.append(sku_id)
+            elif answered[tcgplayer_id] is not None:
+                prices[sku_id] = answered[tcgplayer_id]
+
+        if unanswered:
+            self.stats.fallbacks += len(unanswered)
+            for sku_id, price in bulk_fetch_latest_prices(
+                session, unanswered, marketplace
+            ).items():
+                prices[sku_id] = Decimal(str(price))
+        return prices
+
+    async def _fetch(self, tcgplayer_ids: list[int]) -> Dict[int, Optional[Decimal]]:
+        response = await self.fetcher.get_sku_prices(tcgplayer_ids)
+        expires_at = time.monotonic() + self.ttl
+        # The fetcher leaves out IDs whose request failed; those are not cached
+        answered = {
+            result.sku_id: result.lowest_listing_price_total
+            for result in response.results
+        }
+        for tcgplayer_id, price in answered.items():
+            self._cache[tcgplayer_id] = (expires_at, price)
+        self._evict_expired()
+        return answered
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        for tcgplayer_id in [
+            k for k, (expires_at, _) in self._cache.items() if expires_at <= now
+        ]:
+            del self._cache[tcgplayer_id]
+
+
+def _log_late_fetch_failure(fetch: asyncio.Future) -> None:
+    if not fetch.cancelled() and fetch.exception() is not None:
+        logger.warning(
+            "Live price lookup failed after timing out: %s", fetch.exception()
+        )
+
+
+_live_price_service = LivePriceService(get_tcgplayer_catalog_service())
+
+
+def get_live_price_service() -> LivePriceService:
+    """Get the singleton instance of the live price overlay service"""
+    return _live_price_service
@@ -0,0 +1,363 @@
+"""Process-shared OAuth application tokens with single-flight refresh.
+
+Client-credential tokens are stored under ``oauth_token:<name>`` in Redis so API
+workers, cron jobs and scripts reuse one token instead of each minting their own.
+Within a process, a lock makes concurrent callers wait on a single refresh; across
+processes, a short-lived Redis lock elects one minter while the others poll the
+store. Tokens are renewed ``renew_before`` seconds ahead of expiry, and a still
+valid token keeps being served if renewal fails.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Dict, NamedTuple, Optional
+
+import redis.asyncio as redis
+
+from core.services.redis_service import get_redis_pool
+
+logger = logging.getLogger(__name__)
+
+TOKEN_KEY_PREFIX = "oauth_token"
+DEFAULT_RENEW_BEFORE_SECONDS = 5 * 60
+REFRESH_LOCK_TTL_SECONDS = 30
+REFRESH_WAIT_INTERVAL_SECONDS = 0.1
+REFRESH_MAX_WAIT_SECONDS = 10
+
+
+class CachedToken(NamedTuple):
+    access_token: str
+    expires_at: float  # Unix timestamp
+
+    def valid(self) -> bool:
+        return time.time() < self.expires_at
+
+    def fresh(self, renew_before: float) -> bool:
+        """True while the token is outside its early-renewal window."""
+        return time.time() < self.expires_at - renew_before
+
+
+@dataclass
+class TokenMetrics:
+    """Per-token counters for this process."""
+
+    mints: int = 0
+    mint_failures: int = 0
+    local_hits: int = 0
+    store_hits: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"{self.mints} mints ({self.mint_failures} failed), "
+            f"{self.local_hits} local hits, {self.store_hits} store hits"
+        )
+
+
+_token_metrics: Dict[str, TokenMetrics] = {}
+
+
+def get_token_metrics() -> Dict[str, TokenMetrics]:
+    """Return token counters recorded in this process, keyed by token name."""
+    return dict(_token_metrics)
+
+
+class TokenStore(ABC):
+    """Storage shared by every SharedOAuthToken with the same name."""
+
+    @abstractmethod
+    async def get(self, name: str) -> Optional[CachedToken]:
+        pass
+
+    @abstractmethod
+    async def set(self, name: str, token: CachedToken) -> None:
+        pass
+
+    @abstractmethod
+    def refresh_lock(self, name: str) -> AsyncIterator[bool]:
+        """Async context manager yielding True if the caller should mint."""
+
+    async def record_mint(self, name: str) -> None:
+        """Count a mint in the store's shared metrics, if it has any."""
+
+    async def mint_count(self, name: str) -> Optional[int]:
+        """Mints recorded across processes, or None if the store cannot tell."""
+        return None
+
+
+class InMemoryTokenStore(TokenStore):
+    """Process-local store shared by every client in the process."""
+
+    def __init__(self) -> None:
+        self._tokens: Dict[str, CachedToken] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._mint_counts: Dict[str, int] = {}
+
+    async def get(self, name: str) -> Optional[CachedToken]:
+        token = self._tokens.get(name)
+        if token is not None and token.valid():
+            return token
+        return None
+
+    async def set(self, name: str, token: CachedToken) -> None:
+        self._tokens[name] = token
+
+    @asynccontextmanager
+    async def refresh_lock(self, name: str) -> AsyncIterator[bool]:
+        async with self._locks.setdefault(name, asyncio.Lock()):
+            yield True
+
+    async def record_mint(self, name: str) -> None:
+        self._mint_counts[name] = self._mint_counts.get(name, 0) + 1
+
+    async def mint_count(self, name: str) -> Optional[int]:
+        return self._mint_counts.get(name, 0)
+
+
+class RedisTokenStore(TokenStore):
+    """Redis-backed store that degrades to process-local storage on Redis errors."""
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        fallback: Optional[InMemoryTokenStore] = None,
+    ) -> None:
+        self.redis = redis_client
+        self.fallback = fallback or InMemoryTokenStore()
+
+    @staticmethod
+    def _key(name: str) -> str:
+        return f"{TOKEN_KEY_PREFIX}:{name}"
+
+    async def get(self, name: str) -> Optional[CachedToken]:
+        try:
+            raw = await self.redis.get(self._key(name))
+        except Exception as e:
+            logger.warning("Token store read error for %s: %s", name, e)
+            return await self.fallback.get(name)
+
+        if not raw:
+            return await self.fallback.get(name)
+
+        data = json.loads(raw)
+        token = CachedToken(data["access_token"], float(data["expires_at"]))
+        return token if token.valid() else None
+
+    async def set(self, name: str, token: CachedToken) -> None:
+        await self.fallback.set(name, token)
+
+        ttl = int(token.expires_at - time.time())
+        if ttl <= 0:
+            return
+        try:
+            await self.redis.set(
+                self._key(name),
+                json.dumps(
+                    {
+                        "access_token": token.access_token,
+                        "expires_at": token.expires_at,
+                    }
+                ),
+                ex=ttl,
+            )
+        except Exception as e:
+            logger.warning("Token store write error for %s: %s", name, e)
+
+    @asynccontextmanager
+    async def refresh_lock(self, name: str) -> AsyncIterator[bool]:
+        lock_key = f"{self._key(name)}:lock"
+        lock_token = str(uuid.uuid4())
+        try:
+            acquired = bool(
+                await self.redis.set(
+                    lock_key, lock_token, nx=True, ex=REFRESH_LOCK_TTL_SECONDS
+                )
+            )
+        except Exception as e:
+            logger.warning("Token refresh lock error for %s: %s", name, e)
+            acquired = None
+
+        if acquired is None:
+            # Without Redis only this process can be coordinated
+            async with self.fallback.refresh_lock(name) as fallback_acquired:
+                yield fallback_acquired
+            return
+
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                try:
+                    release_script = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+else
+    return 0
+end
+"""
+                    await self.redis.eval(release_script, 1, lock_key, lock_token)
+                except Exception as e:  # pragma: no cover - Redis connectivity guard
+                    logger.warning(
+                        "Token refresh lock release error for %s: %s", name, e
+                    )
+
+    async def record_mint(self, name: str) -> None:
+        await self.fallback.record_mint(name)
+        try:
+            await self.redis.incr(f"{self._key(name)}:mints")
+        except Exception as e:
+            logger.warning("Token mint counter error for %s: %s", name, e)
+
+    async def mint_count(self, name: str) -> Optional[int]:
+        try:
+            count = await self.redis.get(f"{self._key(name)}:mints")
+        except Exception as e:
+            logger.warning("Token mint counter error for %s: %s", name, e)
+            return None
+        return int(count) if count else 0
+
+
+_default_token_store: Optional[TokenStore] = None
+
+
+def get_default_token_store() -> TokenStore:
+    """Return the process-wide Redis token store."""
+    global _default_token_store
+    if _default_token_store is None:
+        _default_token_store = RedisTokenStore(
+            redis.Redis(connection_pool=get_redis_pool())
+        )
+    return _default_token_store
+
+
+async def log_token_metrics(store: Optional[TokenStore] = None) -> None:
+    """Log this process's counters for every token, with the store's mint count."""
+    store = store or get_default_token_store()
+    for name, metrics in sorted(get_token_metrics().items()):
+        shared_mints = await store.mint_count(name)
+        logger.info(
+            "%s token: %s; %s mints across processes",
+            name,
+            metrics.summary(),
+            "unknown" if shared_mints is None else shared_mints,
+        )
+
+
+class SharedOAuthToken:
+    """An application token shared through a TokenStore.
+
+    Args:
+        name: Store key for the token; include anything that changes the token,
+            such as client id and scope
+        mint: Coroutine function requesting a new token from the provider
+        store: Token store; defaults to the process-wide Redis store
+        renew_before: Seconds before expiry at which the token is renewed
+    """
+
+    def __init__(
+        self,
+        name: str,
+        mint: Callable[[], Awaitable[CachedToken]],
+        store: Optional[TokenStore] = None,
+        renew_before: float = DEFAULT_RENEW_BEFORE_SECONDS,
+    ) -> None:
+        self.name = name
+        self._mint = mint
+        self._store = store
+        self.renew_before = renew_before
+        self._token: Optional[CachedToken] = None
+        self._lock = asyncio.Lock()
+        self.metrics = _token_metrics.setdefault(name, TokenMetrics())
+
+    @property
+    def store(self) -> TokenStore:
+        if self._store is None:
+            self._store = get_default_token_store()
+        return self._store
+
+    async def get_token(self) -> str:
+        token = self._token
+        if token is not None and token.fresh(self.renew_before):
+            self.metrics.local_hits += 1
+            return token.access_token
+
+        async with self._lock:
+            token = self._token
+            if token is not None and token.fresh(self.renew_before):
+                self.metrics.local_hits += 1
+                return token.access_token
+
+            self._token = await self._refresh(token)
+            return self._token.access_token
+
+    async def _refresh(self, current: Optional[CachedToken]) -> CachedToken:
+        stored = await self.store.get(self.name)
+        if stored is not None and stored.fresh(self.renew_before):
+            self.metrics.store_hits += 1
+            return stored
+
+        async with self.store.refresh_lock(self.name) as have_lock:
+            if have_lock:
+                # Another process may have minted between our read and the lock
+                stored = await self.store.get(self.name)
+                if stored is not None and stored.fresh(self.renew_before):
+                    self.metrics.store_hits += 1
+                    return stored
+                return await self._mint_and_store(current)
+
+        # Another process is minting: keep serving a valid token, or wait for it
+        for token in (current, stored):
+            if token is not None and token.valid():
+                return token
+
+        stored = await self._wait_for_store()
+        if stored is not None:
+            self.metrics.store_hits += 1
+            return stored
+
+        logger.warning(
+            "Timed out waiting for %s token from another process; minting", self.name
+        )
+        return await self._mint_and_store(current)
+
+    async def _wait_for_store(self) -> Optional[CachedToken]:
+        elapsed = 0.0
+        while elapsed < REFRESH_MAX_WAIT_SECONDS:
+            await asyncio.sleep(REFRESH_WAIT_INTERVAL_SECONDS)
+            elapsed += REFRESH_WAIT_INTERVAL_SECONDS
+            stored = await self.store.get(self.name)
+            if stored is not None and stored.fresh(self.renew_before):
+                return stored
+        return None
+
+    async def _mint_and_store(self, current: Optional[CachedToken]) -> CachedToken:
+        try:
+            token = await self._mint()
+        except Exception:
+            self.metrics.mint_failures += 1
+            if current is not None and current.valid():
+                logger.warning(
+                    "Failed to renew %s token; serving current token until expiry",
+                    self.name,
+                    exc_info=True,
+                )
+                return current
+            raise
+
+        self.metrics.mints += 1
+        await self.store.set(self.name, token)
+        await self.store.record_mint(self.name)
+        logger.info(
+            "Minted %s token (expires in %ds, %d mints in this process)",
+            self.name,
+            token.expires_at - time.time(),
+            self.metrics.mints,
+        )
+        return token
@@ -0,0 +1,182 @@
+"""Price refresh engine shared by the SKU price cron jobs."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Callable, Iterable, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from core.dao.latest_price import LatestPriceRecord, write_latest_prices
+from core.dao.price_reference import refresh_price_references
+from core.dao.price_refresh import PriceRefreshSource, query_price_refresh_universe
+from core.database import SessionLocal
+from core.models.price import Marketplace
+from core.services.bulk_price_fetcher import BulkSkuPriceFetcher
+from core.services.tcgplayer_catalog_service import TCGPlayerCatalogService
+from core.utils.workers import process_task_queue
+
+logger = logging.getLogger(__name__)
+
+# SKUs written per DB session; BulkSkuPriceFetcher sizes the API requests
+PRICE_REFRESH_BATCH_SIZE = 1000
+
+
+@dataclass
+class PriceRefreshStats:
+    """Work done by one price refresh run."""
+
+    skus_targeted: int = 0
+    prices_received: int = 0
+    cache_updates: int = 0
+    snapshots_written: int = 0
+    references_updated: int = 0
+    api_requests: int = 0
+    db_statements: int = 0
+    failed_batches: int = 0
+    elapsed_seconds: float = 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.skus_targeted} SKUs targeted, {self.prices_received} prices "
+            f"received, {self.cache_updates} cache entries updated, "
+            f"{self.snapshots_written} snapshots written, "
+            f"{self.references_updated} price references updated, "
+            f"{self.api_requests} API requests, {self.db_statements} DB statements, "
+            f"{self.failed_batches} failed batches in {self.elapsed_seconds:.1f}s"
+        )
+
+
+@contextmanager
+def _count_statements(engine: Engine, stats: PriceRefreshStats) -> Iterator[None]:
+    def count(*args) -> None:
+        stats.db_statements += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        yield
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+
+async def refresh_sku_prices(
+    catalog_service: TCGPlayerCatalogService,
+    sources: Iterable[PriceRefreshSource],
+    marketplace: Marketplace = Marketplace.TCGPLAYER,
+    write_snapshots: bool = False,
+    updated_since: datetime | None = None,
+    snapshot_dt: datetime | None = None,
+    batch_size: int = PRICE_REFRESH_BATCH_SIZE,
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> PriceRefreshStats:
+    """
+    Refresh latest prices, and optionally snapshots, for the union of ``sources``.
+
+    The SKU universe and its TCGPlayer ID mapping are read in one statement.
+    Each SKU is fetched once through a shared BulkSkuPriceFetcher, and each
+    batch is written with one statement (see `write_latest_prices`). Runs that
+    write snapshots finish by refreshing the price references
+    (see `refresh_price_references`).
+
+    Parameters
+    ----------
+    catalog_service : TCGPlayerCatalogService
+        Service for fetching prices from TCGPlayer.
+    sources : Iterable[PriceRefreshSource]
+        Sources whose SKUs are refreshed.
+    marketplace : Marketplace
+        Marketplace to write prices for.
+    write_snapshots : bool
+        If True, also write a snapshot for each SKU whose price changed.
+    updated_since : datetime | None
+        Cutoff for PriceRefreshSource.RECENTLY_UPDATED.
+    snapshot_dt : datetime | None
+        Timestamp for the snapshots and price references (defaults to now, UTC).
+    batch_size : int
+        SKUs written per DB session.
+    session_factory : Callable[[], Session]
+        Factory for the sessions the run reads and writes with.
+
+    Returns
+    -------
+    PriceRefreshStats
+        Counts of SKUs, writes, API requests and DB statements for the run.
+    """
+    stats = PriceRefreshStats()
+    started = time.monotonic()
+    # One timestamp for every batch, so the references line up with the snapshots
+    snapshot_dt = snapshot_dt or datetime.now(UTC)
+
+    with session_factory() as session:
+        engine = session.get_bind()
+        with _count_statements(engine, stats):
+            universe = session.execute(
+                query_price_refresh_universe(sources, marketplace, updated_since)
+            ).all()
+    internal_by_tcg_id: dict[int, uuid.UUID] = {
+        tcgplayer_id: sku_id for sku_id, tcgplayer_id in universe
+    }
+    stats.skus_targeted = len(internal_by_tcg_id)
+    if not internal_by_tcg_id:
+        stats.elapsed_seconds = time.monotonic() - started
+        return stats
+
+    price_fetcher = BulkSkuPriceFetcher(catalog_service)
+
+    async def refresh_batch(tcgplayer_ids: list[int]) -> None:
+        response = await price_fetcher.get_sku_prices(tcgplayer_ids)
+        records: list[LatestPriceRecord] = [
+            LatestPriceRecord(
+                sku_id=internal_by_tcg_id[price.sku_id],
+                marketplace=marketplace,
+                lowest_listing_price_total=price.lowest_listing_price_total,
+            )
+            for price in response.results
+            if price.sku_id in internal_by_tcg_id
+            and price.lowest_listing_price_total is not None
+        ]
+        stats.prices_received += len(records)
+        try:
+            with session_factory() as batch_session:
+                cache_updates, snapshots_written = write_latest_prices(
+                    batch_session,
+                    records,
+                    marketplace,
+                    write_snapshots=write_snapshots,
+                    snapshot_dt=snapshot_dt,
+                )
+        except Exception:
+            stats.failed_batches += 1
+            raise
+        stats.cache_updates += cache_updates
+        stats.snapshots_written += snapshots_written
+
+    tcgplayer_ids = list(internal_by_tcg_id)
+    task_queue: asyncio.Queue = asyncio.Queue()
+    for i in range(0, len(tcgplayer_ids), batch_size):
+        task_queue.put_nowait(refresh_batch(tcgplayer_ids[i : i + batch_size]))
+
+    with _count_statements(engine, stats):
+        try:
+            await process_task_queue(task_queue)
+        except ExceptionGroup as eg:
+            logger.error(f"Price refresh: {stats.failed_batches} batches failed: {eg}")
+
+    if write_snapshots:
+        with _count_statements(engine, stats):
+            with session_factory() as session, session.begin():
+                stats.references_updated = refresh_price_references(
+                    session, marketplace, snapshot_dt
+                )
+
+    stats.api_requests = price_fetcher.stats.requests
+    stats.elapsed_seconds = time.monotonic() - started
+    return stats
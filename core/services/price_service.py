@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 
 from core.models.catalog import SKU
 from core.models.price import Marketplace
+from core.services.bulk_price_fetcher import BulkSkuPriceFetcher
 from core.services.tcgplayer_catalog_service import TCGPlayerCatalogService
 from core.dao.price import (
     insert_price_snapshots_if_changed,
@@ -23,7 +24,7 @@ from core.dao.latest_price import upsert_latest_prices, LatestPriceRecord
 
 async def update_latest_sku_prices(
     session: Session,
-    catalog_service: TCGPlayerCatalogService,
+    catalog_service: TCGPlayerCatalogService | BulkSkuPriceFetcher,
     sku_ids: Sequence[uuid.UUID],
     marketplace: Marketplace,
     write_through: bool = False,
@@ -37,8 +38,9 @@ async def update_latest_sku_prices(
     ----------
     session : Session
         Active SQLAlchemy session.
-    catalog_service : TCGPlayerCatalogService
-        Service for fetching prices from TCGPlayer.
+    catalog_service : TCGPlayerCatalogService | BulkSkuPriceFetcher
+        Service for fetching prices from TCGPlayer. Pass a BulkSkuPriceFetcher
+        when ``sku_ids`` may exceed one pricing request.
     sku_ids : Sequence[uuid.UUID]
         SKU IDs to fetch prices for.
     marketplace : Marketplace
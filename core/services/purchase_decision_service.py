@@ -6,6 +6,8 @@ from typing import List, Optional, Dict, Tuple
 from dataclasses import dataclass
 from collections import defaultdict
 
+import numpy as np
+
 from core.database import SessionLocal
 
 from core.models.decisions import BuyDecision, Decision
@@ -16,7 +18,11 @@ from core.services.tcgplayer_listing_service import (
 )
 from core.services.schemas.tcgplayer import TCGPlayerListingSchema
 from core.dao.sales import get_recent_sales_for_skus
-from core.dao.buy_decision import insert_buy_decisions, BuyDecisionData
+from core.dao.buy_decision import (
+    insert_buy_decisions,
+    upsert_current_buy_decisions,
+    BuyDecisionData,
+)
 from core.models.listings import SaleRecord
 from core.utils.request_pacer import BurstRequestPacer
 from core.services.sku_selection import ProcessingSKU
@@ -173,6 +179,18 @@ def compute_resale_nowcast(
     else:
         sales_anchor = recent_prices[len(recent_prices) // 2]
 
+    return adjust_resale_nowcast(sales_anchor, best_ask)
+
+
+def adjust_resale_nowcast(
+    sales_anchor: Decimal, best_ask: Optional[Decimal]
+) -> Decimal:
+    """
+    Apply trend and ask-blend adjustments to a median sales anchor.
+
+    Returns:
+        Expected resale price per unit
+    """
     # Simple trend calculation (placeholder - could be enhanced)
     # For now, assume no trend adjustment
     beta = 0.0  # Daily slope percentage
@@ -291,6 +309,18 @@ def optimize_quantity(
     return best_qty, best_total_edge
 
 
+def compute_resale_net(resale_gross: Decimal) -> Decimal:
+    """
+    Convert a gross resale nowcast into expected net proceeds per unit after fees,
+    outbound shipping and packaging.
+    """
+    return (
+        resale_gross * (Decimal("1") - FEE_RATE_TOTAL)
+        - SHIP_OUT_PER_UNIT
+        - PACK_PER_UNIT
+    )
+
+
 def compute_sales_asp_median(sales: List[SaleRecord]) -> Optional[Decimal]:
     """
     Compute median delivered sale price (sale_price + shipping_price) from recent sales.
@@ -363,11 +393,7 @@ def compute_purchase_decision(market_data: MarketData) -> BuyDecision:
 
     # Step 3: Resale Nowcast
     resale_gross = compute_resale_nowcast(market_data.sales, best_ask)
-    resale_net = (
-        resale_gross * (Decimal("1") - FEE_RATE_TOTAL)
-        - SHIP_OUT_PER_UNIT
-        - PACK_PER_UNIT
-    )
+    resale_net = compute_resale_net(resale_gross)
 
     # Step 4: Find optimal quantity with safety rails
     optimal_qty, total_edge = optimize_quantity(vwap_curve, resale_net, lambda_hat)
@@ -405,6 +431,329 @@ def compute_purchase_decision(market_data: MarketData) -> BuyDecision:
     )
 
 
+# Batch evaluation
+#
+# Resale nets are carried as fixed-point integers with this many decimal places so
+# that edge thresholds and totals can be compared exactly in int64 arrays.
+RESALE_NET_SCALE_EXPONENT = 8
+_RESALE_NET_SCALE = 10**RESALE_NET_SCALE_EXPONENT
+_INT64_SAFE_BOUND = 2**62
+_EDGE_MIN_ABS_RATIO = EDGE_MIN_ABS.as_integer_ratio()
+_EDGE_MIN_PCT_RATIO = EDGE_MIN_PCT.as_integer_ratio()
+
+
+def group_listings_by_sku(
+    listings: List[TCGPlayerListingSchema],
+) -> Dict[int, List[TCGPlayerListingSchema]]:
+    """Bucket a product's listings by TCGPlayer SKU id (product_condition_id) in one pass."""
+    listings_by_sku: Dict[int, List[TCGPlayerListingSchema]] = defaultdict(list)
+    for listing in listings:
+        listings_by_sku[listing.product_condition_id].append(listing)
+    return listings_by_sku
+
+
+def _first_index_per_segment(segments: np.ndarray, segment_count: int) -> np.ndarray:
+    """Start offset of each segment id in a sorted segment array."""
+    return np.searchsorted(segments, np.arange(segment_count))
+
+
+def compute_purchase_decisions_batch(
+    market_data_list: List[MarketData],
+) -> List[BuyDecision]:
+    """
+    Compute buy/pass decisions for many SKUs at once.
+
+    Produces the same decisions as calling compute_purchase_decision for each SKU.
+    Buy ladders are cumulative sums over integer-cent arrays, sales medians are taken
+    from one grouped sort, and quantity optimization scores every candidate quantity
+    of every SKU in a single vectorized pass. SKUs that cannot be evaluated exactly in
+    integer arithmetic (sub-cent prices, values near int64 limits, or exact ties that
+    Decimal rounding would break) fall back to compute_purchase_decision.
+
+    Args:
+        market_data_list: Fresh listings and sales data, one entry per SKU
+
+    Returns:
+        BuyDecisions in the same order as market_data_list
+    """
+    decisions: List[Optional[BuyDecision]] = [None] * len(market_data_list)
+
+    # Flatten listings and sales into segment-tagged arrays (segment = batched SKU)
+    batch_indexes: List[int] = []
+    listing_costs: List[int] = []
+    listing_quantities: List[int] = []
+    listing_sellers: List[int] = []
+    listing_counts: List[int] = []
+    sale_cents: List[int] = []
+    sale_counts_list: List[int] = []
+    units_sold: List[int] = []
+    seller_codes: Dict[str, int] = {}
+
+    for index, market_data in enumerate(market_data_list):
+        listings_start = len(listing_costs)
+        sales_start = len(sale_cents)
+        exact = True
+
+        for listing in market_data.listings:
+            delivered_cents = (listing.price + listing.shipping_price) * 100
+            cents = int(delivered_cents)
+            if cents != delivered_cents or cents <= 0:
+                exact = False
+                break
+            listing_costs.append(cents)
+            listing_quantities.append(listing.quantity)
+            listing_sellers.append(
+                seller_codes.setdefault(listing.seller_id, len(seller_codes))
+            )
+
+        total_units = 0
+        if exact:
+            for sale in market_data.sales:
+                price_cents = (
+                    sale.sale_price + (sale.shipping_price or Decimal("0"))
+                ) * 100
+                cents = int(price_cents)
+                if cents != price_cents:
+                    exact = False
+                    break
+                sale_cents.append(cents)
+                total_units += sale.quantity
+
+        if not exact:
+            del listing_costs[listings_start:]
+            del listing_quantities[listings_start:]
+            del listing_sellers[listings_start:]
+            del sale_cents[sales_start:]
+            decisions[index] = compute_purchase_decision(market_data)
+            continue
+
+        batch_indexes.append(index)
+        listing_counts.append(len(listing_costs) - listings_start)
+        sale_counts_list.append(len(sale_cents) - sales_start)
+        units_sold.append(total_units)
+
+    segment_count = len(batch_indexes)
+    if segment_count == 0:
+        return decisions
+
+    # Step 1: Liquidity and demand caps (same float arithmetic as estimate_sell_through)
+    units = np.asarray(units_sold, dtype=np.int64)
+    lambda_hats = units / SALES_WINDOW_DAYS
+    liquidity_ok = units >= 3
+    demand_caps = np.maximum(1, (lambda_hats * TIME_HORIZON_DAYS).astype(np.int64))
+
+    # Step 2: Buy ladders. Sort listings by (SKU, delivered cost), expand to units up
+    # to each SKU's demand cap, then cumulative-sum costs within each SKU.
+    costs = np.asarray(listing_costs, dtype=np.int64)
+    raw_quantities = np.asarray(listing_quantities, dtype=np.int64)
+    sellers = np.asarray(listing_sellers, dtype=np.int64)
+    listing_segments = np.repeat(np.arange(segment_count), listing_counts)
+    order = np.lexsort((costs, listing_segments))
+    costs, quantities, segments = (
+        costs[order],
+        np.maximum(raw_quantities[order], 0),
+        listing_segments[order],
+    )
+
+    has_listings = np.bincount(segments, minlength=segment_count) > 0
+    best_ask_cents = np.zeros(segment_count, dtype=np.int64)
+    best_ask_cents[has_listings] = costs[
+        _first_index_per_segment(segments, segment_count)[has_listings]
+    ]
+
+    repeats = np.minimum(quantities, demand_caps[segments])
+    unit_costs = np.repeat(costs, repeats)
+    unit_segments = np.repeat(segments, repeats)
+    unit_positions = (
+        np.arange(len(unit_segments))
+        - _first_index_per_segment(unit_segments, segment_count)[unit_segments]
+    )
+    within_cap = unit_positions < demand_caps[unit_segments]
+    unit_costs = unit_costs[within_cap]
+    unit_segments = unit_segments[within_cap]
+    unit_quantities = unit_positions[within_cap] + 1
+
+    running_costs = np.cumsum(unit_costs)
+    unit_starts = _first_index_per_segment(unit_segments, segment_count)
+    cumulative_costs = (
+        running_costs - np.concatenate(([0], running_costs))[unit_starts[unit_segments]]
+    )
+    ladder_lengths = np.bincount(unit_segments, minlength=segment_count)
+
+    # Step 3: Sales medians (twice the median, in cents, to stay integral)
+    prices = np.asarray(sale_cents, dtype=np.int64)
+    price_segments = np.repeat(np.arange(segment_count), sale_counts_list)
+    order = np.lexsort((prices, price_segments))
+    prices, price_segments = prices[order], price_segments[order]
+    sale_counts = np.bincount(price_segments, minlength=segment_count)
+    sale_starts = _first_index_per_segment(price_segments, segment_count)
+    has_sales = sale_counts > 0
+    median_doubled_cents = np.zeros(segment_count, dtype=np.int64)
+    low = (sale_starts + (sale_counts - 1) // 2)[has_sales]
+    high = (sale_starts + sale_counts // 2)[has_sales]
+    median_doubled_cents[has_sales] = prices[low] + prices[high]
+
+    # Step 4: Resale nowcast per SKU (scalar Decimal math, O(1) per SKU)
+    resale_nets: Dict[int, Decimal] = {}
+    resale_scaled = np.zeros(segment_count, dtype=np.int64)
+    vectorized = np.zeros(segment_count, dtype=bool)
+    max_cumulative_costs = np.zeros(segment_count, dtype=np.int64)
+    has_ladder = ladder_lengths > 0
+    max_cumulative_costs[has_ladder] = cumulative_costs[
+        unit_starts[has_ladder] + ladder_lengths[has_ladder] - 1
+    ]
+
+    for segment in range(segment_count):
+        if ladder_lengths[segment] == 0:
+            continue
+
+        best_ask = (
+            Decimal(int(best_ask_cents[segment])).scaleb(-2)
+            if has_listings[segment]
+            else None
+        )
+        if has_sales[segment]:
+            sales_anchor = Decimal(int(median_doubled_cents[segment])) / 200
+            resale_gross = adjust_resale_nowcast(sales_anchor, best_ask)
+        else:
+            resale_gross = Decimal("0")
+        resale_net = compute_resale_net(resale_gross)
+        resale_nets[segment] = resale_net
+
+        scaled = resale_net.scaleb(RESALE_NET_SCALE_EXPONENT)
+        if scaled != scaled.to_integral_value():
+            continue
+        scaled = int(scaled)
+        ladder_length = int(ladder_lengths[segment])
+        magnitude = 100 * (
+            100 * ladder_length * (abs(scaled) + _RESALE_NET_SCALE)
+            + int(max_cumulative_costs[segment]) * _RESALE_NET_SCALE
+        )
+        if magnitude >= _INT64_SAFE_BOUND:
+            continue
+
+        resale_scaled[segment] = scaled
+        vectorized[segment] = True
+
+    # Step 5: Quantity optimization across all SKUs at once.
+    # With S = 10**RESALE_NET_SCALE_EXPONENT, R = resale net and C = ladder cost in cents:
+    #   scaled_edge = 100*q*R*S - C*S        (= 100*q*S * edge_per_unit)
+    #   edge_per_unit >= EDGE_MIN_ABS       <=> scaled_edge >= EDGE_MIN_ABS * 100*q*S
+    #   edge_per_unit / vwap >= EDGE_MIN_PCT <=> scaled_edge >= EDGE_MIN_PCT * C*S
+    # and total edge is proportional to scaled_edge.
+    abs_num, abs_den = _EDGE_MIN_ABS_RATIO
+    pct_num, pct_den = _EDGE_MIN_PCT_RATIO
+    active = vectorized[unit_segments]
+    q = unit_quantities[active]
+    c = cumulative_costs[active]
+    seg = unit_segments[active]
+
+    scaled_edge = 100 * q * resale_scaled[seg] - c * _RESALE_NET_SCALE
+    abs_lhs = scaled_edge * abs_den
+    abs_rhs = abs_num * 100 * q * _RESALE_NET_SCALE
+    pct_lhs = scaled_edge * pct_den
+    pct_rhs = pct_num * c * _RESALE_NET_SCALE
+    valid = (abs_lhs >= abs_rhs) & (pct_lhs >= pct_rhs)
+    score = np.where(valid, scaled_edge, -1)
+
+    best_score = np.full(segment_count, -1, dtype=np.int64)
+    np.maximum.at(best_score, seg, score)
+    is_best = valid & (score == best_score[seg])
+    best_counts = np.bincount(seg[is_best], minlength=segment_count)
+    boundary_counts = np.bincount(
+        seg[(abs_lhs == abs_rhs) | (pct_lhs == pct_rhs)], minlength=segment_count
+    )
+
+    optimal_quantities = np.zeros(segment_count, dtype=np.int64)
+    optimal_costs = np.zeros(segment_count, dtype=np.int64)
+    best_positions = np.flatnonzero(is_best)
+    optimal_quantities[seg[best_positions]] = q[best_positions]
+    optimal_costs[seg[best_positions]] = c[best_positions]
+
+    # Exact ties (optimize_quantity keeps the smallest quantity) and threshold
+    # equalities are left to the Decimal path so rounding behaves identically
+    vectorized &= (best_counts <= 1) & (boundary_counts == 0)
+
+    # Seller concentration (same rule as apply_safety_rails): largest single-seller
+    # share of available quantity per SKU, from (SKU, seller) quantity sums
+    pair_keys = listing_segments * max(len(seller_codes), 1) + sellers
+    unique_pairs, pair_inverse = np.unique(pair_keys, return_inverse=True)
+    pair_quantities = np.bincount(
+        pair_inverse, weights=raw_quantities, minlength=len(unique_pairs)
+    ).astype(np.int64)
+    max_seller_quantity = np.zeros(segment_count, dtype=np.int64)
+    np.maximum.at(
+        max_seller_quantity,
+        unique_pairs // max(len(seller_codes), 1),
+        pair_quantities,
+    )
+    total_available = np.bincount(
+        listing_segments, weights=raw_quantities, minlength=segment_count
+    ).astype(np.int64)
+    seller_concentrated = np.zeros(segment_count, dtype=bool)
+    has_available = total_available > 0
+    seller_concentrated[has_available] = (
+        max_seller_quantity[has_available] / total_available[has_available]
+        > SELLER_CONCENTRATION_MAX
+    )
+
+    # Step 6: Assemble decisions
+    for segment, index in enumerate(batch_indexes):
+        market_data = market_data_list[index]
+
+        if ladder_lengths[segment] > 0 and not vectorized[segment]:
+            decisions[index] = compute_purchase_decision(market_data)
+            continue
+
+        reason_codes: List[str] = []
+        if not liquidity_ok[segment]:
+            reason_codes.append("LOW_LIQUIDITY")
+
+        if ladder_lengths[segment] == 0:
+            reason_codes.append("NO_LISTINGS")
+            decisions[index] = BuyDecision(
+                sku_id=market_data.sku_id,
+                decision=Decision.PASS,
+                quantity=0,
+                buy_vwap=Decimal("0"),
+                expected_resale_net=Decimal("0"),
+                asof_listings=market_data.asof_listings,
+                asof_sales=market_data.asof_sales,
+                reason_codes=reason_codes,
+            )
+            continue
+
+        optimal_qty = int(optimal_quantities[segment])
+        buy_vwap = Decimal("0")
+        if optimal_qty == 0:
+            reason_codes.append("NEG_EDGE")
+        else:
+            buy_vwap = Decimal(int(optimal_costs[segment])).scaleb(-2) / optimal_qty
+            if seller_concentrated[segment]:
+                reason_codes.append("SELLER_CONCENTRATION")
+                optimal_qty = 0
+
+        if optimal_qty > 0 and liquidity_ok[segment] and not reason_codes:
+            decision = Decision.BUY
+        else:
+            decision = Decision.PASS
+            buy_vwap = Decimal("0")
+            optimal_qty = 0
+
+        decisions[index] = BuyDecision(
+            sku_id=market_data.sku_id,
+            decision=decision,
+            quantity=optimal_qty,
+            buy_vwap=buy_vwap,
+            expected_resale_net=resale_nets[segment],
+            asof_listings=market_data.asof_listings,
+            asof_sales=market_data.asof_sales,
+            reason_codes=reason_codes,
+        )
+
+    return decisions
+
+
 @dataclass
 class PurchaseDecisionResult:
     sku_id: uuid.UUID
@@ -418,19 +767,16 @@ class PurchaseDecisionResult:
     reason_codes: List[str]
 
 
-async def process_product_with_request_slot(
+async def fetch_product_market_data(
     product_group: ProductProcessingGroup,
     marketplace: Marketplace,
     sales_data_by_sku: Dict[uuid.UUID, List[SaleRecord]],
     tcgplayer_listing_service: TCGPlayerListingService,
-) -> List[PurchaseDecisionResult]:
-    """Process all SKUs in a product group for purchase decisions with single API call.
-    Raises exceptions on HTTP or processing errors; caller is responsible for handling.
+) -> List[MarketData]:
+    """Fetch listings for a product group with a single API call and build per-SKU market data.
+    Raises exceptions on HTTP errors; caller is responsible for handling.
     """
-
-    results: List[PurchaseDecisionResult] = []
     product_tcgplayer_id = product_group.product_tcgplayer_id
-    skus_in_product = product_group.skus
 
     # Create request data for listings API (single call for entire product)
     listings_request = CardListingRequestData(product_id=product_tcgplayer_id)
@@ -440,48 +786,43 @@ async def process_product_with_request_slot(
     listings_responses = await tcgplayer_listing_service.get_product_active_listings(
         listings_request
     )
+    listings_by_sku = group_listings_by_sku(listings_responses)
 
-    # Process each SKU in the product using the shared listings data
     asof_sales = datetime.now(timezone.utc)
 
-    for sku in skus_in_product:
-        # Get sales data for this SKU (from pre-loaded cache)
-        sku_sales_data = sales_data_by_sku.get(sku.sku_id, [])
-
-        sku_listings = [
-            listing
-            for listing in listings_responses
-            if listing.product_condition_id == sku.sku_tcgplayer_id
-        ]
-
-        # Create market data for decision computation
-        market_data = MarketData(
+    return [
+        MarketData(
             sku_id=sku.sku_id,
             marketplace=marketplace,
-            listings=sku_listings,
-            sales=sku_sales_data,
+            listings=listings_by_sku.get(sku.sku_tcgplayer_id, []),
+            sales=sales_data_by_sku.get(sku.sku_id, []),
             asof_listings=asof_listings,
             asof_sales=asof_sales,
         )
+        for sku in product_group.skus
+    ]
 
-        # Compute purchase decision
-        decision = compute_purchase_decision(market_data)
-
-        results.append(
-            PurchaseDecisionResult(
-                sku_id=sku.sku_id,
-                buy_decision=decision,
-                sales_count=sum(s.quantity for s in sku_sales_data),
-                listings_count=len(sku_listings),
-                decision=decision.decision.value,
-                quantity=decision.quantity,
-                buy_vwap=decision.buy_vwap,
-                expected_resale_net=decision.expected_resale_net,
-                reason_codes=decision.reason_codes,
-            )
-        )
 
-    return results
+def build_purchase_decision_results(
+    market_data_list: List[MarketData],
+) -> List[PurchaseDecisionResult]:
+    """Evaluate market data for many SKUs in one batch and wrap the decisions as results."""
+    decisions = compute_purchase_decisions_batch(market_data_list)
+
+    return [
+        PurchaseDecisionResult(
+            sku_id=market_data.sku_id,
+            buy_decision=decision,
+            sales_count=sum(s.quantity for s in market_data.sales),
+            listings_count=len(market_data.listings),
+            decision=decision.decision.value,
+            quantity=decision.quantity,
+            buy_vwap=decision.buy_vwap,
+            expected_resale_net=decision.expected_resale_net,
+            reason_codes=decision.reason_codes,
+        )
+        for market_data, decision in zip(market_data_list, decisions)
+    ]
 
 
 async def run_purchase_decision_sweep(
@@ -557,7 +898,8 @@ async def run_purchase_decision_sweep(
         f"Grouped {len(filtered_processing_list)} filtered SKUs into {product_count} products for processing"
     )
 
-    # Accumulators for batched DB writes
+    # Accumulators for batched evaluation and DB writes
+    all_market_data: List[MarketData] = []
     all_decisions: List[BuyDecisionData] = []
 
     # Process by product groups instead of individual SKUs
@@ -571,40 +913,24 @@ async def run_purchase_decision_sweep(
         product_group = product_processing_groups[processing_index]
 
         try:
-            # Process the entire product group (makes 1 API call for listings)
-            product_results = await process_product_with_request_slot(
+            # Fetch market data for the entire product group (makes 1 API call for listings)
+            product_market_data = await fetch_product_market_data(
                 product_group=product_group,
                 marketplace=marketplace,
                 sales_data_by_sku=sales_by_sku,
             )
-
-            # Success path for all SKUs in this product
-            for result in product_results:
-                results.append(result)
-                served_skus.add(result.sku_id)
-                # Convert BuyDecision to BuyDecisionData for batch insert
-                decision_data = BuyDecisionData(
-                    sku_id=result.buy_decision.sku_id,
-                    decision=result.buy_decision.decision,
-                    quantity=result.buy_decision.quantity,
-                    buy_vwap=result.buy_decision.buy_vwap,
-                    expected_resale_net=result.buy_decision.expected_resale_net,
-                    asof_listings=result.buy_decision.asof_listings,
-                    asof_sales=result.buy_decision.asof_sales,
-                    reason_codes=result.buy_decision.reason_codes,
-                )
-                all_decisions.append(decision_data)
-                total_successes += 1
+            all_market_data.extend(product_market_data)
+            total_successes += len(product_market_data)
 
             logger.debug(
-                f"Processed product {product_group.product_tcgplayer_id} with {len(product_results)} SKUs"
+                f"Fetched product {product_group.product_tcgplayer_id} with {len(product_market_data)} SKUs"
             )
 
             processing_index += 1
 
             if total_successes % 100 == 0:
                 logger.debug(
-                    f"Purchase decisions: {total_successes} completed across {processing_index} products"
+                    f"Purchase decisions: {total_successes} fetched across {processing_index} products"
                 )
 
         except ClientResponseError as e:
@@ -618,9 +944,27 @@ async def run_purchase_decision_sweep(
             processing_index += 1
             continue
 
+    # Evaluate every fetched SKU in one batch
+    for result in build_purchase_decision_results(all_market_data):
+        results.append(result)
+        served_skus.add(result.sku_id)
+        # Convert BuyDecision to BuyDecisionData for batch insert
+        decision_data = BuyDecisionData(
+            sku_id=result.buy_decision.sku_id,
+            decision=result.buy_decision.decision,
+            quantity=result.buy_decision.quantity,
+            buy_vwap=result.buy_decision.buy_vwap,
+            expected_resale_net=result.buy_decision.expected_resale_net,
+            asof_listings=result.buy_decision.asof_listings,
+            asof_sales=result.buy_decision.asof_sales,
+            reason_codes=result.buy_decision.reason_codes,
+        )
+        all_decisions.append(decision_data)
+
     if all_decisions:
         with SessionLocal.begin() as session:
-            insert_buy_decisions(session, all_decisions)
+            inserted_decisions = insert_buy_decisions(session, all_decisions)
+            upsert_current_buy_decisions(session, inserted_decisions)
 
     logger.info("Purchase decision sweep completed")
     return None
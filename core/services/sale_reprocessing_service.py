@@ -0,0 +1,335 @@
+"""
+Replay the FIFO allocation of a user's sales after a correction.
+
+`reprocess_sales` picks the SKUs touched by a date range and/or a set of
+transactions, rewinds every sale of those SKUs and allocates them again in
+chronological order with the same rule as `process_sale_line_items`: each sale
+draws on the newest of its user's purchase lots dated on or before it. Reads
+and writes are a fixed number of set-based statements; the allocation itself
+runs in memory, one SKU at a time, and only sales whose allocation changed are
+rewritten.
+"""
+
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Integer, any_, bindparam, delete, func, insert, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.orm import Session, aliased
+
+from core.dao.inventory_holding import refresh_holdings
+from core.dao.inventory_version import bump_inventory_versions
+from core.dao.transaction import InsufficientInventoryError
+from core.models.transaction import (
+    LineItem,
+    LineItemConsumption,
+    Transaction,
+    TransactionType,
+)
+
+_UUIDS = ARRAY(PG_UUID(as_uuid=True))
+
+
+@dataclass
+class ConsumptionChange:
+    """How much a sale takes from one purchase lot, before and after the replay."""
+
+    sku_id: uuid.UUID
+    sale_line_item_id: uuid.UUID
+    purchase_line_item_id: uuid.UUID
+    old_quantity: int
+    new_quantity: int
+
+
+@dataclass
+class RemainingQuantityChange:
+    """A purchase lot's remaining quantity before and after the replay."""
+
+    sku_id: uuid.UUID
+    purchase_line_item_id: uuid.UUID
+    old_quantity: int
+    new_quantity: int
+
+
+@dataclass
+class SaleReprocessingResult:
+    """Outcome of a replay; nothing was written if ``dry_run`` or ``shortfalls``."""
+
+    dry_run: bool
+    sku_count: int = 0
+    sale_line_item_count: int = 0
+    consumption_changes: list[ConsumptionChange] = field(default_factory=list)
+    remaining_quantity_changes: list[RemainingQuantityChange] = field(
+        default_factory=list
+    )
+    # sale line item ID -> quantity no purchase lot could cover
+    shortfalls: dict[uuid.UUID, int] = field(default_factory=dict)
+
+
+@dataclass
+class _Lot:
+    id: uuid.UUID
+    date: datetime
+    quantity: int
+    remaining_quantity: int
+    # Taken by sales outside the replay, which keep their allocation
+    held_back: int = 0
+
+
+@dataclass
+class _Sale:
+    id: uuid.UUID
+    date: datetime
+    quantity: int
+
+
+def _allocate(
+    lots: list[_Lot], sales: list[_Sale]
+) -> tuple[dict[tuple[uuid.UUID, uuid.UUID], int], dict[uuid.UUID, int]]:
+    """
+    Allocate ``sales`` (in chronological order) to ``lots`` of one SKU.
+
+    Returns:
+        (sale ID, lot ID) -> quantity, and sale ID -> uncovered quantity
+    """
+    # Newest first, then by ID, as process_sale_line_items consumes them
+    lots = sorted(lots, key=lambda lot: lot.id)
+    lots.sort(key=lambda lot: lot.date, reverse=True)
+    available = {lot.id: lot.quantity - lot.held_back for lot in lots}
+    allocation: dict[tuple[uuid.UUID, uuid.UUID], int] = {}
+    shortfalls: dict[uuid.UUID, int] = {}
+    for sale in sales:
+        wanted = sale.quantity
+        for lot in lots:
+            if wanted == 0:
+                break
+            if lot.date > sale.date or available[lot.id] <= 0:
+                continue
+            taken = min(wanted, available[lot.id])
+            available[lot.id] -= taken
+            allocation[(sale.id, lot.id)] = taken
+            wanted -= taken
+        if wanted:
+            shortfalls[sale.id] = wanted
+    return allocation, shortfalls
+
+
+def reprocess_sales(
+    session: Session,
+    user_id: uuid.UUID,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    transaction_ids: Optional[list[uuid.UUID]] = None,
+    dry_run: bool = False,
+) -> SaleReprocessingResult:
+    """
+    Rewind and replay the sale allocation of every SKU a user's transactions
+    in the given window touch (purchases and sales alike).
+
+    Runs in the caller's transaction and leaves committing to the caller.
+
+    Args:
+        session: Database session
+        user_id: Owner of the transactions
+        start_date: Only consider transactions dated on or after this
+        end_date: Only consider transactions dated before this
+        transaction_ids: Only consider these transactions
+        dry_run: Compute the changes without writing them
+
+    Returns:
+        The allocation changes, and any sale that can no longer be covered
+
+    Raises:
+        InsufficientInventoryError: If a sale can no longer be covered (unless
+            ``dry_run``); nothing is written in that case.
+    """
+    scope = (
+        select(LineItem.sku_id)
+        .join(Transaction)
+        .where(LineItem.user_id == user_id)
+        .distinct()
+    )
+    if start_date is not None:
+        scope = scope.where(Transaction.date >= start_date)
+    if end_date is not None:
+        scope = scope.where(Transaction.date < end_date)
+    if transaction_ids is not None:
+        scope = scope.where(
+            Transaction.id
+            == any_(bindparam("transaction_ids", value=transaction_ids, type_=_UUIDS))
+        )
+    # Never correlated: the queries below also select from line_item
+    sku_scope = scope.correlate(None).scalar_subquery()
+
+    lots: dict[uuid.UUID, list[_Lot]] = defaultdict(list)
+    sales: dict[uuid.UUID, list[_Sale]] = defaultdict(list)
+    lot_sku: dict[uuid.UUID, uuid.UUID] = {}
+    line_items = session.execute(
+        select(
+            LineItem.id,
+            LineItem.sku_id,
+            LineItem.quantity,
+            LineItem.remaining_quantity,
+            Transaction.type,
+            Transaction.date,
+        )
+        .join(Transaction)
+        .where(LineItem.user_id == user_id, LineItem.sku_id.in_(sku_scope))
+        .order_by(Transaction.date, LineItem.id)
+    )
+    for row in line_items:
+        if row.type == TransactionType.PURCHASE:
+            lots[row.sku_id].append(
+                _Lot(row.id, row.date, row.quantity, row.remaining_quantity or 0)
+            )
+            lot_sku[row.id] = row.sku_id
+        else:
+            sales[row.sku_id].append(_Sale(row.id, row.date, row.quantity))
+
+    # Current consumptions of the replayed SKUs' lots, by replayed sales or not
+    sale_line_item = aliased(LineItem)
+    consumptions = session.execute(
+        select(
+            LineItemConsumption.sale_line_item_id,
+            LineItemConsumption.purchase_line_item_id,
+            func.sum(LineItemConsumption.quantity),
+            sale_line_item.user_id == user_id,
+        )
+        .join(LineItem, LineItem.id == LineItemConsumption.purchase_line_item_id)
+        .join(
+            sale_line_item,
+            sale_line_item.id == LineItemConsumption.sale_line_item_id,
+        )
+        .where(LineItem.user_id == user_id, LineItem.sku_id.in_(sku_scope))
+        .group_by(
+            LineItemConsumption.sale_line_item_id,
+            LineItemConsumption.purchase_line_item_id,
+            sale_line_item.user_id,
+        )
+    ).all()
+    old_allocation: dict[tuple[uuid.UUID, uuid.UUID], int] = {}
+    held_back: dict[uuid.UUID, int] = defaultdict(int)
+    for sale_id, lot_id, quantity, replayed in consumptions:
+        if replayed:
+            old_allocation[(sale_id, lot_id)] = quantity
+        else:
+            held_back[lot_id] += quantity
+
+    result = SaleReprocessingResult(
+        dry_run=dry_run,
+        sku_count=len(lots.keys() | sales.keys()),
+        sale_line_item_count=sum(len(sku_sales) for sku_sales in sales.values()),
+    )
+    new_allocation: dict[tuple[uuid.UUID, uuid.UUID], int] = {}
+    for sku_lots in lots.values():
+        for lot in sku_lots:
+            lot.held_back = held_back[lot.id]
+    for sku_id in lots.keys() | sales.keys():
+        allocation, shortfalls = _allocate(lots[sku_id], sales[sku_id])
+        new_allocation.update(allocation)
+        result.shortfalls.update(shortfalls)
+
+    changed_sales = set()
+    for key in sorted(old_allocation.keys() | new_allocation.keys()):
+        old, new = old_allocation.get(key, 0), new_allocation.get(key, 0)
+        if old != new:
+            sale_id, lot_id = key
+            result.consumption_changes.append(
+                ConsumptionChange(lot_sku[lot_id], sale_id, lot_id, old, new)
+            )
+            changed_sales.add(sale_id)
+
+    consumed: dict[uuid.UUID, int] = defaultdict(int)
+    for (_, lot_id), quantity in new_allocation.items():
+        consumed[lot_id] += quantity
+    for sku_id, sku_lots in sorted(lots.items()):
+        for lot in sku_lots:
+            remaining = lot.quantity - lot.held_back - consumed[lot.id]
+            if remaining != lot.remaining_quantity:
+                result.remaining_quantity_changes.append(
+                    RemainingQuantityChange(
+                        sku_id, lot.id, lot.remaining_quantity, remaining
+                    )
+                )
+
+    if dry_run:
+        return result
+    if result.shortfalls:
+        raise InsufficientInventoryError(
+            f"{len(result.shortfalls)} sale line items can no longer be fulfilled"
+        )
+    _write_changes(session, user_id, result, changed_sales, new_allocation)
+    return result
+
+
+def _write_changes(
+    session: Session,
+    user_id: uuid.UUID,
+    result: SaleReprocessingResult,
+    changed_sales: set[uuid.UUID],
+    new_allocation: dict[tuple[uuid.UUID, uuid.UUID], int],
+) -> None:
+    if not changed_sales and not result.remaining_quantity_changes:
+        return
+    # Bulk statements bypass the unit of work: write out pending changes first
+    session.flush()
+
+    if changed_sales:
+        session.execute(
+            delete(LineItemConsumption).where(
+                LineItemConsumption.sale_line_item_id
+                == any_(bindparam("sale_ids", value=list(changed_sales), type_=_UUIDS))
+            ),
+            execution_options={"synchronize_session": False},
+        )
+        session.execute(
+            insert(LineItemConsumption),
+            [
+                {
+                    "user_id": user_id,
+                    "sale_line_item_id": sale_id,
+                    "purchase_line_item_id": lot_id,
+                    "quantity": quantity,
+                }
+                for (sale_id, lot_id), quantity in sorted(new_allocation.items())
+                if sale_id in changed_sales
+            ],
+        )
+
+    if result.remaining_quantity_changes:
+        changes = result.remaining_quantity_changes
+        remaining = (
+            func.unnest(
+                bindparam(
+                    "lot_ids",
+                    value=[change.purchase_line_item_id for change in changes],
+                    type_=_UUIDS,
+                ),
+                bindparam(
+                    "remaining_quantities",
+                    value=[change.new_quantity for change in changes],
+                    type_=ARRAY(Integer),
+                ),
+            )
+            .table_valued("id", "remaining_quantity")
+            .render_derived(name="remaining")
+        )
+        session.execute(
+            update(LineItem)
+            .where(LineItem.id == remaining.c.id)
+            .values(remaining_quantity=remaining.c.remaining_quantity),
+            execution_options={"synchronize_session": False},
+        )
+
+    # Loaded line items and consumptions may now be stale
+    session.expire_all()
+    # The flush hook does not see bulk statements
+    connection = session.connection()
+    refresh_holdings(
+        connection,
+        {(user_id, change.sku_id) for change in result.remaining_quantity_changes},
+    )
+    bump_inventory_versions(connection, [user_id])
@@ -0,0 +1,224 @@
+"""Where weighted unit price calculation gets SKU prices from."""
+
+from __future__ import annotations
+
+import enum
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from typing import Dict, Mapping, Optional, Protocol
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from core.models.price import Marketplace, SKULatestPrice
+from core.services.bulk_price_fetcher import BulkSkuPriceFetcher
+from core.services.tcgplayer_catalog_service import (
+    TCGPlayerCatalogService,
+    get_tcgplayer_catalog_service,
+)
+
+logger = logging.getLogger(__name__)
+
+# Prices only weight a total across line items; the daily refresh keeps held
+# SKUs' latest prices within this
+LATEST_PRICE_MAX_AGE = timedelta(hours=24)
+# Stale SKUs of calculations started within this window share one upstream request
+LIVE_FETCH_BATCH_WINDOW_SECONDS = 0.005
+
+
+class PriceSource(enum.StrEnum):
+    LIVE = "live"  # Fetched from TCGPlayer for this calculation
+    LATEST = "latest"  # Read from sku_latest_price
+    # Read from sku_latest_price past its max age, after the live fetch failed
+    STALE_LATEST = "stale_latest"
+    NONE = "none"  # No known price
+
+
+@dataclass
+class SkuPriceQuote:
+    """A SKU's lowest listing price total and where it came from."""
+
+    price: Optional[Decimal]
+    source: PriceSource
+
+
+@dataclass
+class SkuPriceSourceStats:
+    """SKUs priced per source, for one price source."""
+
+    live: int = 0
+    latest: int = 0
+    stale_latest: int = 0
+    unpriced: int = 0
+    # Stale or missing SKUs the live fetch did not answer
+    fallbacks: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"{self.live} live, {self.latest} from sku_latest_price, "
+            f"{self.stale_latest} stale from sku_latest_price, "
+            f"{self.unpriced} unpriced, {self.fallbacks} live lookups fell back"
+        )
+
+
+class SkuPriceSource(Protocol):
+    stats: SkuPriceSourceStats
+
+    async def get_prices(
+        self, session: Session, sku_ids_by_tcgplayer_id: Mapping[int, uuid.UUID]
+    ) -> Dict[uuid.UUID, SkuPriceQuote]:
+        """
+        Price SKUs.
+
+        Args:
+            session: DB session
+            sku_ids_by_tcgplayer_id: TCGPlayer SKU ID -> internal SKU ID
+
+        Returns:
+            Mapping of internal SKU ID -> quote, for every requested SKU
+        """
+        ...
+
+
+class LiveSkuPriceSource:
+    """Every SKU priced by one TCGPlayer pricing request."""
+
+    def __init__(self, catalog_service: TCGPlayerCatalogService) -> None:
+        self.catalog_service = catalog_service
+        self.stats = SkuPriceSourceStats()
+
+    async def get_prices(
+        self, session: Session, sku_ids_by_tcgplayer_id: Mapping[int, uuid.UUID]
+    ) -> Dict[uuid.UUID, SkuPriceQuote]:
+        response = await self.catalog_service.get_sku_prices(
+            list(sku_ids_by_tcgplayer_id)
+        )
+        quotes = {
+            sku_id: SkuPriceQuote(None, PriceSource.NONE)
+            for sku_id in sku_ids_by_tcgplayer_id.values()
+        }
+        for result in response.results:
+            sku_id = sku_ids_by_tcgplayer_id.get(result.sku_id)
+            if sku_id is not None and result.lowest_listing_price_total is not None:
+                quotes[sku_id] = SkuPriceQuote(
+                    result.lowest_listing_price_total, PriceSource.LIVE
+                )
+        _count(self.stats, quotes)
+        return quotes
+
+
+class LatestSkuPriceSource:
+    """SKUs priced from sku_latest_price, falling back to TCGPlayer.
+
+    A SKU whose latest price was updated within ``max_age`` uses it. The
+    remaining SKUs are fetched live in one call through a BulkSkuPriceFetcher,
+    which splits it into requests under the API's size limit and shares
+    in-flight SKUs between concurrent calculations. SKUs the fetch leaves
+    unanswered (or every remaining SKU, if it fails) use their stale latest
+    price if they have one, quoted as ``PriceSource.STALE_LATEST``.
+    """
+
+    def __init__(
+        self,
+        catalog_service: TCGPlayerCatalogService,
+        max_age: timedelta = LATEST_PRICE_MAX_AGE,
+        marketplace: Marketplace = Marketplace.TCGPLAYER,
+    ) -> None:
+        self.max_age = max_age
+        self.marketplace = marketplace
+        self.fetcher = BulkSkuPriceFetcher(
+            catalog_service,
+            coalesce_window=LIVE_FETCH_BATCH_WINDOW_SECONDS,
+            max_attempts=1,
+        )
+        self.stats = SkuPriceSourceStats()
+
+    async def get_prices(
+        self, session: Session, sku_ids_by_tcgplayer_id: Mapping[int, uuid.UUID]
+    ) -> Dict[uuid.UUID, SkuPriceQuote]:
+        fresh_after = datetime.now(UTC) - self.max_age
+        latest = {
+            row.sku_id: row
+            for row in session.execute(
+                select(
+                    SKULatestPrice.sku_id,
+                    SKULatestPrice.lowest_listing_price_total,
+                    SKULatestPrice.updated_at,
+                ).where(
+                    SKULatestPrice.sku_id.in_(list(sku_ids_by_tcgplayer_id.values())),
+                    SKULatestPrice.marketplace == self.marketplace,
+                )
+            )
+        }
+
+        quotes: Dict[uuid.UUID, SkuPriceQuote] = {}
+        to_fetch = []
+        for tcgplayer_id, sku_id in sku_ids_by_tcgplayer_id.items():
+            row = latest.get(sku_id)
+            if row is not None and row.updated_at >= fresh_after:
+                quotes[sku_id] = SkuPriceQuote(
+                    row.lowest_listing_price_total, PriceSource.LATEST
+                )
+            else:
+                to_fetch.append(tcgplayer_id)
+
+        answered = {}
+        if to_fetch:
+            try:
+                response = await self.fetcher.get_sku_prices(to_fetch)
+                # The fetcher leaves out IDs whose request failed
+                answered = {
+                    result.sku_id: result.lowest_listing_price_total
+                    for result in response.results
+                }
+            except Exception as e:
+                logger.warning(
+                    "Live price lookup failed for %d SKUs: %s", len(to_fetch), e
+                )
+
+        for tcgplayer_id in to_fetch:
+            sku_id = sku_ids_by_tcgplayer_id[tcgplayer_id]
+            if tcgplayer_id in answered:
+                price = answered[tcgplayer_id]
+                quotes[sku_id] = SkuPriceQuote(
+                    price, PriceSource.LIVE if price is not None else PriceSource.NONE
+                )
+                continue
+            self.stats.fallbacks += 1
+            row = latest.get(sku_id)
+            quotes[sku_id] = (
+                SkuPriceQuote(row.lowest_listing_price_total, PriceSource.STALE_LATEST)
+                if row is not None
+                else SkuPriceQuote(None, PriceSource.NONE)
+            )
+        _count(self.stats, quotes)
+        return quotes
+
+
+def _count(stats: SkuPriceSourceStats, quotes: Mapping[uuid.UUID, SkuPriceQuote]):
+    for quote in quotes.values():
+        match quote.source:
+            case PriceSource.LIVE:
+                stats.live += 1
+            case PriceSource.LATEST:
+                stats.latest += 1
+            case PriceSource.STALE_LATEST:
+                stats.stale_latest += 1
+            case PriceSource.NONE:
+                stats.unpriced += 1
+
+
+_sku_price_source = LatestSkuPriceSource(get_tcgplayer_catalog_service())
+
+
+def get_sku_price_source() -> SkuPriceSource:
+    """Get the singleton price source for weighted unit price calculation"""
+    return _sku_price_source
+
+
+def log_price_source_stats() -> None:
+    """Log how this process's weighted unit price calculations were priced."""
+    logger.info("SKU price source: %s", _sku_price_source.stats.summary())
@@ -1,10 +1,10 @@
 import logging
 import math
-import random
 import uuid
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, NamedTuple, Tuple
 
+import numpy as np
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
@@ -112,12 +112,74 @@ def calculate_service_score(priority_score: float, age_norm: float) -> float:
     ] * float(priority_score)
 
 
+def sample_softmax_window(
+    scores: np.ndarray,
+    temperature: float,
+    count: int,
+    window_size: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    Sample ``count`` indices without replacement from scores sorted descending.
+
+    Each draw picks from the ``window_size`` highest-scoring remaining items with
+    probability softmax(score / temperature). Draws use the Gumbel-max trick: when the
+    window spans every remaining item this is plain Gumbel-top-k over one noise
+    vector, otherwise the window slides down the sorted array with fresh noise per
+    draw so every step keeps the exact windowed softmax distribution.
+
+    Returns:
+        Indices into ``scores`` in selection order.
+    """
+    n = len(scores)
+    count = min(count, n)
+    if count <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    # Only the first count + window_size items can enter the window
+    logits = np.asarray(scores[: count + window_size], dtype=float) / temperature
+    n = len(logits)
+
+    if window_size >= n:
+        keys = logits + rng.gumbel(size=n)
+        top = np.argpartition(-keys, count - 1)[:count]
+        return top[np.argsort(-keys[top], kind="stable")]
+
+    window = np.arange(window_size)
+    window_logits = logits[:window_size].copy()
+    next_index = window_size
+    noise = rng.gumbel(size=(count, window_size))
+    selected = np.empty(count, dtype=np.int64)
+
+    for step in range(count):
+        live = min(window_size, n - step)
+        slot = int(np.argmax(window_logits[:live] + noise[step, :live]))
+        selected[step] = window[slot]
+
+        # Refill the slot with the next item in score order, or shrink the window
+        if next_index < n:
+            window[slot] = next_index
+            window_logits[slot] = logits[next_index]
+            next_index += 1
+        else:
+            window[slot] = window[live - 1]
+            window_logits[slot] = window_logits[live - 1]
+
+    return selected
+
+
 class TierCandidates:
     """Manages SKU candidates across tiers with efficient two-phase selection."""
 
-    def __init__(self, session: Session, marketplace: Marketplace):
+    def __init__(
+        self,
+        session: Session,
+        marketplace: Marketplace,
+        rng: Optional[np.random.Generator] = None,
+    ):
         self.marketplace = marketplace
         self.session = session
+        self.rng = rng if rng is not None else np.random.default_rng()
         self.candidates_by_tier = {tier.name: [] for tier in TIER_CONFIGS}
         self.catalog_ids_by_sku: Dict[
             uuid.UUID, Tuple[uuid.UUID, uuid.UUID, uuid.UUID, uuid.UUID]
@@ -219,41 +281,24 @@ class TierCandidates:
     def _select_from_tier(
         self, candidates: List[Candidate], tier: TierConfig, count: int
     ) -> List[Candidate]:
-        """Select multiple SKUs from a tier using softmax sampling within top-L window."""
+        """Select multiple SKUs from a tier using softmax sampling within top-L window.
+
+        Candidates must be sorted by service_score descending.
+        """
         if not candidates or count <= 0:
             return []
 
-        selected = []
-        available = candidates.copy()  # Work with a copy to avoid modifying original
-
-        for _ in range(min(count, len(available))):
-            # Softmax sampling within top-L window
-            window_size = max(MIN_WINDOW_SIZE, min(TOP_L_WINDOW, len(available)))
-            window = available[:window_size]
-
-            # Calculate softmax probabilities
-            scores = [c.service_score for c in window]
-            max_score = max(scores)
-            exp_scores = [
-                math.exp((score - max_score) / tier.temperature) for score in scores
-            ]
-            total_exp = sum(exp_scores)
-            probabilities = [exp_score / total_exp for exp_score in exp_scores]
-
-            # Weighted random selection
-            rand_val = random.random()
-            cumulative = 0.0
-            chosen = window[-1]  # fallback
-            for i, prob in enumerate(probabilities):
-                cumulative += prob
-                if rand_val <= cumulative:
-                    chosen = window[i]
-                    break
-
-            selected.append(chosen)
-            available.remove(chosen)
-
-        return selected
+        window_size = max(MIN_WINDOW_SIZE, TOP_L_WINDOW)
+        # The window advances one slot per pick, so nothing past this prefix is reachable
+        reachable = candidates[: count + window_size]
+        scores = np.fromiter(
+            (c.service_score for c in reachable), dtype=float, count=len(reachable)
+        )
+        selected_indexes = sample_softmax_window(
+            scores, tier.temperature, count, window_size, self.rng
+        )
+
+        return [candidates[i] for i in selected_indexes]
 
     def get_ordered_processing_list(
         self, tier_quotas: Dict[str, int]
@@ -1,12 +1,12 @@
 import logging
-from asyncio import Lock
-from datetime import datetime
+from datetime import datetime, timezone
 from contextlib import asynccontextmanager
 from typing import Optional
 
 import aiohttp
 
 from core.environment import get_environment
+from core.services.oauth_token_store import CachedToken, SharedOAuthToken, TokenStore
 from core.services.schemas.schema import (
     CatalogDetailResponseSchema,
     CatalogPrintingResponseSchema,
@@ -29,21 +29,23 @@ TCGPLAYER_PRICING_URL = f"{TCGPLAYER_BASE_URL}/pricing"
 TCGPLAYER_CATALOG_URL = f"{TCGPLAYER_BASE_URL}/catalog"
 
 
-def access_token_expired(expiry) -> bool:
-    if expiry is None:
-        return True
+def parse_access_token_expiry(expiry: str) -> float:
+    """Convert the token response's ".expires" value to a Unix timestamp."""
     # Sat, 20 Aug 2022 18:39:21 GMT
     expiry_date = datetime.strptime(expiry, "%a, %d %b %Y %H:%M:%S %Z")
 
-    return datetime.now() > expiry_date
+    return expiry_date.replace(tzinfo=timezone.utc).timestamp()
 
 
 class TCGPlayerCatalogService:
-    def __init__(self):
+    def __init__(self, token_store: Optional[TokenStore] = None):
         self.session: Optional[aiohttp.ClientSession] = None
-        self.lock = Lock()
-        self.access_token = None
-        self.access_token_expiry = None
+        # The bearer token is shared with every process using the same client id
+        self.bearer_token = SharedOAuthToken(
+            f"tcgplayer:{get_environment().tcgplayer_client_id}",
+            self._mint_access_token,
+            store=token_store,
+        )
         self._timeout = aiohttp.ClientTimeout(total=30)  # 30 second default timeout
 
     async def init(self, timeout_seconds: int = 30):
@@ -59,13 +61,14 @@ class TCGPlayerCatalogService:
             self.session = None
 
     async def get_authorization_headers(self) -> dict:
-        async with self.lock:
-            refreshed = await self._check_and_refresh_access_token()
-            if not refreshed:
-                raise Exception("Failed to get or refresh TCGPlayer access token")
+        # A fresh token is read without a lock; concurrent callers share one refresh
+        try:
+            access_token = await self.bearer_token.get_token()
+        except Exception as e:
+            logger.error(f"Exception refreshing TCGPlayer token: {str(e)}")
+            raise Exception("Failed to get or refresh TCGPlayer access token") from e
 
-            headers = {"Authorization": f"bearer {self.access_token}"}
-            return headers
+        return {"Authorization": f"bearer {access_token}"}
 
     async def get_catalogs(self, catalog_ids: list[int]) -> CatalogDetailResponseSchema:
         if self.session is None or self.session.closed:
@@ -218,36 +221,29 @@ class TCGPlayerCatalogService:
                 await response.json()
             )
 
-    async def _check_and_refresh_access_token(self) -> bool:
-        if access_token_expired(self.access_token_expiry):
-            logging.debug("ACCESS TOKEN EXPIRED: Fetching new one")
-            environment = get_environment()
-
-            data = RefreshTokenRequestSchema(
-                grant_type="client_credentials",
-                client_id=environment.tcgplayer_client_id,
-                client_secret=environment.tcgplayer_client_secret,
-            ).model_dump()
-
-            try:
-                async with self.session.post(
-                    TCGPLAYER_ACCESS_TOKEN_URL, data=data
-                ) as response:
-                    if not response.ok:
-                        logger.error(
-                            f"Failed to refresh TCGPlayer token: {response.status}"
-                        )
-                        return False
-
-                    data = await response.json()
-                    self.access_token = data["access_token"]
-                    self.access_token_expiry = data[".expires"]
-                    return True
-            except Exception as e:
-                logger.error(f"Exception refreshing TCGPlayer token: {str(e)}")
-                return False
-        else:
-            return True
+    async def _mint_access_token(self) -> CachedToken:
+        logging.debug("ACCESS TOKEN EXPIRED: Fetching new one")
+        if self.session is None or self.session.closed:
+            await self.init()
+
+        environment = get_environment()
+
+        data = RefreshTokenRequestSchema(
+            grant_type="client_credentials",
+            client_id=environment.tcgplayer_client_id,
+            client_secret=environment.tcgplayer_client_secret,
+        ).model_dump()
+
+        async with self.session.post(TCGPLAYER_ACCESS_TOKEN_URL, data=data) as response:
+            if not response.ok:
+                raise RuntimeError(
+                    f"Failed to refresh TCGPlayer token: {response.status}"
+                )
+
+            data = await response.json()
+            return CachedToken(
+                data["access_token"], parse_access_token_expiry(data[".expires"])
+            )
 
 
 # Singleton instance for the application
@@ -0,0 +1,63 @@
+"""Per-user cache of transaction metrics, keyed by transaction version."""
+
+from __future__ import annotations
+
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from core.dao.transaction_version import get_transaction_version
+from core.services.transaction_service import (
+    TransactionMetrics,
+    get_transaction_metrics,
+)
+from core.services.version_keyed_cache import VersionKeyedCache, VersionKeyedCacheStats
+
+TRANSACTION_METRICS_CACHE_MAX_ENTRIES = 10_000
+
+
+class TransactionMetricsCache:
+    """get_transaction_metrics results, reused while the user's transactions are unchanged.
+
+    Every lookup reads the user's transaction version (one primary key probe)
+    and recomputes when it moved since the entry was cached. The version moves
+    in the same transaction as any write to the user's transactions or line
+    items.
+    """
+
+    def __init__(
+        self, max_entries: int = TRANSACTION_METRICS_CACHE_MAX_ENTRIES
+    ) -> None:
+        # user_id -> metrics
+        self._cache: VersionKeyedCache[UUID, TransactionMetrics] = VersionKeyedCache(
+            max_entries
+        )
+
+    @property
+    def stats(self) -> VersionKeyedCacheStats:
+        return self._cache.stats
+
+    def get_metrics(self, session: Session, user_id: UUID) -> TransactionMetrics:
+        """
+        Get aggregate transaction metrics for a user.
+
+        Args:
+            session: Session to read the version and compute metrics with
+            user_id: User whose transactions to aggregate
+
+        Returns:
+            The same metrics as get_transaction_metrics
+        """
+        return self._cache.get(
+            user_id,
+            get_transaction_version(session, user_id),
+            lambda: get_transaction_metrics(session, user_id),
+        )
+
+
+_transaction_metrics_cache = TransactionMetricsCache()
+
+
+def get_transaction_metrics_cache() -> TransactionMetricsCache:
+    """Get the singleton instance of the transaction metrics cache"""
+    return _transaction_metrics_cache
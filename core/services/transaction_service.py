@@ -0,0 +1,75 @@
+from typing import TypedDict
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from core.models.transaction import LineItem, Transaction, TransactionType
+
+
+class TransactionMetrics(TypedDict):
+    """TypedDict representing aggregated transaction metrics."""
+
+    total_revenue: float
+    total_spent: float
+    net_profit: float
+    total_transactions: int
+    currency: str
+
+
+def get_transaction_metrics(session: Session, user_id: UUID) -> TransactionMetrics:
+    """
+    Return aggregate metrics over a user's transactions that have line items.
+
+    Sales and purchases are totalled in one pass over the user's transactions:
+    revenue is sale line items + tax - shipping, spend is purchase line items +
+    tax + shipping.
+    """
+    line_items_total = (
+        select(
+            LineItem.transaction_id,
+            func.sum(LineItem.quantity * LineItem.unit_price_amount).label(
+                "line_items_total"
+            ),
+        )
+        .where(LineItem.user_id == user_id)
+        .group_by(LineItem.transaction_id)
+        .subquery()
+    )
+    is_sale = Transaction.type == TransactionType.SALE
+    is_purchase = Transaction.type == TransactionType.PURCHASE
+    row = session.execute(
+        select(
+            func.count().filter(is_sale).label("sales_count"),
+            func.coalesce(
+                func.sum(
+                    line_items_total.c.line_items_total
+                    + Transaction.tax_amount
+                    - Transaction.shipping_cost_amount
+                ).filter(is_sale),
+                0,
+            ).label("sales_total"),
+            func.count().filter(is_purchase).label("purchase_count"),
+            func.coalesce(
+                func.sum(
+                    line_items_total.c.line_items_total
+                    + Transaction.tax_amount
+                    + Transaction.shipping_cost_amount
+                ).filter(is_purchase),
+                0,
+            ).label("purchase_total"),
+        )
+        .select_from(Transaction)
+        .join(line_items_total, Transaction.id == line_items_total.c.transaction_id)
+        .where(Transaction.user_id == user_id)
+    ).one()
+
+    sales_total = float(row.sales_total)
+    purchase_total = float(row.purchase_total)
+    return {
+        "total_revenue": sales_total,
+        "total_spent": purchase_total,
+        "net_profit": sales_total - purchase_total,
+        "total_transactions": row.sales_count + row.purchase_count,
+        "currency": "USD",
+    }
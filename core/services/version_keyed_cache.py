@@ -0,0 +1,74 @@
+"""In-process cache of values computed per key, reused while the key's version is unchanged."""
+
+from __future__ import annotations
+
+import copy
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Generic, Hashable, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class VersionKeyedCacheStats:
+    """Lookup accounting for one version-keyed cache."""
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class VersionKeyedCache(Generic[K, V]):
+    """Values tagged with the version they were computed at, evicted least recently used.
+
+    A lookup passes the key's current version; an entry tagged with any other
+    version is recomputed. Callers read the version before computing the value,
+    so an entry is never older than the version it is tagged with. Values are
+    returned as shallow copies, so callers may modify them. ``max_entries``
+    bounds memory, not freshness.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self.stats = VersionKeyedCacheStats()
+        # key -> (version, value)
+        self._entries: OrderedDict[K, Tuple[int, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K, version: int, compute: Callable[[], V]) -> V:
+        """
+        Get the value of a key at a version, computing it on a miss.
+
+        Args:
+            key: Key of the value
+            version: The key's current version, read before calling
+            compute: Computes the value at ``version``
+
+        Returns:
+            A copy of the cached or computed value
+        """
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == version:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return copy.copy(cached[1])
+            self.stats.misses += 1
+
+        value = compute()
+        with self._lock:
+            # A concurrent miss may have cached a newer version meanwhile
+            current = self._entries.get(key)
+            if current is None or current[0] <= version:
+                self._entries[key] = (version, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return copy.copy(value)
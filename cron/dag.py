@@ -0,0 +1,340 @@
+"""
+Job graph runner for the cron tasks.
+
+In production each task runs as its own ECS task, started by an EventBridge
+schedule or by an event that its upstream task publishes when it changed
+something. `run_job_graph` runs the same tasks in one process instead:
+
+- Jobs declare ``depends_on`` (run after, and only when one of them reported a
+  change since this job last succeeded) and ``after`` (ordering only).
+- Independent jobs run concurrently, bounded by ``max_concurrency`` and by
+  per-resource limits (e.g. one TCGPlayer API client at a time).
+- Every run is recorded with its duration, status and output in a RunStore.
+  The records drive the change detection above, across runs as well as within
+  one.
+
+`LocalRunStore` keeps the records in a JSON lines file, so the pipeline runs
+without AWS.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import inspect
+import json
+import logging
+import os
+import traceback
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from enum import StrEnum
+from pathlib import Path
+from typing import Any, Callable, Iterable, Protocol
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RUN_STORE_PATH = ".cron/runs.jsonl"
+
+
+def _always_changed(output: Any) -> bool:
+    return True
+
+
+@dataclass(frozen=True)
+class Job:
+    """One cron task and its place in the graph."""
+
+    name: str
+    # A callable, or "module:function" imported when the job runs. Coroutine
+    # functions are awaited, plain functions run in a worker thread.
+    entry_point: str | Callable[[], Any]
+    # Run after these, and skip unless one changed since this job last succeeded
+    depends_on: tuple[str, ...] = ()
+    # Run after these when they are part of the same run; no change gating
+    after: tuple[str, ...] = ()
+    # Named resources held while running, limited by the runner's resource_limits
+    resources: tuple[str, ...] = ()
+    # Whether an output counts as a change for the jobs that depend on this one
+    changed: Callable[[Any], bool] = _always_changed
+
+    def load(self) -> Callable[[], Any]:
+        if callable(self.entry_point):
+            return self.entry_point
+        module_name, _, function_name = self.entry_point.partition(":")
+        return getattr(importlib.import_module(module_name), function_name)
+
+
+class JobStatus(StrEnum):
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    # Nothing upstream changed since the last successful run
+    SKIPPED = "skipped"
+    UPSTREAM_FAILED = "upstream_failed"
+
+
+@dataclass
+class JobRunRecord:
+    """The outcome of one job in one graph run."""
+
+    run_id: str
+    job: str
+    status: JobStatus
+    started_at: datetime
+    finished_at: datetime
+    output: Any = None
+    changed: bool = False
+    error: str | None = None
+
+    @property
+    def duration_seconds(self) -> float:
+        return (self.finished_at - self.started_at).total_seconds()
+
+    def to_json(self) -> str:
+        record = asdict(self)
+        record["started_at"] = self.started_at.isoformat()
+        record["finished_at"] = self.finished_at.isoformat()
+        record["duration_seconds"] = round(self.duration_seconds, 3)
+        return json.dumps(record, default=str)
+
+    @classmethod
+    def from_json(cls, line: str) -> "JobRunRecord":
+        record = json.loads(line)
+        record.pop("duration_seconds", None)
+        return cls(
+            **{
+                **record,
+                "status": JobStatus(record["status"]),
+                "started_at": datetime.fromisoformat(record["started_at"]),
+                "finished_at": datetime.fromisoformat(record["finished_at"]),
+            }
+        )
+
+
+class RunStore(Protocol):
+    def append(self, record: JobRunRecord) -> None: ...
+
+    def records(self, job: str) -> list[JobRunRecord]:
+        """Records for ``job``, oldest first."""
+        ...
+
+
+class LocalRunStore:
+    """RunStore backed by an append-only JSON lines file."""
+
+    def __init__(self, path: str | os.PathLike | None = None) -> None:
+        self.path = Path(
+            path or os.getenv("CRON_RUN_STORE_PATH", DEFAULT_RUN_STORE_PATH)
+        )
+
+    def append(self, record: JobRunRecord) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a") as f:
+            f.write(record.to_json() + "\n")
+
+    def records(self, job: str) -> list[JobRunRecord]:
+        if not self.path.exists():
+            return []
+        with self.path.open() as f:
+            return [
+                record
+                for record in map(JobRunRecord.from_json, filter(str.strip, f))
+                if record.job == job
+            ]
+
+
+def last_success(store: RunStore, job: str) -> JobRunRecord | None:
+    successes = [
+        record for record in store.records(job) if record.status == JobStatus.SUCCEEDED
+    ]
+    return successes[-1] if successes else None
+
+
+def changed_since(store: RunStore, job: str, since: datetime | None) -> bool:
+    """Whether ``job`` succeeded with a change after ``since`` (ever, if None)."""
+    return any(
+        record.status == JobStatus.SUCCEEDED
+        and record.changed
+        and (since is None or record.finished_at > since)
+        for record in store.records(job)
+    )
+
+
+class JobGraph:
+    """A validated set of jobs and the edges between them."""
+
+    def __init__(self, jobs: Iterable[Job]) -> None:
+        self.jobs: dict[str, Job] = {}
+        for job in jobs:
+            if job.name in self.jobs:
+                raise ValueError(f"Duplicate job: {job.name}")
+            self.jobs[job.name] = job
+
+        for job in self.jobs.values():
+            unknown = set(job.depends_on + job.after) - set(self.jobs)
+            if unknown:
+                raise ValueError(f"{job.name} references unknown jobs: {unknown}")
+        self.order = self._topological_order()
+
+    def predecessors(self, name: str) -> tuple[str, ...]:
+        job = self.jobs[name]
+        return job.depends_on + job.after
+
+    def _topological_order(self) -> list[str]:
+        order: list[str] = []
+        state: dict[str, str] = {}
+
+        def visit(name: str, path: list[str]) -> None:
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                cycle = " -> ".join(path[path.index(name) :] + [name])
+                raise ValueError(f"Job graph has a cycle: {cycle}")
+            state[name] = "visiting"
+            for predecessor in self.predecessors(name):
+                visit(predecessor, path + [name])
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.jobs:
+            visit(name, [])
+        return order
+
+    def downstream(self, names: Iterable[str]) -> set[str]:
+        """``names`` plus every job that transitively depends on them."""
+        selected = set(names)
+        for name in self.order:
+            if any(dep in selected for dep in self.jobs[name].depends_on):
+                selected.add(name)
+        return selected
+
+
+@dataclass
+class _RunState:
+    run_id: str
+    records: dict[str, JobRunRecord] = field(default_factory=dict)
+    done: dict[str, asyncio.Event] = field(default_factory=dict)
+
+
+async def run_job_graph(
+    graph: JobGraph,
+    store: RunStore,
+    targets: Iterable[str] | None = None,
+    resource_limits: dict[str, int] | None = None,
+    max_concurrency: int = 4,
+    force: bool = False,
+) -> dict[str, JobRunRecord]:
+    """
+    Run ``targets`` and everything downstream of them, in dependency order.
+
+    Args:
+        graph: Jobs to run
+        store: Where run records are read from and appended to
+        targets: Jobs to start from (every job without dependencies if None).
+            Targets always run; jobs pulled in as their dependents are skipped
+            when nothing they depend on changed since they last succeeded.
+        resource_limits: Maximum concurrent holders per named resource
+            (unlisted resources are unlimited)
+        max_concurrency: Maximum jobs running at once
+        force: Run every selected job regardless of upstream changes
+
+    Returns:
+        Mapping of job name -> record for this run, in graph order
+    """
+    if targets is None:
+        targets = [name for name, job in graph.jobs.items() if not job.depends_on]
+    requested = set(targets)
+    unknown = requested - set(graph.jobs)
+    if unknown:
+        raise ValueError(f"Unknown jobs: {unknown}")
+    selected = graph.downstream(requested)
+
+    state = _RunState(run_id=uuid.uuid4().hex)
+    state.done = {name: asyncio.Event() for name in selected}
+    slots = asyncio.Semaphore(max_concurrency)
+    resources = {
+        name: asyncio.Semaphore(limit)
+        for name, limit in (resource_limits or {}).items()
+    }
+
+    def finish(
+        job: Job,
+        status: JobStatus,
+        started_at: datetime,
+        output: Any = None,
+        changed: bool = False,
+        error: str | None = None,
+    ) -> None:
+        record = JobRunRecord(
+            run_id=state.run_id,
+            job=job.name,
+            status=status,
+            started_at=started_at,
+            finished_at=datetime.now(UTC),
+            output=output,
+            changed=changed,
+            error=error,
+        )
+        store.append(record)
+        state.records[job.name] = record
+        state.done[job.name].set()
+        logger.info(
+            f"{job.name}: {status} in {record.duration_seconds:.1f}s"
+            + (f" output={output}" if output is not None else "")
+        )
+
+    async def run_job(job: Job) -> None:
+        for predecessor in graph.predecessors(job.name):
+            if predecessor in selected:
+                await state.done[predecessor].wait()
+        started_at = datetime.now(UTC)
+
+        if any(
+            state.records[dep].status in (JobStatus.FAILED, JobStatus.UPSTREAM_FAILED)
+            for dep in job.depends_on
+            if dep in selected
+        ):
+            finish(job, JobStatus.UPSTREAM_FAILED, started_at)
+            return
+
+        if job.depends_on and not force and job.name not in requested:
+            previous = last_success(store, job.name)
+            since = previous.started_at if previous else None
+            if not any(changed_since(store, dep, since) for dep in job.depends_on):
+                finish(job, JobStatus.SKIPPED, started_at)
+                return
+
+        # Resources first, so a job waiting on one does not hold a slot
+        held = [resources[name] for name in sorted(job.resources) if name in resources]
+        for semaphore in held:
+            await semaphore.acquire()
+        try:
+            async with slots:
+                started_at = datetime.now(UTC)
+                entry = job.load()
+                if inspect.iscoroutinefunction(entry):
+                    output = await entry()
+                else:
+                    output = await asyncio.to_thread(entry)
+                changed = job.changed(output)
+        except Exception:
+            logger.exception(f"{job.name} failed")
+            finish(job, JobStatus.FAILED, started_at, error=traceback.format_exc())
+            return
+        finally:
+            for semaphore in reversed(held):
+                semaphore.release()
+
+        finish(
+            job,
+            JobStatus.SUCCEEDED,
+            started_at,
+            output=output,
+            changed=changed,
+        )
+
+    await asyncio.gather(
+        *(run_job(graph.jobs[name]) for name in graph.order if name in selected)
+    )
+    return {name: state.records[name] for name in graph.order if name in selected}
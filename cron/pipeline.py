@@ -0,0 +1,125 @@
+"""
+The cron tasks as a job graph, runnable in one process without AWS.
+
+Mirrors the production wiring in terraform/events.tf: snapshot_product_sku_prices
+triggers compute_sku_listing_data_refresh_priority when it updated prices, which
+triggers purchase_decision_sweep when it updated scores. Jobs that call the
+TCGPlayer API share the "tcgplayer_api" resource.
+
+Usage:
+    python -m cron.pipeline                          # every job
+    python -m cron.pipeline snapshot_product_sku_prices [--force]
+    python -m cron.pipeline --list
+"""
+
+import argparse
+import asyncio
+import logging
+
+from core.services.oauth_token_store import log_token_metrics
+from cron.dag import (
+    Job,
+    JobGraph,
+    JobRunRecord,
+    JobStatus,
+    LocalRunStore,
+    run_job_graph,
+)
+
+RESOURCE_LIMITS = {"tcgplayer_api": 2}
+
+JOBS = JobGraph(
+    [
+        Job(
+            "update_catalog_db",
+            "cron.tasks.update_catalog_db:update_card_database",
+            resources=("tcgplayer_api",),
+        ),
+        Job(
+            "snapshot_inventory_sku_prices",
+            "cron.tasks.snapshot_inventory_sku_prices:snapshot_inventory_sku_price_data",
+            resources=("tcgplayer_api",),
+        ),
+        Job(
+            "snapshot_inventory",
+            "cron.tasks.snapshot_inventory:snapshot_inventory",
+            # Metrics are valued at the latest inventory prices
+            after=("snapshot_inventory_sku_prices",),
+        ),
+        Job(
+            "snapshot_product_sku_prices",
+            "cron.tasks.snapshot_product_sku_prices:run",
+            # Market indicator membership is refreshed by the catalog update
+            after=("update_catalog_db",),
+            resources=("tcgplayer_api",),
+            changed=lambda output: output["cache_updates"] > 0,
+        ),
+        Job(
+            "compute_sku_listing_data_refresh_priority",
+            "cron.tasks.compute_sku_listing_data_refresh_priority:run",
+            depends_on=("snapshot_product_sku_prices",),
+            changed=lambda output: output["records_updated"] > 0,
+        ),
+        Job(
+            "purchase_decision_sweep",
+            "cron.tasks.purchase_decision_sweep:main",
+            depends_on=("compute_sku_listing_data_refresh_priority",),
+            resources=("tcgplayer_api",),
+        ),
+    ]
+)
+
+
+async def run(args) -> dict[str, JobRunRecord]:
+    records = await run_job_graph(
+        JOBS,
+        LocalRunStore(args.store),
+        targets=args.jobs or None,
+        resource_limits=RESOURCE_LIMITS,
+        max_concurrency=args.max_concurrency,
+        force=args.force,
+    )
+    # Jobs share OAuth tokens with the API through the token store
+    await log_token_metrics()
+    return records
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "jobs", nargs="*", help="Jobs to run, with their dependents (default: all)"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Run dependents even if nothing changed"
+    )
+    parser.add_argument("--max-concurrency", type=int, default=4)
+    parser.add_argument(
+        "--store",
+        help="Run record file (default: $CRON_RUN_STORE_PATH or .cron/runs.jsonl)",
+    )
+    parser.add_argument("--list", action="store_true", help="List jobs and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for name in JOBS.order:
+            job = JOBS.jobs[name]
+            edges = ", ".join(
+                [f"depends on {dep}" for dep in job.depends_on]
+                + [f"after {dep}" for dep in job.after]
+            )
+            print(f"{name}" + (f" ({edges})" if edges else ""))
+        return
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    records = asyncio.run(run(args))
+    for record in records.values():
+        print(f"{record.job:<44} {record.status:<16} {record.duration_seconds:8.1f}s")
+    if any(record.status == JobStatus.FAILED for record in records.values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -74,18 +74,21 @@ async def publish_purchase_decision_event(total_records_updated: int) -> None:
         logger.info("Published EventBridge event to trigger purchase decision sweep")
 
 
-async def main():
-    total_skus_targeted = 0
-    total_records_updated = 0
+async def run() -> dict:
+    """
+    Recompute listing data refresh priority scores for market indicator SKUs.
 
+    Returns:
+        Dict with skus_targeted and records_updated
+    """
     # Get target SKU IDs with a separate short-lived session
     with SessionLocal() as session:
         target_sku_ids = get_market_indicator_sku_ids(session)
-        total_skus_targeted = len(target_sku_ids)
+    total_skus_targeted = len(target_sku_ids)
 
     if not target_sku_ids:
         logger.info("No SKUs found to process.")
-        return
+        return {"skus_targeted": 0, "records_updated": 0}
 
     logger.info(f"Preparing to process {total_skus_targeted} market indicator SKUs")
 
@@ -102,6 +105,14 @@ async def main():
         f"{JOB_NAME}: completed. {total_skus_targeted} SKUs targeted, "
         f"{total_records_updated} priority records updated"
     )
+    return {
+        "skus_targeted": total_skus_targeted,
+        "records_updated": total_records_updated,
+    }
+
+
+async def main():
+    total_records_updated = (await run())["records_updated"]
 
     # Trigger the purchase decision sweep if we updated any records
     if total_records_updated > 0:
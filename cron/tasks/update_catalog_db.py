@@ -7,6 +7,8 @@ from datetime import timezone
 from sqlalchemy import select, tuple_
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 
+from core.dao.market_indicators import refresh_market_indicator_skus
+from core.dao.transaction_search import refresh_transaction_search_for_products
 from core.database import SessionLocal, upsert
 from core.models.catalog import (
     Catalog,
@@ -83,6 +85,9 @@ async def update_set(
                 index_elements=[Set.tcgplayer_id],
             ).returning(Set.id)
         ).one()
+        # Products whose name, set name, rarity or number changed, which
+        # transaction search documents are built from
+        renamed_product_ids = []
 
         for tcgplayer_product_type in TCGPlayerProductType:
             product_type = map_tcgplayer_product_type_to_product_type(
@@ -153,6 +158,38 @@ async def update_set(
                 if not product_values:
                     continue
 
+                existing_products = session.execute(
+                    select(
+                        Product.tcgplayer_id,
+                        Product.id,
+                        Product.name,
+                        Product.set_name,
+                        Product.rarity,
+                        Product.number,
+                    ).where(
+                        Product.tcgplayer_id.in_(
+                            [values["tcgplayer_id"] for values in product_values]
+                        )
+                    )
+                )
+                existing_by_tcgplayer_id = {
+                    row.tcgplayer_id: row for row in existing_products
+                }
+                for values in product_values:
+                    existing = existing_by_tcgplayer_id.get(values["tcgplayer_id"])
+                    if existing is not None and (
+                        existing.name,
+                        existing.set_name,
+                        existing.rarity,
+                        existing.number,
+                    ) != (
+                        values["name"],
+                        values["set_name"],
+                        values["rarity"],
+                        values["number"],
+                    ):
+                        renamed_product_ids.append(existing.id)
+
                 result = session.execute(
                     upsert(
                         model=Product,
@@ -267,6 +304,14 @@ async def update_set(
                     )
                     logger.debug(f"Upserted {len(sku_values)} SKUs")
 
+        if renamed_product_ids:
+            # Last, as it holds the write lock of the transactions' users
+            refresh_transaction_search_for_products(session, renamed_product_ids)
+            logger.info(
+                f"Refreshed transaction search for {len(renamed_product_ids)} "
+                f"renamed products in set {tcgplayer_set.name}"
+            )
+
 
 async def fetch_catalog_mappings(
     service: TCGPlayerCatalogService, catalog: Catalog
@@ -470,6 +515,14 @@ async def update_card_database():
                 logger.debug(f"Processing catalog: {catalog.display_name}")
                 await update_catalog(service=service, catalog=catalog)
 
+        # Re-materialize market indicator membership against the updated catalog
+        with SessionLocal() as session, session.begin():
+            upserted, deleted = refresh_market_indicator_skus(session)
+        logger.info(
+            f"Market indicator SKUs refreshed: {upserted} added or reclassified, "
+            f"{deleted} removed"
+        )
+
         logger.info("Completed TCGPlayer catalog database update")
     except Exception:
         logger.exception("Error updating card database")
@@ -22,6 +22,7 @@ from core.services.ebay_product_resolver import (
     EbayProductResolver,
     ProductSearchInput,
 )  # noqa: E402
+from core.services.ebay_resolution_store import EbayResolutionStore  # noqa: E402
 
 
 @dataclass(slots=True)
@@ -33,7 +34,9 @@ class ProductRecord:
 
 
 async def resolve_epid_for_product(
-    product: ProductRecord, api_client: EbayAPIClient | None = None
+    product: ProductRecord,
+    api_client: EbayAPIClient | None = None,
+    resolution_store: EbayResolutionStore | None = None,
 ) -> tuple[str, str, str, str | None, str]:
     """Resolve the eBay EPID for the given product and return a status tuple."""
     close_client = False
@@ -41,7 +44,7 @@ async def resolve_epid_for_product(
         api_client = EbayAPIClient()
         close_client = True
 
-    resolver = EbayProductResolver(api_client)
+    resolver = EbayProductResolver(api_client, resolution_store=resolution_store)
     product_id_str = str(product.id)
     clean_name = product.clean_name or ""
     number = product.number or ""
@@ -75,6 +78,7 @@ async def batch_resolve_epids(
 
     product_records = _load_products(product_ids)
     api_client = EbayAPIClient()
+    resolution_store = EbayResolutionStore()
     semaphore = asyncio.Semaphore(concurrent_limit)
 
     async def resolve_with_limit(
@@ -84,7 +88,7 @@ async def batch_resolve_epids(
         if product is None:
             return str(product_id), "", "", None, "product_not_found"
         async with semaphore:
-            return await resolve_epid_for_product(product, api_client)
+            return await resolve_epid_for_product(product, api_client, resolution_store)
 
     print(
         f"Resolving {len(product_ids)} products (max concurrency={concurrent_limit})..."
@@ -133,6 +137,7 @@ async def batch_resolve_epids(
 
     print(f"\nSaved {success_count} EPIDs to {output_file}")
     print(f"Processed {len(product_ids)} products total")
+    print(resolution_store.stats.summary())
 
 
 def get_hardcoded_product_ids() -> list[uuid.UUID]:
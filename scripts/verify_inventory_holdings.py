@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+import argparse
+import sys
+import uuid
+
+from core.database import SessionLocal
+from core.dao.inventory_holding import diff_holdings, rebuild_holdings
+
+
+def verify_holdings(user_id=None, rebuild=False):
+    """Compare the inventory holdings ledger with a recomputation from line items.
+
+    Returns:
+        Number of (user, SKU) pairs that disagreed
+    """
+    with SessionLocal() as session, session.begin():
+        diffs = diff_holdings(session, user_id)
+        for diff in diffs:
+            print(
+                f"user={diff.user_id} sku={diff.sku_id} "
+                f"ledger=({diff.ledger_quantity}, {diff.ledger_total_cost}) "
+                f"line_items=({diff.quantity}, {diff.total_cost})"
+            )
+        print(f"Mismatched holdings: {len(diffs)}")
+
+        if diffs and rebuild:
+            written = rebuild_holdings(session, user_id)
+            print(f"Rebuilt ledger: {written} holdings written")
+    return len(diffs)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Verify the inventory holdings ledger against the line items."
+    )
+    parser.add_argument(
+        "--user-id", type=uuid.UUID, help="Only verify this user's holdings"
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Rebuild the ledger from the line items if it disagrees",
+    )
+
+    args = parser.parse_args()
+
+    mismatches = verify_holdings(user_id=args.user_id, rebuild=args.rebuild)
+    if mismatches and not args.rebuild:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Database fixtures and seeding helpers shared by the tests."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from typing import Mapping, Optional
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from core.dao.transaction import (
+    LineItemData,
+    TransactionData,
+    create_transaction_with_line_items,
+)
+from core.database import engine
+from core.models.transaction import LineItem, Transaction, TransactionType
+
+# A Monday, at noon so the day is the same in any session time zone near UTC
+START = datetime(2024, 1, 1, 12, tzinfo=UTC)
+
+
+@pytest.fixture
+def session_factory():
+    """Sessions whose commits land in savepoints of one rolled-back transaction."""
+    connection = engine.connect()
+    transaction = connection.begin()
+    try:
+        yield lambda: Session(bind=connection, join_transaction_mode="create_savepoint")
+    finally:
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture
+def session(session_factory) -> Session:
+    """A session whose commits land in savepoints of one rolled-back transaction."""
+    return session_factory()
+
+
+def create_user(session: Session) -> uuid.UUID:
+    user_id = uuid.uuid4()
+    session.execute(
+        text("INSERT INTO users (id, email) VALUES (:id, :email)"),
+        {"id": user_id, "email": f"{user_id}@test.local"},
+    )
+    return user_id
+
+
+@pytest.fixture
+def user_id(session) -> uuid.UUID:
+    return create_user(session)
+
+
+@pytest.fixture
+def sku_ids(session) -> list[uuid.UUID]:
+    return list(
+        session.execute(text("SELECT id FROM sku ORDER BY id LIMIT 3")).scalars()
+    )
+
+
+@pytest.fixture
+def sku_id(sku_ids) -> uuid.UUID:
+    return sku_ids[0]
+
+
+def record(
+    session: Session,
+    user_id: uuid.UUID,
+    transaction_type: TransactionType,
+    items: Mapping[uuid.UUID, tuple[int, str]],
+    day: Optional[int] = None,
+    counterparty_name: str = "Test",
+    shipping_cost: str = "0",
+    tax: str = "0",
+) -> Transaction:
+    """
+    Create and commit a transaction of SKU -> (quantity, unit price) ``items``.
+
+    Dated ``day`` days after START, or now if not given.
+    """
+    transaction = create_transaction_with_line_items(
+        session,
+        TransactionData(
+            date=START + timedelta(days=day) if day is not None else datetime.now(UTC),
+            type=transaction_type,
+            counterparty_name=counterparty_name,
+            currency="USD",
+            shipping_cost_amount=Decimal(shipping_cost),
+            tax_amount=Decimal(tax),
+            user_id=user_id,
+        ),
+        [
+            LineItemData(
+                sku_id=sku_id,
+                quantity=quantity,
+                unit_price_amount=Decimal(unit_price),
+                user_id=user_id,
+            )
+            for sku_id, (quantity, unit_price) in items.items()
+        ],
+    )
+    session.commit()
+    return transaction
+
+
+def remaining(session: Session, transaction: Transaction) -> int:
+    """Remaining quantity of a single-line-item transaction."""
+    return session.scalars(
+        select(LineItem.remaining_quantity).where(
+            LineItem.transaction_id == transaction.id
+        )
+    ).one()
@@ -0,0 +1,150 @@
+"""Tests for the cron job graph runner."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from cron.dag import Job, JobGraph, JobStatus, LocalRunStore, run_job_graph
+from cron.pipeline import JOBS
+
+
+class Recorder:
+    """Job entry points that log their start/finish and track concurrency."""
+
+    def __init__(self) -> None:
+        self.events: list[tuple[str, str]] = []
+        self.running = 0
+        self.max_running = 0
+        self.outputs: dict[str, object] = {}
+
+    def job(self, name: str, delay: float = 0.01, fail: bool = False):
+        async def run():
+            self.events.append(("start", name))
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            await asyncio.sleep(delay)
+            self.running -= 1
+            self.events.append(("finish", name))
+            if fail:
+                raise RuntimeError(f"{name} failed")
+            return self.outputs.get(name, {"updated": 1})
+
+        return run
+
+    def finished_before(self, first: str, second: str) -> bool:
+        return self.events.index(("finish", first)) < self.events.index(
+            ("start", second)
+        )
+
+
+def chain(recorder: Recorder, fail: set[str] = frozenset()) -> JobGraph:
+    updated = lambda output: output["updated"] > 0  # noqa: E731
+    return JobGraph(
+        [
+            Job("catalog", recorder.job("catalog", fail="catalog" in fail)),
+            Job("inventory", recorder.job("inventory")),
+            Job(
+                "prices",
+                recorder.job("prices", fail="prices" in fail),
+                after=("catalog",),
+                changed=updated,
+            ),
+            Job("scores", recorder.job("scores"), depends_on=("prices",)),
+        ]
+    )
+
+
+def run(graph, store, **kwargs):
+    return asyncio.run(run_job_graph(graph, store, **kwargs))
+
+
+def test_runs_in_dependency_order_and_overlaps_independent_jobs(tmp_path):
+    recorder = Recorder()
+    records = run(chain(recorder), LocalRunStore(tmp_path / "runs.jsonl"))
+
+    assert {r.status for r in records.values()} == {JobStatus.SUCCEEDED}
+    assert recorder.finished_before("catalog", "prices")
+    assert recorder.finished_before("prices", "scores")
+    # catalog and inventory have no edges between them
+    assert recorder.max_running == 2
+
+
+def test_resource_limits_serialize_jobs(tmp_path):
+    recorder = Recorder()
+    graph = JobGraph(
+        [Job(name, recorder.job(name), resources=("api",)) for name in "abc"]
+        + [Job("d", recorder.job("d"))]
+    )
+
+    run(graph, LocalRunStore(tmp_path / "runs.jsonl"), resource_limits={"api": 1})
+
+    assert recorder.max_running == 2
+
+
+def test_skips_dependents_when_nothing_upstream_changed(tmp_path):
+    recorder = Recorder()
+    store = LocalRunStore(tmp_path / "runs.jsonl")
+    graph = chain(recorder)
+    run(graph, store)
+
+    recorder.outputs["prices"] = {"updated": 0}
+    records = run(graph, store)
+    assert records["prices"].status == JobStatus.SUCCEEDED
+    assert not records["prices"].changed
+    assert records["scores"].status == JobStatus.SKIPPED
+
+    # Named targets and force always run
+    assert run(graph, store, targets=["scores"])["scores"].status == (
+        JobStatus.SUCCEEDED
+    )
+    assert run(graph, store, force=True)["scores"].status == JobStatus.SUCCEEDED
+
+    # The records persist the outputs and durations the gating reads
+    reloaded = LocalRunStore(store.path).records("prices")
+    assert [r.output for r in reloaded] == [{"updated": 1}] + [{"updated": 0}] * 2
+    assert all(r.duration_seconds > 0 for r in reloaded)
+
+
+def test_failures_stop_dependents_but_not_ordering_only_successors(tmp_path):
+    recorder = Recorder()
+    store = LocalRunStore(tmp_path / "runs.jsonl")
+
+    records = run(chain(recorder, fail={"catalog"}), store)
+    assert records["catalog"].status == JobStatus.FAILED
+    assert "catalog failed" in records["catalog"].error
+    assert records["prices"].status == JobStatus.SUCCEEDED
+
+    records = run(chain(recorder, fail={"prices"}), store)
+    assert records["prices"].status == JobStatus.FAILED
+    assert records["scores"].status == JobStatus.UPSTREAM_FAILED
+
+    # An output the changed predicate cannot read fails the job, not the graph
+    recorder.outputs["prices"] = {}
+    records = run(chain(recorder), store)
+    assert records["prices"].status == JobStatus.FAILED
+    assert "KeyError" in records["prices"].error
+    assert records["scores"].status == JobStatus.UPSTREAM_FAILED
+
+
+def test_rejects_invalid_graphs():
+    with pytest.raises(ValueError, match="cycle"):
+        JobGraph(
+            [
+                Job("a", lambda: None, depends_on=("b",)),
+                Job("b", lambda: None, after=("a",)),
+            ]
+        )
+    with pytest.raises(ValueError, match="unknown"):
+        JobGraph([Job("a", lambda: None, depends_on=("missing",))])
+
+
+def test_pipeline_graph():
+    assert JOBS.downstream(["snapshot_product_sku_prices"]) == {
+        "snapshot_product_sku_prices",
+        "compute_sku_listing_data_refresh_priority",
+        "purchase_decision_sweep",
+    }
+    for job in JOBS.jobs.values():
+        assert callable(job.load())
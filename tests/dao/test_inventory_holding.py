@@ -0,0 +1,134 @@
+"""Tests for the inventory holdings ledger maintained by the transaction DAO."""
+
+from __future__ import annotations
+
+import uuid
+from decimal import Decimal
+
+from conftest import record
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from core.dao.inventory_holding import diff_holdings, rebuild_holdings
+from core.dao.transaction import (
+    LineItemUpdateSpec,
+    bulk_update_transaction_line_items,
+    delete_transactions,
+)
+from core.dao.user_lock import user_lock_key
+from core.database import engine
+from core.models.inventory_holding import InventoryHolding
+from core.models.transaction import TransactionType
+
+
+def holdings(session: Session, user_id: uuid.UUID) -> dict[uuid.UUID, tuple]:
+    rows = session.execute(
+        select(
+            InventoryHolding.sku_id,
+            InventoryHolding.quantity,
+            InventoryHolding.total_cost,
+        ).where(InventoryHolding.user_id == user_id)
+    ).all()
+    return {sku_id: (quantity, total_cost) for sku_id, quantity, total_cost in rows}
+
+
+def test_ledger_follows_purchases_sales_updates_and_deletes(session, user_id, sku_ids):
+    first, second = sku_ids[:2]
+
+    purchase = record(
+        session,
+        user_id,
+        TransactionType.PURCHASE,
+        {first: (3, "2.00"), second: (1, "5.00")},
+    )
+    assert holdings(session, user_id) == {
+        first: (3, Decimal("6.00")),
+        second: (1, Decimal("5.00")),
+    }
+
+    # Selling all of one SKU drops its row
+    sale = record(
+        session,
+        user_id,
+        TransactionType.SALE,
+        {first: (1, "4.00"), second: (1, "9.00")},
+    )
+    assert holdings(session, user_id) == {first: (2, Decimal("4.00"))}
+
+    line_item = next(li for li in purchase.line_items if li.sku_id == first)
+    bulk_update_transaction_line_items(
+        session,
+        TransactionType.PURCHASE,
+        [
+            LineItemUpdateSpec(
+                line_item_id=line_item.id,
+                quantity=5,
+                unit_price_amount=Decimal("3.00"),
+            )
+        ],
+    )
+    session.commit()
+    assert holdings(session, user_id) == {first: (4, Decimal("12.00"))}
+
+    # Deleting the sale restores what it consumed
+    delete_transactions(session, [sale.id])
+    session.commit()
+    assert holdings(session, user_id) == {
+        first: (5, Decimal("15.00")),
+        second: (1, Decimal("5.00")),
+    }
+    assert diff_holdings(session, user_id) == []
+
+    delete_transactions(session, [purchase.id])
+    session.commit()
+    assert holdings(session, user_id) == {}
+    assert diff_holdings(session, user_id) == []
+
+
+def test_rebuild_repairs_a_drifted_ledger(session, user_id, sku_ids):
+    first, second = sku_ids[:2]
+    record(
+        session,
+        user_id,
+        TransactionType.PURCHASE,
+        {first: (2, "1.50"), second: (4, "0.25")},
+    )
+    # Drift that bypasses the DAO
+    session.execute(
+        update(InventoryHolding)
+        .where(InventoryHolding.user_id == user_id, InventoryHolding.sku_id == first)
+        .values(quantity=7)
+    )
+    session.execute(
+        InventoryHolding.__table__.delete().where(
+            InventoryHolding.user_id == user_id, InventoryHolding.sku_id == second
+        )
+    )
+
+    diffs = {diff.sku_id: diff for diff in diff_holdings(session, user_id)}
+    assert set(diffs) == {first, second}
+    assert (diffs[first].ledger_quantity, diffs[first].quantity) == (7, 2)
+    assert (diffs[second].ledger_quantity, diffs[second].quantity) == (None, 4)
+
+    assert rebuild_holdings(session, user_id) == 2
+    assert diff_holdings(session, user_id) == []
+    assert holdings(session, user_id) == {
+        first: (2, Decimal("3.00")),
+        second: (4, Decimal("1.00")),
+    }
+
+
+def test_writers_hold_the_users_lock_until_their_transaction_ends(
+    session, user_id, sku_ids
+):
+    record(session, user_id, TransactionType.PURCHASE, {sku_ids[0]: (1, "1.00")})
+
+    # A concurrent writer to the same user waits; other users do not
+    with engine.connect() as other:
+        assert not other.scalar(
+            select(func.pg_try_advisory_xact_lock(*user_lock_key(user_id)))
+        )
+        assert other.scalar(
+            select(func.pg_try_advisory_xact_lock(*user_lock_key(uuid.uuid4())))
+        )
+        other.rollback()
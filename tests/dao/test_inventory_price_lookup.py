@@ -0,0 +1,88 @@
+"""Plan regression test for the 24-hours-ago price lookup in inventory queries."""
+
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from core.dao.inventory import build_inventory_query
+from core.dao.inventory_holding import rebuild_holdings
+
+PORTFOLIO_SIZE = 50
+SNAPSHOTTED_SKUS = 20_000
+SNAPSHOTS_PER_SKU = 10
+
+
+def seed_portfolio(session, user_id: uuid.UUID) -> None:
+    """Snapshot history for many SKUs, of which the user holds only a few."""
+    session.execute(
+        text(
+            """
+            INSERT INTO sku_price_data_snapshot (
+                sku_id, marketplace, snapshot_datetime, lowest_listing_price_total
+            )
+            SELECT s.id, 'tcgplayer', now() - (g * interval '8 hours'),
+                   round((1 + random() * 50)::numeric, 2)
+            FROM (SELECT id FROM sku ORDER BY id LIMIT :sku_count) AS s
+            CROSS JOIN generate_series(1, :snapshots) AS g
+            """
+        ),
+        {"sku_count": SNAPSHOTTED_SKUS, "snapshots": SNAPSHOTS_PER_SKU},
+    )
+    session.execute(
+        text("INSERT INTO users (id, email) VALUES (:id, :email)"),
+        {"id": user_id, "email": f"{user_id}@plan-test.local"},
+    )
+    transaction_id = uuid.uuid4()
+    session.execute(
+        text(
+            """
+            INSERT INTO transaction (id, date, type, currency, shipping_cost_amount,
+                                     tax_amount, user_id)
+            VALUES (:id, now(), 'PURCHASE', 'USD', 0, 0, :user_id)
+            """
+        ),
+        {"id": transaction_id, "user_id": user_id},
+    )
+    session.execute(
+        text(
+            """
+            INSERT INTO line_item (id, sku_id, quantity, remaining_quantity,
+                                   unit_price_amount, transaction_id, user_id)
+            SELECT gen_random_uuid(), id, 2, 2, 5, :transaction_id, :user_id
+            FROM sku ORDER BY id LIMIT :portfolio_size
+            """
+        ),
+        {
+            "transaction_id": transaction_id,
+            "user_id": user_id,
+            "portfolio_size": PORTFOLIO_SIZE,
+        },
+    )
+    rebuild_holdings(session, user_id)
+    session.execute(text("ANALYZE sku_price_data_snapshot"))
+    session.execute(text("ANALYZE line_item"))
+
+
+def explain(session, statement) -> str:
+    compiled = statement.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    rows = session.execute(text(f"EXPLAIN {compiled}")).scalars().all()
+    return "\n".join(rows)
+
+
+def test_price_24h_ago_lookup_is_scoped_to_portfolio(session):
+    user_id = uuid.uuid4()
+    seed_portfolio(session, user_id)
+
+    plan = explain(session, build_inventory_query(user_id=user_id))
+
+    assert "Seq Scan on sku_price_data_snapshot" not in plan, plan
+    assert "ix_sku_price_snapshot_covering" in plan, plan
+
+    rows = session.execute(build_inventory_query(user_id=user_id)).all()
+    assert len(rows) == PORTFOLIO_SIZE
+    assert all(row.price_24h_ago is not None for row in rows)
@@ -0,0 +1,112 @@
+"""Tests for the materialized market indicator SKU set."""
+
+from __future__ import annotations
+
+from sqlalchemy import select, text
+
+from core.dao.market_indicators import (
+    booster_pack_sku_ids_select,
+    classify_market_indicator_skus_select,
+    get_market_indicator_sku_ids,
+    refresh_market_indicator_skus,
+)
+from core.models.market_indicators import (
+    MarketIndicatorClassification,
+    MarketIndicatorSKU,
+)
+
+
+def membership(session) -> dict:
+    return {
+        row.sku_id: (row.classification, row.is_market_indicator)
+        for row in session.execute(select(MarketIndicatorSKU)).scalars()
+    }
+
+
+def test_refresh_tracks_catalog_changes(session):
+    refresh_market_indicator_skus(session)
+    assert refresh_market_indicator_skus(session) == (0, 0)
+
+    # An NM English card switches to Japanese, and a sealed product is renamed
+    # into a booster pack while its SKUs are moved to Unopened
+    card_sku_id = session.execute(
+        text(
+            """
+            SELECT sku.id FROM sku
+            JOIN product ON sku.product_id = product.id
+            JOIN condition ON sku.condition_id = condition.id
+            JOIN language ON sku.language_id = language.id
+            WHERE product.product_type = 'CARDS' AND condition.abbreviation = 'NM'
+              AND language.abbreviation = 'EN'
+            ORDER BY sku.id LIMIT 1
+            """
+        )
+    ).scalar_one()
+    session.execute(
+        text(
+            """
+            UPDATE sku SET language_id = (
+                SELECT id FROM language WHERE abbreviation <> 'EN' LIMIT 1
+            )
+            WHERE id = :sku_id
+            """
+        ),
+        {"sku_id": card_sku_id},
+    )
+    session.execute(
+        text(
+            """
+            INSERT INTO condition (id, tcgplayer_id, name, abbreviation)
+            SELECT gen_random_uuid(), 99, 'Unopened', 'U'
+            WHERE NOT EXISTS (SELECT 1 FROM condition WHERE abbreviation = 'U')
+            """
+        )
+    )
+    sealed_sku_ids = (
+        session.execute(
+            text(
+                """
+                UPDATE sku SET condition_id = (
+                    SELECT id FROM condition WHERE abbreviation = 'U'
+                )
+                WHERE product_id = (
+                    SELECT id FROM product WHERE product_type = 'SEALED'
+                    ORDER BY id LIMIT 1
+                )
+                RETURNING id
+                """
+            )
+        )
+        .scalars()
+        .all()
+    )
+    session.execute(
+        text(
+            """
+            UPDATE product SET name = 'Test Booster Pack'
+            WHERE id = (
+                SELECT id FROM product WHERE product_type = 'SEALED'
+                ORDER BY id LIMIT 1
+            )
+            """
+        )
+    )
+
+    upserted, deleted = refresh_market_indicator_skus(session)
+
+    assert deleted == 1
+    assert upserted >= len(sealed_sku_ids)
+    members = membership(session)
+    assert card_sku_id not in members
+    for sku_id in sealed_sku_ids:
+        assert members[sku_id] == (MarketIndicatorClassification.BOOSTER_PACK, True)
+    live = {
+        row.sku_id: (row.classification, row.is_market_indicator)
+        for row in session.execute(classify_market_indicator_skus_select())
+    }
+    assert members == live
+
+    indicator_ids = set(get_market_indicator_sku_ids(session))
+    booster_ids = set(session.execute(booster_pack_sku_ids_select()).scalars())
+    assert indicator_ids == {k for k, (_, is_mi) in live.items() if is_mi}
+    assert set(sealed_sku_ids) <= indicator_ids & booster_ids
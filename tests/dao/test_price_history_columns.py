@@ -0,0 +1,114 @@
+"""Tests for the columnar bulk price history."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from core.dao.price import (
+    fetch_price_history_columns,
+    fetch_sku_price_snapshots,
+    normalize_price_history,
+)
+from core.models.price import PriceHistoryResolution
+
+END = datetime(2026, 3, 15, 18, 30, tzinfo=UTC)
+HISTORY_DAYS = 90
+
+
+@pytest.fixture
+def sku_ids(session) -> list[uuid.UUID]:
+    """20 SKUs with a price change every few hours to few days, at varying times."""
+    ids = list(
+        session.execute(text("SELECT id FROM sku ORDER BY id LIMIT 20")).scalars()
+    )
+    session.execute(
+        text(
+            """
+            INSERT INTO sku_price_data_snapshot (sku_id, marketplace,
+                                                 snapshot_datetime,
+                                                 lowest_listing_price_total)
+            SELECT sku_id, 'tcgplayer',
+                   :end - make_interval(hours => n * (7 + ordinality::int % 53)),
+                   1 + (n * 37 + ordinality) % 500 / 100.0
+            FROM unnest(CAST(:sku_ids AS uuid[])) WITH ORDINALITY AS skus(sku_id)
+            CROSS JOIN generate_series(0, :history_hours / (7 + ordinality::int % 53)) AS n
+            ON CONFLICT DO NOTHING
+            """
+        ),
+        {
+            "end": END,
+            "sku_ids": ids,
+            "history_hours": HISTORY_DAYS * 24,
+        },
+    )
+    # Starts pricing halfway through the window
+    session.execute(
+        text(
+            """
+            DELETE FROM sku_price_data_snapshot
+            WHERE sku_id = :sku_id AND snapshot_datetime < :cutoff
+            """
+        ),
+        {"sku_id": ids[1], "cutoff": END - timedelta(days=10)},
+    )
+    # Never priced
+    session.execute(
+        text("DELETE FROM sku_price_data_snapshot WHERE sku_id = :sku_id"),
+        {"sku_id": ids[2]},
+    )
+    return ids
+
+
+def test_daily_columns_match_per_sku_history(session, sku_ids):
+    start = END - timedelta(days=30)
+    columns = fetch_price_history_columns(session, sku_ids, start, END)
+
+    assert columns.timestamps[0] == datetime(2026, 2, 13, tzinfo=UTC)
+    assert columns.timestamps[-1] == datetime(2026, 3, 15, tzinfo=UTC)
+    assert len(columns.timestamps) == 31
+    assert sku_ids[2] not in columns.prices
+    assert columns.prices[sku_ids[1]][:20] == [None] * 20
+
+    for sku_id in sku_ids:
+        price_changes, initial_price = fetch_sku_price_snapshots(
+            session, sku_id, start_date=start, end_date=END
+        )
+        expected = {
+            point.datetime_iso: point.price
+            for point in normalize_price_history(
+                price_changes, initial_price, start, END
+            )
+        }
+        actual = {
+            timestamp.isoformat(): price
+            for timestamp, price in zip(
+                columns.timestamps, columns.prices.get(sku_id, [])
+            )
+            if price is not None
+        }
+        # The first bucket closes at midnight; the per-SKU history's first point
+        # is the price at ``start``
+        expected.pop(columns.timestamps[0].isoformat(), None)
+        actual.pop(columns.timestamps[0].isoformat(), None)
+        assert actual == expected
+
+
+def test_weekly_columns_hold_each_weeks_close(session, sku_ids):
+    start = END - timedelta(days=60)
+    daily = fetch_price_history_columns(session, sku_ids, start, END)
+    weekly = fetch_price_history_columns(
+        session, sku_ids, start, END, PriceHistoryResolution.WEEKLY
+    )
+
+    assert all(t.weekday() == 0 for t in weekly.timestamps)
+    assert weekly.timestamps[0] <= start < weekly.timestamps[1]
+    assert weekly.prices.keys() == daily.prices.keys()
+    for sku_id, prices in weekly.prices.items():
+        closes = dict(zip(daily.timestamps, daily.prices[sku_id]))
+        for week_start, price in zip(weekly.timestamps, prices):
+            last_day = min(week_start + timedelta(days=6), daily.timestamps[-1])
+            assert price == closes[last_day]
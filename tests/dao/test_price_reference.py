@@ -0,0 +1,129 @@
+"""Tests for the precomputed price references and the set price comparison."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select, text
+
+from core.dao.price_reference import (
+    refresh_price_references,
+    set_price_comparison_select,
+)
+from core.models.price import Marketplace, PriceReferenceHorizon, SKUPriceReference
+
+HISTORY_DAYS = 40
+
+
+def price(sku_index: int, days_ago: int) -> Decimal:
+    return Decimal(sku_index * 100 + days_ago + 1) / 100
+
+
+@pytest.fixture
+def priced_set(session):
+    """A card set whose SKUs have one snapshot per day and a latest price."""
+    set_id = session.execute(
+        text(
+            """
+            SELECT product.set_id FROM product
+            JOIN sku ON sku.product_id = product.id
+            WHERE product.product_type = 'CARDS'
+            GROUP BY product.set_id
+            ORDER BY count(*), product.set_id LIMIT 1
+            """
+        )
+    ).scalar_one()
+    sku_ids = (
+        session.execute(
+            text(
+                """
+                SELECT sku.id FROM sku
+                JOIN product ON sku.product_id = product.id
+                WHERE product.set_id = :set_id AND product.product_type = 'CARDS'
+                ORDER BY sku.id
+                """
+            ),
+            {"set_id": set_id},
+        )
+        .scalars()
+        .all()
+    )
+    snapshot_dt = datetime.now(UTC).replace(microsecond=0) - timedelta(minutes=1)
+    # Prices follow `price`: sku_index * 100 + days_ago + 1 cents
+    session.execute(
+        text(
+            """
+            INSERT INTO sku_price_data_snapshot (sku_id, marketplace,
+                                                 snapshot_datetime,
+                                                 lowest_listing_price_total)
+            SELECT sku_id, 'tcgplayer',
+                   :snapshot_dt - make_interval(days => days_ago),
+                   ((sku_index - 1) * 100 + days_ago + 1) / 100.0
+            FROM unnest(CAST(:sku_ids AS uuid[])) WITH ORDINALITY
+                AS skus (sku_id, sku_index)
+            CROSS JOIN generate_series(0, :history_days - 1) AS days_ago
+            """
+        ),
+        {
+            "snapshot_dt": snapshot_dt,
+            "sku_ids": sku_ids,
+            "history_days": HISTORY_DAYS,
+        },
+    )
+    session.execute(
+        text(
+            """
+            INSERT INTO sku_latest_price (sku_id, marketplace,
+                                          lowest_listing_price_total)
+            SELECT sku_id, 'tcgplayer', lowest_listing_price_total
+            FROM sku_price_data_snapshot
+            WHERE sku_id = ANY(CAST(:sku_ids AS uuid[]))
+              AND snapshot_datetime = :snapshot_dt
+            """
+        ),
+        {"snapshot_dt": snapshot_dt, "sku_ids": sku_ids},
+    )
+    return set_id, sku_ids, snapshot_dt
+
+
+def test_refresh_price_references(session, priced_set):
+    _, sku_ids, snapshot_dt = priced_set
+
+    assert refresh_price_references(session, Marketplace.TCGPLAYER, snapshot_dt) >= (
+        len(sku_ids) * len(PriceReferenceHorizon)
+    )
+    # Unchanged history leaves every reference in place
+    assert refresh_price_references(session, Marketplace.TCGPLAYER, snapshot_dt) == 0
+
+    references = {
+        (row.sku_id, row.horizon): row
+        for row in session.execute(
+            select(SKUPriceReference).where(SKUPriceReference.sku_id.in_(sku_ids))
+        ).scalars()
+    }
+    for i, sku_id in enumerate(sku_ids):
+        for horizon in PriceReferenceHorizon:
+            reference = references[sku_id, horizon]
+            assert reference.reference_datetime == snapshot_dt - horizon.delta
+            assert reference.lowest_listing_price_total == price(i, horizon.delta.days)
+
+    # A day later every reference moves one snapshot forward
+    assert refresh_price_references(
+        session, Marketplace.TCGPLAYER, snapshot_dt + timedelta(days=1)
+    ) >= len(sku_ids) * len(PriceReferenceHorizon)
+
+
+@pytest.mark.parametrize("days_ago", [1, 7, 29, 30])
+def test_set_price_comparison_select(session, priced_set, days_ago):
+    set_id, sku_ids, snapshot_dt = priced_set
+    refresh_price_references(session, Marketplace.TCGPLAYER, snapshot_dt)
+
+    rows = session.execute(set_price_comparison_select(set_id, days_ago)).all()
+
+    assert [row.sku_id for row in sorted(rows, key=lambda r: r.sku_id)] == sku_ids
+    by_sku = {row.sku_id: row for row in rows}
+    for i, sku_id in enumerate(sku_ids):
+        assert by_sku[sku_id].current_price == price(i, 0)
+        assert by_sku[sku_id].historical_price == price(i, days_ago)
@@ -0,0 +1,41 @@
+"""Tests for the top-N-per-SKU recent sales query."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from core.dao.sales import get_recent_sales_for_skus
+from core.models.price import Marketplace
+
+
+def test_get_recent_sales_for_skus_limits_per_sku(session):
+    sku_ids = list(
+        session.execute(text("SELECT id FROM sku ORDER BY id LIMIT 3")).scalars()
+    )
+    # 30, 5 and 0 sales, one hour apart
+    for sku_id, sale_count in zip(sku_ids, (30, 5, 0)):
+        session.execute(
+            text(
+                """
+                INSERT INTO sale_record (
+                    id, sku_id, marketplace, sale_date, sale_price, quantity
+                )
+                SELECT gen_random_uuid(), :sku_id, 'tcgplayer',
+                       now() - (g * interval '1 hour'), g, 1
+                FROM generate_series(1, :sale_count) AS g
+                """
+            ),
+            {"sku_id": sku_id, "sale_count": sale_count},
+        )
+
+    since_date = datetime.now(timezone.utc) - timedelta(hours=20, minutes=30)
+    sales_by_sku = get_recent_sales_for_skus(
+        session, sku_ids + sku_ids[:1], Marketplace.TCGPLAYER, since_date, 10
+    )
+
+    assert set(sales_by_sku) == set(sku_ids[:2])
+    liquid_sales = sales_by_sku[sku_ids[0]]
+    assert [int(sale.sale_price) for sale in liquid_sales] == list(range(1, 11))
+    assert len(sales_by_sku[sku_ids[1]]) == 5
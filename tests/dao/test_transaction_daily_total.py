@@ -0,0 +1,172 @@
+"""Tests for the transaction daily totals rollup and the series read from it."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+
+from conftest import START, create_user, record
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.routes.transactions.service import get_transaction_performance
+from core.dao.transaction import (
+    LineItemUpdateSpec,
+    bulk_update_transaction_line_items,
+    delete_transaction_line_items,
+    delete_transactions,
+)
+from core.dao.transaction_daily_total import (
+    performance_series_select,
+    recompute_daily_totals_select,
+    refresh_daily_totals,
+)
+from core.dao.user_lock import user_lock_key
+from core.database import engine
+from core.models.transaction import Transaction, TransactionType
+from core.models.transaction_daily_total import TransactionDailyTotal
+
+
+def record_costed(
+    session: Session,
+    user_id: uuid.UUID,
+    sku_id: uuid.UUID,
+    transaction_type: TransactionType,
+    day: int,
+    quantity: int,
+    unit_price: str = "10.00",
+) -> Transaction:
+    """A one-SKU transaction with 1.00 shipping and 2.00 tax."""
+    return record(
+        session,
+        user_id,
+        transaction_type,
+        {sku_id: (quantity, unit_price)},
+        day,
+        shipping_cost="1.00",
+        tax="2.00",
+    )
+
+
+def rollup(session: Session, user_id: uuid.UUID) -> set[tuple]:
+    return {
+        tuple(row)
+        for row in session.execute(
+            select(
+                TransactionDailyTotal.user_id,
+                TransactionDailyTotal.day,
+                TransactionDailyTotal.sale_count,
+                TransactionDailyTotal.revenue,
+                TransactionDailyTotal.purchase_count,
+                TransactionDailyTotal.expenses,
+            ).where(TransactionDailyTotal.user_id == user_id)
+        )
+    }
+
+
+def recomputed(session: Session, user_id: uuid.UUID) -> set[tuple]:
+    return {
+        tuple(row) for row in session.execute(recompute_daily_totals_select(user_id))
+    }
+
+
+def test_rollup_follows_every_write(session, user_id, sku_id):
+    purchase = record_costed(session, user_id, sku_id, TransactionType.PURCHASE, 0, 3)
+    sale = record_costed(session, user_id, sku_id, TransactionType.SALE, 0, 1, "15.00")
+    other_day = record_costed(session, user_id, sku_id, TransactionType.PURCHASE, 2, 1)
+    assert rollup(session, user_id) == {
+        # 30 + 2 + 1 expenses, 15 + 2 - 1 revenue
+        (user_id, date(2024, 1, 1), 1, Decimal("16.00"), 1, Decimal("33.00")),
+        (user_id, date(2024, 1, 3), 0, Decimal("0.00"), 1, Decimal("13.00")),
+    }
+
+    bulk_update_transaction_line_items(
+        session,
+        TransactionType.PURCHASE,
+        [LineItemUpdateSpec(purchase.line_items[0].id, 4, Decimal("5.00"))],
+    )
+    session.commit()
+    assert rollup(session, user_id) == recomputed(session, user_id)
+
+    # Moving a transaction refreshes the day it left as well
+    other_day.date = START + timedelta(days=5)
+    session.commit()
+    assert {row[1] for row in rollup(session, user_id)} == {
+        date(2024, 1, 1),
+        date(2024, 1, 6),
+    }
+    assert rollup(session, user_id) == recomputed(session, user_id)
+
+    delete_transaction_line_items(session, [sale.line_items[0].id])
+    session.commit()
+    assert rollup(session, user_id) == recomputed(session, user_id)
+
+    delete_transactions(session, [purchase.id, sale.id])
+    session.commit()
+    assert rollup(session, user_id) == recomputed(session, user_id)
+    assert {row[1] for row in rollup(session, user_id)} == {date(2024, 1, 6)}
+
+
+def test_series_fills_gaps_from_the_first_period(session, user_id, sku_id):
+    record_costed(session, user_id, sku_id, TransactionType.PURCHASE, 2, 1)
+    record_costed(session, user_id, sku_id, TransactionType.SALE, 4, 1, "15.00")
+    record_costed(session, user_id, sku_id, TransactionType.PURCHASE, 15, 1)
+
+    daily = session.execute(
+        performance_series_select(
+            date(2023, 12, 25), date(2024, 1, 7), "daily", user_id
+        )
+    ).all()
+    assert [row.period for row in daily] == [
+        date(2024, 1, 3) + timedelta(days=n) for n in range(5)
+    ]
+    assert [row.transaction_count for row in daily] == [1, 0, 1, 0, 0]
+    assert daily[2].revenue == Decimal("16.00")
+
+    weekly = session.execute(
+        performance_series_select(
+            date(2023, 12, 1), date(2024, 1, 31), "weekly", user_id
+        )
+    ).all()
+    assert [
+        (row.period, row.transaction_count, row.revenue, row.expenses) for row in weekly
+    ] == [
+        (date(2024, 1, 1), 2, Decimal("16.00"), Decimal("13.00")),
+        (date(2024, 1, 8), 0, 0, 0),
+        (date(2024, 1, 15), 1, 0, Decimal("13.00")),
+        (date(2024, 1, 22), 0, 0, 0),
+        (date(2024, 1, 29), 0, 0, 0),
+    ]
+
+    assert (
+        session.execute(
+            performance_series_select(
+                date(2023, 1, 1), date(2023, 12, 31), "daily", user_id
+            )
+        ).all()
+        == []
+    )
+
+
+def test_refresh_holds_the_users_lock_until_the_transaction_ends(session, user_id):
+    refresh_daily_totals(session.connection(), [(user_id, START)])
+
+    # A concurrent writer to the same user waits
+    with engine.connect() as other:
+        assert not other.scalar(
+            select(func.pg_try_advisory_xact_lock(*user_lock_key(user_id)))
+        )
+        other.rollback()
+
+
+def test_performance_is_scoped_to_the_user(session, user_id, sku_id):
+    record_costed(session, user_id, sku_id, TransactionType.PURCHASE, 0, 1)
+    # Older and larger, in another account
+    other_user_id = create_user(session)
+    record_costed(session, other_user_id, sku_id, TransactionType.PURCHASE, -400, 9)
+
+    performance = get_transaction_performance(session, user_id, days=None)
+
+    assert performance["data_points"][0]["date"] == START.date().isoformat()
+    assert sum(point["expenses"] for point in performance["data_points"]) == 13.0
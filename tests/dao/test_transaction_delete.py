@@ -0,0 +1,114 @@
+"""Tests for set-based transaction and line item deletion."""
+
+from __future__ import annotations
+
+import uuid
+
+import pytest
+from conftest import record, remaining
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from core.dao.inventory_holding import diff_holdings
+from core.dao.transaction import (
+    InsufficientInventoryError,
+    TransactionNotFoundError,
+    delete_transaction_line_items,
+    delete_transactions,
+    find_line_item_invariant_violations,
+)
+from core.models.transaction import (
+    LineItem,
+    LineItemConsumption,
+    Transaction,
+    TransactionType,
+)
+
+
+def assert_consistent(session: Session, user_id: uuid.UUID) -> None:
+    assert find_line_item_invariant_violations(session, user_id) == []
+    assert diff_holdings(session, user_id) == []
+
+
+def test_deleting_a_consumed_purchase_reconsumes_the_sale(session, user_id, sku_id):
+    older = record(session, user_id, TransactionType.PURCHASE, {sku_id: (5, "1.00")}, 0)
+    newer = record(session, user_id, TransactionType.PURCHASE, {sku_id: (3, "1.00")}, 1)
+    # Takes 3 from the newer lot and 1 from the older one
+    sale = record(session, user_id, TransactionType.SALE, {sku_id: (4, "1.00")}, 2)
+    assert (remaining(session, older), remaining(session, newer)) == (4, 0)
+
+    delete_transactions(session, [newer.id])
+    session.commit()
+
+    # The whole sale now comes out of the older lot, counted once
+    assert remaining(session, older) == 1
+    consumptions = session.scalars(
+        select(LineItemConsumption)
+        .join(LineItem, LineItem.id == LineItemConsumption.sale_line_item_id)
+        .where(LineItem.transaction_id == sale.id)
+    ).all()
+    assert sum(consumption.quantity for consumption in consumptions) == 4
+    assert session.get(Transaction, newer.id) is None
+    assert_consistent(session, user_id)
+
+
+def test_bulk_delete_of_sales_and_purchases(session, user_id, sku_id):
+    kept = record(session, user_id, TransactionType.PURCHASE, {sku_id: (2, "1.00")}, 0)
+    purchases = [
+        record(session, user_id, TransactionType.PURCHASE, {sku_id: (2, "1.00")}, day)
+        for day in (1, 2, 3)
+    ]
+    sales = [
+        record(session, user_id, TransactionType.SALE, {sku_id: (3, "1.00")}, day)
+        for day in (4, 5)
+    ]
+    assert remaining(session, kept) == 2
+
+    delete_transactions(session, [t.id for t in purchases[1:] + sales])
+    session.commit()
+
+    assert remaining(session, kept) == 2
+    assert remaining(session, purchases[0]) == 2
+    assert (
+        session.scalar(
+            select(LineItemConsumption.id).where(LineItemConsumption.user_id == user_id)
+        )
+        is None
+    )
+    assert_consistent(session, user_id)
+
+
+def test_deleting_a_sale_line_item_restores_its_lots(session, user_id, sku_id):
+    purchase = record(
+        session, user_id, TransactionType.PURCHASE, {sku_id: (3, "1.00")}, 0
+    )
+    sale = record(session, user_id, TransactionType.SALE, {sku_id: (2, "1.00")}, 1)
+    assert remaining(session, purchase) == 1
+
+    delete_transaction_line_items(
+        session, [line_item.id for line_item in sale.line_items]
+    )
+    session.commit()
+
+    assert remaining(session, purchase) == 3
+    assert_consistent(session, user_id)
+
+
+def test_delete_fails_when_a_sale_loses_its_only_lot(session, user_id, sku_id):
+    purchase = record(
+        session, user_id, TransactionType.PURCHASE, {sku_id: (2, "1.00")}, 0
+    )
+    record(session, user_id, TransactionType.SALE, {sku_id: (2, "1.00")}, 1)
+
+    with pytest.raises(InsufficientInventoryError):
+        delete_transactions(session, [purchase.id])
+
+
+def test_delete_of_unknown_transaction_changes_nothing(session, user_id, sku_id):
+    purchase = record(
+        session, user_id, TransactionType.PURCHASE, {sku_id: (2, "1.00")}, 0
+    )
+
+    with pytest.raises(TransactionNotFoundError):
+        delete_transactions(session, [purchase.id, uuid.uuid4()])
+    assert remaining(session, purchase) == 2
@@ -0,0 +1,183 @@
+"""Tests for stored transaction search documents and the search built on them."""
+
+from __future__ import annotations
+
+import uuid
+from decimal import Decimal
+
+import pytest
+from conftest import record
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from core.dao.transaction import (
+    LineItemData,
+    TransactionFilterParams,
+    build_filtered_transactions_query,
+    create_transaction_line_items,
+    delete_transaction_line_items,
+    delete_transactions,
+)
+from core.dao.transaction_search import (
+    rebuild_transaction_search,
+    refresh_transaction_search,
+    refresh_transaction_search_for_products,
+)
+from core.dao.user_lock import user_lock_key
+from core.database import engine
+from core.models.transaction import Transaction, TransactionType
+from core.models.transaction_search import TransactionSearchDocument
+
+
+@pytest.fixture
+def products(session) -> list[tuple[uuid.UUID, str]]:
+    """(SKU ID, product name) of two SKUs of different products."""
+    return session.execute(
+        text(
+            """
+            SELECT DISTINCT ON (product.id) sku.id, product.name
+            FROM sku JOIN product ON product.id = sku.product_id
+            ORDER BY product.id, sku.id
+            LIMIT 2
+            """
+        )
+    ).all()
+
+
+def purchase_from(
+    session: Session,
+    user_id: uuid.UUID,
+    counterparty_name: str,
+    sku_ids: list[uuid.UUID],
+) -> Transaction:
+    return record(
+        session,
+        user_id,
+        TransactionType.PURCHASE,
+        dict.fromkeys(sku_ids, (1, "1.00")),
+        counterparty_name=counterparty_name,
+    )
+
+
+def search(session: Session, search_query: str) -> list[uuid.UUID]:
+    page = build_filtered_transactions_query(
+        session, TransactionFilterParams(search_query=search_query)
+    )
+    return [row.id for row in session.execute(page)]
+
+
+def test_search_follows_counterparty_and_line_item_writes(session, user_id, products):
+    (first_sku, first_name), (second_sku, second_name) = products
+    both = purchase_from(session, user_id, "Quixotic Cards", [first_sku, second_sku])
+    second_only = purchase_from(session, user_id, "Zanzibar Games", [second_sku])
+
+    assert search(session, "quixot") == [both.id]
+    assert set(search(session, second_name)) >= {both.id, second_only.id}
+    assert second_only.id not in search(session, first_name)
+
+    second_only.counterparty_name = "Xylophone Traders"
+    session.commit()
+    assert search(session, "zanzibar") == []
+    assert search(session, "xylophon") == [second_only.id]
+
+    create_transaction_line_items(
+        session,
+        second_only.id,
+        TransactionType.PURCHASE,
+        [
+            LineItemData(
+                sku_id=first_sku,
+                quantity=1,
+                unit_price_amount=Decimal("1.00"),
+                user_id=user_id,
+            )
+        ],
+    )
+    session.commit()
+    assert second_only.id in search(session, first_name)
+
+    first_line_item = next(li for li in both.line_items if li.sku_id == first_sku)
+    delete_transaction_line_items(session, [first_line_item.id])
+    session.commit()
+    assert both.id not in search(session, f"quixot {first_name}")
+
+    delete_transactions(session, [both.id])
+    session.commit()
+    assert (
+        session.get(TransactionSearchDocument, both.id) is None
+        and search(session, "quixot") == []
+    )
+
+
+def test_counterparty_matches_rank_first_and_rebuild_agrees(session, user_id, products):
+    (sku_id, name), _ = products
+    by_product = purchase_from(session, user_id, "Somebody", [sku_id])
+    # The product name as the counterparty too (weight A in both places)
+    by_both = purchase_from(session, user_id, name, [sku_id])
+
+    ranked = search(session, name)
+    assert ranked.index(by_both.id) < ranked.index(by_product.id)
+
+    documents = dict(
+        session.execute(
+            select(
+                TransactionSearchDocument.transaction_id,
+                TransactionSearchDocument.document,
+            )
+        ).all()
+    )
+    rebuild_transaction_search(session)
+    assert (
+        dict(
+            session.execute(
+                select(
+                    TransactionSearchDocument.transaction_id,
+                    TransactionSearchDocument.document,
+                )
+            ).all()
+        )
+        == documents
+    )
+
+
+def test_renamed_products_refresh_their_transactions(session, user_id, products):
+    (first_sku, first_name), (second_sku, _) = products
+    renamed = purchase_from(session, user_id, "Test", [first_sku])
+    purchase_from(session, user_id, "Test", [second_sku])
+    product_id = session.scalar(
+        text("SELECT product_id FROM sku WHERE id = :id"), {"id": first_sku}
+    )
+    session.execute(
+        text("UPDATE product SET name = 'Quizzical Wyvern' WHERE id = :id"),
+        {"id": product_id},
+    )
+
+    # Documents keep the name they were written with until refreshed
+    assert search(session, "quizzical") == []
+    refresh_transaction_search_for_products(session, [product_id])
+
+    assert search(session, "quizzical wyvern") == [renamed.id]
+    assert renamed.id not in search(session, first_name)
+
+
+def test_refresh_holds_the_users_lock_until_the_transaction_ends(session, user_id):
+    transaction_id = session.execute(
+        text(
+            """
+            INSERT INTO transaction (id, date, type, counterparty_name, currency,
+                                     shipping_cost_amount, tax_amount, user_id)
+            VALUES (gen_random_uuid(), now(), 'PURCHASE', 'Test', 'USD', 0, 0,
+                    :user_id)
+            RETURNING id
+            """
+        ),
+        {"user_id": user_id},
+    ).scalar_one()
+    refresh_transaction_search(session.connection(), [transaction_id])
+
+    # A concurrent writer to the same user waits
+    with engine.connect() as other:
+        assert not other.scalar(
+            select(func.pg_try_advisory_xact_lock(*user_lock_key(user_id)))
+        )
+        other.rollback()
@@ -0,0 +1,143 @@
+"""Tests for concurrent, coalescing SKU price fetching."""
+
+from __future__ import annotations
+
+import asyncio
+from decimal import Decimal
+
+from core.services.bulk_price_fetcher import (
+    MAX_SKU_IDS_PER_REQUEST,
+    MIN_SKU_IDS_PER_REQUEST,
+    BulkSkuPriceFetcher,
+)
+from core.services.schemas.schema import SKUPricingResponseSchema, SKUPricingSchema
+
+
+def price(sku_id: int) -> SKUPricingSchema:
+    return SKUPricingSchema(
+        sku_id=sku_id,
+        low_price=None,
+        lowest_shipping=Decimal("0.99"),
+        lowest_listing_price=Decimal(sku_id) / 100,
+        market_price=None,
+        direct_low_price=None,
+    )
+
+
+class StubCatalogService:
+    """Answers pricing requests and records their sizes and concurrency."""
+
+    def __init__(
+        self,
+        failures: int = 0,
+        unknown_ids: frozenset = frozenset(),
+        latency: float = 0.001,
+    ):
+        self.failures = failures
+        self.latency = latency
+        self.unknown_ids = unknown_ids
+        self.requested: list[list[int]] = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def get_sku_prices(self, sku_ids: list[int]) -> SKUPricingResponseSchema:
+        self.requested.append(list(sku_ids))
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError("503 from pricing API")
+            return SKUPricingResponseSchema(
+                success=True,
+                errors=[],
+                results=[price(i) for i in sku_ids if i not in self.unknown_ids],
+            )
+        finally:
+            self.in_flight -= 1
+
+
+def fetch(fetcher: BulkSkuPriceFetcher, *id_lists: list[int]):
+    async def run():
+        return await asyncio.gather(*(fetcher.get_sku_prices(ids) for ids in id_lists))
+
+    return [
+        sorted(result.sku_id for result in response.results)
+        for response in asyncio.run(run())
+    ]
+
+
+def test_overlapping_callers_share_requests():
+    service = StubCatalogService()
+    fetcher = BulkSkuPriceFetcher(service, max_concurrency=4)
+
+    first, second = fetch(fetcher, list(range(0, 3000)), list(range(2000, 5000)))
+
+    assert first == list(range(0, 3000))
+    assert second == list(range(2000, 5000))
+    requested = [sku_id for batch in service.requested for sku_id in batch]
+    assert sorted(requested) == list(range(5000))
+    assert max(len(batch) for batch in service.requested) <= MAX_SKU_IDS_PER_REQUEST
+    assert service.peak_in_flight <= 4
+    assert fetcher.stats.skus_coalesced == 1000
+
+
+def test_failed_batches_are_retried_with_less_fan_out():
+    service = StubCatalogService(failures=4, unknown_ids=frozenset({7}))
+    fetcher = BulkSkuPriceFetcher(service, max_concurrency=4)
+
+    (result,) = fetch(fetcher, list(range(1000)))
+
+    assert result == [i for i in range(1000) if i != 7]
+    # Failed IDs are retried before IDs not yet tried
+    retried = sorted(sku_id for batch in service.requested[4:8] for sku_id in batch)
+    assert retried == sorted(
+        sku_id for batch in service.requested[:4] for sku_id in batch
+    )
+    assert fetcher.stats.failed_requests == 4
+    assert fetcher.stats.skus_failed == 0
+    # Four concurrent failures halve the fan-out once, not four times
+    assert fetcher.concurrency >= 2
+
+
+def test_slow_batches_shrink():
+    service = StubCatalogService(latency=0.02)
+    fetcher = BulkSkuPriceFetcher(service, max_concurrency=1, target_latency=0.01)
+
+    (result,) = fetch(fetcher, list(range(400)))
+
+    assert result == list(range(400))
+    sizes = [len(batch) for batch in service.requested]
+    assert sizes[:3] == [MAX_SKU_IDS_PER_REQUEST, 100, 50]
+    assert fetcher.batch_size == MIN_SKU_IDS_PER_REQUEST
+
+
+def test_persistently_failing_ids_are_dropped():
+    service = StubCatalogService(failures=10_000)
+    fetcher = BulkSkuPriceFetcher(service, max_concurrency=2, max_attempts=2)
+
+    (result,) = fetch(fetcher, list(range(300)))
+
+    assert result == []
+    assert fetcher.stats.skus_failed == 300
+    assert fetcher.concurrency == 1
+
+
+def test_cancelled_workers_release_their_callers():
+    service = StubCatalogService(latency=3600)
+    fetcher = BulkSkuPriceFetcher(service, max_concurrency=2)
+
+    async def run():
+        caller = asyncio.create_task(fetcher.get_sku_prices(list(range(300))))
+        while len(service.requested) < 2:
+            await asyncio.sleep(0.01)
+        for task in list(fetcher._worker_tasks):
+            task.cancel()
+        return await asyncio.wait_for(caller, timeout=1)
+
+    response = asyncio.run(run())
+
+    assert response.results == []
+    assert fetcher.stats.skus_failed == 300
+    assert not fetcher._worker_tasks
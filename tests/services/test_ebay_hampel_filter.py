@@ -0,0 +1,100 @@
+"""Property tests: the NumPy Hampel filter keeps exactly what the Decimal one keeps."""
+
+from __future__ import annotations
+
+import random
+from decimal import Decimal
+
+import pytest
+
+from core.environment import OutlierFilterImpl
+from core.services.ebay_listing_service import EbayListingService
+from core.services.schemas.ebay import (
+    ItemSummarySchema,
+    MoneySchema,
+    ShippingOptionSchema,
+)
+
+CASES = 3000
+
+
+def make_item(
+    index: int, price: Decimal, shipping: Decimal | None
+) -> ItemSummarySchema:
+    shipping_options = []
+    if shipping is not None:
+        shipping_options.append(
+            ShippingOptionSchema(
+                shipping_cost=MoneySchema(value=shipping, currency="USD")
+            )
+        )
+    return ItemSummarySchema(
+        item_id=f"v1|{index}|0",
+        price=MoneySchema(value=price, currency="USD"),
+        shipping_options=shipping_options,
+    )
+
+
+def cents(value: float) -> Decimal:
+    return Decimal(max(0, round(value * 100))) / 100
+
+
+def random_listings(rng: random.Random) -> list[ItemSummarySchema]:
+    """Listing sets that sit on and around every guard of the filter."""
+    count = rng.choice([rng.randint(0, 12), rng.randint(13, 80)])
+    center = rng.choice([0.5, 3, 25, 400, 12_000])
+    spread = center * rng.choice([0, 0.01, 0.05, 0.3])
+    outlier_rate = rng.choice([0, 0.1, 0.25, 0.4])
+    grid = rng.choice([None, 0.25, 1.0])
+
+    items = []
+    for index in range(count):
+        if rng.random() < outlier_rate:
+            price = rng.uniform(0, center * 0.6)
+        else:
+            price = rng.gauss(center, spread)
+        if grid:
+            # Ties make even-count medians and MADs land on half-cents
+            price = round(price / grid) * grid
+        shipping = rng.choice([None, Decimal("0"), cents(rng.uniform(0, 5))])
+        items.append(make_item(index, cents(price), shipping))
+    return items
+
+
+def build_service(outlier_filter: OutlierFilterImpl) -> EbayListingService:
+    return EbayListingService(None, None, outlier_filter=outlier_filter)
+
+
+def test_numpy_filter_matches_decimal_filter():
+    rng = random.Random(20251118)
+    decimal_service = build_service(OutlierFilterImpl.DECIMAL)
+    numpy_service = build_service(OutlierFilterImpl.NUMPY)
+
+    filtered_cases = 0
+    for _ in range(CASES):
+        items = random_listings(rng)
+        expected = decimal_service._filter_price_outliers(items)
+        actual = numpy_service._filter_price_outliers_numpy(items)
+
+        assert actual is not None
+        assert [item.item_id for item in actual] == [item.item_id for item in expected]
+        filtered_cases += len(expected) < len(items)
+
+    # The generator must actually exercise the removal path
+    assert filtered_cases > CASES // 20
+
+
+@pytest.mark.parametrize("shipping", [Decimal("0.005"), Decimal("1.999")])
+def test_sub_cent_totals_use_decimal_filter(shipping):
+    items = [make_item(i, Decimal("40.00"), None) for i in range(9)]
+    items += [make_item(9, Decimal("1.00"), shipping)]
+
+    service = build_service(OutlierFilterImpl.NUMPY)
+
+    assert service._filter_price_outliers_numpy(items) is None
+    assert [item.item_id for item in service._filter_price_outliers(items)] == [
+        item.item_id
+        for item in build_service(OutlierFilterImpl.DECIMAL)._filter_price_outliers(
+            items
+        )
+    ]
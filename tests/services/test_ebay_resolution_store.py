@@ -0,0 +1,127 @@
+"""Tests for reusing persisted EPID resolution outcomes across resolver runs."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+
+
+from core.services.ebay_api_client import (
+    AspectEntry,
+    AspectGroup,
+    EbayItemResponse,
+    ProductInfo,
+)
+from core.services.ebay_product_resolver import EbayProductResolver, ProductSearchInput
+from core.services.ebay_resolution_store import EbayResolutionStore
+
+HOLO = ProductSearchInput(
+    clean_name="Resolver Store Testmon",
+    number="2/62",
+    set_code="TST",
+    printing_name="Holofoil",
+)
+REVERSE_HOLO = ProductSearchInput(
+    clean_name="Resolver Store Testmon",
+    number="2/62",
+    set_code="TST",
+    printing_name="Reverse Holofoil",
+)
+UNLISTED = ProductSearchInput(clean_name="Resolver Store Nomatch", number="1/1")
+
+
+def item_with_finish(finish: str) -> EbayItemResponse:
+    return EbayItemResponse(
+        product=ProductInfo(
+            aspectGroups=[
+                AspectGroup(
+                    localizedGroupName="Product Key Features",
+                    aspects=[
+                        AspectEntry(
+                            localizedName="Card Number", localizedValues=["2/62"]
+                        ),
+                        AspectEntry(localizedName="Finish", localizedValues=[finish]),
+                    ],
+                )
+            ]
+        )
+    )
+
+
+class RecordingAPIClient:
+    """Serves canned search and item responses and counts calls."""
+
+    def __init__(self) -> None:
+        self.search_calls = 0
+        self.item_calls = 0
+        self.items = {
+            "item-holo": item_with_finish("Holo"),
+            "item-reverse": item_with_finish("Reverse Holo"),
+        }
+
+    async def browse_item_summary_search(self, request):
+        self.search_calls += 1
+        if "Nomatch" in request["query"]:
+            return SimpleNamespace(item_summaries=[])
+        return SimpleNamespace(
+            item_summaries=[
+                SimpleNamespace(epid="epid-holo", item_id="item-holo"),
+                SimpleNamespace(epid="epid-reverse", item_id="item-reverse"),
+            ]
+        )
+
+    async def get_item(self, item_id: str, fieldgroups: str):
+        self.item_calls += 1
+        return self.items[item_id]
+
+
+def resolve_all(resolver: EbayProductResolver) -> list[str | None]:
+    async def run():
+        return [await resolver.resolve(p) for p in (HOLO, REVERSE_HOLO, UNLISTED)]
+
+    return asyncio.run(run())
+
+
+def test_rerun_skips_settled_products(session_factory):
+    first_client = RecordingAPIClient()
+    first_store = EbayResolutionStore(session_factory=session_factory)
+    first = resolve_all(EbayProductResolver(first_client, first_store))
+
+    assert first == ["epid-holo", "epid-reverse", None]
+    # The reverse holo search differs by aspect filter, but item-holo is reused
+    assert first_client.search_calls == 3
+    assert first_client.item_calls == 2
+    assert first_store.stats.item_validations_reused == 1
+
+    rerun_client = RecordingAPIClient()
+    rerun_store = EbayResolutionStore(session_factory=session_factory)
+    rerun = resolve_all(EbayProductResolver(rerun_client, rerun_store))
+
+    assert rerun == first
+    assert rerun_client.search_calls == rerun_client.item_calls == 0
+    assert rerun_store.stats.products_skipped == 3
+    assert rerun_store.stats.api_calls_saved == first_store.stats.api_calls_made + 1
+
+
+def test_negative_outcome_retried_after_cooldown(session_factory):
+    store = EbayResolutionStore(session_factory=session_factory)
+    asyncio.run(EbayProductResolver(RecordingAPIClient(), store).resolve(UNLISTED))
+
+    expired = EbayResolutionStore(
+        session_factory=session_factory, negative_cooldown=timedelta(0)
+    )
+    assert store.get_settled(UNLISTED) is not None
+    assert expired.get_settled(UNLISTED) is None
+
+
+def test_failed_search_is_not_recorded(session_factory):
+    class FailingAPIClient(RecordingAPIClient):
+        async def browse_item_summary_search(self, request):
+            raise RuntimeError("503 from browse API")
+
+    store = EbayResolutionStore(session_factory=session_factory)
+    resolver = EbayProductResolver(FailingAPIClient(), store)
+
+    assert asyncio.run(resolver.resolve(HOLO)) is None
+    assert store.get_settled(HOLO) is None
@@ -0,0 +1,96 @@
+"""Tests for the versioned inventory metrics cache."""
+
+from __future__ import annotations
+
+import uuid
+from decimal import Decimal
+
+from conftest import record
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from core.dao.inventory_version import get_inventory_version
+from core.dao.latest_price import write_latest_prices
+from core.dao.transaction import delete_transactions
+from core.models.price import Marketplace
+from core.models.transaction import TransactionType
+from core.services.inventory_metrics_cache import InventoryMetricsCache
+
+
+def set_prices(session: Session, prices: dict[uuid.UUID, str]) -> None:
+    write_latest_prices(
+        session,
+        [
+            {
+                "sku_id": sku_id,
+                "marketplace": Marketplace.TCGPLAYER,
+                "lowest_listing_price_total": Decimal(price),
+            }
+            for sku_id, price in prices.items()
+        ],
+        Marketplace.TCGPLAYER,
+    )
+
+
+def test_cached_until_holdings_or_their_prices_change(session, user_id, sku_ids):
+    held, other = sku_ids[:2], sku_ids[2]
+    set_prices(session, {held[0]: "3.00", held[1]: "4.00", other: "5.00"})
+    cache = InventoryMetricsCache()
+
+    assert get_inventory_version(session, user_id) == 0
+    transaction = record(
+        session, user_id, TransactionType.PURCHASE, dict.fromkeys(held, (2, "1.00"))
+    )
+    assert get_inventory_version(session, user_id) > 0
+
+    metrics = cache.get_metrics(session, user_id)
+    assert metrics["number_of_items"] == 4
+    assert metrics["total_market_value"] == Decimal("14.00")
+    assert cache.get_metrics(session, user_id) == metrics
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    # A price refresh of SKUs the user does not hold keeps the entry
+    set_prices(session, {other: "6.00"})
+    assert cache.get_metrics(session, user_id) == metrics
+    assert cache.stats.hits == 2
+
+    # Refreshing a held SKU invalidates it
+    set_prices(session, {held[0]: "5.00"})
+    assert cache.get_metrics(session, user_id)["total_market_value"] == Decimal("18.00")
+    assert cache.stats.misses == 2
+
+    # As does deleting the transaction
+    delete_transactions(session, [transaction.id])
+    session.commit()
+    assert cache.get_metrics(session, user_id)["number_of_items"] == 0
+    assert cache.stats.misses == 3
+
+
+def test_entries_are_per_catalog(session, user_id, sku_ids):
+    set_prices(session, {sku_id: "2.00" for sku_id in sku_ids})
+    record(
+        session, user_id, TransactionType.PURCHASE, dict.fromkeys(sku_ids, (2, "1.00"))
+    )
+    catalog_id = session.execute(
+        text(
+            """
+            SELECT set.catalog_id FROM sku
+            JOIN product ON sku.product_id = product.id
+            JOIN set ON product.set_id = set.id
+            WHERE sku.id = :sku_id
+            """
+        ),
+        {"sku_id": sku_ids[0]},
+    ).scalar_one()
+    cache = InventoryMetricsCache()
+
+    everything = cache.get_metrics(session, user_id)
+    in_catalog = cache.get_metrics(session, user_id, catalog_id)
+    unknown_catalog = cache.get_metrics(session, user_id, uuid.uuid4())
+
+    assert cache.stats.misses == 3
+    assert everything["number_of_items"] == 6
+    assert 2 <= in_catalog["number_of_items"] <= 6
+    assert unknown_catalog["number_of_items"] == 0
+    assert cache.get_metrics(session, user_id, catalog_id) == in_catalog
+    assert cache.stats.hits == 1
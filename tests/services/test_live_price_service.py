@@ -0,0 +1,164 @@
+"""Tests for the live price overlay."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import text
+
+from core.services.live_price_service import LivePriceService
+from core.services.schemas.schema import SKUPricingResponseSchema, SKUPricingSchema
+
+
+def price(sku_id: int) -> SKUPricingSchema:
+    return SKUPricingSchema(
+        sku_id=sku_id,
+        low_price=None,
+        lowest_shipping=Decimal("0"),
+        lowest_listing_price=Decimal(sku_id % 1000 + 100) / 100,
+        market_price=None,
+        direct_low_price=None,
+    )
+
+
+class StubCatalogService:
+    """Answers pricing requests after ``latency`` seconds and records them."""
+
+    def __init__(self, latency: float = 0.001, fail: bool = False):
+        self.latency = latency
+        self.fail = fail
+        self.requested: list[list[int]] = []
+
+    async def get_sku_prices(self, sku_ids: list[int]) -> SKUPricingResponseSchema:
+        self.requested.append(list(sku_ids))
+        await asyncio.sleep(self.latency)
+        if self.fail:
+            raise RuntimeError("503 from pricing API")
+        return SKUPricingResponseSchema(
+            success=True, errors=[], results=[price(i) for i in sku_ids]
+        )
+
+
+@pytest.fixture
+def skus(session) -> dict:
+    """TCGPlayer ID -> SKU ID for 20 SKUs, each with a cached latest price of 1.00."""
+    rows = session.execute(
+        text("SELECT tcgplayer_id, id FROM sku ORDER BY id LIMIT 20")
+    ).all()
+    session.execute(
+        text(
+            """
+            INSERT INTO sku_latest_price (sku_id, marketplace,
+                                          lowest_listing_price_total)
+            VALUES (:sku_id, 'tcgplayer', 1)
+            ON CONFLICT (sku_id, marketplace)
+            DO UPDATE SET lowest_listing_price_total = 1
+            """
+        ),
+        [{"sku_id": row.id} for row in rows],
+    )
+    return {row.tcgplayer_id: row.id for row in rows}
+
+
+def page_loads(service: LivePriceService, session, lookups: list[dict]) -> list[dict]:
+    async def run():
+        return await asyncio.gather(
+            *(service.get_live_prices(session, lookup) for lookup in lookups)
+        )
+
+    return asyncio.run(run())
+
+
+def test_concurrent_lookups_share_one_upstream_request(session, skus):
+    catalog = StubCatalogService()
+    service = LivePriceService(catalog)
+    items = list(skus.items())
+    # Overlapping single-SKU and multi-SKU lookups arriving together
+    lookups = [dict(items[i : i + 5]) for i in range(0, 16)] + [
+        {tcgplayer_id: sku_id} for tcgplayer_id, sku_id in items
+    ]
+
+    results = page_loads(service, session, lookups)
+
+    assert len(catalog.requested) == 1
+    assert sorted(catalog.requested[0]) == sorted(skus)
+    for lookup, prices in zip(lookups, results):
+        assert prices == {
+            sku_id: price(tcgplayer_id).lowest_listing_price_total
+            for tcgplayer_id, sku_id in lookup.items()
+        }
+
+    # Within the TTL every lookup is answered from the cache
+    page_loads(service, session, lookups)
+    assert len(catalog.requested) == 1
+    assert service.stats.cache_hits == sum(map(len, lookups))
+
+
+def test_slow_upstream_falls_back_to_latest_price(session, skus):
+    catalog = StubCatalogService(latency=0.2)
+    service = LivePriceService(catalog, timeout=0.02)
+
+    async def run():
+        fallback = await service.get_live_prices(session, skus)
+        # The upstream request completes in the background and fills the cache
+        await asyncio.sleep(0.3)
+        live = await service.get_live_prices(session, skus)
+        return fallback, live
+
+    fallback, live = asyncio.run(run())
+
+    assert fallback == {sku_id: Decimal("1.00") for sku_id in skus.values()}
+    assert live == {
+        sku_id: price(tcgplayer_id).lowest_listing_price_total
+        for tcgplayer_id, sku_id in skus.items()
+    }
+    assert len(catalog.requested) == 1
+    assert service.stats.fallbacks == len(skus)
+
+
+class BrokenFetcher:
+    """Fails after ``latency`` seconds, as a bug past the fetcher's retries would."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def get_sku_prices(self, sku_ids: list[int]) -> SKUPricingResponseSchema:
+        await asyncio.sleep(self.latency)
+        raise ValueError("malformed pricing response")
+
+
+def test_fetch_failing_after_timeout_is_logged(session, skus, caplog):
+    service = LivePriceService(StubCatalogService(), timeout=0.01)
+    service.fetcher = BrokenFetcher(latency=0.05)
+    unretrieved = []
+
+    async def run():
+        asyncio.get_running_loop().set_exception_handler(
+            lambda loop, context: unretrieved.append(context)
+        )
+        prices = await service.get_live_prices(session, skus)
+        await asyncio.sleep(0.1)
+        return prices
+
+    with caplog.at_level(logging.WARNING, logger="core.services.live_price_service"):
+        prices = asyncio.run(run())
+
+    assert prices == {sku_id: Decimal("1.00") for sku_id in skus.values()}
+    assert [record.getMessage() for record in caplog.records] == [
+        "Live price lookup failed after timing out: malformed pricing response"
+    ]
+    assert unretrieved == []
+
+
+def test_failed_upstream_falls_back_and_is_not_cached(session, skus):
+    catalog = StubCatalogService(fail=True)
+    service = LivePriceService(catalog)
+
+    for _ in range(2):
+        [prices] = page_loads(service, session, [skus])
+        assert prices == {sku_id: Decimal("1.00") for sku_id in skus.values()}
+
+    assert len(catalog.requested) == 2
@@ -0,0 +1,134 @@
+"""Tests for sharing OAuth application tokens between clients."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+
+import pytest
+import redis.asyncio as redis
+from redis.asyncio.retry import Retry
+from redis.backoff import NoBackoff
+
+from core.services.oauth_token_store import (
+    CachedToken,
+    InMemoryTokenStore,
+    RedisTokenStore,
+    SharedOAuthToken,
+    log_token_metrics,
+)
+
+TOKEN_LIFETIME_SECONDS = 7200
+
+
+class TokenEndpoint:
+    """Stands in for the provider's token endpoint and counts mints."""
+
+    def __init__(self, lifetime: float = TOKEN_LIFETIME_SECONDS) -> None:
+        self.lifetime = lifetime
+        self.mints = 0
+        self.fail = False
+        self._serial = itertools.count(1)
+
+    async def mint(self) -> CachedToken:
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise RuntimeError("token endpoint unavailable")
+        self.mints += 1
+        return CachedToken(f"token-{next(self._serial)}", time.time() + self.lifetime)
+
+
+def test_clients_sharing_a_store_mint_once():
+    endpoint = TokenEndpoint()
+    store = InMemoryTokenStore()
+    clients = [SharedOAuthToken("test:shared", endpoint.mint, store) for _ in range(5)]
+
+    async def run():
+        return await asyncio.gather(
+            *(client.get_token() for client in clients for _ in range(20))
+        )
+
+    tokens = asyncio.run(run())
+
+    assert set(tokens) == {"token-1"}
+    assert endpoint.mints == 1
+    assert asyncio.run(store.mint_count("test:shared")) == 1
+
+
+def test_token_renewed_ahead_of_expiry():
+    endpoint = TokenEndpoint(lifetime=60)
+    token = SharedOAuthToken(
+        "test:renewal", endpoint.mint, InMemoryTokenStore(), renew_before=120
+    )
+
+    async def run():
+        return [await token.get_token() for _ in range(2)]
+
+    # A 60s token is always inside a 120s renewal window
+    assert asyncio.run(run()) == ["token-1", "token-2"]
+    assert token.metrics.mints >= 2
+
+
+def test_failed_renewal_serves_still_valid_token():
+    endpoint = TokenEndpoint(lifetime=60)
+    token = SharedOAuthToken(
+        "test:failed-renewal", endpoint.mint, InMemoryTokenStore(), renew_before=120
+    )
+
+    async def run():
+        first = await token.get_token()
+        endpoint.fail = True
+        return first, await token.get_token()
+
+    first, second = asyncio.run(run())
+
+    assert first == second == "token-1"
+    assert token.metrics.mint_failures == 1
+
+
+def test_failed_mint_without_token_raises():
+    endpoint = TokenEndpoint()
+    endpoint.fail = True
+    token = SharedOAuthToken("test:no-token", endpoint.mint, InMemoryTokenStore())
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(token.get_token())
+
+
+def test_unreachable_redis_falls_back_to_process_store():
+    endpoint = TokenEndpoint()
+    # Nothing listens on port 1; every Redis call fails to connect
+    store = RedisTokenStore(
+        redis.Redis(host="127.0.0.1", port=1, retry=Retry(NoBackoff(), 0))
+    )
+    clients = [
+        SharedOAuthToken("test:redis-down", endpoint.mint, store) for _ in range(3)
+    ]
+
+    async def run():
+        return await asyncio.gather(*(client.get_token() for client in clients))
+
+    assert set(asyncio.run(run())) == {"token-1"}
+    assert endpoint.mints == 1
+
+
+def test_token_metrics_are_logged_with_the_shared_mint_count(caplog):
+    endpoint = TokenEndpoint()
+    store = InMemoryTokenStore()
+    token = SharedOAuthToken("test:logged", endpoint.mint, store)
+
+    async def run():
+        await token.get_token()
+        await token.get_token()
+        with caplog.at_level(logging.INFO, logger="core.services.oauth_token_store"):
+            await log_token_metrics(store)
+
+    asyncio.run(run())
+
+    assert any(
+        record.getMessage().startswith("test:logged token: ")
+        and record.getMessage().endswith("; 1 mints across processes")
+        for record in caplog.records
+    )
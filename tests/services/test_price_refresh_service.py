@@ -0,0 +1,156 @@
+"""Tests for the unified SKU price refresh engine."""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from core.dao.inventory_holding import rebuild_holdings
+from core.dao.price_refresh import PriceRefreshSource
+from core.services.price_refresh_service import refresh_sku_prices
+from core.services.schemas.schema import SKUPricingResponseSchema, SKUPricingSchema
+
+HOLDINGS = 300
+OVERLAP = 100
+
+
+class PricedCatalogService:
+    """Serves a fixed price per TCGPlayer SKU ID and records the IDs asked for."""
+
+    def __init__(self, prices: dict[int, Decimal]) -> None:
+        self.prices = prices
+        self.requested: list[int] = []
+
+    async def get_sku_prices(self, sku_ids: list[int]) -> SKUPricingResponseSchema:
+        self.requested.extend(sku_ids)
+        return SKUPricingResponseSchema(
+            success=True,
+            errors=[],
+            results=[
+                SKUPricingSchema(
+                    sku_id=sku_id,
+                    low_price=None,
+                    lowest_shipping=Decimal("0"),
+                    lowest_listing_price=self.prices[sku_id],
+                    market_price=None,
+                    direct_low_price=None,
+                )
+                for sku_id in sku_ids
+                if sku_id in self.prices
+            ],
+        )
+
+
+def seed_holdings(session: Session, offset: int) -> None:
+    """One user holding HOLDINGS SKUs, starting at ``offset`` in SKU id order."""
+    user_id, transaction_id = uuid.uuid4(), uuid.uuid4()
+    session.execute(
+        text("INSERT INTO users (id, email) VALUES (:id, :email)"),
+        {"id": user_id, "email": f"{user_id}@refresh-test.local"},
+    )
+    session.execute(
+        text(
+            """
+            INSERT INTO transaction (id, date, type, currency, shipping_cost_amount,
+                                     tax_amount, user_id)
+            VALUES (:id, now(), 'PURCHASE', 'USD', 0, 0, :user_id)
+            """
+        ),
+        {"id": transaction_id, "user_id": user_id},
+    )
+    session.execute(
+        text(
+            """
+            INSERT INTO line_item (id, sku_id, quantity, remaining_quantity,
+                                   unit_price_amount, transaction_id, user_id)
+            SELECT gen_random_uuid(), id, 1, 1, 5, :transaction_id, :user_id
+            FROM sku WHERE tcgplayer_id IS NOT NULL
+            ORDER BY id OFFSET :offset LIMIT :holdings
+            """
+        ),
+        {
+            "transaction_id": transaction_id,
+            "user_id": user_id,
+            "offset": offset,
+            "holdings": HOLDINGS,
+        },
+    )
+    rebuild_holdings(session, user_id)
+    session.commit()
+
+
+def held_tcgplayer_ids(session: Session) -> list[int]:
+    return (
+        session.execute(
+            text(
+                """
+                SELECT tcgplayer_id FROM sku WHERE tcgplayer_id IS NOT NULL
+                ORDER BY id LIMIT :count
+                """
+            ),
+            {"count": 2 * HOLDINGS - OVERLAP},
+        )
+        .scalars()
+        .all()
+    )
+
+
+def test_overlapping_inventories_fetch_each_sku_once(session_factory):
+    with session_factory() as session:
+        seed_holdings(session, 0)
+        seed_holdings(session, HOLDINGS - OVERLAP)
+        tcgplayer_ids = held_tcgplayer_ids(session)
+    service = PricedCatalogService({i: Decimal("2.50") for i in tcgplayer_ids})
+
+    stats = asyncio.run(
+        refresh_sku_prices(
+            service,
+            [PriceRefreshSource.INVENTORY],
+            batch_size=200,
+            session_factory=session_factory,
+        )
+    )
+
+    assert sorted(service.requested) == sorted(tcgplayer_ids)
+    assert stats.skus_targeted == stats.cache_updates == len(tcgplayer_ids)
+    assert stats.snapshots_written == 0
+    assert stats.api_requests == 3
+    with session_factory() as session:
+        cached = session.execute(
+            text("SELECT count(*) FROM sku_latest_price WHERE updated_at >= now()")
+        ).scalar_one()
+    assert cached == len(tcgplayer_ids)
+
+
+def test_snapshots_written_only_for_changed_prices(session_factory):
+    with session_factory() as session:
+        seed_holdings(session, 0)
+        tcgplayer_ids = held_tcgplayer_ids(session)[:HOLDINGS]
+    service = PricedCatalogService({i: Decimal("2.50") for i in tcgplayer_ids})
+    day = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def refresh(snapshot_dt: datetime):
+        return asyncio.run(
+            refresh_sku_prices(
+                service,
+                [PriceRefreshSource.INVENTORY, PriceRefreshSource.RECENTLY_UPDATED],
+                write_snapshots=True,
+                updated_since=day,
+                snapshot_dt=snapshot_dt,
+                session_factory=session_factory,
+            )
+        )
+
+    first = refresh(day)
+    service.prices[tcgplayer_ids[0]] = Decimal("3.00")
+    second = refresh(day + timedelta(hours=1))
+
+    assert first.snapshots_written == HOLDINGS
+    # RECENTLY_UPDATED now covers the same SKUs as INVENTORY
+    assert second.skus_targeted == HOLDINGS
+    assert second.snapshots_written == 1
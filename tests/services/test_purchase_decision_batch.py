@@ -0,0 +1,157 @@
+"""Equivalence tests for the batched purchase decision engine."""
+
+from __future__ import annotations
+
+import random
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from core.models.listings import SaleRecord
+from core.models.price import Marketplace
+from core.services.purchase_decision_service import (
+    MarketData,
+    compute_purchase_decision,
+    compute_purchase_decisions_batch,
+    group_listings_by_sku,
+)
+from core.services.schemas.tcgplayer import TCGPlayerListingSchema
+
+ASOF = datetime(2025, 10, 1, tzinfo=timezone.utc)
+
+
+def make_listing(
+    price: Decimal, shipping: Decimal, quantity: int, seller_id: str, sku: int = 1
+) -> TCGPlayerListingSchema:
+    return TCGPlayerListingSchema.model_construct(
+        price=price,
+        shipping_price=shipping,
+        quantity=quantity,
+        seller_id=seller_id,
+        product_condition_id=sku,
+    )
+
+
+def make_sale(price: Decimal, shipping: Decimal | None, quantity: int) -> SaleRecord:
+    return SaleRecord(
+        sku_id=uuid.uuid4(),
+        marketplace=Marketplace.TCGPLAYER,
+        sale_date=ASOF,
+        sale_price=price,
+        shipping_price=shipping,
+        quantity=quantity,
+    )
+
+
+def random_market_data(rng: random.Random) -> MarketData:
+    base = Decimal(rng.randint(100, 8000)) / 100
+    listings = [
+        make_listing(
+            price=base * Decimal(rng.randint(70, 140)) / 100,
+            shipping=Decimal(rng.choice([0, 0, 99, 130])) / 100,
+            quantity=rng.randint(0, 6),
+            seller_id=f"seller-{rng.randint(1, 6)}",
+        )
+        for _ in range(rng.randint(0, 25))
+    ]
+    # Round listing prices to cents, as the API returns them
+    for listing in listings:
+        listing.price = listing.price.quantize(Decimal("0.01"))
+    sales = [
+        make_sale(
+            price=(base * Decimal(rng.randint(80, 160)) / 100).quantize(
+                Decimal("0.01")
+            ),
+            shipping=rng.choice([None, Decimal("0.99"), Decimal("0")]),
+            quantity=rng.randint(1, 3),
+        )
+        for _ in range(rng.randint(0, 30))
+    ]
+    return MarketData(
+        sku_id=uuid.uuid4(),
+        marketplace=Marketplace.TCGPLAYER,
+        listings=listings,
+        sales=sales,
+        asof_listings=ASOF,
+        asof_sales=ASOF,
+    )
+
+
+def assert_same_decision(batch, scalar) -> None:
+    assert batch.sku_id == scalar.sku_id
+    assert batch.decision == scalar.decision
+    assert batch.quantity == scalar.quantity
+    assert batch.buy_vwap == scalar.buy_vwap
+    assert batch.expected_resale_net == scalar.expected_resale_net
+    assert batch.reason_codes == scalar.reason_codes
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_batch_matches_per_sku_decisions(seed: int) -> None:
+    rng = random.Random(seed)
+    market_data_list = [random_market_data(rng) for _ in range(400)]
+
+    batch_decisions = compute_purchase_decisions_batch(market_data_list)
+
+    assert len(batch_decisions) == len(market_data_list)
+    for market_data, batch in zip(market_data_list, batch_decisions):
+        assert_same_decision(batch, compute_purchase_decision(market_data))
+
+
+def test_batch_handles_sub_cent_prices_and_ties() -> None:
+    sales = [make_sale(Decimal("20.00"), None, 2) for _ in range(10)]
+    market_data_list = [
+        # Sub-cent listing price falls back to the Decimal path
+        MarketData(
+            sku_id=uuid.uuid4(),
+            marketplace=Marketplace.TCGPLAYER,
+            listings=[make_listing(Decimal("5.005"), Decimal("0"), 3, "a")],
+            sales=sales,
+            asof_listings=ASOF,
+            asof_sales=ASOF,
+        ),
+        # Identical units give equal totals only when quantity is equal; spread sellers
+        MarketData(
+            sku_id=uuid.uuid4(),
+            marketplace=Marketplace.TCGPLAYER,
+            listings=[
+                make_listing(Decimal("10.00"), Decimal("0"), 1, seller)
+                for seller in "abcdefgh"
+            ],
+            sales=sales,
+            asof_listings=ASOF,
+            asof_sales=ASOF,
+        ),
+        # No listings at all
+        MarketData(
+            sku_id=uuid.uuid4(),
+            marketplace=Marketplace.TCGPLAYER,
+            listings=[],
+            sales=[],
+            asof_listings=ASOF,
+            asof_sales=ASOF,
+        ),
+    ]
+
+    for market_data, batch in zip(
+        market_data_list, compute_purchase_decisions_batch(market_data_list)
+    ):
+        assert_same_decision(batch, compute_purchase_decision(market_data))
+
+
+def test_group_listings_by_sku() -> None:
+    listings = [
+        make_listing(Decimal("1.00"), Decimal("0"), 1, "a", sku=1),
+        make_listing(Decimal("2.00"), Decimal("0"), 1, "b", sku=2),
+        make_listing(Decimal("3.00"), Decimal("0"), 1, "c", sku=1),
+    ]
+
+    grouped = group_listings_by_sku(listings)
+
+    assert [listing.price for listing in grouped[1]] == [
+        Decimal("1.00"),
+        Decimal("3.00"),
+    ]
+    assert len(grouped[2]) == 1
@@ -0,0 +1,67 @@
+"""Tests for replaying sale allocation after a correction."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+from conftest import START, record, remaining
+from sqlalchemy import text
+
+from core.dao.inventory_holding import diff_holdings
+from core.dao.transaction import (
+    InsufficientInventoryError,
+    find_line_item_invariant_violations,
+)
+from core.models.transaction import TransactionType
+from core.services.sale_reprocessing_service import reprocess_sales
+
+
+def test_replay_moves_sales_onto_a_late_imported_purchase(session, user_id, sku_id):
+    early = record(session, user_id, TransactionType.PURCHASE, {sku_id: (2, "1.00")}, 0)
+    record(session, user_id, TransactionType.SALE, {sku_id: (2, "1.00")}, 5)
+    # Imported after the sale, so the sale was allocated to the early lot
+    late = record(session, user_id, TransactionType.PURCHASE, {sku_id: (2, "1.00")}, 3)
+    assert (remaining(session, early), remaining(session, late)) == (0, 2)
+
+    preview = reprocess_sales(session, user_id, transaction_ids=[late.id], dry_run=True)
+    assert preview.sku_count == 1 and preview.sale_line_item_count == 1
+    assert sorted(
+        (c.old_quantity, c.new_quantity) for c in preview.consumption_changes
+    ) == [(0, 2), (2, 0)]
+    assert {
+        (c.old_quantity, c.new_quantity) for c in preview.remaining_quantity_changes
+    } == {(0, 2), (2, 0)}
+    assert (remaining(session, early), remaining(session, late)) == (0, 2)
+
+    # The newest lot dated before the sale now covers it
+    result = reprocess_sales(session, user_id, start_date=START + timedelta(days=3))
+    session.commit()
+    assert result.consumption_changes == preview.consumption_changes
+    assert (remaining(session, early), remaining(session, late)) == (2, 0)
+    assert find_line_item_invariant_violations(session, user_id) == []
+    assert diff_holdings(session, user_id) == []
+
+    again = reprocess_sales(session, user_id)
+    assert again.consumption_changes == [] and again.remaining_quantity_changes == []
+
+
+def test_shortfall_aborts_without_writing(session, user_id, sku_id):
+    purchase = record(
+        session, user_id, TransactionType.PURCHASE, {sku_id: (3, "1.00")}, 0
+    )
+    sale = record(session, user_id, TransactionType.SALE, {sku_id: (3, "1.00")}, 1)
+    # A corrected import: the purchase was really of 2
+    session.execute(
+        text("UPDATE line_item SET quantity = 2 WHERE transaction_id = :id"),
+        {"id": purchase.id},
+    )
+
+    preview = reprocess_sales(
+        session, user_id, transaction_ids=[purchase.id], dry_run=True
+    )
+    assert preview.shortfalls == {sale.line_items[0].id: 1}
+
+    with pytest.raises(InsufficientInventoryError):
+        reprocess_sales(session, user_id, transaction_ids=[purchase.id])
+    assert remaining(session, purchase) == 0
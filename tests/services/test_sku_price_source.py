@@ -0,0 +1,171 @@
+"""Tests for the SKU price sources of weighted unit price calculation."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from datetime import UTC, datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import text
+
+from app.routes.transactions.schemas import (
+    LineItemCreateRequestSchema,
+    TransactionCreateRequestSchema,
+)
+from app.routes.transactions.service import create_transaction_service
+from conftest import create_user
+from core.models.transaction import TransactionType
+from core.services.create_transaction import (
+    LineItemInput,
+    calculate_weighted_unit_prices,
+)
+from core.services.schemas.schema import SKUPricingResponseSchema, SKUPricingSchema
+from core.services.sku_price_source import (
+    LatestSkuPriceSource,
+    LiveSkuPriceSource,
+    PriceSource,
+)
+
+
+def price(sku_id: int) -> SKUPricingSchema:
+    return SKUPricingSchema(
+        sku_id=sku_id,
+        low_price=None,
+        lowest_shipping=Decimal("0"),
+        lowest_listing_price=Decimal("3.00"),
+        market_price=None,
+        direct_low_price=None,
+    )
+
+
+class StubCatalogService:
+    """Prices every SKU at 3.00 and records the requests."""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.requested: list[list[int]] = []
+
+    async def get_sku_prices(self, sku_ids: list[int]) -> SKUPricingResponseSchema:
+        self.requested.append(list(sku_ids))
+        if self.fail:
+            raise RuntimeError("429 from pricing API")
+        return SKUPricingResponseSchema(
+            success=True, errors=[], results=[price(i) for i in sku_ids]
+        )
+
+
+@pytest.fixture
+def skus(session) -> list:
+    """Three SKUs: a fresh latest price of 1.00, a two-day-old one of 2.00, none."""
+    rows = session.execute(
+        text("SELECT tcgplayer_id, id FROM sku ORDER BY id LIMIT 3")
+    ).all()
+    session.execute(
+        text("DELETE FROM sku_latest_price WHERE sku_id = ANY(CAST(:ids AS uuid[]))"),
+        {"ids": [str(row.id) for row in rows]},
+    )
+    session.execute(
+        text(
+            """
+            INSERT INTO sku_latest_price (sku_id, marketplace,
+                                          lowest_listing_price_total, updated_at)
+            VALUES (:sku_id, 'tcgplayer', :price, now() - :age * interval '1 day')
+            """
+        ),
+        [
+            {"sku_id": rows[0].id, "price": 1, "age": 0},
+            {"sku_id": rows[1].id, "price": 2, "age": 2},
+        ],
+    )
+    return rows
+
+
+def calculate(session, price_source, skus, total_amount: str):
+    return asyncio.run(
+        calculate_weighted_unit_prices(
+            session,
+            price_source,
+            [LineItemInput(sku_id=row.id, quantity=1) for row in skus],
+            Decimal(total_amount),
+            uuid.uuid4(),
+        )
+    )
+
+
+def test_only_stale_and_missing_skus_are_fetched_live(session, skus):
+    catalog_service = StubCatalogService()
+    price_source = LatestSkuPriceSource(catalog_service)
+
+    line_items = calculate(session, price_source, skus, "7.00")
+
+    assert catalog_service.requested == [[skus[1].tcgplayer_id, skus[2].tcgplayer_id]]
+    assert [(item.sku_id, item.price_source) for item in line_items] == [
+        (skus[0].id, PriceSource.LATEST),
+        (skus[1].id, PriceSource.LIVE),
+        (skus[2].id, PriceSource.LIVE),
+    ]
+    # Weighted 1 : 3 : 3
+    assert [item.unit_price_amount for item in line_items] == [
+        Decimal("1.00"),
+        Decimal("3.00"),
+        Decimal("3.00"),
+    ]
+    assert (price_source.stats.latest, price_source.stats.live) == (1, 2)
+
+    # The live source prices everything upstream, as before
+    catalog_service = StubCatalogService()
+    line_items = calculate(session, LiveSkuPriceSource(catalog_service), skus, "9.00")
+    assert len(catalog_service.requested) == 1
+    assert {item.price_source for item in line_items} == {PriceSource.LIVE}
+
+
+def test_failed_live_fetch_falls_back_to_stale_prices(session, skus):
+    price_source = LatestSkuPriceSource(StubCatalogService(fail=True))
+
+    line_items = calculate(session, price_source, skus, "6.00")
+
+    # 1.00 and 2.00 share the priced two thirds; the unpriced SKU gets the rest
+    assert [
+        (item.price_source, round(item.unit_price_amount, 2)) for item in line_items
+    ] == [
+        (PriceSource.LATEST, Decimal("1.33")),
+        (PriceSource.STALE_LATEST, Decimal("2.67")),
+        (PriceSource.NONE, Decimal("2.00")),
+    ]
+    assert price_source.stats.fallbacks == 2
+    assert (price_source.stats.latest, price_source.stats.stale_latest) == (1, 1)
+
+
+def test_created_transactions_log_each_line_items_price_source(session, skus, caplog):
+    request = TransactionCreateRequestSchema(
+        date=datetime.now(UTC),
+        type=TransactionType.PURCHASE,
+        counterparty_name="Test",
+        line_items=[
+            LineItemCreateRequestSchema(sku_id=row.id, quantity=1) for row in skus
+        ],
+        currency="USD",
+        shipping_cost_amount=Decimal("0"),
+        tax_amount=Decimal("0"),
+        subtotal_amount=Decimal("6.00"),
+    )
+    price_source = LatestSkuPriceSource(StubCatalogService(fail=True))
+
+    with caplog.at_level(logging.INFO, logger="app.routes.transactions.service"):
+        transaction = asyncio.run(
+            create_transaction_service(
+                request, price_source, session, create_user(session)
+            )
+        )
+
+    assert [
+        record.getMessage()
+        for record in caplog.records
+        if record.name == "app.routes.transactions.service"
+    ] == [
+        f"Transaction {transaction.id} line item prices weighted by: "
+        f"{skus[0].id}=latest, {skus[1].id}=stale_latest, {skus[2].id}=none"
+    ]
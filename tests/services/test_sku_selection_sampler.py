@@ -0,0 +1,128 @@
+"""Statistical equivalence tests for the vectorized tier sampler."""
+
+from __future__ import annotations
+
+import math
+import random
+import uuid
+
+import numpy as np
+import pytest
+
+from core.services.sku_selection import (
+    MIN_WINDOW_SIZE,
+    TIER_CONFIGS,
+    TOP_L_WINDOW,
+    Candidate,
+    TierCandidates,
+    sample_softmax_window,
+)
+
+TRIALS = 20_000
+
+
+def reference_select(scores: list[float], temperature: float, count: int) -> list[int]:
+    """The original list-based sampler: softmax over a sliding top-L window."""
+    available = list(range(len(scores)))
+    selected = []
+    for _ in range(min(count, len(available))):
+        window_size = max(MIN_WINDOW_SIZE, min(TOP_L_WINDOW, len(available)))
+        window = available[:window_size]
+        max_score = max(scores[i] for i in window)
+        weights = [math.exp((scores[i] - max_score) / temperature) for i in window]
+        total = sum(weights)
+        rand_val = random.random()
+        cumulative = 0.0
+        chosen = window[-1]
+        for i, weight in zip(window, weights):
+            cumulative += weight / total
+            if rand_val <= cumulative:
+                chosen = i
+                break
+        selected.append(chosen)
+        available.remove(chosen)
+    return selected
+
+
+def selection_frequencies(sample, n: int, count: int) -> tuple[np.ndarray, np.ndarray]:
+    """Return (first-pick frequency, inclusion frequency) per candidate index."""
+    first = np.zeros(n)
+    included = np.zeros(n)
+    for _ in range(TRIALS):
+        picks = sample()
+        first[picks[0]] += 1
+        included[list(picks)] += 1
+    return first / TRIALS, included / TRIALS
+
+
+def assert_frequencies_match(expected: np.ndarray, actual: np.ndarray) -> None:
+    # Both sides are Monte Carlo estimates; allow 5 standard errors of the difference
+    p = np.clip((expected + actual) / 2, 1e-4, 1.0)
+    tolerance = 5 * np.sqrt(2 * p * (1 - p) / TRIALS) + 1e-3
+    assert np.all(np.abs(expected - actual) <= tolerance), np.abs(expected - actual)
+
+
+@pytest.mark.parametrize(
+    "n, count, tier",
+    [
+        (60, 12, TIER_CONFIGS[0]),  # sliding window, tight temperature
+        (45, 20, TIER_CONFIGS[2]),  # sliding window runs into the tail
+        (12, 6, TIER_CONFIGS[1]),  # window spans every candidate (Gumbel-top-k)
+    ],
+)
+def test_sampler_matches_reference_distribution(n, count, tier):
+    scores_rng = random.Random(n)
+    scores = sorted((scores_rng.uniform(0.6, 1.0) for _ in range(n)), reverse=True)
+    scores_array = np.array(scores)
+    window_size = max(MIN_WINDOW_SIZE, TOP_L_WINDOW)
+
+    random.seed(1234)
+    expected_first, expected_included = selection_frequencies(
+        lambda: reference_select(scores, tier.temperature, count), n, count
+    )
+
+    rng = np.random.default_rng(1234)
+    actual_first, actual_included = selection_frequencies(
+        lambda: sample_softmax_window(
+            scores_array, tier.temperature, count, window_size, rng
+        ),
+        n,
+        count,
+    )
+
+    assert_frequencies_match(expected_first, actual_first)
+    assert_frequencies_match(expected_included, actual_included)
+
+
+@pytest.mark.parametrize("n, count", [(300, 50), (15, 15), (40, 100), (5, 0)])
+def test_sampler_returns_distinct_indices(n, count):
+    scores = np.sort(np.random.default_rng(0).random(n))[::-1]
+    picks = sample_softmax_window(
+        scores, 0.07, count, TOP_L_WINDOW, np.random.default_rng(1)
+    )
+
+    assert len(picks) == min(count, n)
+    assert len(set(picks.tolist())) == len(picks)
+    assert all(0 <= i < n for i in picks)
+
+
+def test_select_from_tier_is_deterministic_under_seed():
+    candidates = [
+        Candidate(
+            sku_id=uuid.uuid4(),
+            product_tcgplayer_id=i,
+            priority_score=0.9,
+            age_norm=1.0,
+            service_score=1.0 - i / 1000,
+            last_refresh_at=None,
+        )
+        for i in range(500)
+    ]
+    tier = TIER_CONFIGS[0]
+
+    first = TierCandidates(None, None, rng=np.random.default_rng(42))
+    second = TierCandidates(None, None, rng=np.random.default_rng(42))
+
+    assert first._select_from_tier(candidates, tier, 40) == second._select_from_tier(
+        candidates, tier, 40
+    )
@@ -0,0 +1,48 @@
+"""Tests for TCGPlayerCatalogService's bearer token headers."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from core.services.oauth_token_store import CachedToken, InMemoryTokenStore
+from core.services.tcgplayer_catalog_service import TCGPlayerCatalogService
+
+
+class CountingMintService(TCGPlayerCatalogService):
+    def __init__(self, lifetime: float) -> None:
+        super().__init__(token_store=InMemoryTokenStore())
+        self.lifetime = lifetime
+        self.mints = 0
+
+    async def _mint_access_token(self) -> CachedToken:
+        self.mints += 1
+        await asyncio.sleep(0.01)
+        return CachedToken(f"token-{self.mints}", time.time() + self.lifetime)
+
+
+def test_concurrent_callers_share_one_refresh():
+    service = CountingMintService(lifetime=3600)
+
+    async def run():
+        return await asyncio.gather(
+            *(service.get_authorization_headers() for _ in range(500))
+        )
+
+    headers = asyncio.run(run())
+
+    assert {h["Authorization"] for h in headers} == {"bearer token-1"}
+    assert service.mints == 1
+
+
+def test_failed_mint_raises():
+    class FailingMintService(CountingMintService):
+        async def _mint_access_token(self) -> CachedToken:
+            raise RuntimeError("Failed to refresh TCGPlayer token: 401")
+
+    service = FailingMintService(lifetime=3600)
+
+    with pytest.raises(Exception, match="Failed to get or refresh"):
+        asyncio.run(service.get_authorization_headers())
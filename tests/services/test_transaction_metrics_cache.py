@@ -0,0 +1,73 @@
+"""Tests for user-scoped transaction metrics and their versioned cache."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+from conftest import create_user, record
+
+from core.dao.transaction import delete_transactions
+from core.dao.transaction_version import get_transaction_version
+from core.models.transaction import TransactionType
+from core.services.transaction_metrics_cache import TransactionMetricsCache
+
+
+# Every transaction pays 1.00 shipping and 2.00 tax
+COSTS = {"shipping_cost": "1.00", "tax": "2.00"}
+
+
+def test_metrics_are_scoped_to_the_user(session, user_id, sku_id):
+    other_user_id = create_user(session)
+    record(session, user_id, TransactionType.PURCHASE, {sku_id: (2, "10.00")}, **COSTS)
+    record(session, user_id, TransactionType.SALE, {sku_id: (2, "15.00")}, **COSTS)
+    record(
+        session,
+        other_user_id,
+        TransactionType.PURCHASE,
+        {sku_id: (2, "99.00")},
+        **COSTS,
+    )
+    cache = TransactionMetricsCache()
+
+    assert cache.get_metrics(session, user_id) == {
+        "total_revenue": 31.0,  # 30 + 2 - 1
+        "total_spent": 23.0,  # 20 + 2 + 1
+        "net_profit": 8.0,
+        "total_transactions": 2,
+        "currency": "USD",
+    }
+    assert cache.get_metrics(session, other_user_id)["total_spent"] == 201.0
+    assert cache.get_metrics(session, create_user(session))["total_transactions"] == 0
+
+
+def test_cached_until_the_users_transactions_change(session, user_id, sku_id):
+    other_user_id = create_user(session)
+    assert get_transaction_version(session, user_id) == 0
+    purchase = record(
+        session, user_id, TransactionType.PURCHASE, {sku_id: (2, "10.00")}, **COSTS
+    )
+    assert get_transaction_version(session, user_id) > 0
+    cache = TransactionMetricsCache()
+
+    metrics = cache.get_metrics(session, user_id)
+    assert cache.get_metrics(session, user_id) == metrics
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    # Another user's writes keep the entry
+    record(
+        session, other_user_id, TransactionType.PURCHASE, {sku_id: (2, "5.00")}, **COSTS
+    )
+    assert cache.get_metrics(session, user_id) == metrics
+    assert cache.stats.hits == 2
+
+    # Editing the transaction header invalidates it
+    purchase.shipping_cost_amount = Decimal("4.00")
+    session.commit()
+    assert cache.get_metrics(session, user_id)["total_spent"] == 26.0
+    assert cache.stats.misses == 2
+
+    # As does deleting the transaction
+    delete_transactions(session, [purchase.id])
+    session.commit()
+    assert cache.get_metrics(session, user_id)["total_transactions"] == 0
+    assert cache.stats.misses == 3
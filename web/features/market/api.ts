@@ -8,9 +8,28 @@ import {
 import { DisplayCardProps } from "@/features/catalog/components/DisplayCard";
 import { queryOptions } from "@tanstack/react-query";
 
+// Largest page the endpoint serves
+const BUY_DECISIONS_PAGE_SIZE = 200;
+
 async function fetchBuyDecisions(): Promise<BuyDecisionsResponse> {
-  const response = await fetch(`${API_URL}/buy-decisions`);
-  return response.json();
+  // Follow next_cursor so every current decision is loaded, not just the first page
+  let page: BuyDecisionsResponse | null = null;
+  const decisions: BuyDecisionsResponse["decisions"] = [];
+  do {
+    const params = new URLSearchParams({
+      limit: BUY_DECISIONS_PAGE_SIZE.toString(),
+    });
+    if (page?.next_cursor) {
+      params.set("cursor", page.next_cursor);
+    }
+    const response = await fetch(
+      `${API_URL}/buy-decisions?${params.toString()}`,
+    );
+    page = (await response.json()) as BuyDecisionsResponse;
+    decisions.push(...page.decisions);
+  } while (page.next_cursor);
+
+  return { ...page, decisions, next_cursor: null };
 }
 
 export function getCardDecisionsQuery() {
@@ -139,6 +139,7 @@ export interface BuyDecisionsResponse {
   decisions: BuyDecisionResponse[];
   total_count: number;
   filters_applied: Record<string, any>;
+  next_cursor: string | null;
 }
 
 /* -----------------------------------------------------